@@ -0,0 +1,310 @@
+"""
+Lazy, auto-paginating iterators over endpoints that return one page per call.
+
+`sessions.retrieve_history`, `user.list` and `namespace.list` take `limit`/`skip` or
+`page`/`page_size` and return a single page. The `*_all` resource methods wrap them:
+
+    for message in client.messages.sessions.retrieve_history_all(session_id):
+        ...  # newest first; the next page is already being fetched
+
+    for page in client.user.list_all(page_size=100, concurrency=8).iter_pages():
+        ...  # pages arrive in order, up to 8 requests in flight
+
+Pages are requested only as iteration reaches them. While the caller works through a
+page the next one is fetched in the background (`prefetch=False` turns this off). Once the
+first page reports the total number of items, up to `concurrency` pages are fetched in
+parallel; they are still yielded in order. Abandoning the iteration cancels pages that
+were not started yet.
+"""
+
+from __future__ import annotations
+
+import math
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    List,
+    Union,
+    Generic,
+    TypeVar,
+    Callable,
+    Iterator,
+    Optional,
+    Awaitable,
+    AsyncIterator,
+)
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ._types import Omit, omit
+from ._logging import get_logger
+from .types.user_response import UserResponse
+from .types.namespace_item import NamespaceItem
+from .types.user_list_response import UserListResponse
+from .types.namespace_list_response import NamespaceListResponse
+from .types.messages.session_retrieve_history_response import Message, SessionRetrieveHistoryResponse
+
+if TYPE_CHECKING:
+    from .resources.user import UserResource, AsyncUserResource
+    from .resources.namespace.namespace import NamespaceResource, AsyncNamespaceResource
+    from .resources.messages.sessions import SessionsResource, AsyncSessionsResource
+
+__all__ = ["PageIterator", "AsyncPageIterator"]
+
+logger = get_logger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+
+_T = TypeVar("_T")
+_PageT = TypeVar("_PageT")
+
+
+class _Pager(Generic[_T, _PageT]):
+    """What the sync and async iterators share: page layout and when to stop."""
+
+    def __init__(
+        self,
+        items: Callable[[_PageT], Optional[List[_T]]],
+        total: Callable[[_PageT], Optional[int]],
+        *,
+        page_size: int,
+        prefetch: bool,
+        concurrency: int,
+        served_page_size: Optional[Callable[[_PageT], Optional[int]]] = None,
+    ) -> None:
+        if page_size < 1:
+            raise ValueError(f"page_size must be at least 1, got {page_size}")
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        self._items = items
+        self._total = total
+        self._served_page_size = served_page_size
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.concurrency = concurrency
+        self.total: Optional[int] = None
+        """Total number of items, once the first page has reported it."""
+
+    def items(self, page: _PageT) -> List[_T]:
+        return self._items(page) or []
+
+    def page_count(self, first: _PageT) -> Optional[int]:
+        # Page-numbered endpoints may serve fewer items per page than requested; count their pages
+        served = self._served_page_size(first) if self._served_page_size is not None else None
+        if served:
+            self.page_size = served
+        self.total = self._total(first)
+        if self.total is None:
+            return None
+        return math.ceil(self.total / self.page_size)
+
+    def ahead(self, pages: Optional[int]) -> int:
+        """How many pages to keep in flight beyond the one being consumed."""
+        if pages is not None:
+            return self.concurrency if self.prefetch or self.concurrency > 1 else 0
+        return 1 if self.prefetch else 0
+
+    def more_after(self, index: int, page: _PageT, pages: Optional[int]) -> bool:
+        count = len(self.items(page))
+        if pages is not None:
+            return count > 0 and index + 1 < pages
+        return count >= self.page_size
+
+
+class PageIterator(_Pager[_T, _PageT]):
+    """Iterates over every item (or, with `iter_pages()`, every page) of a paginated endpoint."""
+
+    def __init__(
+        self,
+        fetch: Callable[[int], _PageT],
+        items: Callable[[_PageT], Optional[List[_T]]],
+        total: Callable[[_PageT], Optional[int]],
+        **options: Any,
+    ) -> None:
+        super().__init__(items, total, **options)
+        self._fetch = fetch
+
+    def __iter__(self) -> Iterator[_T]:
+        for page in self.iter_pages():
+            yield from self.items(page)
+
+    def iter_pages(self) -> Iterator[_PageT]:
+        index, page = 0, self._fetch(0)
+        pages = self.page_count(page)
+        ahead = self.ahead(pages)
+        if not ahead:
+            yield page
+            while self.more_after(index, page, pages):
+                index += 1
+                page = self._fetch(index)
+                yield page
+            return
+
+        pool: Optional[ThreadPoolExecutor] = None
+        pending: deque[Future[_PageT]] = deque()
+        requested = 1
+
+        def top_up() -> None:
+            nonlocal pool, requested
+            # Without a total, a page is only requested once the one before it came back full
+            limit = pages if pages is not None else index + 2
+            while len(pending) < ahead and requested < limit:
+                if pool is None:
+                    pool = ThreadPoolExecutor(max_workers=ahead, thread_name_prefix="PaprPages")
+                pending.append(pool.submit(self._fetch, requested))
+                requested += 1
+
+        try:
+            while self.more_after(index, page, pages):
+                top_up()  # before handing out the page, so the next ones load while it is consumed
+                yield page
+                index, page = index + 1, pending.popleft().result()
+            yield page
+        finally:
+            for future in pending:
+                future.cancel()
+            if pool is not None:
+                pool.shutdown(wait=False)
+
+
+class AsyncPageIterator(_Pager[_T, _PageT]):
+    """Async counterpart of `PageIterator`: `async for item in ...` or `async for page in ....iter_pages()`."""
+
+    def __init__(
+        self,
+        fetch: Callable[[int], Awaitable[_PageT]],
+        items: Callable[[_PageT], Optional[List[_T]]],
+        total: Callable[[_PageT], Optional[int]],
+        **options: Any,
+    ) -> None:
+        super().__init__(items, total, **options)
+        self._fetch = fetch
+
+    async def __aiter__(self) -> AsyncIterator[_T]:
+        async for page in self.iter_pages():
+            for item in self.items(page):
+                yield item
+
+    async def iter_pages(self) -> AsyncIterator[_PageT]:
+        index, page = 0, await self._fetch(0)
+        pages = self.page_count(page)
+        ahead = self.ahead(pages)
+        if not ahead:
+            yield page
+            while self.more_after(index, page, pages):
+                index += 1
+                page = await self._fetch(index)
+                yield page
+            return
+
+        pending: deque[asyncio.Future[_PageT]] = deque()
+        requested = 1
+
+        def top_up() -> None:
+            nonlocal requested
+            limit = pages if pages is not None else index + 2
+            while len(pending) < ahead and requested < limit:
+                pending.append(asyncio.ensure_future(self._fetch(requested)))
+                requested += 1
+
+        try:
+            while self.more_after(index, page, pages):
+                top_up()
+                yield page
+                index, page = index + 1, await pending.popleft()
+            yield page
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def history_pages(
+    resource: SessionsResource, session_id: str, **options: Any
+) -> PageIterator[Message, SessionRetrieveHistoryResponse]:
+    size = options["page_size"]
+    return PageIterator(
+        lambda index: resource.retrieve_history(session_id, limit=size, skip=index * size),
+        _messages,
+        _total_count,
+        **options,
+    )
+
+
+def async_history_pages(
+    resource: AsyncSessionsResource, session_id: str, **options: Any
+) -> AsyncPageIterator[Message, SessionRetrieveHistoryResponse]:
+    size = options["page_size"]
+    return AsyncPageIterator(
+        lambda index: resource.retrieve_history(session_id, limit=size, skip=index * size),
+        _messages,
+        _total_count,
+        **options,
+    )
+
+
+def user_pages(
+    resource: UserResource,
+    *,
+    email: Optional[str] | Omit = omit,
+    external_id: Optional[str] | Omit = omit,
+    **options: Any,
+) -> PageIterator[UserResponse, UserListResponse]:
+    size = options["page_size"]
+    return PageIterator(
+        # `page` is 1-based
+        lambda index: resource.list(email=email, external_id=external_id, page=index + 1, page_size=size),
+        _data,
+        _total,
+        served_page_size=_page_size,
+        **options,
+    )
+
+
+def async_user_pages(
+    resource: AsyncUserResource,
+    *,
+    email: Optional[str] | Omit = omit,
+    external_id: Optional[str] | Omit = omit,
+    **options: Any,
+) -> AsyncPageIterator[UserResponse, UserListResponse]:
+    size = options["page_size"]
+    return AsyncPageIterator(
+        lambda index: resource.list(email=email, external_id=external_id, page=index + 1, page_size=size),
+        _data,
+        _total,
+        served_page_size=_page_size,
+        **options,
+    )
+
+
+def namespace_pages(resource: NamespaceResource, **options: Any) -> PageIterator[NamespaceItem, NamespaceListResponse]:
+    size = options["page_size"]
+    return PageIterator(lambda index: resource.list(limit=size, skip=index * size), _data, _total, **options)
+
+
+def async_namespace_pages(
+    resource: AsyncNamespaceResource, **options: Any
+) -> AsyncPageIterator[NamespaceItem, NamespaceListResponse]:
+    size = options["page_size"]
+    return AsyncPageIterator(lambda index: resource.list(limit=size, skip=index * size), _data, _total, **options)
+
+
+def _messages(page: SessionRetrieveHistoryResponse) -> List[Message]:
+    return page.messages
+
+
+def _total_count(page: SessionRetrieveHistoryResponse) -> Optional[int]:
+    return page.total_count
+
+
+def _data(page: Union[UserListResponse, NamespaceListResponse]) -> Optional[List[Any]]:
+    return page.data
+
+
+def _total(page: Union[UserListResponse, NamespaceListResponse]) -> Optional[int]:
+    return page.total
+
+
+def _page_size(page: UserListResponse) -> Optional[int]:
+    return page.page_size
@@ -0,0 +1,107 @@
+"""
+Shared plumbing of the background buffers behind `feedback.buffered`, `telemetry.buffered`
+and `messages.buffered`.
+
+Each buffer queues work in memory and sends it from a background flusher: a daemon thread
+for the sync buffers, a task on the caller's event loop for the async ones. What they have
+in common lives here:
+
+- Counters: every buffer names its counters in `_counters` (e.g. `sent`, `failed`), and they
+  start at zero and show up in `repr(buffer)` next to the number of unsent items.
+- Open buffers are tracked in a process-wide weak set, and one `atexit` hook closes them.
+  A sync buffer is closed (and drained) there. An async buffer cannot be drained once its
+  event loop has stopped, so the hook only warns about what it left behind.
+"""
+
+from __future__ import annotations
+
+import atexit
+import weakref
+from typing import Any, Tuple, ClassVar
+from typing_extensions import Self
+
+from ._logging import get_logger
+
+__all__ = ["BackgroundBuffer", "SyncBackgroundBuffer", "AsyncBackgroundBuffer"]
+
+logger = get_logger(__name__)
+
+_open_buffers: "weakref.WeakSet[BackgroundBuffer]" = weakref.WeakSet()
+
+
+class BackgroundBuffer:
+    """Counters and open-buffer tracking; subclasses call `__init__` once their settings are validated."""
+
+    # Counter attributes, for debugging / metrics
+    _counters: ClassVar[Tuple[str, ...]] = ()
+    # Name of the unsent-items count in `repr`, and how the atexit warning refers to one item
+    _backlog_name: ClassVar[str] = "pending"
+    _item_name: ClassVar[str] = "item"
+
+    def __init__(self) -> None:
+        for name in self._counters:
+            setattr(self, name, 0)
+        _open_buffers.add(self)
+
+    def _unsent(self) -> int:
+        """Items queued or being sent."""
+        raise NotImplementedError
+
+    def _unregister(self) -> None:
+        """Called once `close` has finished; the atexit hook leaves the buffer alone from then on."""
+        _open_buffers.discard(self)
+
+    def _close_at_exit(self) -> None:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        fields = [f"{self._backlog_name}={self._unsent()}"]
+        fields.extend(f"{name}={getattr(self, name)}" for name in self._counters)
+        return f"{type(self).__name__}({', '.join(fields)})"
+
+
+class SyncBackgroundBuffer(BackgroundBuffer):
+    """A buffer flushed from a background thread; usable as a context manager that closes it on exit."""
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+    def _close_at_exit(self) -> None:
+        self.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+
+class AsyncBackgroundBuffer(BackgroundBuffer):
+    """A buffer flushed by a task on the caller's event loop; `async with` closes it on exit."""
+
+    async def close(self) -> None:
+        raise NotImplementedError
+
+    def _left_behind(self) -> str:
+        """What happens to items an unclosed buffer leaves behind, appended to the atexit warning."""
+        return ""
+
+    def _close_at_exit(self) -> None:
+        unsent = self._unsent()
+        if unsent:
+            logger.warning(
+                f"{unsent} {self._item_name}(s) were never sent{self._left_behind()}; "
+                "call `await buffer.close()` before the event loop stops"
+            )
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        await self.close()
+
+
+@atexit.register
+def _close_open_buffers() -> None:
+    for buffer in list(_open_buffers):
+        buffer._close_at_exit()
@@ -0,0 +1,184 @@
+"""
+Bulk holographic transforms for `client.holographic.transform.create_many`.
+
+`/v1/holographic/transform/batch` accepts at most 50 items. This splits any iterable of
+items into sub-batches, keeps up to `concurrency` of them in flight, and streams the
+results back in input order. A sub-batch that fails or comes back with items missing is
+retried on its own, resending only the missing items, so one bad request does not restart
+the whole corpus. These retries replace the client's request retries (see `_retries`).
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+import itertools
+from typing import TYPE_CHECKING, Any, Dict, List, Deque, Mapping, Iterable, Iterator, AsyncIterator
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ._logging import get_logger
+from ._retries import retry_delay, is_retryable, without_client_retries
+from ._exceptions import PaprError
+from .types.holographic import transform_create_batch_params
+from .types.holographic.transform_create_batch_response import Result, TransformCreateBatchResponse
+
+if TYPE_CHECKING:
+    from .resources.holographic.transform import TransformResource, AsyncTransformResource
+
+__all__ = ["MAX_BATCH_SIZE", "transform_many", "async_transform_many"]
+
+logger = get_logger(__name__)
+
+MAX_BATCH_SIZE = 50
+
+Item = transform_create_batch_params.Item
+
+
+def _batches(items: Iterable[Item], batch_size: int) -> Iterator[List[Item]]:
+    if not 1 <= batch_size <= MAX_BATCH_SIZE:
+        raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}, got {batch_size}")
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class _SubBatch:
+    """Bookkeeping for one sub-batch across retries."""
+
+    def __init__(self, items: List[Item]) -> None:
+        self.items = items
+        self.results: Dict[str, Result] = {}
+        self.attempt = 0
+
+    def missing(self) -> List[Item]:
+        return [item for item in self.items if item["id"] not in self.results]
+
+    def record(self, response: TransformCreateBatchResponse) -> None:
+        for result in response.results:
+            self.results[result.id] = result
+
+    def ordered(self) -> List[Result]:
+        return [self.results[item["id"]] for item in self.items]
+
+
+def _run_sub_batch(
+    resource: TransformResource, items: List[Item], max_attempts: int, params: Mapping[str, Any]
+) -> List[Result]:
+    sub = _SubBatch(items)
+    while True:
+        pending = sub.missing()
+        if not pending:
+            return sub.ordered()
+        sub.attempt += 1
+        try:
+            sub.record(resource.create_batch_cached(items=pending, **params))
+            error: Exception | None = None
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            error = e
+        if not sub.missing():
+            continue
+        if sub.attempt >= max_attempts:
+            raise error or PaprError(
+                f"Transform batch returned no result for {len(sub.missing())} item(s) after {max_attempts} attempts"
+            )
+        logger.warning(f"Retrying {len(sub.missing())}/{len(items)} transform item(s) (attempt {sub.attempt + 1})")
+        time.sleep(retry_delay(sub.attempt, error))
+
+
+def transform_many(
+    resource: TransformResource,
+    items: Iterable[Item],
+    *,
+    batch_size: int,
+    concurrency: int,
+    max_attempts: int,
+    params: Mapping[str, Any],
+) -> Iterator[Result]:
+    concurrency = max(1, concurrency)
+    resource = without_client_retries(resource)
+    batches = _batches(items, batch_size)
+    window: Deque[Future[List[Result]]] = deque()
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="PaprTransform")
+    try:
+        # Queue twice as many batches as there are workers so a slow head batch doesn't idle the pool
+        for batch in itertools.islice(batches, 2 * concurrency):
+            window.append(pool.submit(_run_sub_batch, resource, batch, max_attempts, params))
+        while window:
+            # Results are released strictly in submission order; later batches keep the pool busy meanwhile
+            results = window.popleft().result()
+            for batch in itertools.islice(batches, 1):
+                window.append(pool.submit(_run_sub_batch, resource, batch, max_attempts, params))
+            yield from results
+    finally:
+        for future in window:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+async def _async_run_sub_batch(
+    resource: AsyncTransformResource, items: List[Item], max_attempts: int, params: Mapping[str, Any]
+) -> List[Result]:
+    sub = _SubBatch(items)
+    while True:
+        pending = sub.missing()
+        if not pending:
+            return sub.ordered()
+        sub.attempt += 1
+        try:
+            sub.record(await resource.create_batch_cached(items=pending, **params))
+            error: Exception | None = None
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            error = e
+        if not sub.missing():
+            continue
+        if sub.attempt >= max_attempts:
+            raise error or PaprError(
+                f"Transform batch returned no result for {len(sub.missing())} item(s) after {max_attempts} attempts"
+            )
+        logger.warning(f"Retrying {len(sub.missing())}/{len(items)} transform item(s) (attempt {sub.attempt + 1})")
+        await asyncio.sleep(retry_delay(sub.attempt, error))
+
+
+async def async_transform_many(
+    resource: AsyncTransformResource,
+    items: Iterable[Item],
+    *,
+    batch_size: int,
+    concurrency: int,
+    max_attempts: int,
+    params: Mapping[str, Any],
+) -> AsyncIterator[Result]:
+    concurrency = max(1, concurrency)
+    resource = without_client_retries(resource)
+    batches = _batches(items, batch_size)
+    window: Deque[asyncio.Task[List[Result]]] = deque()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(batch: List[Item]) -> List[Result]:
+        async with semaphore:
+            return await _async_run_sub_batch(resource, batch, max_attempts, params)
+
+    def submit(batch: List[Item]) -> None:
+        window.append(asyncio.ensure_future(run(batch)))
+
+    try:
+        for batch in itertools.islice(batches, 2 * concurrency):
+            submit(batch)
+        while window:
+            results = await window.popleft()
+            for batch in itertools.islice(batches, 1):
+                submit(batch)
+            for result in results:
+                yield result
+    finally:
+        for task in window:
+            task.cancel()
+
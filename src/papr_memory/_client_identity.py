@@ -0,0 +1,32 @@
+"""
+Which account a client talks to, for the SDK's process-wide and on-disk state.
+
+Caches, registries and ledgers that outlive one client (transform outputs, session context,
+frequency schemas, GraphQL support, deployed schema hashes, tenant indexes, upload records)
+are shared by every client with the same host and credentials and kept apart otherwise.
+They all key on `client_key(client)`: the base URL and a SHA-256 of the auth headers, so no
+credential is ever stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING, Tuple, Union
+
+if TYPE_CHECKING:
+    from ._client import Papr, AsyncPapr
+
+__all__ = ["ClientKey", "client_key", "client_key_string"]
+
+# (base URL, SHA-256 hex digest of the sorted auth headers)
+ClientKey = Tuple[str, str]
+
+
+def client_key(client: Union[Papr, AsyncPapr]) -> ClientKey:
+    credentials = hashlib.sha256(repr(sorted(client.auth_headers.items())).encode()).hexdigest()
+    return (str(client.base_url), credentials)
+
+
+def client_key_string(client: Union[Papr, AsyncPapr]) -> str:
+    """`client_key` as one string, for keys in files and databases."""
+    return "|".join(client_key(client))
@@ -0,0 +1,351 @@
+"""
+Bulk document ingestion for `client.document.ingest_many`.
+
+Uploads run on a bounded pool, and every accepted upload is tracked by one polling
+scheduler instead of a polling loop per document. Each document is re-checked at an
+interval that grows with its age, so fresh uploads (often small, fast documents) are noticed
+quickly while long-running ones cost few requests. All checks that come due together are
+issued as one concurrent batch. Results are yielded in completion order:
+
+    for result in client.document.ingest_many(Path("reports").glob("*.pdf"), concurrency=8):
+        print(result.path, result.state, result.upload_id)
+
+Leaving the loop early (``break``, an exception, or Ctrl-C) cancels server-side
+processing of every document that has not finished yet.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import heapq
+import asyncio
+import pathlib
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union, Mapping, Iterable, Iterator, Optional, AsyncIterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from ._logging import get_logger
+from .types.document_upload_response import DocumentUploadResponse
+
+if TYPE_CHECKING:
+    from .resources.document import DocumentResource, AsyncDocumentResource
+
+__all__ = ["IngestResult"]
+
+logger = get_logger(__name__)
+
+TERMINAL_STATES = frozenset({"completed", "failed", "cancelled", "not_found"})
+
+PathInput = Union[str, "os.PathLike[str]"]
+
+
+class IngestResult:
+    """Outcome of ingesting one document.
+
+    Attributes:
+        path: The file that was uploaded.
+        upload_id: Server-side upload id, once the upload was accepted.
+        state: ``"completed"``, ``"failed"``, ``"cancelled"``, ``"not_found"`` or
+            ``"upload_failed"`` when the upload request itself raised.
+        status: Last response of `document.get_status` (or the upload response).
+        error: The exception raised by the upload or the last status check, if any.
+        elapsed: Seconds from the start of the upload until the result was known.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        *,
+        state: str,
+        upload_id: Optional[str] = None,
+        status: Optional[Mapping[str, object]] = None,
+        error: Optional[BaseException] = None,
+        elapsed: float = 0.0,
+    ) -> None:
+        self.path = path
+        self.state = state
+        self.upload_id = upload_id
+        self.status = status
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return self.state == "completed"
+
+    def __repr__(self) -> str:
+        return f"IngestResult(path={str(self.path)!r}, state={self.state!r}, upload_id={self.upload_id!r})"
+
+
+def status_state(status: Mapping[str, Any]) -> Optional[str]:
+    """Processing state from a `get_status` payload or an upload response."""
+    nested = status.get("document_status")
+    if isinstance(nested, Mapping) and nested.get("status_type"):
+        return str(nested["status_type"])
+    for key in ("status_type", "status"):
+        value = status.get(key)
+        if isinstance(value, str):
+            return value
+    return None
+
+
+class _Tracked:
+    def __init__(self, path: pathlib.Path, upload_id: str, started: float) -> None:
+        self.path = path
+        self.upload_id = upload_id
+        self.started = started
+        self.polls = 0
+
+
+class PollSchedule:
+    """Next-check times for in-flight documents; the interval grows with document age."""
+
+    def __init__(self, poll_interval: float, max_poll_interval: float, age_factor: float = 0.25) -> None:
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.age_factor = age_factor
+        self._heap: List[Tuple[float, int, _Tracked]] = []
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def interval(self, tracked: _Tracked, now: float) -> float:
+        age = now - tracked.started
+        return min(self.max_poll_interval, max(self.poll_interval, age * self.age_factor))
+
+    def add(self, tracked: _Tracked, now: float) -> None:
+        self._counter += 1
+        heapq.heappush(self._heap, (now + self.interval(tracked, now), self._counter, tracked))
+
+    def next_due(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> List[_Tracked]:
+        due: List[_Tracked] = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def drain(self) -> List[_Tracked]:
+        tracked = [entry[2] for entry in self._heap]
+        self._heap.clear()
+        return tracked
+
+
+def _accepted(path: pathlib.Path, response: DocumentUploadResponse, started: float) -> Union[_Tracked, IngestResult]:
+    status = response.to_dict()
+    upload_id = response.document_status.upload_id
+    state = status_state(status)
+    if state in TERMINAL_STATES or not upload_id:
+        return IngestResult(
+            path,
+            state=state if state in TERMINAL_STATES else "failed",
+            upload_id=upload_id,
+            status=status,
+            elapsed=time.monotonic() - started,
+        )
+    return _Tracked(path, upload_id, started)
+
+
+def ingest_many(
+    resource: DocumentResource,
+    paths: Iterable[PathInput],
+    *,
+    concurrency: int,
+    poll_interval: float,
+    max_poll_interval: float,
+    params: Mapping[str, Any],
+) -> Iterator[IngestResult]:
+    concurrency = max(1, concurrency)
+    pending_paths = [pathlib.Path(p) for p in paths]
+    pending_paths.reverse()
+    schedule = PollSchedule(poll_interval, max_poll_interval)
+    uploads: Dict[Future[DocumentUploadResponse], Tuple[pathlib.Path, float]] = {}
+    finished = False
+
+    # Status checks get their own workers so they are never queued behind long uploads
+    upload_pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="PaprIngestUpload")
+    status_pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="PaprIngestStatus")
+
+    def submit_uploads() -> None:
+        while pending_paths and len(uploads) < concurrency:
+            path = pending_paths.pop()
+            uploads[upload_pool.submit(resource.upload, file=path, **params)] = (path, time.monotonic())
+
+    try:
+        submit_uploads()
+        while uploads or len(schedule):
+            next_due = schedule.next_due()
+            timeout = None if next_due is None else max(0.0, next_due - time.monotonic())
+            if uploads:
+                done, _ = wait(list(uploads), timeout=timeout, return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(timeout or 0)
+                done = set()
+
+            # Update the schedule before yielding so an abort at any yield can cancel everything in flight
+            results: List[IngestResult] = []
+            for future in done:
+                path, started = uploads.pop(future)
+                error = future.exception()
+                if error is not None:
+                    results.append(_upload_failed(path, error, started))
+                    continue
+                _track(_accepted(path, future.result(), started), schedule, results)
+            submit_uploads()
+
+            due = schedule.pop_due(time.monotonic())
+            if due:
+                # One batch of status checks for everything that came due together
+                checks = [(tracked, status_pool.submit(resource.get_status, tracked.upload_id)) for tracked in due]
+                for tracked, check in checks:
+                    error = check.exception()
+                    _track(_after_check(tracked, None if error else check.result(), error), schedule, results)
+
+            yield from results
+        finished = True
+    finally:
+        if not finished:
+            _cancel_all(resource, schedule.drain(), uploads)
+        upload_pool.shutdown(wait=finished)
+        status_pool.shutdown(wait=finished)
+
+
+def _upload_failed(path: pathlib.Path, error: BaseException, started: float) -> IngestResult:
+    return IngestResult(path, state="upload_failed", error=error, elapsed=time.monotonic() - started)
+
+
+def _track(outcome: Union[_Tracked, IngestResult, None], schedule: PollSchedule, results: List[IngestResult]) -> None:
+    if isinstance(outcome, IngestResult):
+        results.append(outcome)
+    elif outcome is not None:
+        schedule.add(outcome, time.monotonic())
+
+
+def _after_check(tracked: _Tracked, status: Any, error: Optional[BaseException]) -> Union[_Tracked, IngestResult]:
+    tracked.polls += 1
+    if error is not None:
+        # The client already retried the request; try again on the next tick
+        logger.warning(f"Status check for {tracked.upload_id} failed: {error}")
+        return tracked
+    state = status_state(status)
+    if state in TERMINAL_STATES:
+        return IngestResult(
+            tracked.path,
+            state=str(state),
+            upload_id=tracked.upload_id,
+            status=status,
+            elapsed=time.monotonic() - tracked.started,
+        )
+    return tracked
+
+
+def _cancel_all(
+    resource: DocumentResource,
+    tracked: List[_Tracked],
+    uploads: Mapping[Future[DocumentUploadResponse], Tuple[pathlib.Path, float]],
+) -> None:
+    in_flight = [future for future in uploads if not future.cancel()]
+    # Uploads already on the wire can't be recalled; wait for their upload ids so processing can be cancelled
+    wait(in_flight)
+    upload_ids = [t.upload_id for t in tracked]
+    for future in in_flight:
+        if future.exception() is None:
+            upload_id = future.result().document_status.upload_id
+            if upload_id:
+                upload_ids.append(upload_id)
+    for upload_id in upload_ids:
+        try:
+            resource.cancel_processing(upload_id)
+        except Exception as e:
+            logger.warning(f"Failed to cancel processing of {upload_id}: {e}")
+    if upload_ids:
+        logger.info(f"Cancelled processing of {len(upload_ids)} document(s)")
+
+
+async def async_ingest_many(
+    resource: AsyncDocumentResource,
+    paths: Iterable[PathInput],
+    *,
+    concurrency: int,
+    poll_interval: float,
+    max_poll_interval: float,
+    params: Mapping[str, Any],
+) -> AsyncIterator[IngestResult]:
+    concurrency = max(1, concurrency)
+    pending_paths = [pathlib.Path(p) for p in paths]
+    pending_paths.reverse()
+    schedule = PollSchedule(poll_interval, max_poll_interval)
+    uploads: Dict[asyncio.Future[DocumentUploadResponse], Tuple[pathlib.Path, float]] = {}
+    finished = False
+
+    def submit_uploads() -> None:
+        while pending_paths and len(uploads) < concurrency:
+            path = pending_paths.pop()
+            uploads[asyncio.ensure_future(resource.upload(file=path, **params))] = (path, time.monotonic())
+
+    try:
+        submit_uploads()
+        while uploads or len(schedule):
+            next_due = schedule.next_due()
+            timeout = None if next_due is None else max(0.0, next_due - time.monotonic())
+            if uploads:
+                done, _ = await asyncio.wait(list(uploads), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                await asyncio.sleep(timeout or 0)
+                done = set()
+
+            results: List[IngestResult] = []
+            for task in done:
+                path, started = uploads.pop(task)
+                error = task.exception()
+                if error is not None:
+                    results.append(_upload_failed(path, error, started))
+                    continue
+                _track(_accepted(path, task.result(), started), schedule, results)
+            submit_uploads()
+
+            due = schedule.pop_due(time.monotonic())
+            if due:
+                statuses = await asyncio.gather(
+                    *(resource.get_status(tracked.upload_id) for tracked in due), return_exceptions=True
+                )
+                for tracked, status in zip(due, statuses):
+                    if isinstance(status, BaseException):
+                        _track(_after_check(tracked, None, status), schedule, results)
+                    else:
+                        _track(_after_check(tracked, status, None), schedule, results)
+
+            for result in results:
+                yield result
+        finished = True
+    finally:
+        if not finished:
+            await _async_cancel_all(resource, schedule.drain(), uploads)
+
+
+async def _async_cancel_all(
+    resource: AsyncDocumentResource,
+    tracked: List[_Tracked],
+    uploads: Mapping[asyncio.Future[DocumentUploadResponse], Tuple[pathlib.Path, float]],
+) -> None:
+    upload_ids = [t.upload_id for t in tracked]
+    if uploads:
+        # Let uploads already on the wire finish so their processing can be cancelled too
+        await asyncio.wait(list(uploads))
+    for task in uploads:
+        if not task.cancelled() and task.exception() is None:
+            upload_id = task.result().document_status.upload_id
+            if upload_id:
+                upload_ids.append(upload_id)
+
+    async def cancel(upload_id: str) -> None:
+        try:
+            await resource.cancel_processing(upload_id)
+        except Exception as e:
+            logger.warning(f"Failed to cancel processing of {upload_id}: {e}")
+
+    await asyncio.gather(*(cancel(upload_id) for upload_id in upload_ids))
+    if upload_ids:
+        logger.info(f"Cancelled processing of {len(upload_ids)} document(s)")
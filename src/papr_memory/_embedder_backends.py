@@ -0,0 +1,268 @@
+"""
+Built-in on-device embedder backends.
+
+Each backend implements the public `papr_memory.lib.Embedder` protocol and is
+registered by name ("coreml", "mlx", "onnx", "sentence-transformers") so the
+local search pipeline can select it through the embedder registry.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, List, Callable, Optional, cast
+
+from papr_memory._logging import get_logger
+from papr_memory.lib._embedders import Embedder, BaseEmbedder, to_vectors, register_embedder
+
+logger = get_logger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "Qwen/Qwen3-Embedding-4B"
+DEFAULT_MLX_MODEL = "mlx-community/Qwen3-Embedding-4B-4bit-DWQ"
+QWEN3_4B_DIMENSIONS = 2560
+
+_backend_lock = threading.Lock()
+_backend_instances: Dict[str, Embedder] = {}
+
+
+class CoreMLEmbedder(BaseEmbedder):
+    """Core ML embedder (Apple Neural Engine / GPU) for a traced Qwen3-Embedding export."""
+
+    name = "coreml"
+    dimensions = QWEN3_4B_DIMENSIONS
+    batch_size = 1
+    dtype = "float16"
+    normalized = False
+
+    def __init__(self, model: Any, tokenizer: Any, *, max_length: int = 32, model_id: str = "") -> None:
+        self.model = model
+        self.tokenizer = tokenizer
+        self.model_id = model_id
+        # Must match the fixed padding used at conversion time (see agent.md, Learning 2)
+        self.max_length = max_length
+
+    def embed_documents(self, input: List[str]) -> List[List[float]]:
+        import numpy as np  # type: ignore
+
+        # Normalize inputs to list[str]
+        texts: List[str] = [input] if isinstance(input, str) else list(input)
+        texts = ["" if t is None else str(t) for t in texts]
+
+        # Use fixed padding to match Core ML conversion
+        enc = self.tokenizer(
+            texts,
+            padding="max_length",
+            max_length=self.max_length,
+            truncation=True,
+            return_tensors="np",
+        )
+        # Core ML expects int32 inputs typically
+        feed = {
+            "input_ids": enc["input_ids"].astype(np.int32),
+            "attention_mask": enc["attention_mask"].astype(np.int32),
+        }
+        out = self.model.predict(feed)
+
+        # Select the most likely embedding tensor among outputs
+        candidates = [np.asarray(v) for v in out.values()]
+
+        # Prefer tensors with last dim == 2560, else highest last-dim, else highest ndim
+        def score(a: Any) -> tuple[int, int, int]:
+            last_dim = a.shape[-1] if a.ndim >= 1 else 0
+            return (
+                2 if last_dim == QWEN3_4B_DIMENSIONS else (1 if a.ndim >= 2 else 0),
+                last_dim,
+                a.size,
+            )
+
+        best = max(candidates, key=score)
+
+        # Pool to [batch, dim]
+        if best.ndim == 3:
+            pooled = best.mean(axis=1).astype(np.float32)
+        elif best.ndim == 2:
+            pooled = best.astype(np.float32)
+        elif best.ndim == 1:
+            pooled = best.astype(np.float32)[None, :]
+        else:
+            raise TypeError(f"Unexpected Core ML output shape: {best.shape}")
+
+        return cast(List[List[float]], pooled.tolist())
+
+
+class MlxEmbedder(BaseEmbedder):
+    """Native MLX embedder for quantized Qwen3-Embedding models on Apple Silicon."""
+
+    name = "mlx"
+    dimensions = QWEN3_4B_DIMENSIONS
+    batch_size = 8
+    dtype = "int4"
+    normalized = False
+
+    def __init__(self, model: Any, tokenizer: Any, *, model_id: str = "") -> None:
+        self.model = model
+        self.tokenizer = tokenizer
+        self.model_id = model_id
+        self._hf_tokenizer: Any = None
+        self._fallback: Optional[Embedder] = None
+
+    def _tokenize(self, inputs: List[str]) -> Any:
+        # Prefer HF tokenizer for MLX models when available
+        try:
+            if self._hf_tokenizer is None:
+                from transformers import AutoTokenizer  # type: ignore
+
+                self._hf_tokenizer = AutoTokenizer.from_pretrained(
+                    os.environ.get("PAPR_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+                )
+            return self._hf_tokenizer(inputs, padding=True, truncation=True, return_tensors=None)
+        except Exception:
+            if not callable(self.tokenizer):
+                raise TypeError("MLX tokenizer is not callable; falling back to ST embedder") from None
+            tok = cast(Callable[..., Any], self.tokenizer)
+            return tok(inputs, return_tensors=None, padding=True, truncation=True)
+
+    def embed_documents(self, input: List[str]) -> List[List[float]]:
+        try:
+            enc = self._tokenize(input)
+            # Some MLX models expose a nested .model; try both
+            mdl: object = getattr(self.model, "model", self.model)
+
+            # Request hidden states if supported
+            if not callable(mdl):
+                raise TypeError("MLX model is not callable; using fallback embedder")
+            outputs: Any = cast(Callable[..., Any], mdl)(
+                **{k: enc[k] for k in enc if isinstance(enc[k], list)},
+                output_hidden_states=True,
+            )
+            hidden: object | None = None
+            if hasattr(outputs, "hidden_states") and outputs.hidden_states:
+                hidden = outputs.hidden_states[-1]
+            elif hasattr(outputs, "last_hidden_state"):
+                hidden = outputs.last_hidden_state
+
+            if hidden is None:
+                raise RuntimeError("MLX model did not return hidden states for pooling")
+
+            # Normalize to ndarray then mean-pool
+            import numpy as np  # type: ignore
+
+            arr = np.asarray(hidden)
+            if arr.ndim == 3:  # [batch, seq_len, dim]
+                return cast(List[List[float]], arr.mean(axis=1).tolist())
+            if arr.ndim == 2:  # [seq_len, dim] -> single item
+                return [cast(List[float], arr.mean(axis=0).tolist())]
+            raise TypeError(f"Unexpected hidden shape: {arr.shape}")
+        except Exception as e:  # pragma: no cover
+            logger.warning(f"MLX embedding failed, falling back to ST: {e}")
+            # Fallback: sentence-transformers on local device
+            try:
+                if self._fallback is None:
+                    fallback_name = os.environ.get("PAPR_EMBEDDING_FALLBACK_MODEL", DEFAULT_EMBEDDING_MODEL)
+                    self._fallback = load_sentence_transformer_embedder(fallback_name)
+                return self._fallback.embed_documents(input)
+            except Exception as e2:
+                logger.error(f"Fallback ST embedding failed: {e2}")
+                return [[] for _ in input]
+
+
+class SentenceTransformerEmbedder(BaseEmbedder):
+    """Adapter for a loaded `sentence_transformers.SentenceTransformer` model."""
+
+    name = "sentence-transformers"
+    dimensions = QWEN3_4B_DIMENSIONS
+    batch_size = 32
+    dtype = "float32"
+    normalized = False
+
+    def __init__(self, model: Any, *, name: Optional[str] = None, model_id: str = "") -> None:
+        self.model = model
+        if name is not None:
+            self.name = name
+        self.model_id = model_id
+        get_dim = getattr(model, "get_sentence_embedding_dimension", None)
+        if callable(get_dim):
+            self.dimensions = int(cast(Any, get_dim()) or self.dimensions)
+
+    def embed_documents(self, input: List[str]) -> List[List[float]]:
+        if isinstance(input, str):
+            input = [input]
+        return to_vectors(self.model.encode(input, batch_size=self.batch_size))
+
+
+def _detect_torch_device() -> str:
+    import torch  # type: ignore[import-not-found]
+
+    if hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
+        return "mps"
+    if torch.cuda.is_available():
+        return "cuda"
+    return "cpu"
+
+
+def load_coreml_embedder() -> CoreMLEmbedder:
+    """Load the Core ML model (auto-downloaded if needed) and its tokenizer."""
+    import coremltools as ct  # type: ignore
+    from transformers import AutoTokenizer  # type: ignore
+
+    from papr_memory._model_cache import resolve_coreml_model_path
+
+    # Auto-download from HuggingFace if not found locally
+    coreml_path = resolve_coreml_model_path(os.environ.get("PAPR_COREML_MODEL"))
+    tok_id = os.environ.get("PAPR_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+
+    logger.info(f"Loading Core ML model from {coreml_path}")
+    # Use ALL compute units to enable Neural Engine (ANE) for fast inference
+    mlmodel = ct.models.MLModel(coreml_path, compute_units=ct.ComputeUnit.ALL)
+    tokenizer = AutoTokenizer.from_pretrained(tok_id)
+    return CoreMLEmbedder(mlmodel, tokenizer, model_id=str(coreml_path))
+
+
+def load_mlx_embedder() -> MlxEmbedder:
+    """Load a quantized MLX embedding model."""
+    from mlx_lm import load as mlx_load  # type: ignore
+
+    mlx_model_name = os.environ.get("PAPR_EMBEDDING_MODEL", DEFAULT_MLX_MODEL)
+    logger.info(f"Attempting MLX native embedder: {mlx_model_name}")
+    mlx_model, mlx_tokenizer = mlx_load(mlx_model_name)
+    return MlxEmbedder(mlx_model, mlx_tokenizer, model_id=mlx_model_name)
+
+
+def load_sentence_transformer_embedder(model_name: Optional[str] = None, device: Optional[str] = None) -> Embedder:
+    """Load a sentence-transformers model on the best available torch device."""
+    from sentence_transformers import SentenceTransformer  # type: ignore[import-not-found]
+
+    model_name = model_name or os.environ.get("PAPR_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+    model = SentenceTransformer(model_name, device=device or _detect_torch_device())
+    model.eval()
+    return SentenceTransformerEmbedder(model, model_id=model_name)
+
+
+def _load_onnx_embedder() -> Optional[Embedder]:
+    from papr_memory._onnx_embedder import load_onnx_embedder
+
+    return load_onnx_embedder()
+
+
+def _singleton(name: str, loader: Callable[[], Optional[Embedder]]) -> Callable[[], Optional[Embedder]]:
+    """Wrap a loader so the (heavy) model is loaded at most once per process."""
+
+    def factory() -> Optional[Embedder]:
+        if name in _backend_instances:
+            return _backend_instances[name]
+        with _backend_lock:
+            if name not in _backend_instances:
+                instance = loader()
+                if instance is None:
+                    return None
+                _backend_instances[name] = instance
+            return _backend_instances[name]
+
+    return factory
+
+
+def register_builtin_embedders() -> None:
+    register_embedder("coreml", _singleton("coreml", load_coreml_embedder))
+    register_embedder("mlx", _singleton("mlx", load_mlx_embedder))
+    register_embedder("onnx", _singleton("onnx", _load_onnx_embedder))
+    register_embedder("sentence-transformers", _singleton("sentence-transformers", load_sentence_transformer_embedder))
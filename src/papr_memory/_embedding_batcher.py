@@ -0,0 +1,160 @@
+"""
+Dynamic micro-batching for on-device query embeddings.
+
+When many threads call `memory.search` at the same time with on-device processing
+enabled, each of them would otherwise run its own single-text forward pass. The
+`EmbeddingMicroBatcher` sits in front of the local embedder, collects queries that
+arrive within a short window (or until the batch is full), runs one batched forward
+pass and fans the vectors back out to the waiting callers.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import queue
+import threading
+from typing import List, Tuple, Callable, Optional, Sequence
+from concurrent.futures import Future
+
+from papr_memory._logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT_MS = 3.0
+
+EmbedBatchFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+def micro_batching_enabled() -> bool:
+    """Whether concurrent local query embeddings should be coalesced (`PAPR_EMBED_MICRO_BATCHING`)."""
+    return os.environ.get("PAPR_EMBED_MICRO_BATCHING", "true").lower() in ("true", "1", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+class EmbeddingMicroBatcher:
+    """Coalesces concurrent single-text embedding requests into batched forward passes.
+
+    Args:
+        embed_batch: Callable that embeds a list of texts and returns one vector per text, in order.
+        max_batch_size: Upper bound on the number of texts sent to `embed_batch` at once
+            (default from `PAPR_EMBED_BATCH_MAX_SIZE`, falling back to 32).
+        max_wait_ms: How long the worker keeps collecting after the first request of a batch
+            arrives (default from `PAPR_EMBED_BATCH_WINDOW_MS`, falling back to 3ms).
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFn,
+        *,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        name: str = "PaprEmbeddingBatcher",
+    ) -> None:
+        self._embed_batch = embed_batch
+        self.max_batch_size = (
+            max_batch_size
+            if max_batch_size is not None
+            else _env_int("PAPR_EMBED_BATCH_MAX_SIZE", DEFAULT_MAX_BATCH_SIZE)
+        )
+        self.max_wait_ms = (
+            max_wait_ms if max_wait_ms is not None else _env_float("PAPR_EMBED_BATCH_WINDOW_MS", DEFAULT_MAX_WAIT_MS)
+        )
+        self._name = name
+        self._queue: "queue.Queue[Optional[Tuple[str, Future[List[float]]]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+        # Counters for debugging / metrics
+        self.batches_run = 0
+        self.items_embedded = 0
+
+    def embed(self, text: str, timeout: Optional[float] = None) -> List[float]:
+        """Embed a single text, sharing a forward pass with any concurrent callers."""
+        return self.submit(text).result(timeout=timeout)
+
+    def submit(self, text: str) -> "Future[List[float]]":
+        """Enqueue a text for embedding and return a future for its vector."""
+        future: Future[List[float]] = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("EmbeddingMicroBatcher is closed")
+            self._ensure_worker()
+            self._queue.put((text, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the worker thread once all queued requests have been served."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            worker = self._worker
+            self._queue.put(None)
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout=5.0)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._worker.start()
+
+    def _collect(self, first: Tuple[str, "Future[List[float]]"]) -> Tuple[List[Tuple[str, "Future[List[float]]"]], bool]:
+        """Gather requests for one batch; returns the batch and whether a shutdown sentinel was seen."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch, stop = self._collect(first)
+            # Drop requests whose callers already gave up (e.g. cancelled futures)
+            live = [(text, fut) for text, fut in batch if fut.set_running_or_notify_cancel()]
+            if live:
+                texts = [text for text, _ in live]
+                start = time.perf_counter()
+                try:
+                    vectors = self._embed_batch(texts)
+                    if len(vectors) != len(texts):
+                        raise RuntimeError(f"Embedder returned {len(vectors)} vectors for {len(texts)} inputs")
+                except Exception as e:
+                    for _, fut in live:
+                        fut.set_exception(e)
+                else:
+                    for (_, fut), vec in zip(live, vectors):
+                        fut.set_result([float(x) for x in vec])
+                    self.batches_run += 1
+                    self.items_embedded += len(live)
+                    logger.debug(
+                        f"Micro-batched {len(live)} query embedding(s) in {(time.perf_counter() - start) * 1000:.1f}ms"
+                    )
+            if stop:
+                return
@@ -0,0 +1,433 @@
+"""
+Background feedback submission for `client.feedback.buffered`.
+
+Feedback is usually recorded from latency-sensitive code (rendering an answer, handling
+a click), where a blocking `feedback.submit` round trip per event is wasted time. A
+feedback buffer queues the events in memory and a background flusher sends them with
+`feedback.submit_batch`:
+
+    feedback = client.feedback.buffered(max_batch_size=50, flush_interval=2.0)
+    feedback.submit(
+        search_id=response.search_id,
+        feedback_data={"feedback_source": "inline", "feedback_type": "thumbs_up"},
+    )  # returns immediately
+    ...
+    feedback.close()  # sends whatever is still queued
+
+A batch is sent as soon as `max_batch_size` events are queued, or `flush_interval`
+seconds after the oldest queued event arrived. When `max_queue_size` events are waiting,
+`submit` blocks until the flusher catches up (or drops the event once `full_timeout`
+expires). Batches that fail with a connection error, 429 or 5xx are retried; events that
+still cannot be delivered are logged and passed to `on_error`. Buffers that are still open
+when the interpreter exits are drained from an `atexit` hook.
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+import threading
+from typing import TYPE_CHECKING, List, Deque, Callable, Optional
+from collections import deque
+
+from ._types import Omit, omit
+from ._utils import is_given
+from ._logging import get_logger
+from ._retries import retry_delay, is_retryable, without_client_retries
+from ._background_buffer import BackgroundBuffer, SyncBackgroundBuffer, AsyncBackgroundBuffer
+from .types.batch_response import BatchResponse
+from .types.feedback_request_param import FeedbackData, FeedbackRequestParam
+
+if TYPE_CHECKING:
+    from .resources.feedback import FeedbackResource, AsyncFeedbackResource
+
+__all__ = ["FeedbackBuffer", "AsyncFeedbackBuffer"]
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_QUEUE_SIZE = 1000
+DEFAULT_CLOSE_TIMEOUT = 10.0
+
+ErrorCallback = Callable[[List[FeedbackRequestParam], Exception], None]
+
+
+def _item(
+    *,
+    feedback_data: FeedbackData,
+    search_id: str,
+    external_user_id: Optional[str] | Omit,
+    namespace_id: Optional[str] | Omit,
+    organization_id: Optional[str] | Omit,
+    user_id: Optional[str] | Omit,
+) -> FeedbackRequestParam:
+    item: FeedbackRequestParam = {"feedback_data": feedback_data, "search_id": search_id}
+    if is_given(external_user_id):
+        item["external_user_id"] = external_user_id
+    if is_given(namespace_id):
+        item["namespace_id"] = namespace_id
+    if is_given(organization_id):
+        item["organization_id"] = organization_id
+    if is_given(user_id):
+        item["user_id"] = user_id
+    return item
+
+
+class _BufferState(BackgroundBuffer):
+    """Queue bookkeeping shared by the sync and async buffers; guarded by the owner's condition."""
+
+    _counters = ("sent", "failed", "dropped", "batches")
+    _item_name = "feedback event"
+    sent: int
+    failed: int
+    dropped: int
+    batches: int
+
+    def __init__(
+        self,
+        *,
+        max_batch_size: int,
+        flush_interval: float,
+        max_queue_size: int,
+        full_timeout: Optional[float],
+        max_attempts: int,
+        on_error: Optional[ErrorCallback],
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        if max_queue_size < max_batch_size:
+            raise ValueError(f"max_queue_size ({max_queue_size}) must be at least max_batch_size ({max_batch_size})")
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.full_timeout = full_timeout
+        self.max_attempts = max_attempts
+        self.on_error = on_error
+
+        self._items: Deque[FeedbackRequestParam] = deque()
+        self._oldest = 0.0
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        super().__init__()
+
+    @property
+    def pending(self) -> int:
+        """Events queued or being sent."""
+        return len(self._items) + self._in_flight
+
+    def _unsent(self) -> int:
+        return self.pending
+
+    def _has_room(self) -> bool:
+        return self._closed or len(self._items) < self.max_queue_size
+
+    def _append(self, item: FeedbackRequestParam) -> bool:
+        """Queue an event; returns whether the flusher should wake up now."""
+        if not self._items:
+            self._oldest = time.monotonic()
+        self._items.append(item)
+        return len(self._items) >= self.max_batch_size
+
+    def _drop(self) -> None:
+        self.dropped += 1
+        logger.warning(f"Feedback queue stayed full for {self.full_timeout}s; dropping a feedback event")
+
+    def _batch_ready(self) -> bool:
+        return len(self._items) >= self.max_batch_size or self._flush_requested or self._closed
+
+    def _time_left(self) -> float:
+        return max(0.0, self._oldest + self.flush_interval - time.monotonic())
+
+    def _take_batch(self) -> List[FeedbackRequestParam]:
+        batch = [self._items.popleft() for _ in range(min(len(self._items), self.max_batch_size))]
+        if self._items:
+            self._oldest = time.monotonic()
+        else:
+            self._flush_requested = False
+        self._in_flight += len(batch)
+        return batch
+
+    def _drained(self) -> bool:
+        return not self._items and not self._in_flight
+
+    def _record(self, batch: List[FeedbackRequestParam], response: BatchResponse) -> None:
+        rejected = min(response.failed_count or 0, len(batch))
+        self.batches += 1
+        self.sent += len(batch) - rejected
+        self.failed += rejected
+        if rejected:
+            logger.warning(f"{rejected} of {len(batch)} feedback event(s) were rejected: {response.errors}")
+
+    def _record_failure(self, batch: List[FeedbackRequestParam], error: Exception) -> None:
+        self.failed += len(batch)
+        logger.warning(f"Failed to submit {len(batch)} feedback event(s): {error}")
+        if self.on_error is not None:
+            try:
+                self.on_error(batch, error)
+            except Exception:
+                logger.exception("Feedback on_error callback raised")
+
+
+class FeedbackBuffer(_BufferState, SyncBackgroundBuffer):
+    """Queues feedback events and sends them with `feedback.submit_batch` from a background thread.
+
+    Create one with `client.feedback.buffered()`. Also usable as a context manager, which
+    closes (and drains) the buffer on exit.
+    """
+
+    def __init__(
+        self,
+        resource: FeedbackResource,
+        *,
+        max_batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        full_timeout: Optional[float] = None,
+        max_attempts: int = 3,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> None:
+        super().__init__(
+            max_batch_size=max_batch_size,
+            flush_interval=flush_interval,
+            max_queue_size=max_queue_size,
+            full_timeout=full_timeout,
+            max_attempts=max_attempts,
+            on_error=on_error,
+        )
+        self._resource = without_client_retries(resource)
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(
+        self,
+        *,
+        feedback_data: FeedbackData,
+        search_id: str,
+        external_user_id: Optional[str] | Omit = omit,
+        namespace_id: Optional[str] | Omit = omit,
+        organization_id: Optional[str] | Omit = omit,
+        user_id: Optional[str] | Omit = omit,
+    ) -> bool:
+        """Queue one feedback event; takes the same arguments as `feedback.submit`.
+
+        Returns False if the event was dropped because the queue stayed full for `full_timeout` seconds.
+        """
+        item = _item(
+            feedback_data=feedback_data,
+            search_id=search_id,
+            external_user_id=external_user_id,
+            namespace_id=namespace_id,
+            organization_id=organization_id,
+            user_id=user_id,
+        )
+        with self._cond:
+            if not self._cond.wait_for(self._has_room, self.full_timeout):
+                self._drop()
+                return False
+            if self._closed:
+                raise RuntimeError("FeedbackBuffer is closed")
+            if self._append(item):
+                self._cond.notify_all()
+            self._ensure_worker()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Send everything queued so far without waiting for `flush_interval`.
+
+        Returns False if events were still pending when `timeout` expired.
+        """
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(self._drained, timeout)
+
+    def close(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """Send the queued events and stop the flusher. Further `submit` calls raise."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout)
+        if self.pending:
+            logger.warning(f"Feedback buffer closed with {self.pending} event(s) still unsent")
+        self._unregister()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="PaprFeedbackFlusher", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: bool(self._items) or self._closed)
+                if not self._items:
+                    return
+                self._cond.wait_for(self._batch_ready, self._time_left())
+                batch = self._take_batch()
+                self._cond.notify_all()
+            self._send(batch)
+            with self._cond:
+                self._in_flight -= len(batch)
+                self._cond.notify_all()
+
+    def _send(self, batch: List[FeedbackRequestParam]) -> None:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._resource.submit_batch(feedback_items=batch)
+            except Exception as e:
+                if attempt < self.max_attempts and is_retryable(e):
+                    time.sleep(retry_delay(attempt, e))
+                    continue
+                self._record_failure(batch, e)
+                return
+            self._record(batch, response)
+            return
+
+
+class AsyncFeedbackBuffer(_BufferState, AsyncBackgroundBuffer):
+    """Async counterpart of `FeedbackBuffer`; the flusher runs as a task on the caller's event loop.
+
+    Close it with `await buffer.close()` (or `async with`) before the loop stops: the `atexit`
+    hook has no loop to send on and can only report events that were left behind.
+    """
+
+    def __init__(
+        self,
+        resource: AsyncFeedbackResource,
+        *,
+        max_batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        full_timeout: Optional[float] = None,
+        max_attempts: int = 3,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> None:
+        super().__init__(
+            max_batch_size=max_batch_size,
+            flush_interval=flush_interval,
+            max_queue_size=max_queue_size,
+            full_timeout=full_timeout,
+            max_attempts=max_attempts,
+            on_error=on_error,
+        )
+        self._resource = without_client_retries(resource)
+        # Created on first use so it binds to the loop the buffer is used from
+        self._cond_: Optional[asyncio.Condition] = None
+        self._worker: Optional[asyncio.Task[None]] = None
+
+    @property
+    def _cond(self) -> asyncio.Condition:
+        if self._cond_ is None:
+            self._cond_ = asyncio.Condition()
+        return self._cond_
+
+    async def submit(
+        self,
+        *,
+        feedback_data: FeedbackData,
+        search_id: str,
+        external_user_id: Optional[str] | Omit = omit,
+        namespace_id: Optional[str] | Omit = omit,
+        organization_id: Optional[str] | Omit = omit,
+        user_id: Optional[str] | Omit = omit,
+    ) -> bool:
+        """Queue one feedback event; takes the same arguments as `feedback.submit`.
+
+        Returns False if the event was dropped because the queue stayed full for `full_timeout` seconds.
+        """
+        item = _item(
+            feedback_data=feedback_data,
+            search_id=search_id,
+            external_user_id=external_user_id,
+            namespace_id=namespace_id,
+            organization_id=organization_id,
+            user_id=user_id,
+        )
+        async with self._cond:
+            if not await _wait_for(self._cond, self._has_room, self.full_timeout):
+                self._drop()
+                return False
+            if self._closed:
+                raise RuntimeError("AsyncFeedbackBuffer is closed")
+            if self._append(item):
+                self._cond.notify_all()
+            if self._worker is None or self._worker.done():
+                self._worker = asyncio.get_running_loop().create_task(self._run())
+        return True
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """Send everything queued so far without waiting for `flush_interval`.
+
+        Returns False if events were still pending when `timeout` expired.
+        """
+        async with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            return await _wait_for(self._cond, self._drained, timeout)
+
+    async def close(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """Send the queued events and stop the flusher. Further `submit` calls raise."""
+        async with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        worker = self._worker
+        if worker is not None:
+            done, _ = await asyncio.wait({worker}, timeout=timeout)
+            if not done:
+                worker.cancel()
+        if self.pending:
+            logger.warning(f"Feedback buffer closed with {self.pending} event(s) still unsent")
+        self._unregister()
+
+    async def _run(self) -> None:
+        while True:
+            async with self._cond:
+                await self._cond.wait_for(lambda: bool(self._items) or self._closed)
+                if not self._items:
+                    return
+                await _wait_for(self._cond, self._batch_ready, self._time_left())
+                batch = self._take_batch()
+                self._cond.notify_all()
+            try:
+                await self._send(batch)
+            finally:
+                async with self._cond:
+                    self._in_flight -= len(batch)
+                    self._cond.notify_all()
+
+    async def _send(self, batch: List[FeedbackRequestParam]) -> None:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self._resource.submit_batch(feedback_items=batch)
+            except Exception as e:
+                if attempt < self.max_attempts and is_retryable(e):
+                    await asyncio.sleep(retry_delay(attempt, e))
+                    continue
+                self._record_failure(batch, e)
+                return
+            self._record(batch, response)
+            return
+
+
+async def _wait_for(cond: asyncio.Condition, predicate: Callable[[], bool], timeout: Optional[float]) -> bool:
+    """`Condition.wait_for` with a timeout; returns the predicate's final value."""
+    if timeout is None:
+        await cond.wait_for(predicate)
+        return True
+    try:
+        await asyncio.wait_for(cond.wait_for(predicate), timeout)
+    except asyncio.TimeoutError:
+        pass
+    return predicate()
@@ -3,7 +3,8 @@ from __future__ import annotations
 import io
 import os
 import pathlib
-from typing import Sequence, cast, overload
+import threading
+from typing import Callable, Optional, Sequence, cast, overload
 from typing_extensions import TypeVar, TypeGuard
 
 import anyio
@@ -21,6 +22,100 @@ from ._utils import is_list, is_mapping, is_tuple_t, is_mapping_t, is_sequence_t
 
 _T = TypeVar("_T")
 
+# Paths at least this large are streamed from disk in chunks instead of being read into memory
+STREAMING_THRESHOLD = 8 * 1024 * 1024
+
+ProgressCallback = Callable[[int, int], None]
+"""Called with ``(bytes_sent, total_bytes)`` as an upload is read by the HTTP client."""
+
+
+class StreamingFile(io.RawIOBase):
+    """Read-only view of a file on disk that is streamed into multipart requests.
+
+    The file is opened lazily and closed again once it has been fully read, so a request
+    holds at most one chunk in memory and no file descriptor between retries. Seeking back
+    to the start (which httpx does before every attempt) restarts progress reporting.
+
+    ```py
+    from papr_memory import file_from_path
+
+    client.document.upload(
+        file=file_from_path("report.pdf", on_progress=lambda sent, total: print(f"{sent}/{total}")),
+    )
+    ```
+    """
+
+    def __init__(self, path: str | os.PathLike[str], *, on_progress: Optional[ProgressCallback] = None) -> None:
+        super().__init__()
+        self.path = pathlib.Path(path)
+        self.name = self.path.name
+        self.size = self.path.stat().st_size
+        self._on_progress = on_progress
+        self._position = 0
+        self._handle: Optional[io.BufferedReader] = None
+        self._lock = threading.Lock()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence!r})")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return position
+
+    def read(self, size: int = -1) -> bytes:
+        with self._lock:
+            if self._position >= self.size:
+                self._release()
+                return b""
+            if self._handle is None:
+                self._handle = open(self.path, "rb")
+            if self._handle.tell() != self._position:
+                self._handle.seek(self._position)
+            chunk = self._handle.read(size if size is not None and size >= 0 else -1)
+            self._position += len(chunk)
+            if not chunk or self._position >= self.size:
+                self._release()
+        if chunk and self._on_progress is not None:
+            self._on_progress(min(self._position, self.size), self.size)
+        return chunk
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore[override]
+        chunk = self.read(len(buffer))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def close(self) -> None:
+        with self._lock:
+            self._release()
+        super().close()
+
+    def _release(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __repr__(self) -> str:
+        return f"StreamingFile(path={str(self.path)!r}, size={self.size})"
+
 
 def is_base64_file_input(obj: object) -> TypeGuard[Base64FileInput]:
     return isinstance(obj, io.IOBase) or isinstance(obj, os.PathLike)
@@ -66,6 +161,8 @@ def _transform_file(file: FileTypes) -> HttpxFileTypes:
     if is_file_content(file):
         if isinstance(file, os.PathLike):
             path = pathlib.Path(file)
+            if path.stat().st_size >= STREAMING_THRESHOLD:
+                return (path.name, StreamingFile(path))
             return (path.name, path.read_bytes())
 
         return file
@@ -78,7 +175,10 @@ def _transform_file(file: FileTypes) -> HttpxFileTypes:
 
 def read_file_content(file: FileContent) -> HttpxFileContent:
     if isinstance(file, os.PathLike):
-        return pathlib.Path(file).read_bytes()
+        path = pathlib.Path(file)
+        if path.stat().st_size >= STREAMING_THRESHOLD:
+            return StreamingFile(path)
+        return path.read_bytes()
     return file
 
 
@@ -108,6 +208,8 @@ async def _async_transform_file(file: FileTypes) -> HttpxFileTypes:
     if is_file_content(file):
         if isinstance(file, os.PathLike):
             path = anyio.Path(file)
+            if (await path.stat()).st_size >= STREAMING_THRESHOLD:
+                return (path.name, StreamingFile(str(path)))
             return (path.name, await path.read_bytes())
 
         return file
@@ -120,7 +222,10 @@ async def _async_transform_file(file: FileTypes) -> HttpxFileTypes:
 
 async def async_read_file_content(file: FileContent) -> HttpxFileContent:
     if isinstance(file, os.PathLike):
-        return await anyio.Path(file).read_bytes()
+        path = anyio.Path(file)
+        if (await path.stat()).st_size >= STREAMING_THRESHOLD:
+            return StreamingFile(str(path))
+        return await path.read_bytes()
 
     return file
 
@@ -0,0 +1,395 @@
+"""
+Typed GraphQL execution for `client.graphql.execute` and `client.graphql.execute_batch`.
+
+`graphql.query` posts whatever is in `extra_body` and returns untyped JSON. `execute` builds
+the request for you, can keep the query text off the wire once the server knows it, and can
+serve repeated queries from a local cache:
+
+    response = client.graphql.execute(
+        "query GetProject($id: ID!) { project(id: $id) { name tasks { title } } }",
+        {"id": "proj_123"},
+        cache_ttl=60,
+    )
+    print(response.raise_for_errors().data.project.name)
+
+    projects, people = client.graphql.execute_batch(
+        [GraphQLRequest(PROJECTS_QUERY), GraphQLRequest(PEOPLE_QUERY, {"first": 10})]
+    )
+
+- Automatic persisted queries are opt-in (`persisted_queries=True`), since `/v1/graphql` may
+  proxy a server without them. The first attempt then sends only the query's SHA-256 hash. If
+  the server does not know it yet (`PERSISTED_QUERY_NOT_FOUND`) the request is repeated once
+  with the full text, which registers it. Any other error in reply to a hash-only request is
+  taken to mean persisted queries are not supported: the request is repeated with the full
+  text, and that server is sent the full text from then on.
+- Results of requests with a `cache_ttl` are cached per query, operation and variables for
+  that many seconds, shared by every client with the same host and credentials. Responses
+  with errors are never cached, and executing a mutation clears the cache.
+- `execute_batch` sends every request that is not cached in one HTTP call, as a JSON array.
+  If the server rejects batches, the requests are sent one by one instead.
+- `data` is decoded into `GraphQLObject`s, dicts whose fields can also be read as attributes,
+  without any validation. Pass a `BaseModel` subclass as `result_type` to get model instances,
+  which are constructed without validation as well.
+"""
+
+from __future__ import annotations
+
+import re
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Union,
+    Mapping,
+    Iterable,
+    Optional,
+    Generator,
+    NamedTuple,
+)
+from collections import OrderedDict
+
+import httpx
+
+from ._models import construct_type
+from ._logging import get_logger
+from ._client_identity import ClientKey, client_key
+from ._exceptions import PaprError, APIStatusError
+from ._base_client import make_request_options
+
+if TYPE_CHECKING:
+    from ._client import Papr, AsyncPapr
+    from .resources.graphql import GraphqlResource, AsyncGraphqlResource
+
+__all__ = ["GraphQLError", "GraphQLObject", "GraphQLRequest", "GraphQLResponse"]
+
+logger = get_logger(__name__)
+
+MAX_CACHED_RESULTS = 1000
+
+_PERSISTED_QUERY_NOT_FOUND = ("PERSISTED_QUERY_NOT_FOUND", "PersistedQueryNotFound")
+_PERSISTED_QUERY_NOT_SUPPORTED = ("PERSISTED_QUERY_NOT_SUPPORTED", "PersistedQueryNotSupported")
+# Leading comments and whitespace, then the operation type
+_MUTATION = re.compile(r"\A(?:\s|,|#[^\n]*)*mutation\b")
+
+Body = Dict[str, Any]
+CacheKey = Tuple[str, Optional[str], str]
+
+
+class GraphQLError(PaprError):
+    """Raised by `GraphQLResponse.raise_for_errors` when the response contains GraphQL errors."""
+
+    def __init__(self, errors: List[Any]) -> None:
+        self.errors = errors
+        messages = (error.get("message", error) if isinstance(error, dict) else error for error in errors)
+        super().__init__("; ".join(str(message) for message in messages))
+
+
+class GraphQLObject(Dict[str, Any]):
+    """A decoded JSON object whose fields can also be read as attributes."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__} has no field {name!r}") from None
+
+
+class GraphQLRequest(NamedTuple):
+    query: str
+    variables: Optional[Mapping[str, Any]] = None
+    operation_name: Optional[str] = None
+    # A `BaseModel` subclass to construct `data` as, without validation
+    result_type: Optional[type] = None
+    # Seconds to cache a successful result for; not cached when unset
+    cache_ttl: Optional[float] = None
+    # Send only the query's hash first (automatic persisted queries)
+    persisted_queries: bool = False
+
+
+class GraphQLResponse:
+    """Outcome of one GraphQL operation.
+
+    Attributes:
+        data: The decoded `data`, as `GraphQLObject`s or an instance of the request's `result_type`.
+        errors: GraphQL errors reported by the server.
+        extensions: The response's `extensions`, if any.
+        from_cache: Whether the result was served from the local cache.
+    """
+
+    __slots__ = ("data", "errors", "extensions", "from_cache")
+
+    def __init__(self, data: Any, errors: List[Any], extensions: Any, from_cache: bool) -> None:
+        self.data = data
+        self.errors = errors
+        self.extensions = extensions
+        self.from_cache = from_cache
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self) -> GraphQLResponse:
+        if self.errors:
+            raise GraphQLError(self.errors)
+        return self
+
+    def __repr__(self) -> str:
+        return f"GraphQLResponse(data={self.data!r}, errors={len(self.errors)}, from_cache={self.from_cache})"
+
+
+def _decode(text: Union[str, bytes]) -> Any:
+    return json.loads(text, object_hook=GraphQLObject)
+
+
+class _State:
+    """What is known about one server: persisted query and batch support, and cached results."""
+
+    def __init__(self) -> None:
+        self.persisted = True
+        self.batching = True
+        self._results: OrderedDict[CacheKey, Tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cached(self, key: CacheKey) -> Optional[str]:
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._results[key]
+                return None
+            self._results.move_to_end(key)
+            return entry[1]
+
+    def store(self, key: CacheKey, data: str, ttl: float) -> None:
+        with self._lock:
+            self._results[key] = (time.monotonic() + ttl, data)
+            self._results.move_to_end(key)
+            while len(self._results) > MAX_CACHED_RESULTS:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+
+_states: Dict[ClientKey, _State] = {}
+_states_lock = threading.Lock()
+
+
+def _state_for(client: Union[Papr, AsyncPapr]) -> _State:
+    key = client_key(client)
+    with _states_lock:
+        state = _states.get(key)
+        if state is None:
+            state = _states[key] = _State()
+        return state
+
+
+class _Operation:
+    __slots__ = ("request", "hash", "key", "mutation", "response")
+
+    def __init__(self, request: GraphQLRequest) -> None:
+        self.request = request
+        self.hash = hashlib.sha256(request.query.encode("utf-8")).hexdigest()
+        self.mutation = _MUTATION.match(request.query) is not None
+        self.key: Optional[CacheKey] = None
+        if request.cache_ttl and request.cache_ttl > 0 and not self.mutation:
+            variables = json.dumps(request.variables or {}, sort_keys=True, separators=(",", ":"), default=str)
+            self.key = (self.hash, request.operation_name, variables)
+        self.response: Optional[GraphQLResponse] = None
+
+    def payload(self, *, with_query: bool, persisted: bool) -> Body:
+        request = self.request
+        body: Body = {"variables": dict(request.variables or {})}
+        if request.operation_name is not None:
+            body["operationName"] = request.operation_name
+        if with_query:
+            body["query"] = request.query
+        if persisted:
+            body["extensions"] = {"persistedQuery": {"version": 1, "sha256Hash": self.hash}}
+        return body
+
+    def finish(self, data: Any, errors: List[Any], extensions: Any, from_cache: bool) -> None:
+        result_type = self.request.result_type
+        if result_type is not None and data is not None:
+            data = construct_type(type_=result_type, value=data)
+        self.response = GraphQLResponse(data, errors, extensions, from_cache)
+
+
+def _coerce(request: Union[GraphQLRequest, str, Tuple[Any, ...]]) -> GraphQLRequest:
+    if isinstance(request, GraphQLRequest):
+        return request
+    if isinstance(request, str):
+        return GraphQLRequest(request)
+    return GraphQLRequest(*request)
+
+
+def _persisted_query_problem(body: Any) -> Optional[str]:
+    """Why a hash-only request failed, or None if it was executed."""
+    if not isinstance(body, dict):
+        return "not_supported"
+    errors = body.get("errors")
+    if not errors or body.get("data") is not None:
+        return None
+    for error in errors:
+        if not isinstance(error, dict):
+            continue
+        codes = {error.get("message"), (error.get("extensions") or {}).get("code")}
+        for code in codes:
+            if code in _PERSISTED_QUERY_NOT_FOUND:
+                return "not_found"
+            if code in _PERSISTED_QUERY_NOT_SUPPORTED:
+                return "not_supported"
+    # e.g. "Must provide query string." from a server that ignores the persistedQuery extension
+    return "not_supported"
+
+
+# Yields the payloads of each round trip and receives the decoded response bodies
+Rounds = Generator[List[Body], List[Any], None]
+
+
+def _rounds(state: _State, operations: List[_Operation]) -> Rounds:
+    if any(operation.mutation for operation in operations):
+        state.clear()
+    send: List[Tuple[_Operation, bool]] = []  # (operation, include the query text)
+    for operation in operations:
+        cached = state.cached(operation.key) if operation.key is not None else None
+        if cached is not None:
+            operation.finish(_decode(cached), [], None, from_cache=True)
+        else:
+            send.append((operation, not (operation.request.persisted_queries and state.persisted)))
+
+    while send:
+        bodies = yield [
+            operation.payload(with_query=with_query, persisted=operation.request.persisted_queries and state.persisted)
+            for operation, with_query in send
+        ]
+        retry: List[Tuple[_Operation, bool]] = []
+        for (operation, with_query), body in zip(send, bodies):
+            problem = None if with_query else _persisted_query_problem(body)
+            if problem == "not_supported" and state.persisted:
+                logger.info("GraphQL server did not accept a persisted query; sending query text from now on")
+                state.persisted = False
+            if problem is not None:
+                retry.append((operation, True))
+                continue
+            if not isinstance(body, dict):
+                operation.finish(None, [{"message": f"Unexpected GraphQL response: {body!r}"}], None, from_cache=False)
+                continue
+            errors = body.get("errors") or []
+            data = body.get("data")
+            if operation.key is not None and not errors and data is not None:
+                state.store(operation.key, json.dumps(data, separators=(",", ":")), operation.request.cache_ttl or 0)
+            operation.finish(data, errors, body.get("extensions"), from_cache=False)
+        send = retry
+
+
+def _error_body(error: APIStatusError) -> Any:
+    # GraphQL servers may report request errors, including unknown persisted queries, with a 4xx
+    if isinstance(error.body, dict) and "errors" in error.body:
+        return _decode(json.dumps(error.body))
+    raise error
+
+
+def _batch_rejected(error: APIStatusError) -> bool:
+    return error.status_code in (400, 404, 405, 413, 415, 422)
+
+
+def _post(resource: GraphqlResource, body: Any, timeout: Any) -> Any:
+    try:
+        response = resource._post(
+            "/v1/graphql", body=body, options=make_request_options(timeout=timeout), cast_to=httpx.Response
+        )
+    except APIStatusError as e:
+        return _error_body(e)
+    return _decode(response.content)
+
+
+def _send(resource: GraphqlResource, state: _State, payloads: List[Body], timeout: Any) -> List[Any]:
+    if len(payloads) > 1 and state.batching:
+        try:
+            response = resource._post(
+                "/v1/graphql", body=payloads, options=make_request_options(timeout=timeout), cast_to=httpx.Response
+            )
+            bodies = _decode(response.content)
+            if isinstance(bodies, list) and len(bodies) == len(payloads):
+                return bodies
+        except APIStatusError as e:
+            if not _batch_rejected(e):
+                raise
+        logger.info("GraphQL server does not accept batched requests; sending them one by one")
+        state.batching = False
+    return [_post(resource, payload, timeout) for payload in payloads]
+
+
+def execute_graphql(
+    resource: GraphqlResource,
+    requests: Iterable[Union[GraphQLRequest, str, Tuple[Any, ...]]],
+    *,
+    timeout: Any,
+) -> List[GraphQLResponse]:
+    operations = [_Operation(_coerce(request)) for request in requests]
+    state = _state_for(resource._client)
+    rounds = _rounds(state, operations)
+    try:
+        payloads = next(rounds)
+        while True:
+            payloads = rounds.send(_send(resource, state, payloads, timeout))
+    except StopIteration:
+        pass
+    return [operation.response for operation in operations if operation.response is not None]
+
+
+async def _async_post(resource: AsyncGraphqlResource, body: Any, timeout: Any) -> Any:
+    try:
+        response = await resource._post(
+            "/v1/graphql", body=body, options=make_request_options(timeout=timeout), cast_to=httpx.Response
+        )
+    except APIStatusError as e:
+        return _error_body(e)
+    return _decode(response.content)
+
+
+async def _async_send(resource: AsyncGraphqlResource, state: _State, payloads: List[Body], timeout: Any) -> List[Any]:
+    if len(payloads) > 1 and state.batching:
+        try:
+            response = await resource._post(
+                "/v1/graphql", body=payloads, options=make_request_options(timeout=timeout), cast_to=httpx.Response
+            )
+            bodies = _decode(response.content)
+            if isinstance(bodies, list) and len(bodies) == len(payloads):
+                return bodies
+        except APIStatusError as e:
+            if not _batch_rejected(e):
+                raise
+        logger.info("GraphQL server does not accept batched requests; sending them one by one")
+        state.batching = False
+    return list(await asyncio.gather(*(_async_post(resource, payload, timeout) for payload in payloads)))
+
+
+async def async_execute_graphql(
+    resource: AsyncGraphqlResource,
+    requests: Iterable[Union[GraphQLRequest, str, Tuple[Any, ...]]],
+    *,
+    timeout: Any,
+) -> List[GraphQLResponse]:
+    operations = [_Operation(_coerce(request)) for request in requests]
+    state = _state_for(resource._client)
+    rounds = _rounds(state, operations)
+    try:
+        payloads = next(rounds)
+        while True:
+            payloads = rounds.send(await _async_send(resource, state, payloads, timeout))
+    except StopIteration:
+        pass
+    return [operation.response for operation in operations if operation.response is not None]
@@ -0,0 +1,105 @@
+"""
+Manifest stored with the local tier0 vector index.
+
+The manifest records how the vectors in a collection were produced (embedder, dimensions,
+dtype, normalization and the SDK's index schema version). It is written into the ChromaDB
+collection metadata when the collection is created, so compatibility with the active
+embedder is an O(1) metadata comparison instead of running test embeddings through the model.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from papr_memory.lib._embedders import Embedder
+
+# Bump when the layout of stored documents/metadata changes in a way that requires a rebuild
+# 2: records carry filter facets (papr_type, papr_consent, papr_risk, papr_topic:*, papr_read:*, ...)
+INDEX_SCHEMA_VERSION = 2
+
+_PREFIX = "papr_index_"
+
+
+class IndexManifest:
+    """Description of the vectors stored in a local index."""
+
+    def __init__(
+        self,
+        *,
+        model_id: str,
+        dimensions: int,
+        dtype: str,
+        normalized: bool,
+        schema_version: int = INDEX_SCHEMA_VERSION,
+        created_at: Optional[float] = None,
+    ) -> None:
+        self.model_id = model_id
+        self.dimensions = dimensions
+        self.dtype = dtype
+        self.normalized = normalized
+        self.schema_version = schema_version
+        self.created_at = time.time() if created_at is None else created_at
+
+    @classmethod
+    def for_embedder(cls, embedder: Embedder, *, dimensions: Optional[int] = None) -> "IndexManifest":
+        """Manifest for an index built with `embedder`; `dimensions` overrides an undeclared (0) size.
+
+        The model id is the embedder's `model_id` (the weights it loaded), or its backend `name` if unset.
+        """
+        return cls(
+            model_id=getattr(embedder, "model_id", None) or embedder.name,
+            dimensions=embedder.dimensions or (dimensions or 0),
+            dtype=embedder.dtype,
+            normalized=bool(embedder.normalized),
+        )
+
+    @classmethod
+    def from_metadata(cls, metadata: Optional[Mapping[str, Any]]) -> Optional["IndexManifest"]:
+        """Read a manifest back from collection metadata; None for indexes built before manifests existed."""
+        if not metadata or f"{_PREFIX}model_id" not in metadata:
+            return None
+        try:
+            return cls(
+                model_id=str(metadata[f"{_PREFIX}model_id"]),
+                dimensions=int(metadata[f"{_PREFIX}dimensions"]),
+                dtype=str(metadata[f"{_PREFIX}dtype"]),
+                normalized=str(metadata[f"{_PREFIX}normalized"]).lower() == "true",
+                schema_version=int(metadata[f"{_PREFIX}schema_version"]),
+                created_at=float(metadata.get(f"{_PREFIX}created_at", 0.0)),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """Flat, scalar-only representation (ChromaDB metadata values must be str/int/float/bool)."""
+        return {
+            f"{_PREFIX}model_id": self.model_id,
+            f"{_PREFIX}dimensions": self.dimensions,
+            f"{_PREFIX}dtype": self.dtype,
+            f"{_PREFIX}normalized": str(self.normalized).lower(),
+            f"{_PREFIX}schema_version": self.schema_version,
+            f"{_PREFIX}created_at": self.created_at,
+        }
+
+    def incompatibility(self, stored: Optional["IndexManifest"]) -> Optional[str]:
+        """Why an index described by `stored` cannot be searched with this manifest's embedder (None if it can)."""
+        if stored is None:
+            return "index has no manifest"
+        if stored.schema_version != self.schema_version:
+            return f"index schema version {stored.schema_version} != {self.schema_version}"
+        if stored.model_id != self.model_id:
+            return f"index built with {stored.model_id!r}, active embedder is {self.model_id!r}"
+        if stored.dimensions != self.dimensions:
+            return f"index has {stored.dimensions} dimensions, active embedder produces {self.dimensions}"
+        if stored.dtype != self.dtype:
+            return f"index built with {stored.dtype} weights, active embedder uses {self.dtype}"
+        if stored.normalized != self.normalized:
+            return "index and active embedder disagree on vector normalization"
+        return None
+
+    def __repr__(self) -> str:
+        return (
+            f"IndexManifest(model_id={self.model_id!r}, dimensions={self.dimensions}, dtype={self.dtype!r}, "
+            f"normalized={self.normalized}, schema_version={self.schema_version})"
+        )
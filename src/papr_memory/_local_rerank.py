@@ -0,0 +1,296 @@
+"""
+Client-side H-COND fast-path scoring for `client.holographic.rerank_local`.
+
+When the query and every candidate already carry an `embedding` and `phases` (from a prior
+`/v1/holographic/transform`, see `_transform_cache`), the server's fast path only computes
+cosine similarity plus per-frequency phase alignment. That is a few vectorised NumPy
+operations, so this module approximates it locally and returns a `HolographicRerankResponse`
+without a network round trip. It is not a substitute for `rerank`; see the caveat below:
+
+    response = client.holographic.rerank_local(
+        candidates=candidates,  # each with embedding + phases (+ metadata_embeddings)
+        query="how to parse json",
+        query_embedding=query_embedding,
+        query_phases=query_phases,
+        frequency_schema_id="cosqa",
+        top_k=10,
+    )
+
+Score of a candidate::
+
+    alignment_f = (1 + cos(query_phase_f - phase_f)) / 2          per frequency band f
+                  averaged with (1 + cos_sim(query_meta_f, meta_f)) / 2 when both sides
+                  carry metadata embeddings for f
+    score       = (1 - phase_weight) * cos_sim(query_embedding, embedding)
+                  + phase_weight * weighted_mean_f(alignment_f)
+
+This formula is an approximation of the server's H-COND fast path, reconstructed from its
+documented behaviour; it has not been verified against server rankings. Scores will not match
+the server's and rankings may differ, so use `rerank` wherever the server's ranking matters.
+The tests only check that the formula gives the rankings computed by hand from it.
+
+Band names, frequencies and weights come from the frequency schema, looked up in the
+in-memory registry behind `frequencies.lookup` (see `_schema_registry`). Without a schema the
+bands are unweighted, named by phase index, and metadata embeddings are not used.
+
+Requests the local scorer cannot answer exactly the way the server would are sent to
+`holographic.rerank` unchanged: cold-path candidates (no `phases` or no `embedding`), a
+query without `query_embedding`/`query_phases`, cross-encoder scoring, an explicit
+`scoring_method` or non-`auto` ensemble, or NumPy not being installed.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Mapping, Iterable, Optional, NamedTuple
+
+from ._utils import is_given
+from ._logging import get_logger
+from ._exceptions import APIError
+from .types.holographic_rerank_response import Data, DataRanking, HolographicRerankResponse
+
+if TYPE_CHECKING:
+    from .resources.frequencies import FrequenciesResource, AsyncFrequenciesResource
+    from .types.frequency_retrieve_response import FrequencyRetrieveResponse
+
+__all__ = ["DEFAULT_PHASE_WEIGHT", "FrequencyBand", "fallback_reason", "score_locally"]
+
+logger = get_logger(__name__)
+
+DEFAULT_PHASE_WEIGHT = 0.3
+
+LOCAL_ENSEMBLE = "local_hcond"
+
+
+class FrequencyBand(NamedTuple):
+    """One frequency band of a schema, in phase order."""
+
+    name: str
+    frequency_hz: float
+    weight: float
+
+
+def bands_from_schema(schema: FrequencyRetrieveResponse) -> List[FrequencyBand]:
+    return [
+        FrequencyBand(field.name, field.frequency_hz, field.weight if field.weight is not None else 1.0)
+        for field in schema.frequencies
+    ]
+
+
+def _numpy() -> Any:
+    try:
+        import numpy as np  # type: ignore
+    except ImportError:
+        return None
+    return np
+
+
+def is_fast_path(candidate: Mapping[str, Any]) -> bool:
+    return candidate.get("phases") is not None and candidate.get("embedding") is not None
+
+
+def fallback_reason(
+    candidates: List[Mapping[str, Any]],
+    *,
+    query_embedding: Any,
+    query_phases: Any,
+    options: Any,
+) -> Optional[str]:
+    """Why a rerank request has to go to the server, or None if it can be scored locally."""
+    if _numpy() is None:
+        return "numpy is not installed"
+    if not is_given(query_embedding) or query_embedding is None:
+        return "no query_embedding"
+    if not is_given(query_phases) or query_phases is None:
+        return "no query_phases"
+    cold = sum(1 for candidate in candidates if not is_fast_path(candidate))
+    if cold:
+        return f"{cold} cold-path candidate(s) without embedding and phases"
+    if is_given(options) and options:
+        if options.get("use_cross_encoder"):
+            return "cross-encoder scoring requested"
+        if options.get("scoring_method"):
+            return f"scoring_method={options['scoring_method']!r} requested"
+        if options.get("ensemble", "auto") != "auto":
+            return f"ensemble={options['ensemble']!r} requested"
+    return None
+
+
+def note_fallback(reason: str) -> None:
+    logger.debug(f"Reranking on the server: {reason}")
+
+
+def _frequency_map(embeddings: Optional[Mapping[str, Iterable[float]]]) -> Dict[float, Iterable[float]]:
+    """Metadata embeddings keyed by frequency as a number, so '4' and '4.0' match."""
+    result: Dict[float, Iterable[float]] = {}
+    for key, vector in (embeddings or {}).items():
+        try:
+            result[float(key)] = vector
+        except ValueError:
+            continue
+    return result
+
+
+def _normalize_rows(np: Any, matrix: Any) -> Any:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def hcond_scores(
+    query_embedding: Iterable[float],
+    query_phases: Iterable[float],
+    candidates: List[Mapping[str, Any]],
+    *,
+    query_metadata_embeddings: Optional[Mapping[str, Iterable[float]]] = None,
+    bands: Optional[List[FrequencyBand]] = None,
+    phase_weight: float = DEFAULT_PHASE_WEIGHT,
+) -> Tuple[Any, Any, Any, Any, List[str]]:
+    """Score fast-path candidates.
+
+    Returns ``(scores, cosine, mean_alignment, alignment, band_names)`` where `alignment`
+    is a ``(len(candidates), len(band_names))`` array of per-band alignments in [0, 1].
+    """
+    np = _numpy()
+    query_vector = np.asarray(list(query_embedding), dtype=np.float64)
+    embeddings = np.asarray([list(candidate["embedding"]) for candidate in candidates], dtype=np.float64)
+    if embeddings.shape[1] != query_vector.shape[0]:
+        raise ValueError(
+            f"Candidate embeddings have {embeddings.shape[1]} dimensions, query_embedding has {query_vector.shape[0]}"
+        )
+    cosine = _normalize_rows(np, embeddings) @ _normalize_rows(np, query_vector)
+
+    q_phases = np.asarray(list(query_phases), dtype=np.float64)
+    phase_rows = [list(candidate["phases"]) for candidate in candidates]
+    width = min([len(q_phases)] + [len(row) for row in phase_rows])
+    if bands is not None:
+        width = min(width, len(bands))
+    else:
+        bands = [FrequencyBand(str(i), float("nan"), 1.0) for i in range(width)]
+    bands = bands[:width]
+    phases = np.asarray([row[:width] for row in phase_rows], dtype=np.float64)
+    alignment = (1.0 + np.cos(q_phases[:width] - phases)) / 2.0
+
+    # Blend in metadata-embedding agreement for bands where both sides have one
+    query_meta = _frequency_map(query_metadata_embeddings)
+    if query_meta:
+        candidate_meta = [_frequency_map(candidate.get("metadata_embeddings")) for candidate in candidates]
+        for column, band in enumerate(bands):
+            query_band = query_meta.get(band.frequency_hz)
+            if query_band is None:
+                continue
+            rows = [i for i, meta in enumerate(candidate_meta) if band.frequency_hz in meta]
+            if not rows:
+                continue
+            vectors = _normalize_rows(np, np.asarray([list(candidate_meta[i][band.frequency_hz]) for i in rows]))
+            semantic = (1.0 + vectors @ _normalize_rows(np, np.asarray(list(query_band), dtype=np.float64))) / 2.0
+            alignment[rows, column] = (alignment[rows, column] + semantic) / 2.0
+
+    weights = np.asarray([band.weight for band in bands], dtype=np.float64)
+    total = weights.sum()
+    mean_alignment = alignment @ weights / total if total > 0 else alignment.mean(axis=1)
+    scores = (1.0 - phase_weight) * cosine + phase_weight * mean_alignment
+    return scores, cosine, mean_alignment, alignment, [band.name for band in bands]
+
+
+def score_locally(
+    candidates: List[Mapping[str, Any]],
+    *,
+    query_embedding: Iterable[float],
+    query_phases: Iterable[float],
+    query_metadata_embeddings: Any = None,
+    domain: Any = None,
+    options: Any = None,
+    top_k: Any = None,
+    schema: Optional[FrequencyRetrieveResponse] = None,
+    phase_weight: float = DEFAULT_PHASE_WEIGHT,
+) -> HolographicRerankResponse:
+    """Rank fast-path candidates with the local approximation of the H-COND formula, without a request."""
+    started = time.perf_counter()
+    options = options if is_given(options) and options else {}
+    frequency_filters: Mapping[str, float] = options.get("frequency_filters") or {}
+    bands = bands_from_schema(schema) if schema is not None else None
+    if frequency_filters:
+        known = {band.name for band in bands or []}
+        unknown = sorted(set(frequency_filters) - known)
+        if unknown:
+            raise ValueError(f"frequency_filters name unknown frequency fields: {', '.join(unknown)}")
+
+    rankings: List[DataRanking] = []
+    if candidates:
+        scores, cosine, mean_alignment, alignment, names = hcond_scores(
+            query_embedding,
+            query_phases,
+            candidates,
+            query_metadata_embeddings=query_metadata_embeddings if is_given(query_metadata_embeddings) else None,
+            bands=bands,
+            phase_weight=phase_weight,
+        )
+        np = _numpy()
+        keep = np.ones(len(candidates), dtype=bool)
+        for field, minimum in frequency_filters.items():
+            if field in names:
+                keep &= alignment[:, names.index(field)] >= minimum
+        # Stable sort keeps input order between equal scores
+        order = [int(i) for i in np.argsort(-scores, kind="stable") if keep[i]]
+        if is_given(top_k) and top_k is not None:
+            order = order[:top_k]
+
+        return_scores = bool(options.get("return_scores"))
+        include_frequency_scores = return_scores and bool(options.get("include_frequency_scores"))
+        for rank, i in enumerate(order, start=1):
+            candidate = candidates[i]
+            rankings.append(
+                DataRanking(
+                    id=candidate["id"],
+                    path="fast",
+                    rank=rank,
+                    score=float(scores[i]),
+                    original_score=candidate.get("score"),
+                    scores={"cosine": float(cosine[i]), "phase_alignment": float(mean_alignment[i])}
+                    if return_scores
+                    else None,
+                    frequency_scores={name: float(alignment[i, j]) for j, name in enumerate(names)}
+                    if include_frequency_scores
+                    else None,
+                )
+            )
+
+    return HolographicRerankResponse(
+        data=Data(
+            domain=schema.domain if schema is not None else (domain if is_given(domain) and domain else "general"),
+            ensemble_used=LOCAL_ENSEMBLE,
+            rankings=rankings,
+            timing_ms=(time.perf_counter() - started) * 1000.0,
+        ),
+        status="success",
+    )
+
+
+def schema_id_for(domain: Any, frequency_schema_id: Any) -> Optional[str]:
+    """Schema to describe the bands with; an explicit schema id wins over the domain, as on the server."""
+    for value in (frequency_schema_id, domain):
+        if is_given(value) and value:
+            return str(value)
+    return None
+
+
+def needs_schema(options: Any) -> bool:
+    return bool(is_given(options) and options and options.get("frequency_filters"))
+
+
+def resolve_schema(frequencies: FrequenciesResource, schema_id: str) -> Optional[FrequencyRetrieveResponse]:
+    try:
+        return frequencies.lookup(schema_id)
+    except APIError as e:
+        logger.debug(f"Could not fetch frequency schema {schema_id!r} for local rerank: {e}")
+        return None
+
+
+async def async_resolve_schema(
+    frequencies: AsyncFrequenciesResource, schema_id: str
+) -> Optional[FrequencyRetrieveResponse]:
+    try:
+        return await frequencies.lookup(schema_id)
+    except APIError as e:
+        logger.debug(f"Could not fetch frequency schema {schema_id!r} for local rerank: {e}")
+        return None
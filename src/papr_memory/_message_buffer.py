@@ -0,0 +1,604 @@
+"""
+Background, session-ordered message storage for `client.messages.buffered`.
+
+Chat backends store every user and assistant turn with `messages.store`, usually inline with
+the response. A message buffer takes that round trip off the hot path:
+
+    messages = client.messages.buffered(journal="~/.cache/papr_memory/messages.jsonl")
+    messages.store(session_id=chat.id, role="user", content=question)  # returns immediately
+    messages.store(session_id=chat.id, role="assistant", content=answer)
+    ...
+    messages.close()
+
+Messages are queued per `session_id` and stored in order: a session never has more than one
+request in flight, while up to `concurrency` sessions are written in parallel. Connection
+errors, 429s and 5xx responses are retried with backoff (or after the server's `Retry-After`)
+until the message is stored (later messages of the same session wait behind it); other
+errors are logged and passed to `on_error`. These retries replace the client's own.
+
+With a `journal` file every queued message is appended to it before `store` returns and
+marked done once the server accepted it. Messages still in the journal after a crash or
+restart are sent again by the next buffer opened on that journal. Use one journal per process.
+
+Duplicates: every message gets an id when it is queued, passed as the request's
+`idempotency_key` option. The client only sends it when the API declares an idempotency
+header, which it currently does not, so the server cannot deduplicate retries. Instead, before
+a message is sent again after an attempt that may have reached the server (a connection
+error, timeout or 5xx, or a journal replay after a crash), the newest message of its session
+is fetched with `sessions.retrieve_history`. If it has the same role and content, the message
+counts as stored. An identical message stored just before it is indistinguishable, so in that
+rare case the retry is skipped.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Any, Set, Dict, List, Deque, Tuple, Union, Callable, Iterable, Optional
+from collections import deque
+from typing_extensions import Literal
+
+from .types import message_store_params
+from ._types import Omit, omit
+from ._utils import is_given, maybe_transform, async_maybe_transform
+from ._logging import get_logger
+from ._exceptions import RateLimitError
+from ._base_client import make_request_options
+from ._retries import retry_delay, is_retryable, without_client_retries
+from ._session_cache import note_stored
+from ._background_buffer import BackgroundBuffer, SyncBackgroundBuffer, AsyncBackgroundBuffer
+from .types.memory_metadata_param import MemoryMetadataParam
+from .types.graph_generation_param import GraphGenerationParam
+from .types.message_store_response import MessageStoreResponse
+from .types.shared_params.memory_policy import MemoryPolicy
+
+if TYPE_CHECKING:
+    from .resources.messages.messages import MessagesResource, AsyncMessagesResource
+    from .types.messages.session_retrieve_history_response import SessionRetrieveHistoryResponse
+
+__all__ = ["MessageJournal", "MessageBuffer", "AsyncMessageBuffer"]
+
+logger = get_logger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_PENDING = 1000
+DEFAULT_CLOSE_TIMEOUT = 10.0
+MAX_RETRY_DELAY = 30.0
+# Recent messages fetched to find a session's newest one before a resend
+HISTORY_CHECK_LIMIT = 5
+
+ErrorCallback = Callable[[str, Dict[str, Any], Exception], None]
+
+
+def _retry_delay(attempt: int, error: Optional[Exception]) -> float:
+    return retry_delay(attempt, error, max_delay=MAX_RETRY_DELAY)
+
+
+class MessageJournal:
+    """Append-only record of queued messages, so unsent ones survive a crash or restart.
+
+    Each line is either ``{"id": ..., "params": {...}}`` for a queued message or
+    ``{"done": id}`` once it was stored; the file is compacted after `compact_after` done
+    records.
+    """
+
+    def __init__(self, path: str, *, compact_after: int = 1000) -> None:
+        self.path = os.path.expanduser(path)
+        self.compact_after = compact_after
+        self._lock = threading.Lock()
+        self._done = 0
+        self._tail_checked = False
+
+    def pending(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Messages queued but never marked done, in the order they were queued."""
+        with self._lock:
+            return self._pending()
+
+    def add(self, message_id: str, params: Dict[str, Any]) -> None:
+        self._append({"id": message_id, "params": params})
+
+    def done(self, message_id: str) -> None:
+        self._append({"done": message_id})
+        with self._lock:
+            self._done += 1
+            if self._done >= self.compact_after:
+                self._compact()
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                if not self._tail_checked:
+                    # Don't glue the first record onto a line a crash cut short
+                    line = self._separator() + line
+                    self._tail_checked = True
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError as e:
+                logger.warning(f"Could not write message journal {self.path}: {e}")
+
+    def _separator(self) -> str:
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return ""
+                f.seek(-1, os.SEEK_END)
+                return "" if f.read(1) == b"\n" else "\n"
+        except OSError:
+            return ""
+
+    def _pending(self) -> List[Tuple[str, Dict[str, Any]]]:
+        queued: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    if "done" in record:
+                        queued.pop(record["done"], None)
+                    elif "id" in record:
+                        queued[record["id"]] = record["params"]
+        except OSError:
+            return []
+        return list(queued.items())
+
+    def _compact(self) -> None:
+        self._done = 0
+        try:
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for message_id, params in self._pending():
+                    f.write(json.dumps({"id": message_id, "params": params}, default=str) + "\n")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not compact message journal {self.path}: {e}")
+
+
+class _Message:
+    def __init__(self, message_id: str, params: Dict[str, Any], *, maybe_stored: bool = False) -> None:
+        self.id = message_id
+        self.params = params
+        self.attempt = 0
+        self.error: Optional[Exception] = None
+        # An earlier attempt may have reached the server; check the history before resending
+        self.maybe_stored = maybe_stored
+
+
+def _is_newest(params: Dict[str, Any], history: SessionRetrieveHistoryResponse) -> bool:
+    """Whether the session's newest stored message is this one (same role and content)."""
+    if not history.messages:
+        return False
+    newest = max(history.messages, key=lambda stored: stored.created_at)
+    return newest.role == params["role"] and newest.content == params["content"]
+
+
+def _params(
+    *,
+    content: Union[str, Iterable[Dict[str, object]]],
+    role: Literal["user", "assistant"],
+    session_id: str,
+    **optional: Any,
+) -> Dict[str, Any]:
+    if not isinstance(content, str):
+        content = list(content)
+    params: Dict[str, Any] = {"content": content, "role": role, "session_id": session_id}
+    for name, value in optional.items():
+        if is_given(value):
+            params[name] = list(value) if name in ("context", "relationships_json") and value is not None else value
+    return params
+
+
+class _BufferState(BackgroundBuffer):
+    """Per-session queues shared by the sync and async buffers; guarded by the owner's condition."""
+
+    _counters = ("stored", "failed", "retries")
+    _item_name = "message"
+    stored: int
+    failed: int
+    retries: int
+
+    def __init__(
+        self,
+        *,
+        concurrency: int,
+        max_pending: int,
+        journal: Optional[str],
+        on_error: Optional[ErrorCallback],
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.on_error = on_error
+        self.journal = MessageJournal(journal) if journal else None
+
+        self._sessions: Dict[str, Deque[_Message]] = {}
+        self._ready: Deque[str] = deque()  # sessions with queued messages and nothing in flight
+        self._busy: Set[str] = set()
+        self._pending = 0
+        self._closed = False
+        super().__init__()
+
+        if self.journal is not None:
+            replay = self.journal.pending()
+            if replay:
+                logger.info(f"Resending {len(replay)} message(s) left in {self.journal.path}")
+            heads: Set[str] = set()
+            for message_id, params in replay:
+                # Only a session's first unfinished message can have been in flight at the crash
+                head = params["session_id"] not in heads
+                heads.add(params["session_id"])
+                self._enqueue(_Message(message_id, params, maybe_stored=head))
+
+    @property
+    def pending(self) -> int:
+        """Messages queued or being stored."""
+        return self._pending
+
+    def _unsent(self) -> int:
+        return self._pending
+
+    def _has_room(self) -> bool:
+        return self._closed or self._pending < self.max_pending
+
+    def _enqueue(self, message: _Message) -> None:
+        session_id = message.params["session_id"]
+        queue = self._sessions.setdefault(session_id, deque())
+        if not queue and session_id not in self._busy:
+            self._ready.append(session_id)
+        queue.append(message)
+        self._pending += 1
+
+    def _new_message(self, params: Dict[str, Any]) -> _Message:
+        message = _Message(uuid.uuid4().hex, params)
+        if self.journal is not None:
+            self.journal.add(message.id, params)
+        return message
+
+    def _next(self) -> Optional[_Message]:
+        """Claim the oldest message of the next ready session."""
+        if not self._ready:
+            return None
+        session_id = self._ready.popleft()
+        self._busy.add(session_id)
+        return self._sessions[session_id][0]
+
+    def _release(self, message: _Message, finished: bool) -> None:
+        """Hand a session back after an attempt; unfinished messages stay at the head of their session."""
+        session_id = message.params["session_id"]
+        self._busy.discard(session_id)
+        queue = self._sessions[session_id]
+        if finished:
+            queue.popleft()
+            self._pending -= 1
+        if queue:
+            self._ready.append(session_id)
+        else:
+            del self._sessions[session_id]
+
+    def _finish(self, message: _Message, error: Optional[Exception]) -> bool:
+        """Record an attempt; returns False if the message should be retried."""
+        if error is not None and is_retryable(error) and not self._closed:
+            message.attempt += 1
+            message.error = error
+            # A rate-limited request was refused; anything else may have been stored
+            message.maybe_stored = message.maybe_stored or not isinstance(error, RateLimitError)
+            self.retries += 1
+            log = logger.warning if message.attempt == 1 else logger.debug
+            log(f"Storing message {message.id} failed ({error}); retrying")
+            return False
+        if error is None:
+            self.stored += 1
+        else:
+            self.failed += 1
+            if self._closed and is_retryable(error):
+                kept = " (kept in the journal)" if self.journal is not None else ""
+                logger.warning(f"Could not store message {message.id} before closing{kept}: {error}")
+                return True
+            logger.warning(f"Dropping message {message.id} for session {message.params['session_id']}: {error}")
+            if self.on_error is not None:
+                try:
+                    self.on_error(message.id, message.params, error)
+                except Exception:
+                    logger.exception("Message buffer on_error callback raised")
+        if self.journal is not None:
+            self.journal.done(message.id)
+        return True
+
+
+class MessageBuffer(_BufferState, SyncBackgroundBuffer):
+    """Stores chat messages in the background, in order within each session.
+
+    Create one with `client.messages.buffered()`. Also usable as a context manager, which
+    closes (and drains) the buffer on exit.
+    """
+
+    def __init__(
+        self,
+        resource: MessagesResource,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        journal: Optional[str] = None,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> None:
+        self._resource = without_client_retries(resource)
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        super().__init__(concurrency=concurrency, max_pending=max_pending, journal=journal, on_error=on_error)
+        if self._pending:
+            with self._cond:
+                self._start_workers()
+
+    def store(
+        self,
+        *,
+        content: Union[str, Iterable[Dict[str, object]]],
+        role: Literal["user", "assistant"],
+        session_id: str,
+        context: Optional[Iterable[Dict[str, object]]] | Omit = omit,
+        graph_generation: Optional[GraphGenerationParam] | Omit = omit,
+        memory_policy: Optional[MemoryPolicy] | Omit = omit,
+        metadata: Optional[MemoryMetadataParam] | Omit = omit,
+        namespace_id: Optional[str] | Omit = omit,
+        organization_id: Optional[str] | Omit = omit,
+        process_messages: bool | Omit = omit,
+        relationships_json: Optional[Iterable[Dict[str, object]]] | Omit = omit,
+        title: Optional[str] | Omit = omit,
+    ) -> str:
+        """Queue a message; takes the same arguments as `messages.store` and returns the message id.
+
+        Blocks only while `max_pending` messages are waiting to be stored.
+        """
+        params = _params(
+            content=content,
+            role=role,
+            session_id=session_id,
+            context=context,
+            graph_generation=graph_generation,
+            memory_policy=memory_policy,
+            metadata=metadata,
+            namespace_id=namespace_id,
+            organization_id=organization_id,
+            process_messages=process_messages,
+            relationships_json=relationships_json,
+            title=title,
+        )
+        with self._cond:
+            self._cond.wait_for(self._has_room)
+            if self._closed:
+                raise RuntimeError("MessageBuffer is closed")
+            message = self._new_message(params)
+            self._enqueue(message)
+            self._start_workers()
+            self._cond.notify_all()
+        return message.id
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message is stored; returns False if some are still pending after `timeout`."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending, timeout)
+
+    def close(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """Store the queued messages and stop the workers. Further `store` calls raise."""
+        with self._cond:
+            if self._closed:
+                return
+            if not self._cond.wait_for(lambda: not self._pending, timeout):
+                logger.warning(f"Message buffer closed with {self._pending} message(s) unsent")
+            self._closed = True
+            self._cond.notify_all()
+        for worker in self._workers:
+            if worker is not threading.current_thread():
+                worker.join(timeout)
+        self._unregister()
+
+    def _start_workers(self) -> None:
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        while len(self._workers) < self.concurrency:
+            worker = threading.Thread(target=self._run, name="PaprMessageWriter", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: bool(self._ready) or self._closed)
+                # Once closed, whatever is still queued stays in the journal for the next run
+                message = None if self._closed else self._next()
+                if message is None:
+                    return
+            if message.attempt:
+                time.sleep(_retry_delay(message.attempt, message.error))
+            error: Optional[Exception] = None
+            try:
+                if message.maybe_stored and self._already_stored(message):
+                    logger.info(f"Message {message.id} was stored by an earlier attempt; not sending it again")
+                else:
+                    self._store(message)
+            except Exception as e:
+                error = e
+            with self._cond:
+                self._release(message, self._finish(message, error))
+                self._cond.notify_all()
+
+    def _store(self, message: _Message) -> None:
+        self._resource._post(
+            "/v1/messages",
+            body=maybe_transform(message.params, message_store_params.MessageStoreParams),
+            options=make_request_options(idempotency_key=message.id),
+            cast_to=MessageStoreResponse,
+        )
+        note_stored(self._resource._client, message.params["session_id"])
+
+    def _already_stored(self, message: _Message) -> bool:
+        try:
+            history = self._resource.sessions.retrieve_history(
+                message.params["session_id"], limit=HISTORY_CHECK_LIMIT
+            )
+        except Exception as e:
+            logger.debug(f"Could not check the history of session {message.params['session_id']}: {e}")
+            return False
+        return _is_newest(message.params, history)
+
+
+class AsyncMessageBuffer(_BufferState, AsyncBackgroundBuffer):
+    """Async counterpart of `MessageBuffer`; writers run as tasks on the caller's event loop.
+
+    Close it with `await buffer.close()` (or `async with`) before the loop stops. Messages
+    left behind are only recoverable through the journal.
+    """
+
+    def __init__(
+        self,
+        resource: AsyncMessagesResource,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        journal: Optional[str] = None,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> None:
+        self._resource = without_client_retries(resource)
+        # Created on first use so it binds to the loop the buffer is used from
+        self._cond_: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task[None]] = []
+        super().__init__(concurrency=concurrency, max_pending=max_pending, journal=journal, on_error=on_error)
+
+    @property
+    def _cond(self) -> asyncio.Condition:
+        if self._cond_ is None:
+            self._cond_ = asyncio.Condition()
+        return self._cond_
+
+    async def store(
+        self,
+        *,
+        content: Union[str, Iterable[Dict[str, object]]],
+        role: Literal["user", "assistant"],
+        session_id: str,
+        context: Optional[Iterable[Dict[str, object]]] | Omit = omit,
+        graph_generation: Optional[GraphGenerationParam] | Omit = omit,
+        memory_policy: Optional[MemoryPolicy] | Omit = omit,
+        metadata: Optional[MemoryMetadataParam] | Omit = omit,
+        namespace_id: Optional[str] | Omit = omit,
+        organization_id: Optional[str] | Omit = omit,
+        process_messages: bool | Omit = omit,
+        relationships_json: Optional[Iterable[Dict[str, object]]] | Omit = omit,
+        title: Optional[str] | Omit = omit,
+    ) -> str:
+        """Queue a message; takes the same arguments as `messages.store` and returns the message id.
+
+        Waits only while `max_pending` messages are waiting to be stored.
+        """
+        params = _params(
+            content=content,
+            role=role,
+            session_id=session_id,
+            context=context,
+            graph_generation=graph_generation,
+            memory_policy=memory_policy,
+            metadata=metadata,
+            namespace_id=namespace_id,
+            organization_id=organization_id,
+            process_messages=process_messages,
+            relationships_json=relationships_json,
+            title=title,
+        )
+        async with self._cond:
+            await self._cond.wait_for(self._has_room)
+            if self._closed:
+                raise RuntimeError("AsyncMessageBuffer is closed")
+            message = self._new_message(params)
+            self._enqueue(message)
+            self._start_workers()
+            self._cond.notify_all()
+        return message.id
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message is stored; returns False if some are still pending after `timeout`."""
+        async with self._cond:
+            self._start_workers()
+            return await self._wait_drained(timeout)
+
+    async def close(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """Store the queued messages and stop the workers. Further `store` calls raise."""
+        async with self._cond:
+            if self._closed:
+                return
+            self._start_workers()
+            if not await self._wait_drained(timeout):
+                logger.warning(f"Message buffer closed with {self._pending} message(s) unsent")
+            self._closed = True
+            self._cond.notify_all()
+        if self._workers:
+            _, stuck = await asyncio.wait(self._workers, timeout=timeout)
+            for worker in stuck:
+                worker.cancel()
+        self._unregister()
+
+    async def _wait_drained(self, timeout: Optional[float]) -> bool:
+        try:
+            await asyncio.wait_for(self._cond.wait_for(lambda: not self._pending), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return not self._pending
+
+    def _start_workers(self) -> None:
+        if not self._pending:
+            return
+        loop = asyncio.get_running_loop()
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(loop.create_task(self._run()))
+
+    async def _run(self) -> None:
+        while True:
+            async with self._cond:
+                await self._cond.wait_for(lambda: bool(self._ready) or self._closed)
+                # Once closed, whatever is still queued stays in the journal for the next run
+                message = None if self._closed else self._next()
+                if message is None:
+                    return
+            if message.attempt:
+                await asyncio.sleep(_retry_delay(message.attempt, message.error))
+            error: Optional[Exception] = None
+            try:
+                if message.maybe_stored and await self._already_stored(message):
+                    logger.info(f"Message {message.id} was stored by an earlier attempt; not sending it again")
+                else:
+                    await self._store(message)
+            except Exception as e:
+                error = e
+            async with self._cond:
+                self._release(message, self._finish(message, error))
+                self._cond.notify_all()
+
+    async def _store(self, message: _Message) -> None:
+        await self._resource._post(
+            "/v1/messages",
+            body=await async_maybe_transform(message.params, message_store_params.MessageStoreParams),
+            options=make_request_options(idempotency_key=message.id),
+            cast_to=MessageStoreResponse,
+        )
+        note_stored(self._resource._client, message.params["session_id"])
+
+    async def _already_stored(self, message: _Message) -> bool:
+        try:
+            history = await self._resource.sessions.retrieve_history(
+                message.params["session_id"], limit=HISTORY_CHECK_LIMIT
+            )
+        except Exception as e:
+            logger.debug(f"Could not check the history of session {message.params['session_id']}: {e}")
+            return False
+        return _is_newest(message.params, history)
+
+    def _left_behind(self) -> str:
+        return " (they remain in the journal)" if self.journal is not None else ""
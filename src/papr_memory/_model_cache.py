@@ -153,3 +153,57 @@ def resolve_coreml_model_path(specified_path: Optional[str] = None) -> str:
             "3. Specify model path: export PAPR_COREML_MODEL=/path/to/model.mlpackage"
         ) from e
 
+
+
+def resolve_onnx_model_path(specified: Optional[str] = None) -> str:
+    """
+    Resolve the ONNX embedding model location, downloading from HuggingFace if needed.
+
+    Args:
+        specified: Local path or HuggingFace repo ID (from PAPR_ONNX_MODEL env var)
+
+    Returns:
+        Path to a local .onnx file or export directory
+
+    Priority:
+        1. Local file/directory at the specified path
+        2. HuggingFace repo ID, downloaded into ~/.cache/papr_memory/onnx
+        3. Common local export paths
+    """
+    if specified and os.path.exists(specified):
+        logger.info(f"Using user-specified ONNX model: {specified}")
+        return specified
+
+    if specified and "/" in specified:
+        try:
+            from huggingface_hub import snapshot_download
+        except ImportError as e:
+            raise ImportError(
+                "huggingface_hub is required to auto-download ONNX models. "
+                "Install it with: pip install huggingface_hub"
+            ) from e
+
+        cache_dir = get_model_cache_dir().parent / "onnx" / specified.replace("/", "--")
+        logger.info(f"📥 Downloading ONNX model from {specified} (cached at {cache_dir})")
+        downloaded_path = snapshot_download(  # type: ignore[call-overload]
+            repo_id=specified,
+            allow_patterns=["*.onnx", "*.onnx_data", "*.json", "*.txt", "onnx/*"],
+            local_dir=cache_dir,
+        )
+        return str(downloaded_path)
+
+    common_paths = [
+        "./onnx/Qwen3-Embedding-4B-int8",
+        "./onnx/Qwen3-Embedding-4B",
+        "./onnx/model.onnx",
+    ]
+    for path in common_paths:
+        if os.path.exists(path):
+            logger.info(f"Using local ONNX model: {path}")
+            return path
+
+    raise FileNotFoundError(
+        "ONNX model not found. Please either:\n"
+        "1. Export the model: optimum-cli export onnx --model Qwen/Qwen3-Embedding-4B ./onnx/Qwen3-Embedding-4B\n"
+        "2. Specify a local path or HuggingFace repo: export PAPR_ONNX_MODEL=/path/to/export"
+    )
@@ -0,0 +1,282 @@
+"""
+Sharded, parallel OMO exports for `client.omo.export_stream`.
+
+`omo.export_memories` exports every requested memory in one request, which times out
+for large workspaces. `export_stream` splits the memory ids into shards, exports up to
+`concurrency` shards at a time and streams the merged result to one JSON Lines file:
+
+    report = client.omo.export_stream(memory_ids, "export.jsonl", shard_size=200, concurrency=8)
+    print(report.exported, report.failures)
+
+Shards are written in input order as soon as every earlier shard is done, so memory use
+stays bounded by the shards in flight. Memory ids are de-duplicated on the way in and
+exported memories (by their `id`) on the way out. Each shard is retried on connection
+errors, 429s and 5xx responses; a shard that times out or is too large is split in half
+and the halves exported separately. Shards that still fail are listed in the report and
+the export carries on.
+
+The export endpoints select memories by id only, so group the ids yourself (for example
+per namespace, organization or created-at range) and pass them in that order to keep
+related memories in the same shards.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import asyncio
+import itertools
+from typing import IO, TYPE_CHECKING, Any, Set, Dict, List, Union, Callable, Iterable, Iterator, Optional, NamedTuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ._logging import get_logger
+from ._exceptions import APIStatusError, APITimeoutError
+from ._retries import retry_delay, is_retryable, without_client_retries
+
+if TYPE_CHECKING:
+    from .resources.omo import OmoResource, AsyncOmoResource
+
+__all__ = ["OmoExportFailure", "OmoExportReport"]
+
+logger = get_logger(__name__)
+
+DEFAULT_SHARD_SIZE = 100
+DEFAULT_CONCURRENCY = 4
+
+Memory = Dict[str, object]
+Output = Union[str, "os.PathLike[str]", IO[str]]
+ProgressCallback = Callable[[int, int], None]
+
+
+class OmoExportFailure(NamedTuple):
+    memory_ids: List[str]
+    error: str
+
+
+class OmoExportReport:
+    """Outcome of `omo.export_stream`.
+
+    Attributes:
+        exported: Memories written to the output.
+        duplicates: Repeated memory ids, or repeated memories in responses, that were skipped.
+        shards: Export requests that succeeded, including halves of split shards.
+        failures: Shards that could not be exported, with the last error.
+        elapsed: Seconds the export took.
+    """
+
+    def __init__(self) -> None:
+        self.exported = 0
+        self.duplicates = 0
+        self.shards = 0
+        self.failures: List[OmoExportFailure] = []
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    def __repr__(self) -> str:
+        return (
+            f"OmoExportReport(exported={self.exported}, duplicates={self.duplicates}, "
+            f"shards={self.shards}, failed={len(self.failures)})"
+        )
+
+
+class _ShardResult(NamedTuple):
+    memories: List[Memory]
+    requests: int
+    failures: List[OmoExportFailure]
+
+
+def _should_split(error: Exception, ids: List[str]) -> bool:
+    # A shard the server cannot finish in time (or at all) usually succeeds in smaller pieces
+    if len(ids) < 2:
+        return False
+    if isinstance(error, APITimeoutError):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code in (408, 413, 504)
+
+
+def _shards(memory_ids: Iterable[str], shard_size: int, report: OmoExportReport) -> Iterator[List[str]]:
+    if shard_size < 1:
+        raise ValueError(f"shard_size must be at least 1, got {shard_size}")
+    seen: Set[str] = set()
+
+    def unique() -> Iterator[str]:
+        for memory_id in memory_ids:
+            if memory_id in seen:
+                report.duplicates += 1
+                continue
+            seen.add(memory_id)
+            yield memory_id
+
+    ids = unique()
+    return iter(lambda: list(itertools.islice(ids, shard_size)), [])
+
+
+class _Writer:
+    """Writes de-duplicated memories as JSON Lines, in shard order."""
+
+    def __init__(self, output: Output, report: OmoExportReport, on_progress: Optional[ProgressCallback]) -> None:
+        self._report = report
+        self._on_progress = on_progress
+        self._seen: Set[str] = set()
+        self._requested = 0
+        if isinstance(output, (str, os.PathLike)):
+            self._file: IO[str] = open(output, "w", encoding="utf-8")
+            self._owned = True
+        else:
+            self._file = output
+            self._owned = False
+
+    def requested(self, n: int) -> None:
+        self._requested += n
+
+    def write(self, result: _ShardResult) -> None:
+        report = self._report
+        for memory in result.memories:
+            memory_id = memory.get("id")
+            if isinstance(memory_id, str):
+                if memory_id in self._seen:
+                    report.duplicates += 1
+                    continue
+                self._seen.add(memory_id)
+            self._file.write(json.dumps(memory, default=str) + "\n")
+            report.exported += 1
+        report.shards += result.requests
+        for failure in result.failures:
+            logger.warning(f"Could not export {len(failure.memory_ids)} memories: {failure.error}")
+            report.failures.append(failure)
+        if self._on_progress is not None:
+            self._on_progress(report.exported, self._requested)
+
+    def close(self) -> None:
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def _export_shard(resource: OmoResource, ids: List[str], max_attempts: int, timeout: Any) -> _ShardResult:
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = resource.export_memories(memory_ids=ids, timeout=timeout)
+            return _ShardResult(response.memories, 1, [])
+        except Exception as e:
+            if _should_split(e, ids):
+                half = len(ids) // 2
+                logger.info(f"Splitting OMO export shard of {len(ids)} memories after: {e}")
+                left = _export_shard(resource, ids[:half], max_attempts, timeout)
+                right = _export_shard(resource, ids[half:], max_attempts, timeout)
+                return _merge(left, right)
+            if attempt >= max_attempts or not is_retryable(e):
+                return _ShardResult([], 0, [OmoExportFailure(ids, str(e))])
+            time.sleep(retry_delay(attempt, e))
+
+
+def _merge(left: _ShardResult, right: _ShardResult) -> _ShardResult:
+    return _ShardResult(left.memories + right.memories, left.requests + right.requests, left.failures + right.failures)
+
+
+def export_omo(
+    resource: OmoResource,
+    memory_ids: Iterable[str],
+    output: Output,
+    *,
+    shard_size: int,
+    concurrency: int,
+    max_attempts: int,
+    timeout: Any,
+    on_progress: Optional[ProgressCallback],
+) -> OmoExportReport:
+    started = time.monotonic()
+    resource = without_client_retries(resource)
+    report = OmoExportReport()
+    concurrency = max(1, concurrency)
+    shards = _shards(memory_ids, shard_size, report)
+    writer = _Writer(output, report, on_progress)
+    # Shards finish out of order; keeping a window of them in submission order lets each
+    # be written as soon as the ones before it are
+    window: deque[Future[_ShardResult]] = deque()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="PaprOmoExport") as pool:
+            try:
+                for shard in shards:
+                    if len(window) >= 2 * concurrency:
+                        writer.write(window.popleft().result())
+                    writer.requested(len(shard))
+                    window.append(pool.submit(_export_shard, resource, shard, max_attempts, timeout))
+                while window:
+                    writer.write(window.popleft().result())
+            finally:
+                for future in window:
+                    future.cancel()
+    finally:
+        writer.close()
+    report.elapsed = time.monotonic() - started
+    return report
+
+
+async def _async_export_shard(
+    resource: AsyncOmoResource, ids: List[str], max_attempts: int, timeout: Any
+) -> _ShardResult:
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = await resource.export_memories(memory_ids=ids, timeout=timeout)
+            return _ShardResult(response.memories, 1, [])
+        except Exception as e:
+            if _should_split(e, ids):
+                half = len(ids) // 2
+                logger.info(f"Splitting OMO export shard of {len(ids)} memories after: {e}")
+                left = await _async_export_shard(resource, ids[:half], max_attempts, timeout)
+                right = await _async_export_shard(resource, ids[half:], max_attempts, timeout)
+                return _merge(left, right)
+            if attempt >= max_attempts or not is_retryable(e):
+                return _ShardResult([], 0, [OmoExportFailure(ids, str(e))])
+            await asyncio.sleep(retry_delay(attempt, e))
+
+
+async def async_export_omo(
+    resource: AsyncOmoResource,
+    memory_ids: Iterable[str],
+    output: Output,
+    *,
+    shard_size: int,
+    concurrency: int,
+    max_attempts: int,
+    timeout: Any,
+    on_progress: Optional[ProgressCallback],
+) -> OmoExportReport:
+    started = time.monotonic()
+    resource = without_client_retries(resource)
+    report = OmoExportReport()
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(ids: List[str]) -> _ShardResult:
+        async with semaphore:
+            return await _async_export_shard(resource, ids, max_attempts, timeout)
+
+    shards = _shards(memory_ids, shard_size, report)
+    writer = _Writer(output, report, on_progress)
+    window: deque[asyncio.Future[_ShardResult]] = deque()
+    try:
+        for shard in shards:
+            if len(window) >= 2 * concurrency:
+                writer.write(await window.popleft())
+            writer.requested(len(shard))
+            window.append(asyncio.ensure_future(limited(shard)))
+        while window:
+            writer.write(await window.popleft())
+    finally:
+        for task in window:
+            task.cancel()
+        writer.close()
+    report.elapsed = time.monotonic() - started
+    return report
@@ -0,0 +1,479 @@
+"""
+Streaming, resumable imports of Open Memory Object (OMO) exports for `client.omo.import_stream`.
+
+`omo.import_memories` sends every memory in one request body. `import_stream` reads the
+memories lazily and sends them in size-bounded chunks over several connections:
+
+    report = client.omo.import_stream("export.jsonl", checkpoint="export.jsonl.checkpoint")
+    print(report.imported, report.skipped, report.errors)
+
+The source is a path or an iterable of memory dicts. Files may hold JSON Lines, a JSON
+array of memories, or an export object with a `memories` array (what `omo.export_memories`
+returns); all three are parsed incrementally, so the file is never loaded whole.
+
+A chunk is closed at `chunk_size` memories or `max_chunk_bytes` of encoded JSON, whichever
+comes first. After every committed chunk the checkpoint file is rewritten; running the same
+import again skips the chunks it records. Chunks that were sent but not yet recorded when
+the import was interrupted are sent again, which `skip_duplicates` (on by default) makes
+harmless.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import json
+import time
+import asyncio
+from typing import TYPE_CHECKING, Any, Set, Dict, List, Union, TextIO, Callable, Iterable, Iterator, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from ._utils import asyncify
+from ._logging import get_logger
+from ._retries import retry_delay, is_retryable, without_client_retries
+from .types.omo_import_memories_response import OmoImportMemoriesResponse
+
+if TYPE_CHECKING:
+    from .resources.omo import OmoResource, AsyncOmoResource
+
+__all__ = ["OmoImportReport", "ImportCheckpoint", "read_omo"]
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_MAX_CHUNK_BYTES = 4 * 1024 * 1024
+DEFAULT_CONCURRENCY = 4
+
+Memory = Dict[str, object]
+Source = Union[str, "os.PathLike[str]", Iterable[Memory]]
+ProgressCallback = Callable[[int, int], None]
+
+_READ_SIZE = 1024 * 1024
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _JsonStream:
+    """Reads consecutive JSON values from a text file without loading it whole."""
+
+    def __init__(self, f: TextIO, name: str) -> None:
+        self._f = f
+        self._name = name
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        data = self._f.read(_READ_SIZE)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or "" at the end of the file."""
+        while True:
+            match = _WHITESPACE.match(self._buf, self._pos)
+            self._pos = match.end() if match else self._pos
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"{self._name}: expected {char!r}, found {found or 'end of file'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # Usually the value continues past the buffer
+                if self._fill():
+                    continue
+                raise ValueError(f"{self._name}: {e}") from e
+            if end == len(self._buf) and not self._eof and self._fill():
+                continue  # a number (or nothing) may continue in the next read
+            self._pos = end
+            return value
+
+    def array(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == "]":
+                self._pos += 1
+                return
+            self.expect(",")
+
+
+def _iter_file(f: TextIO, name: str) -> Iterator[Any]:
+    stream = _JsonStream(f, name)
+    first = stream.peek()
+    if first == "[":
+        yield from stream.array()
+    elif first == "{":
+        # An export object streams its `memories`; any other object is a memory, possibly the
+        # first of several (JSON Lines)
+        stream.expect("{")
+        fields: Dict[str, Any] = {}
+        exported = False
+        while stream.peek() != "}":
+            key = stream.value()
+            stream.expect(":")
+            if key == "memories" and stream.peek() == "[":
+                exported = True
+                yield from stream.array()
+            else:
+                fields[key] = stream.value()
+            if stream.peek() != ",":
+                break
+            stream.expect(",")
+        stream.expect("}")
+        if not exported:
+            yield fields
+    elif first:
+        raise ValueError(f"{name}: expected a JSON object or array, found {first!r}")
+    while stream.peek():
+        yield stream.value()
+
+
+def read_omo(source: Source) -> Iterator[Memory]:
+    """Lazily yield the memories of an OMO file (JSON Lines, JSON array or export object) or iterable."""
+    if isinstance(source, (str, os.PathLike)):
+        name = os.fspath(source)
+        with open(name, "r", encoding="utf-8") as f:
+            values: Iterable[Any] = _iter_file(f, name)
+            for n, memory in enumerate(values):
+                if not isinstance(memory, dict):
+                    raise ValueError(f"{name}: memory #{n} is not a JSON object")
+                yield memory
+    else:
+        yield from source
+
+
+def _chunks(memories: Iterable[Memory], chunk_size: int, max_chunk_bytes: int) -> Iterator[List[Memory]]:
+    chunk: List[Memory] = []
+    size = 0
+    for memory in memories:
+        encoded = len(json.dumps(memory, separators=(",", ":"), default=str)) + 1
+        if chunk and (len(chunk) >= chunk_size or size + encoded > max_chunk_bytes):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(memory)
+        size += encoded
+    if chunk:
+        yield chunk
+
+
+def _fingerprint(source: Source) -> Optional[Dict[str, Any]]:
+    if not isinstance(source, (str, os.PathLike)):
+        return None
+    stat = os.stat(source)
+    return {"path": os.path.abspath(source), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class ImportCheckpoint:
+    """Progress of one import, rewritten atomically after every committed chunk."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable import checkpoint {self.path}: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self, state: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+
+class OmoImportReport:
+    """Outcome of `omo.import_stream`, including chunks committed by earlier, interrupted runs.
+
+    Attributes:
+        imported / skipped: Memories the server imported, or skipped as duplicates.
+        errors: Per-memory errors reported by the server.
+        chunks: Chunks committed in total.
+        resumed_chunks: Chunks skipped because the checkpoint already recorded them.
+        complete: True once every chunk is committed.
+        elapsed: Seconds this run took.
+    """
+
+    def __init__(self) -> None:
+        self.imported = 0
+        self.skipped = 0
+        self.errors: List[Dict[str, object]] = []
+        self.chunks = 0
+        self.resumed_chunks = 0
+        self.complete = False
+        self.elapsed = 0.0
+
+    @property
+    def done(self) -> int:
+        return self.imported + self.skipped + len(self.errors)
+
+    def __repr__(self) -> str:
+        return (
+            f"OmoImportReport(imported={self.imported}, skipped={self.skipped}, errors={len(self.errors)}, "
+            f"chunks={self.chunks}, complete={self.complete})"
+        )
+
+
+class _Progress:
+    """Committed chunks, the report and the checkpoint that records both."""
+
+    def __init__(
+        self,
+        source: Source,
+        checkpoint: Optional[ImportCheckpoint],
+        layout: Dict[str, Any],
+        on_progress: Optional[ProgressCallback],
+    ) -> None:
+        self.report = OmoImportReport()
+        self.checkpoint = checkpoint
+        self.layout = {"source": _fingerprint(source), **layout}
+        self.committed = 0  # every chunk below this index is committed
+        self.done: Set[int] = set()  # committed chunks at or above `committed`
+        self.read = 0
+        self._on_progress = on_progress
+
+    def resume(self, state: Dict[str, Any]) -> None:
+        if not state:
+            return
+        if {key: state.get(key) for key in self.layout} != self.layout:
+            logger.warning(
+                f"Import checkpoint {self.checkpoint and self.checkpoint.path} belongs to a different source "
+                "or chunk layout; starting over"
+            )
+            return
+        report = self.report
+        report.imported, report.skipped = state["imported"], state["skipped"]
+        report.errors = list(state["errors"])
+        report.complete = state["complete"]
+        self.committed = state["committed"]
+        self.done = set(state["done"])
+        report.chunks = self.committed + len(self.done)
+        logger.info(f"Resuming import: {report.chunks} chunk(s) already committed")
+
+    def is_done(self, index: int) -> bool:
+        if index < self.committed or index in self.done:
+            self.report.resumed_chunks += 1
+            return True
+        return False
+
+    def commit(self, index: int, response: OmoImportMemoriesResponse) -> None:
+        report = self.report
+        report.imported += response.imported
+        report.skipped += response.skipped or 0
+        report.errors.extend(response.errors or [])
+        report.chunks += 1
+        self.done.add(index)
+        while self.committed in self.done:
+            self.done.remove(self.committed)
+            self.committed += 1
+        if self._on_progress is not None:
+            self._on_progress(report.done, self.read)
+
+    def state(self) -> Dict[str, Any]:
+        report = self.report
+        return {
+            **self.layout,
+            "committed": self.committed,
+            "done": sorted(self.done),
+            "imported": report.imported,
+            "skipped": report.skipped,
+            "errors": report.errors,
+            "complete": report.complete,
+        }
+
+    def save(self) -> None:
+        if self.checkpoint is not None:
+            self.checkpoint.save(self.state())
+
+
+def _counted(memories: Iterable[Memory], progress: _Progress) -> Iterator[Memory]:
+    for memory in memories:
+        progress.read += 1
+        yield memory
+
+
+def _send(
+    resource: OmoResource, chunk: List[Memory], skip_duplicates: bool, max_attempts: int
+) -> OmoImportMemoriesResponse:
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return resource.import_memories(memories=chunk, skip_duplicates=skip_duplicates)
+        except Exception as e:
+            if attempt >= max_attempts or not is_retryable(e):
+                raise
+            logger.warning(f"Retrying OMO import chunk of {len(chunk)} memories (attempt {attempt + 1}): {e}")
+            time.sleep(retry_delay(attempt, e))
+
+
+def import_omo(
+    resource: OmoResource,
+    source: Source,
+    *,
+    chunk_size: int,
+    max_chunk_bytes: int,
+    concurrency: int,
+    skip_duplicates: bool,
+    checkpoint: Optional[str],
+    max_attempts: int,
+    on_progress: Optional[ProgressCallback],
+) -> OmoImportReport:
+    started = time.monotonic()
+    resource = without_client_retries(resource)
+    progress = _Progress(
+        source,
+        ImportCheckpoint(checkpoint) if checkpoint else None,
+        {"chunk_size": chunk_size, "max_chunk_bytes": max_chunk_bytes},
+        on_progress,
+    )
+    if progress.checkpoint is not None:
+        progress.resume(progress.checkpoint.load())
+    if progress.report.complete:
+        return progress.report
+
+    concurrency = max(1, concurrency)
+    failure: Optional[BaseException] = None
+    in_flight: Dict[Future[OmoImportMemoriesResponse], int] = {}
+
+    def collect(finished: Iterable[Future[OmoImportMemoriesResponse]]) -> None:
+        nonlocal failure
+        for future in finished:
+            index = in_flight.pop(future)
+            error = future.exception()
+            if error is None:
+                progress.commit(index, future.result())
+                progress.save()
+            elif failure is None:
+                failure = error
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="PaprOmoImport") as pool:
+        try:
+            chunks = _chunks(_counted(read_omo(source), progress), chunk_size, max_chunk_bytes)
+            for index, chunk in enumerate(chunks):
+                if progress.is_done(index):
+                    continue
+                while len(in_flight) >= concurrency:
+                    collect(wait(list(in_flight), return_when=FIRST_COMPLETED).done)
+                if failure is not None:
+                    break
+                in_flight[pool.submit(_send, resource, chunk, skip_duplicates, max_attempts)] = index
+        finally:
+            # Record whatever finishes, even when reading the source failed
+            collect(wait(list(in_flight)).done)
+
+    if failure is not None:
+        raise failure
+    progress.report.complete = True
+    progress.save()
+    progress.report.elapsed = time.monotonic() - started
+    return progress.report
+
+
+async def _async_send(
+    resource: AsyncOmoResource, chunk: List[Memory], skip_duplicates: bool, max_attempts: int
+) -> OmoImportMemoriesResponse:
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return await resource.import_memories(memories=chunk, skip_duplicates=skip_duplicates)
+        except Exception as e:
+            if attempt >= max_attempts or not is_retryable(e):
+                raise
+            logger.warning(f"Retrying OMO import chunk of {len(chunk)} memories (attempt {attempt + 1}): {e}")
+            await asyncio.sleep(retry_delay(attempt, e))
+
+
+async def async_import_omo(
+    resource: AsyncOmoResource,
+    source: Source,
+    *,
+    chunk_size: int,
+    max_chunk_bytes: int,
+    concurrency: int,
+    skip_duplicates: bool,
+    checkpoint: Optional[str],
+    max_attempts: int,
+    on_progress: Optional[ProgressCallback],
+) -> OmoImportReport:
+    started = time.monotonic()
+    resource = without_client_retries(resource)
+    progress = _Progress(
+        source,
+        ImportCheckpoint(checkpoint) if checkpoint else None,
+        {"chunk_size": chunk_size, "max_chunk_bytes": max_chunk_bytes},
+        on_progress,
+    )
+    if progress.checkpoint is not None:
+        progress.resume(await asyncify(progress.checkpoint.load)())
+    if progress.report.complete:
+        return progress.report
+
+    concurrency = max(1, concurrency)
+    failure: Optional[BaseException] = None
+    in_flight: Dict[asyncio.Future[OmoImportMemoriesResponse], int] = {}
+
+    async def collect(finished: Iterable[asyncio.Future[OmoImportMemoriesResponse]]) -> None:
+        nonlocal failure
+        for task in finished:
+            index = in_flight.pop(task)
+            error = task.exception()
+            if error is None:
+                progress.commit(index, task.result())
+                await asyncify(progress.save)()
+            elif failure is None:
+                failure = error
+
+    # Parsing the source blocks, so chunks are read in a worker thread
+    chunks = enumerate(_chunks(_counted(read_omo(source), progress), chunk_size, max_chunk_bytes))
+    try:
+        while True:
+            item = await asyncify(next)(chunks, None)
+            if item is None:
+                break
+            index, chunk = item
+            if progress.is_done(index):
+                continue
+            while len(in_flight) >= concurrency:
+                finished, _ = await asyncio.wait(list(in_flight), return_when=asyncio.FIRST_COMPLETED)
+                await collect(finished)
+            if failure is not None:
+                break
+            in_flight[asyncio.ensure_future(_async_send(resource, chunk, skip_duplicates, max_attempts))] = index
+    finally:
+        if in_flight:
+            finished, _ = await asyncio.wait(list(in_flight))
+            await collect(finished)
+
+    if failure is not None:
+        raise failure
+    progress.report.complete = True
+    await asyncify(progress.save)()
+    progress.report.elapsed = time.monotonic() - started
+    return progress.report
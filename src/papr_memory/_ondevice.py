@@ -0,0 +1,277 @@
+"""
+Warm-up and readiness lifecycle for on-device search.
+
+Local search is only used once the tier0 collection is synced and the embedding
+model is loaded and warmed; until then `memory.search` routes to the server. This
+module tracks that lifecycle process-wide (the collection and model are shared by
+all clients in a process) and exposes it as `client.memory.ondevice`:
+
+    client.memory.ondevice.on_progress(lambda event: print(event))
+    status = client.memory.ondevice.warmup(timeout=120)
+    status.stages  # {"sync": 0.84, "model": 11.2, "warmup": 0.31}
+
+    # e.g. in a readiness probe
+    if not client.memory.ondevice.ready():
+        return 503
+"""
+
+from __future__ import annotations
+
+import time
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Callable, Iterator, Optional
+from contextlib import contextmanager
+
+from ._utils import asyncify
+from ._logging import get_logger
+
+if TYPE_CHECKING:
+    from .resources.memory import MemoryResource
+
+__all__ = ["OnDevice", "AsyncOnDevice", "OnDeviceEvent", "OnDeviceStatus"]
+
+logger = get_logger(__name__)
+
+# Stages in the order they run
+STAGES = ("sync", "model", "warmup")
+
+
+class OnDeviceEvent:
+    """Progress event emitted when a warm-up stage starts, completes or fails."""
+
+    def __init__(self, stage: str, state: str, elapsed: Optional[float] = None, error: Optional[str] = None) -> None:
+        self.stage = stage
+        self.state = state
+        self.elapsed = elapsed
+        self.error = error
+
+    def __repr__(self) -> str:
+        parts = [f"stage={self.stage!r}", f"state={self.state!r}"]
+        if self.elapsed is not None:
+            parts.append(f"elapsed={self.elapsed:.3f}")
+        if self.error is not None:
+            parts.append(f"error={self.error!r}")
+        return f"OnDeviceEvent({', '.join(parts)})"
+
+
+class OnDeviceStatus:
+    """Snapshot of the on-device lifecycle.
+
+    Attributes:
+        state: ``"not_started"``, ``"loading"``, ``"ready"`` or ``"failed"``.
+        stages: Seconds spent in each completed stage (``sync``, ``model``, ``warmup``).
+        current_stage: Stage currently running, if any.
+        embedder: Name of the warmed-up embedder once ready.
+        error: Failure reason when ``state == "failed"``.
+    """
+
+    def __init__(
+        self,
+        state: str,
+        stages: Dict[str, float],
+        current_stage: Optional[str] = None,
+        embedder: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        self.state = state
+        self.stages = stages
+        self.current_stage = current_stage
+        self.embedder = embedder
+        self.error = error
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "stages": dict(self.stages),
+            "current_stage": self.current_stage,
+            "embedder": self.embedder,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return f"OnDeviceStatus(state={self.state!r}, stages={self.stages!r}, embedder={self.embedder!r})"
+
+
+class OnDeviceLifecycle:
+    """Process-wide readiness state shared by every client's on-device pipeline."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._done = threading.Event()
+        self._listeners: List[Callable[[OnDeviceEvent], None]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = "not_started"
+            self._stages: Dict[str, float] = {}
+            self._current_stage: Optional[str] = None
+            self._embedder: Optional[str] = None
+            self._error: Optional[str] = None
+            self._ready.clear()
+            self._done.clear()
+
+    def begin(self) -> None:
+        """Enter the loading state (clears a previous failure so warm-up can be retried)."""
+        with self._lock:
+            if self._state == "ready":
+                return
+            self._state = "loading"
+            self._error = None
+            self._done.clear()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time one stage and emit started/completed/failed events; failures mark the lifecycle failed."""
+        with self._lock:
+            self._state = "loading"
+            self._current_stage = name
+        self._emit(OnDeviceEvent(name, "started"))
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            self._emit(OnDeviceEvent(name, "failed", elapsed, str(e)))
+            self.mark_failed(f"{name}: {e}")
+            raise
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stages[name] = elapsed
+            self._current_stage = None
+        logger.info(f"⏱️ On-device stage '{name}' completed in {elapsed:.2f}s")
+        self._emit(OnDeviceEvent(name, "completed", elapsed))
+
+    def mark_ready(self, embedder: Optional[str] = None) -> None:
+        with self._lock:
+            self._state = "ready"
+            self._current_stage = None
+            self._embedder = embedder
+            self._error = None
+        self._ready.set()
+        self._done.set()
+        self._emit(OnDeviceEvent("ready", "completed", sum(self._stages.values())))
+
+    def mark_failed(self, error: str) -> None:
+        with self._lock:
+            self._state = "failed"
+            self._current_stage = None
+            self._error = error
+        self._ready.clear()
+        self._done.set()
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until ready or failed (or `timeout` seconds); returns whether local search is ready."""
+        self._done.wait(timeout)
+        return self._ready.is_set()
+
+    def status(self) -> OnDeviceStatus:
+        with self._lock:
+            return OnDeviceStatus(
+                state=self._state,
+                stages=dict(self._stages),
+                current_stage=self._current_stage,
+                embedder=self._embedder,
+                error=self._error,
+            )
+
+    def subscribe(self, listener: Callable[[OnDeviceEvent], None]) -> Callable[[], None]:
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def _emit(self, event: OnDeviceEvent) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"On-device progress listener failed: {e}")
+
+
+lifecycle = OnDeviceLifecycle()
+
+
+class OnDevice:
+    """Warm-up and readiness controls for on-device search, available as `client.memory.ondevice`."""
+
+    def __init__(self, memory: MemoryResource) -> None:
+        self._memory = memory
+
+    def warmup(self, *, timeout: Optional[float] = None) -> OnDeviceStatus:
+        """Sync the local tier0 index, load the embedding model and run a warm-up pass.
+
+        Work runs on the shared background loader, so concurrent calls (from any
+        client in the process) wait on the same warm-up instead of repeating it.
+
+        Args:
+            timeout: Maximum seconds to wait; None waits until warm-up finishes.
+                Warm-up keeps running in the background after a timeout.
+
+        Raises:
+            RuntimeError: If on-device processing is disabled or a stage failed.
+            TimeoutError: If warm-up did not finish within `timeout`.
+        """
+        if not lifecycle.is_ready():
+            self._memory._start_ondevice_warmup()
+        if lifecycle.wait(timeout):
+            return lifecycle.status()
+
+        status = lifecycle.status()
+        if status.state == "failed":
+            raise RuntimeError(f"On-device warm-up failed ({status.error})")
+        raise TimeoutError(f"On-device warm-up did not finish within {timeout}s (stage: {status.current_stage})")
+
+    def ready(self, timeout: Optional[float] = 0) -> bool:
+        """Whether local search is warm. Pass a `timeout` (None = forever) to block until it is."""
+        if timeout == 0:
+            return lifecycle.is_ready()
+        return lifecycle.wait(timeout)
+
+    def status(self) -> OnDeviceStatus:
+        """Current lifecycle state and per-stage load timings."""
+        return lifecycle.status()
+
+    def on_progress(self, callback: Callable[[OnDeviceEvent], None]) -> Callable[[], None]:
+        """Call `callback` for every stage event; returns a function that removes the callback.
+
+        Callbacks run on the background loader thread and must not block.
+        """
+        return lifecycle.subscribe(callback)
+
+
+class AsyncOnDevice:
+    """Awaitable readiness for async clients.
+
+    Async clients do not run local search themselves; this waits on the process-wide
+    lifecycle driven by a sync client's `memory.ondevice.warmup()`.
+    """
+
+    def status(self) -> OnDeviceStatus:
+        """Current lifecycle state and per-stage load timings."""
+        return lifecycle.status()
+
+    async def ready(self, timeout: Optional[float] = 0) -> bool:
+        """Whether local search is warm. Pass a `timeout` (None = forever) to wait for it."""
+        if timeout == 0:
+            return lifecycle.is_ready()
+        return await asyncify(lifecycle.wait)(timeout)
+
+    def on_progress(self, callback: Callable[[OnDeviceEvent], None]) -> Callable[[], None]:
+        """Call `callback` for every stage event; returns a function that removes the callback."""
+        return lifecycle.subscribe(callback)
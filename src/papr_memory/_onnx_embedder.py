@@ -0,0 +1,294 @@
+"""
+ONNX Runtime embedding backend for CPU-only (Linux x86) hosts.
+
+The Core ML and MLX fast paths only exist on Apple hardware. On CPU servers the SDK
+would otherwise fall back to a full-precision sentence-transformers model, which is
+too slow per query. This backend runs an int8 / dynamically quantized ONNX export of
+the embedding model through ONNX Runtime with tuned thread counts, and exposes the
+same `embed_query` / `embed_documents` interface as the other local embedders.
+
+Optional Matryoshka-style truncation (`PAPR_EMBEDDING_DIMENSIONS`) keeps only the
+leading dimensions of each vector and re-normalizes them.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, List, Optional, Sequence
+from pathlib import Path
+
+from papr_memory._logging import get_logger
+from papr_memory.lib._embedders import BaseEmbedder
+
+logger = get_logger(__name__)
+
+DEFAULT_TOKENIZER_ID = "Qwen/Qwen3-Embedding-4B"
+DEFAULT_MAX_LENGTH = 512
+DEFAULT_BATCH_SIZE = 16
+
+# Preferred file names inside an ONNX export directory, quantized variants first
+_ONNX_CANDIDATE_FILES = (
+    "model_int8.onnx",
+    "model_quantized.onnx",
+    "model_qint8.onnx",
+    "model.int8.onnx",
+    "model.onnx",
+)
+
+_onnx_embedder_lock = threading.Lock()
+_onnx_embedder: Optional["OnnxEmbeddingFunction"] = None
+
+
+def onnx_enabled() -> bool:
+    """Whether the ONNX Runtime CPU backend was requested via `PAPR_ENABLE_ONNX`."""
+    return os.environ.get("PAPR_ENABLE_ONNX", "false").lower() in ("true", "1", "yes", "on")
+
+
+def get_matryoshka_dimensions() -> Optional[int]:
+    """Target dimension from `PAPR_EMBEDDING_DIMENSIONS`, or None to keep full-size vectors."""
+    raw = os.environ.get("PAPR_EMBEDDING_DIMENSIONS")
+    if not raw:
+        return None
+    try:
+        dims = int(raw)
+    except ValueError:
+        logger.warning(f"Invalid PAPR_EMBEDDING_DIMENSIONS: {raw!r}, keeping full-size embeddings")
+        return None
+    return dims if dims > 0 else None
+
+
+def matryoshka_truncate(vector: Sequence[float], dims: Optional[int]) -> List[float]:
+    """Keep the leading `dims` values of a vector and L2 re-normalize them."""
+    values = [float(x) for x in vector]
+    if dims is None or dims >= len(values):
+        return values
+    values = values[:dims]
+    norm = sum(x * x for x in values) ** 0.5
+    if norm > 0:
+        values = [x / norm for x in values]
+    return values
+
+
+def _default_thread_count() -> int:
+    try:
+        import psutil  # type: ignore
+
+        physical = psutil.cpu_count(logical=False)
+        if physical:
+            return int(physical)
+    except Exception:
+        pass
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(f"Invalid {name}, using {default}")
+        return default
+
+
+def _find_onnx_file(path: Path) -> Path:
+    if path.is_file():
+        return path
+    for name in _ONNX_CANDIDATE_FILES:
+        for candidate in (path / name, path / "onnx" / name):
+            if candidate.exists():
+                return candidate
+    found = sorted(path.rglob("*.onnx"))
+    if found:
+        return found[0]
+    raise FileNotFoundError(f"No .onnx file found under {path}")
+
+
+def _quantize_dynamic_int8(model_path: Path) -> Path:
+    """Dynamically quantize an fp32 export to int8 once and cache it next to the source."""
+    target = model_path.with_name(model_path.stem + ".int8.onnx")
+    if target.exists():
+        return target
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic  # type: ignore
+
+    logger.info(f"Quantizing {model_path.name} to int8 (one-time, cached at {target})")
+    quantize_dynamic(str(model_path), str(target), weight_type=QuantType.QInt8, use_external_data_format=True)
+    return target
+
+
+def _is_quantized(model_path: Path) -> bool:
+    name = model_path.name.lower()
+    return any(tag in name for tag in ("int8", "quant", "qint", "uint8", "q4", "q8"))
+
+
+class OnnxEmbeddingFunction(BaseEmbedder):
+    """`Embedder` backed by an ONNX Runtime CPU session (also usable as a Chroma embedding function)."""
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        session: Any,
+        tokenizer: Any,
+        *,
+        model_path: str,
+        max_length: int = DEFAULT_MAX_LENGTH,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        dimensions: Optional[int] = None,
+        pooling: str = "last",
+    ) -> None:
+        self.session = session
+        self.tokenizer = tokenizer
+        self.model_path = model_path
+        self.model_id = model_path
+        self.max_length = max_length
+        self.batch_size = max(1, batch_size)
+        self.truncate_dimensions = dimensions
+        self.pooling = pooling
+        self.dtype = "int8" if _is_quantized(Path(model_path)) else "float32"
+        self.normalized = True
+        self._input_names = {i.name for i in session.get_inputs()}
+        outputs = session.get_outputs()
+        self._output_names = [o.name for o in outputs]
+        self.dimensions = self._declared_dimensions(outputs)
+
+    def _declared_dimensions(self, outputs: Sequence[Any]) -> int:
+        """Output width from the graph's static shape, after Matryoshka truncation."""
+        native = 0
+        for o in outputs:
+            shape = getattr(o, "shape", None)
+            if shape and isinstance(shape[-1], int):
+                native = shape[-1]
+                break
+        if self.truncate_dimensions is not None and (native == 0 or self.truncate_dimensions < native):
+            return self.truncate_dimensions
+        return native or 2560
+
+    def _run(self, texts: List[str]) -> List[List[float]]:
+        import numpy as np  # type: ignore
+
+        enc = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np",
+        )
+        attention_mask = enc["attention_mask"].astype(np.int64)
+        feed = {"input_ids": enc["input_ids"].astype(np.int64), "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feed["token_type_ids"] = enc.get("token_type_ids", np.zeros_like(attention_mask)).astype(np.int64)
+        if "position_ids" in self._input_names:
+            positions = np.clip(np.cumsum(attention_mask, axis=1) - 1, 0, None)
+            feed["position_ids"] = positions.astype(np.int64)
+        feed = {k: v for k, v in feed.items() if k in self._input_names}
+
+        outputs = self.session.run(None, feed)
+        named = dict(zip(self._output_names, outputs))
+
+        # Exports with a pooling head expose a 2D sentence embedding directly
+        pooled = None
+        for key in ("sentence_embedding", "embeddings", "pooler_output"):
+            if key in named and np.asarray(named[key]).ndim == 2:
+                pooled = np.asarray(named[key], dtype=np.float32)
+                break
+        if pooled is None:
+            hidden = np.asarray(named.get("last_hidden_state", outputs[0]), dtype=np.float32)
+            if hidden.ndim == 2:
+                pooled = hidden
+            elif self.pooling == "mean":
+                mask = attention_mask[..., None].astype(np.float32)
+                pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            else:
+                # Last non-padding token (Qwen3-Embedding pooling); works for left or right padding
+                seq_len = attention_mask.shape[1]
+                last_idx = seq_len - 1 - np.argmax(attention_mask[:, ::-1], axis=1)
+                pooled = hidden[np.arange(hidden.shape[0]), last_idx]
+
+        if self.truncate_dimensions is not None and self.truncate_dimensions < pooled.shape[1]:
+            pooled = pooled[:, : self.truncate_dimensions]
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        pooled = pooled / np.clip(norms, 1e-12, None)
+        return pooled.astype(np.float32).tolist()
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        if isinstance(texts, str):
+            texts = [texts]
+        texts = ["" if t is None else str(t) for t in texts]
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._run(texts[start : start + self.batch_size]))
+        return vectors
+
+    def embed_documents(self, input: List[str]) -> List[List[float]]:
+        return self._encode(input)
+
+
+def load_onnx_embedder() -> Optional[OnnxEmbeddingFunction]:
+    """Load (once per process) the ONNX Runtime embedder configured via environment variables.
+
+    Returns None if onnxruntime/transformers are not installed or no model could be resolved.
+    """
+    global _onnx_embedder
+
+    if _onnx_embedder is not None:
+        return _onnx_embedder
+
+    with _onnx_embedder_lock:
+        if _onnx_embedder is not None:
+            return _onnx_embedder
+
+        try:
+            import onnxruntime as ort  # type: ignore
+            from transformers import AutoTokenizer  # type: ignore
+
+            from papr_memory._model_cache import resolve_onnx_model_path
+
+            model_dir = Path(resolve_onnx_model_path(os.environ.get("PAPR_ONNX_MODEL")))
+            model_path = _find_onnx_file(model_dir)
+            if not _is_quantized(model_path) and os.environ.get("PAPR_ONNX_QUANTIZE", "true").lower() in (
+                "true",
+                "1",
+                "yes",
+                "on",
+            ):
+                try:
+                    model_path = _quantize_dynamic_int8(model_path)
+                except Exception as quant_e:
+                    logger.warning(f"Dynamic int8 quantization failed, using original export: {quant_e}")
+
+            threads = _env_int("PAPR_ONNX_THREADS", _default_thread_count())
+            opts = ort.SessionOptions()
+            opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+            opts.intra_op_num_threads = threads
+            opts.inter_op_num_threads = 1
+            session = ort.InferenceSession(str(model_path), sess_options=opts, providers=["CPUExecutionProvider"])
+
+            tokenizer_dir = model_path.parent
+            if not (tokenizer_dir / "tokenizer.json").exists() and (tokenizer_dir.parent / "tokenizer.json").exists():
+                tokenizer_dir = tokenizer_dir.parent
+            if (tokenizer_dir / "tokenizer.json").exists():
+                tokenizer = AutoTokenizer.from_pretrained(str(tokenizer_dir))
+            else:
+                tokenizer = AutoTokenizer.from_pretrained(os.environ.get("PAPR_EMBEDDING_MODEL", DEFAULT_TOKENIZER_ID))
+
+            pooling = os.environ.get("PAPR_ONNX_POOLING", "last").lower()
+            _onnx_embedder = OnnxEmbeddingFunction(
+                session,
+                tokenizer,
+                model_path=str(model_path),
+                max_length=_env_int("PAPR_ONNX_MAX_LENGTH", DEFAULT_MAX_LENGTH),
+                batch_size=_env_int("PAPR_ONNX_BATCH_SIZE", DEFAULT_BATCH_SIZE),
+                dimensions=get_matryoshka_dimensions(),
+                pooling="mean" if pooling == "mean" else "last",
+            )
+            logger.info(f"Loaded ONNX Runtime embedder from {model_path} ({threads} intra-op threads)")
+        except ImportError as e:
+            logger.warning(f"ONNX Runtime backend unavailable - install with: pip install papr_memory[onnx] ({e})")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to load ONNX Runtime embedder: {e}")
+            return None
+
+    return _onnx_embedder
@@ -0,0 +1,447 @@
+"""
+Deduplicated and, on servers that support it, resumable chunked document uploads.
+
+Every upload is recorded in a small local ledger, keyed by the account (base URL and
+credentials), the file's SHA-256 and the upload parameters. Re-uploading the same file with the
+same parameters from the same account costs one `document.get_status` request instead of the
+upload; if the server no longer knows the document (or it failed or was cancelled), the file is
+uploaded again. By default the file is sent as one streamed `document.upload` request.
+
+With `chunked=True` the file is split into fixed-size chunks, each addressed by its SHA-256,
+and sent over several connections at once. These session endpoints are not part of the
+published API spec, so the chunked protocol is opt-in and only for servers that implement it:
+
+    POST /v1/document/uploads                            open (or resume) a session
+    PUT  /v1/document/uploads/{session_id}/chunks/{n}    send one chunk
+    POST /v1/document/uploads/{session_id}/complete      assemble and start processing
+
+The server answers the open request with the chunks it already holds, so a failed upload
+resumes from the last acknowledged chunk, and with the finished document when it has seen
+the file before, in which case nothing is sent at all. Servers without the session endpoints
+get the single streamed request instead.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import asyncio
+import hashlib
+import pathlib
+import threading
+import contextlib
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Callable, Iterator, Optional, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+from ._files import StreamingFile
+from ._utils import asyncify
+from ._logging import get_logger
+from ._exceptions import NotFoundError, APIStatusError
+from ._base_client import make_request_options
+from ._document_ingest import status_state
+from ._client_identity import client_key_string
+from .types.document_upload_response import DocumentUploadResponse
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from ._client import Papr, AsyncPapr
+    from .resources.document import DocumentResource, AsyncDocumentResource
+
+__all__ = ["DEFAULT_CHUNK_SIZE", "UploadChunk", "UploadPlan", "UploadLedger", "plan_upload"]
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_CONCURRENCY = 4
+
+_UPLOADS_PATH = "/v1/document/uploads"
+
+# Server states in which a recorded upload has to be sent again
+_GONE_STATES = frozenset({"failed", "cancelled", "not_found"})
+
+
+class UploadChunk:
+    """One content-addressed slice of a file."""
+
+    def __init__(self, index: int, offset: int, size: int, sha256: str) -> None:
+        self.index = index
+        self.offset = offset
+        self.size = size
+        self.sha256 = sha256
+
+    def read(self, path: pathlib.Path) -> bytes:
+        with open(path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(self.size)
+        if hashlib.sha256(data).hexdigest() != self.sha256:
+            raise RuntimeError(f"{path} changed while it was being uploaded (chunk {self.index})")
+        return data
+
+    def __repr__(self) -> str:
+        return f"UploadChunk(index={self.index}, offset={self.offset}, size={self.size})"
+
+
+class UploadPlan:
+    """File hash and chunk layout of an upload, computed in a single streaming pass."""
+
+    def __init__(self, path: pathlib.Path, sha256: str, size: int, chunk_size: int, chunks: List[UploadChunk]) -> None:
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.chunk_size = chunk_size
+        self.chunks = chunks
+
+    def session_body(self, params: Mapping[str, Any], session_id: Optional[str]) -> Dict[str, Any]:
+        body: Dict[str, Any] = {
+            "filename": self.path.name,
+            "size": self.size,
+            "sha256": self.sha256,
+            "chunk_size": self.chunk_size,
+            "chunks": [{"index": c.index, "size": c.size, "sha256": c.sha256} for c in self.chunks],
+            **params,
+        }
+        if session_id is not None:
+            body["session_id"] = session_id
+        return body
+
+
+def plan_upload(file: str | os.PathLike[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> UploadPlan:
+    """Hash `file` and split it into `chunk_size` chunks, holding one chunk in memory at a time."""
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    path = pathlib.Path(file)
+    file_hash = hashlib.sha256()
+    chunks: List[UploadChunk] = []
+    offset = 0
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            file_hash.update(data)
+            chunks.append(UploadChunk(len(chunks), offset, len(data), hashlib.sha256(data).hexdigest()))
+            offset += len(data)
+    return UploadPlan(path, file_hash.hexdigest(), offset, chunk_size, chunks)
+
+
+def _default_ledger_path() -> str:
+    return os.environ.get(
+        "PAPR_UPLOAD_LEDGER", os.path.join(os.path.expanduser("~"), ".cache", "papr_memory", "uploads.json")
+    )
+
+
+# One lock per ledger file, shared by every UploadLedger in the process
+_ledger_locks: Dict[str, threading.Lock] = {}
+_ledger_locks_lock = threading.Lock()
+
+
+def _ledger_lock(path: str) -> threading.Lock:
+    with _ledger_locks_lock:
+        lock = _ledger_locks.get(path)
+        if lock is None:
+            lock = _ledger_locks[path] = threading.Lock()
+        return lock
+
+
+class UploadLedger:
+    """Local record of open sessions and finished uploads, keyed by account, file hash and upload parameters.
+
+    Updates are read-modify-write cycles on one JSON file, serialized by a per-file lock in
+    the process and an advisory file lock (where `fcntl` exists) across processes.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = os.path.abspath(path or _default_ledger_path())
+        self._lock = _ledger_lock(self.path)
+
+    @staticmethod
+    def key(client: Papr | AsyncPapr, plan: UploadPlan, params: Mapping[str, Any]) -> str:
+        # The same file uploaded by another account, or to another namespace/user/schema, is a different document
+        scope = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        return f"{client_key_string(client)}|{plan.sha256}:{scope}"
+
+    def forget(self, key: str) -> None:
+        with self._lock, self._file_lock():
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._save(entries)
+
+    def get(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._load().get(key, {}))
+
+    def update(self, key: str, **values: Any) -> None:
+        with self._lock, self._file_lock():
+            entries = self._load()
+            entries[key] = {**entries.get(key, {}), **values}
+            self._save(entries)
+
+    @contextlib.contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            lock_file = open(f"{self.path}.lock", "a")
+        except OSError:
+            # Without a lock file, updates are still serialized within this process
+            yield
+            return
+        with lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            # Losing the ledger only costs a round trip on the next upload
+            logger.warning(f"Could not write upload ledger {self.path}: {e}")
+
+
+def _is_unsupported(error: APIStatusError) -> bool:
+    return isinstance(error, NotFoundError) or error.status_code in (405, 501)
+
+
+def _recorded_upload_id(entry: Mapping[str, Any]) -> Optional[str]:
+    document = entry.get("document")
+    status = document.get("document_status") if isinstance(document, dict) else None
+    upload_id = status.get("upload_id") if isinstance(status, dict) else None
+    return str(upload_id) if upload_id else None
+
+
+class _Progress:
+    def __init__(self, total: int, callback: Optional[Callable[[int, int], None]]) -> None:
+        self.total = total
+        self.sent = 0
+        self._callback = callback
+        self._lock = threading.Lock()
+
+    def advance(self, n: int) -> None:
+        with self._lock:
+            self.sent += n
+            sent = self.sent
+        if self._callback is not None:
+            self._callback(sent, self.total)
+
+
+class ResumableUpload:
+    """Drives one resumable upload for `client.document.upload_resumable`."""
+
+    def __init__(
+        self,
+        resource: DocumentResource,
+        plan: UploadPlan,
+        params: Mapping[str, Any],
+        *,
+        concurrency: int,
+        ledger: Optional[UploadLedger],
+        on_progress: Optional[Callable[[int, int], None]],
+        chunked: bool = False,
+    ) -> None:
+        self._resource = resource
+        self._plan = plan
+        self._params = {k: v for k, v in params.items() if v is not None}
+        self._concurrency = max(1, concurrency)
+        self._ledger = ledger
+        self._key = UploadLedger.key(resource._client, plan, self._params)
+        self._progress = _Progress(plan.size, on_progress)
+        self._on_progress = on_progress
+        self._chunked = chunked
+
+    def run(self) -> DocumentUploadResponse:
+        entry = self._ledger.get(self._key) if self._ledger else {}
+        if entry.get("document"):
+            upload_id = _recorded_upload_id(entry)
+            try:
+                status = self._resource.get_status(upload_id) if upload_id else None
+            except NotFoundError:
+                status = None
+            if self._still_known(status):
+                return self._skip(entry)
+            entry = {}
+        if not self._chunked:
+            return self._single_request()
+
+        try:
+            session = self._open(entry.get("session_id"))
+        except APIStatusError as e:
+            if not _is_unsupported(e):
+                raise
+            logger.info("Server does not support resumable uploads; sending the file in a single request")
+            return self._single_request()
+
+        if session.get("document"):
+            # The server already has this file
+            self._progress.advance(self._plan.size)
+            return self._finish(session["document"])
+
+        session_id = str(session["session_id"])
+        if self._ledger:
+            self._ledger.update(self._key, session_id=session_id)
+        pending = self._pending(session.get("received") or [])
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self._concurrency, len(pending))) as pool:
+                # list() re-raises the first chunk failure; acknowledged chunks are kept for the next attempt
+                list(pool.map(lambda chunk: self._send(session_id, chunk), pending))
+
+        completed = self._resource._post(
+            f"{_UPLOADS_PATH}/{session_id}/complete",
+            body={"sha256": self._plan.sha256},
+            options=make_request_options(),
+            cast_to=object,
+        )
+        return self._finish(completed)
+
+    def _still_known(self, status: Optional[Mapping[str, Any]]) -> bool:
+        """Whether the server still has the recorded upload; forgets the ledger entry if not."""
+        if status is not None and status_state(status) not in _GONE_STATES:
+            return True
+        logger.info(f"Uploading {self._plan.path.name} again: the server no longer has the recorded upload")
+        if self._ledger:
+            self._ledger.forget(self._key)
+        return False
+
+    def _skip(self, entry: Mapping[str, Any]) -> DocumentUploadResponse:
+        logger.info(f"Skipping upload of {self._plan.path.name}: already uploaded ({self._plan.sha256[:12]})")
+        self._progress.advance(self._plan.size)
+        return DocumentUploadResponse.construct(**entry["document"])
+
+    def _single_request(self) -> DocumentUploadResponse:
+        response = self._resource.upload(
+            file=(self._plan.path.name, StreamingFile(self._plan.path, on_progress=self._on_progress)),
+            **self._params,
+        )
+        self._record(response)
+        return response
+
+    def _record(self, response: DocumentUploadResponse) -> None:
+        if self._ledger:
+            self._ledger.update(self._key, session_id=None, document=response.to_dict(mode="json"))
+
+    def _open(self, session_id: Optional[str]) -> Dict[str, Any]:
+        return self._resource._post(  # type: ignore[no-any-return]
+            _UPLOADS_PATH,
+            body=self._plan.session_body(self._params, session_id),
+            options=make_request_options(),
+            cast_to=object,
+        )
+
+    def _pending(self, received: Sequence[int]) -> List[UploadChunk]:
+        done = set(received)
+        pending = [c for c in self._plan.chunks if c.index not in done]
+        already = sum(c.size for c in self._plan.chunks if c.index in done)
+        if already:
+            logger.info(f"Resuming upload of {self._plan.path.name}: {len(done)}/{len(self._plan.chunks)} chunks acknowledged")
+            self._progress.advance(already)
+        return pending
+
+    def _send(self, session_id: str, chunk: UploadChunk) -> None:
+        self._resource._put(
+            f"{_UPLOADS_PATH}/{session_id}/chunks/{chunk.index}",
+            content=chunk.read(self._plan.path),
+            options=make_request_options(
+                extra_headers={"Content-Type": "application/octet-stream", "X-Content-SHA256": chunk.sha256}
+            ),
+            cast_to=object,
+        )
+        self._progress.advance(chunk.size)
+
+    def _finish(self, document: Any) -> DocumentUploadResponse:
+        if self._ledger and isinstance(document, dict):
+            self._ledger.update(self._key, session_id=None, document=document)
+        return DocumentUploadResponse.construct(**document)
+
+
+class AsyncResumableUpload(ResumableUpload):
+    """Async counterpart of `ResumableUpload`; chunks are read in worker threads."""
+
+    _resource: AsyncDocumentResource  # type: ignore[assignment]
+
+    async def run(self) -> DocumentUploadResponse:  # type: ignore[override]
+        entry = await asyncify(self._ledger.get)(self._key) if self._ledger else {}
+        if entry.get("document"):
+            upload_id = _recorded_upload_id(entry)
+            try:
+                status = await self._resource.get_status(upload_id) if upload_id else None
+            except NotFoundError:
+                status = None
+            if await asyncify(self._still_known)(status):
+                return self._skip(entry)
+            entry = {}
+        if not self._chunked:
+            return await self._async_single_request()
+
+        try:
+            session: Dict[str, Any] = await self._resource._post(
+                _UPLOADS_PATH,
+                body=self._plan.session_body(self._params, entry.get("session_id")),
+                options=make_request_options(),
+                cast_to=object,
+            )
+        except APIStatusError as e:
+            if not _is_unsupported(e):
+                raise
+            logger.info("Server does not support resumable uploads; sending the file in a single request")
+            return await self._async_single_request()
+
+        if session.get("document"):
+            self._progress.advance(self._plan.size)
+            return await asyncify(self._finish)(session["document"])
+
+        session_id = str(session["session_id"])
+        if self._ledger:
+            await asyncify(self._ledger.update)(self._key, session_id=session_id)
+        pending = self._pending(session.get("received") or [])
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def send(chunk: UploadChunk) -> None:
+            async with semaphore:
+                content = await asyncify(chunk.read)(self._plan.path)
+                await self._resource._put(
+                    f"{_UPLOADS_PATH}/{session_id}/chunks/{chunk.index}",
+                    content=content,
+                    options=make_request_options(
+                        extra_headers={"Content-Type": "application/octet-stream", "X-Content-SHA256": chunk.sha256}
+                    ),
+                    cast_to=object,
+                )
+                self._progress.advance(chunk.size)
+
+        await asyncio.gather(*(send(chunk) for chunk in pending))
+
+        completed = await self._resource._post(
+            f"{_UPLOADS_PATH}/{session_id}/complete",
+            body={"sha256": self._plan.sha256},
+            options=make_request_options(),
+            cast_to=object,
+        )
+        return await asyncify(self._finish)(completed)
+
+    async def _async_single_request(self) -> DocumentUploadResponse:
+        response = await self._resource.upload(
+            file=(self._plan.path.name, StreamingFile(self._plan.path, on_progress=self._on_progress)),
+            **self._params,
+        )
+        await asyncify(self._record)(response)
+        return response
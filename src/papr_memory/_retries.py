@@ -0,0 +1,82 @@
+"""
+Retries for the SDK's multi-request helpers.
+
+`transform.create_many`, `users.sync`, OMO import and export and the feedback, telemetry
+and message buffers retry failed work themselves, because they can do better than resend
+the same request: resend only the missing items, split an export shard, requeue buffered
+events. So that a request is not retried by both layers (the client's `max_retries` for
+every helper attempt), the helpers send their requests through `without_client_retries`
+and are the only retry layer. They follow the client's own rules:
+
+- `is_retryable(error)`: connection errors and timeouts, and the statuses the client
+  retries (408, 409, 429 and 5xx). An `x-should-retry: true` or `false` response header
+  overrides the status, as it does for the client.
+- `retry_delay(attempt, error)`: the server's `Retry-After` (or `retry-after-ms`) when it
+  is between 0 and 60 seconds, otherwise jittered exponential backoff.
+"""
+
+from __future__ import annotations
+
+import time
+import random
+import email.utils
+from typing import TYPE_CHECKING, Union, TypeVar, Optional
+
+from ._exceptions import APIStatusError, APIConnectionError
+
+if TYPE_CHECKING:
+    from ._resource import SyncAPIResource, AsyncAPIResource
+
+__all__ = ["is_retryable", "retry_after", "retry_delay", "without_client_retries"]
+
+INITIAL_RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 8.0
+# Longest Retry-After that is honoured, as in the client's own retries
+MAX_RETRY_AFTER = 60.0
+
+_ResourceT = TypeVar("_ResourceT", bound="Union[SyncAPIResource, AsyncAPIResource]")
+
+
+def without_client_retries(resource: _ResourceT) -> _ResourceT:
+    """The same resource on a copy of its client with `max_retries=0` (sharing the HTTP connection pool)."""
+    return type(resource)(resource._client.with_options(max_retries=0))  # type: ignore[arg-type]
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, APIConnectionError):
+        return True
+    if not isinstance(error, APIStatusError):
+        return False
+    should_retry = error.response.headers.get("x-should-retry")
+    if should_retry in ("true", "false"):
+        return should_retry == "true"
+    return error.status_code in (408, 409, 429) or error.status_code >= 500
+
+
+def retry_after(error: Optional[Exception]) -> Optional[float]:
+    """Seconds the server asked to wait before retrying, if it asked for a reasonable amount."""
+    if not isinstance(error, APIStatusError):
+        return None
+    headers = error.response.headers
+    seconds: Optional[float] = None
+    try:
+        seconds = float(headers.get("retry-after-ms", "")) / 1000
+    except ValueError:
+        header = headers.get("retry-after")
+        try:
+            seconds = float(header) if header is not None else None
+        except ValueError:
+            parsed = email.utils.parsedate_tz(header)
+            if parsed is not None:
+                seconds = float(email.utils.mktime_tz(parsed) - time.time())
+    if seconds is not None and 0 < seconds <= MAX_RETRY_AFTER:
+        return seconds
+    return None
+
+
+def retry_delay(attempt: int, error: Optional[Exception] = None, *, max_delay: float = MAX_RETRY_DELAY) -> float:
+    """Delay before retry number `attempt` (1-based) after `error`."""
+    server_delay = retry_after(error)
+    if server_delay is not None:
+        return server_delay
+    return min(max_delay, INITIAL_RETRY_DELAY * 2**attempt) * (0.75 + random.random() / 2)
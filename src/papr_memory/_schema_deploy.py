@@ -0,0 +1,362 @@
+"""
+Idempotent deployment of `@schema` classes for `client.schemas.deploy`.
+
+Services usually register their graph schema on every boot with `schemas.list` followed by
+`schemas.create` or `schemas.update`; hundreds of pods starting together turn that into a
+burst of slow, rate-limited calls for a schema that has not changed. `deploy` hashes the
+built schema and keeps a local record of what was deployed, so only the first boot after a
+change talks to the API:
+
+    result = client.schemas.deploy(MySchema)  # or a `build_schema_params` dict
+    print(result.action, result.schema_id)  # "created" / "updated" / "unchanged"
+
+- The hash is a SHA-256 of the canonical JSON of the schema params (sorted keys), so it
+  only changes when the schema does.
+- The record lives in `PAPR_SCHEMA_DEPLOY_STATE` (default
+  `~/.cache/papr_memory/schemas.json`), one entry per API host, credentials and schema name.
+  Point it at a volume shared by the pods to deploy once per change across all of them.
+- Deploys that need the API hold an exclusive lock file next to the record. Others wait for
+  it, then find the new record and return without any API call. The holder touches the lock
+  file every `stale_after / 4` seconds, so a lock that has not been touched for `stale_after`
+  seconds was left behind by a crashed process and is broken. The default `lock_timeout` is
+  longer than `stale_after`, so waiters outlive such a lock.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import uuid
+import socket
+import asyncio
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Union, Mapping, Iterator, Optional
+
+from ._utils import asyncify
+from ._logging import get_logger
+from ._client_identity import client_key_string
+from ._exceptions import NotFoundError
+from .lib._builders import build_schema_params
+from .types.schema_list_response import SchemaListResponse
+
+if TYPE_CHECKING:
+    from ._client import Papr, AsyncPapr
+    from .resources.schemas import SchemasResource, AsyncSchemasResource
+
+__all__ = ["SchemaDeployResult", "schema_hash"]
+
+logger = get_logger(__name__)
+
+DEFAULT_LOCK_TIMEOUT = 120.0
+# Held locks are refreshed every stale_after / 4 seconds, so this only has to cover a stalled holder
+DEFAULT_STALE_AFTER = 30.0
+_POLL_INTERVAL = 0.05
+_MAX_POLL_INTERVAL = 1.0
+
+SchemaSource = Union[type, Mapping[str, Any]]
+
+
+class SchemaDeployResult:
+    """Outcome of `schemas.deploy`.
+
+    Attributes:
+        name: Name of the schema.
+        schema_id: Server id of the deployed schema, if known.
+        hash: Content hash of the deployed schema params.
+        action: "created", "updated" or "unchanged".
+    """
+
+    def __init__(self, name: str, schema_id: Optional[str], hash: str, action: str) -> None:
+        self.name = name
+        self.schema_id = schema_id
+        self.hash = hash
+        self.action = action
+
+    @property
+    def changed(self) -> bool:
+        return self.action != "unchanged"
+
+    def __repr__(self) -> str:
+        return f"SchemaDeployResult(name={self.name!r}, schema_id={self.schema_id!r}, action={self.action!r})"
+
+
+def schema_hash(params: Mapping[str, Any]) -> str:
+    """Content hash of schema params, independent of key order."""
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _params(schema: SchemaSource) -> Dict[str, Any]:
+    if isinstance(schema, type):
+        return build_schema_params(schema)
+    params = dict(schema)
+    if not params.get("name"):
+        raise ValueError("Schema params need a `name`")
+    return params
+
+
+def _default_state_path() -> str:
+    return os.environ.get(
+        "PAPR_SCHEMA_DEPLOY_STATE", os.path.join(os.path.expanduser("~"), ".cache", "papr_memory", "schemas.json")
+    )
+
+
+def _record_key(client: Union[Papr, AsyncPapr], name: str) -> str:
+    return f"{client_key_string(client)}|{name}"
+
+
+class DeployRecord:
+    """Local record of deployed schema hashes; writes are atomic so it can be read without the lock."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = os.path.expanduser(path or _default_state_path())
+
+    def get(self, key: str) -> Dict[str, Any]:
+        entry = self._load().get(key)
+        return dict(entry) if isinstance(entry, dict) else {}
+
+    def put(self, key: str, **values: Any) -> None:
+        # Only called with the lock held, so the read-modify-write is not racing other deploys
+        entries = self._load()
+        entries[key] = values
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            # Losing the record only costs a redeploy on the next boot
+            logger.warning(f"Could not write schema deploy record {self.path}: {e}")
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+class LockFile:
+    """An exclusive lock held by creating `path`, usable across processes and hosts sharing a volume.
+
+    While held, a daemon thread refreshes the file's mtime every `stale_after / 4` seconds, so
+    only the lock of a process that died (or hung) goes `stale_after` seconds without a touch.
+    """
+
+    def __init__(self, path: str, *, stale_after: float = DEFAULT_STALE_AFTER) -> None:
+        self.path = path
+        self.stale_after = stale_after
+        self._token: Optional[str] = None
+        self._released = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def try_acquire(self) -> bool:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            self._break_if_stale()
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(token)
+        self._token = token
+        self._released.clear()
+        self._heartbeat = threading.Thread(target=self._refresh, args=(token,), name="papr-schema-lock", daemon=True)
+        self._heartbeat.start()
+        return True
+
+    def release(self) -> None:
+        if self._token is None:
+            return
+        self._released.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        if self._read(self.path) == self._token:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self._token = None
+
+    def _refresh(self, token: str) -> None:
+        while not self._released.wait(self.stale_after / 4):
+            if self._read(self.path) != token:
+                logger.warning(f"Schema deploy lock {self.path} was taken over while held")
+                return
+            try:
+                os.utime(self.path)
+            except OSError:
+                pass
+
+    def _break_if_stale(self) -> None:
+        try:
+            age = time.time() - os.path.getmtime(self.path)
+        except OSError:
+            return
+        if age <= self.stale_after:
+            return
+        observed = self._read(self.path)
+        # Move the lock aside atomically: of several waiters breaking it, exactly one succeeds
+        # and the others find it gone, rather than removing a lock a winner has just created
+        broken = f"{self.path}.{uuid.uuid4().hex}.stale"
+        try:
+            os.rename(self.path, broken)
+        except OSError:
+            return
+        if self._read(broken) != observed:
+            # The stale lock was broken and re-acquired between our check and the rename: put it back
+            try:
+                os.link(broken, self.path)
+            except OSError:
+                pass
+        else:
+            logger.warning(f"Broke schema deploy lock {self.path} not refreshed for {age:.0f}s")
+        try:
+            os.remove(broken)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _read(path: str) -> Optional[str]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+
+def _poll_intervals() -> Iterator[float]:
+    interval = _POLL_INTERVAL
+    while True:
+        yield interval
+        interval = min(interval * 2, _MAX_POLL_INTERVAL)
+
+
+def _unchanged(name: str, entry: Mapping[str, Any], digest: str) -> Optional[SchemaDeployResult]:
+    if entry.get("hash") == digest:
+        return SchemaDeployResult(name, entry.get("schema_id"), digest, "unchanged")
+    return None
+
+
+def _find_id(response: SchemaListResponse, name: str) -> Optional[str]:
+    for existing in response.data or []:
+        if existing.name == name and existing.id:
+            return str(existing.id)
+    return None
+
+
+def deploy_schema(
+    resource: SchemasResource,
+    schema: SchemaSource,
+    *,
+    state_path: Optional[str],
+    force: bool,
+    lock_timeout: float,
+    stale_after: float,
+) -> SchemaDeployResult:
+    params = _params(schema)
+    name = params["name"]
+    digest = schema_hash(params)
+    record = DeployRecord(state_path)
+    key = _record_key(resource._client, name)
+    if not force:
+        done = _unchanged(name, record.get(key), digest)
+        if done is not None:
+            return done
+
+    lock = LockFile(record.path + ".lock", stale_after=stale_after)
+    deadline = time.monotonic() + lock_timeout
+    for interval in _poll_intervals():
+        if lock.try_acquire():
+            break
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Timed out after {lock_timeout}s waiting for schema deploy lock {lock.path}")
+        time.sleep(interval)
+    try:
+        entry = record.get(key)
+        # Another process may have deployed this exact schema while we waited
+        if not force:
+            done = _unchanged(name, entry, digest)
+            if done is not None:
+                return done
+        schema_id: Optional[str] = entry.get("schema_id")
+        action = "updated"
+        if schema_id is not None:
+            try:
+                resource.update(schema_id, body=params)
+            except NotFoundError:
+                schema_id = None
+        if schema_id is None:
+            schema_id = _find_id(resource.list(), name)
+            if schema_id is not None:
+                resource.update(schema_id, body=params)
+            else:
+                created = resource.create(**params)
+                schema_id = created.data.id if created.data is not None else None
+                action = "created"
+        record.put(key, hash=digest, schema_id=schema_id, deployed_at=time.time())
+        logger.info(f"Schema {name!r} {action} ({schema_id})")
+        return SchemaDeployResult(name, schema_id, digest, action)
+    finally:
+        lock.release()
+
+
+async def async_deploy_schema(
+    resource: AsyncSchemasResource,
+    schema: SchemaSource,
+    *,
+    state_path: Optional[str],
+    force: bool,
+    lock_timeout: float,
+    stale_after: float,
+) -> SchemaDeployResult:
+    params = _params(schema)
+    name = params["name"]
+    digest = schema_hash(params)
+    record = DeployRecord(state_path)
+    key = _record_key(resource._client, name)
+    if not force:
+        done = _unchanged(name, await asyncify(record.get)(key), digest)
+        if done is not None:
+            return done
+
+    lock = LockFile(record.path + ".lock", stale_after=stale_after)
+    deadline = time.monotonic() + lock_timeout
+    for interval in _poll_intervals():
+        if await asyncify(lock.try_acquire)():
+            break
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Timed out after {lock_timeout}s waiting for schema deploy lock {lock.path}")
+        await asyncio.sleep(interval)
+    try:
+        entry = await asyncify(record.get)(key)
+        if not force:
+            done = _unchanged(name, entry, digest)
+            if done is not None:
+                return done
+        schema_id: Optional[str] = entry.get("schema_id")
+        action = "updated"
+        if schema_id is not None:
+            try:
+                await resource.update(schema_id, body=params)
+            except NotFoundError:
+                schema_id = None
+        if schema_id is None:
+            schema_id = _find_id(await resource.list(), name)
+            if schema_id is not None:
+                await resource.update(schema_id, body=params)
+            else:
+                created = await resource.create(**params)
+                schema_id = created.data.id if created.data is not None else None
+                action = "created"
+        await asyncify(record.put)(key, hash=digest, schema_id=schema_id, deployed_at=time.time())
+        logger.info(f"Schema {name!r} {action} ({schema_id})")
+        return SchemaDeployResult(name, schema_id, digest, action)
+    finally:
+        await asyncify(lock.release)()
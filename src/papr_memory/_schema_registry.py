@@ -0,0 +1,286 @@
+"""
+Process-wide registry of holographic domains and frequency schemas.
+
+`holographic.domains.list`, `frequencies.list` and `frequencies.retrieve` return data that
+changes only when someone registers a custom domain, yet callers consult it before every
+`transform` / `rerank` / search with `holographic_config`. The registry loads both lists
+once per API host and credentials, answers lookups from memory, and refreshes in the
+background once the data is older than the TTL; lookups keep using the previous data
+until the refresh lands, so they never wait on the network after the first load.
+
+    schema = client.frequencies.lookup("cosqa")  # alias, schema id or domain
+    schema.frequencies[0].name
+
+The TTL defaults to one hour (``PAPR_SCHEMA_CACHE_TTL``, in seconds). Creating a custom
+domain with `holographic.domains.create_validated` marks the registry stale so the new
+schema is picked up by the next refresh.
+
+`validate_fields` checks custom-domain `Field.frequency` values against the 14 standard
+frequency bands; `create_validated` calls it before the request is sent.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Any, Set, Dict, List, Union, Mapping, Iterable, Optional
+
+from ._compat import model_dump, model_parse
+from ._logging import get_logger
+from ._client_identity import ClientKey, client_key
+from ._exceptions import APIError, NotFoundError
+from .types.frequency_list_response import FrequencyListResponse
+from .types.frequency_retrieve_response import FrequencyRetrieveResponse
+from .types.holographic.domain_list_response import Domain, DomainListResponse
+
+if TYPE_CHECKING:
+    from ._client import Papr, AsyncPapr
+
+__all__ = ["STANDARD_FREQUENCIES", "SchemaRegistry", "validate_fields", "schema_registry", "async_schema_registry"]
+
+logger = get_logger(__name__)
+
+# Hz values a custom-domain field may use, one field per band
+STANDARD_FREQUENCIES = (0.1, 0.5, 2.0, 4.0, 6.0, 10.0, 12.0, 18.0, 19.0, 24.0, 30.0, 40.0, 50.0, 70.0)
+
+MAX_FIELDS = len(STANDARD_FREQUENCIES)
+
+DEFAULT_TTL = 3600.0
+
+# After a failed refresh, serve the old data and try again after this many seconds
+RETRY_INTERVAL = 30.0
+
+
+def validate_fields(fields: Iterable[Mapping[str, Any]]) -> None:
+    """Raise `ValueError` for field definitions the server would reject because of their frequencies."""
+    fields = list(fields)
+    if not 1 <= len(fields) <= MAX_FIELDS:
+        raise ValueError(f"A custom domain needs between 1 and {MAX_FIELDS} fields, got {len(fields)}")
+    used: Dict[float, str] = {}
+    for field in fields:
+        name = field.get("name", "?")
+        try:
+            frequency = float(field["frequency"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Field {name!r} needs a numeric `frequency`, got {field.get('frequency')!r}") from None
+        if frequency not in STANDARD_FREQUENCIES:
+            allowed = ", ".join(f"{f:g}" for f in STANDARD_FREQUENCIES)
+            raise ValueError(f"Field {name!r} uses frequency {frequency:g} Hz; it must be one of {allowed}")
+        if frequency in used:
+            raise ValueError(f"Fields {used[frequency]!r} and {name!r} both use frequency {frequency:g} Hz")
+        used[frequency] = name
+
+
+class SchemaRegistry:
+    """In-memory view of the domains and frequency schemas visible to one set of credentials."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL) -> None:
+        self.ttl = ttl
+        self.loaded_at: Optional[float] = None
+        self._next_refresh = 0.0
+        self._refreshing = False
+        self._schemas: Dict[str, FrequencyRetrieveResponse] = {}
+        self._missing: Set[str] = set()
+        self._aliases: Dict[str, str] = {}
+        self._domains: List[Domain] = []
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def needs_refresh(self, now: Optional[float] = None) -> bool:
+        with self._lock:
+            return not self._refreshing and (now or time.monotonic()) >= self._next_refresh
+
+    def invalidate(self) -> None:
+        """Refresh on the next lookup (data stays available until then)."""
+        with self._lock:
+            self._next_refresh = 0.0
+            self._missing.clear()
+
+    # -- lookups --
+
+    def domains(self) -> List[Domain]:
+        with self._lock:
+            return list(self._domains)
+
+    def schema_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._schemas)
+
+    def resolve(self, name: str) -> str:
+        """The schema id for a schema id, shorthand alias or domain name (unknown names are returned as-is)."""
+        with self._lock:
+            return self._aliases.get(name, name)
+
+    def get(self, name: str) -> Optional[FrequencyRetrieveResponse]:
+        with self._lock:
+            return self._schemas.get(self._aliases.get(name, name))
+
+    def is_known_missing(self, name: str) -> bool:
+        with self._lock:
+            return self._aliases.get(name, name) in self._missing
+
+    # -- loading --
+
+    def _start_refresh(self) -> None:
+        with self._lock:
+            self._refreshing = True
+
+    def install(self, frequencies: FrequencyListResponse, domains: Optional[DomainListResponse]) -> None:
+        schemas = {s.schema_id: model_parse(FrequencyRetrieveResponse, model_dump(s)) for s in frequencies.schemas}
+        aliases: Dict[str, str] = {}
+        for schema in schemas.values():
+            aliases.setdefault(schema.domain, schema.schema_id)
+        if domains is not None:
+            for domain in domains.domains:
+                aliases.setdefault(domain.domain, domain.schema_id)
+            aliases.update(domains.shortcuts or {})
+        aliases.update(frequencies.shortcuts or {})
+        now = time.monotonic()
+        with self._lock:
+            # Schemas fetched one by one (custom domains) stay until the server stops listing their domain
+            listed = {domain.schema_id for domain in domains.domains} if domains is not None else None
+            for schema_id, schema in self._schemas.items():
+                if schema_id not in schemas and (listed is None or schema_id in listed):
+                    schemas[schema_id] = schema
+            self._schemas = schemas
+            self._aliases = aliases
+            self._domains = list(domains.domains) if domains is not None else self._domains
+            self._missing.clear()
+            self.loaded_at = now
+            self._next_refresh = now + self.ttl
+            self._refreshing = False
+
+    def add(self, name: str, schema: Optional[FrequencyRetrieveResponse]) -> None:
+        """Remember one schema fetched with `frequencies.retrieve` (None if the server doesn't know it)."""
+        with self._lock:
+            if schema is None:
+                self._missing.add(self._aliases.get(name, name))
+                return
+            self._schemas[schema.schema_id] = schema
+            if name != schema.schema_id:
+                self._aliases[name] = schema.schema_id
+
+    def _refresh_failed(self, error: Exception) -> None:
+        logger.warning(f"Could not refresh frequency schemas: {error}")
+        with self._lock:
+            self._next_refresh = time.monotonic() + min(self.ttl, RETRY_INTERVAL)
+            self._refreshing = False
+
+    # -- sync client --
+
+    def load(self, client: Papr) -> None:
+        self._start_refresh()
+        try:
+            frequencies = client.frequencies.list()
+            domains: Optional[DomainListResponse]
+            try:
+                domains = client.holographic.domains.list()
+            except APIError as e:
+                logger.debug(f"Could not list holographic domains: {e}")
+                domains = None
+        except Exception as e:
+            self._refresh_failed(e)
+            if not self.loaded:
+                raise
+            return
+        self.install(frequencies, domains)
+
+    def lookup(self, client: Papr, name: str) -> Optional[FrequencyRetrieveResponse]:
+        schema = self.get(name)
+        if schema is not None or self.is_known_missing(name):
+            return schema
+        try:
+            schema = client.frequencies.retrieve(self.resolve(name))
+        except NotFoundError:
+            schema = None
+        self.add(name, schema)
+        return schema
+
+    def ensure(self, client: Papr) -> SchemaRegistry:
+        if not self.loaded:
+            with self._load_lock:
+                if not self.loaded:
+                    self.load(client)
+        elif self.needs_refresh():
+            self._start_refresh()
+            threading.Thread(target=self.load, args=(client,), name="PaprSchemaRefresh", daemon=True).start()
+        return self
+
+    # -- async client --
+
+    async def async_load(self, client: AsyncPapr) -> None:
+        self._start_refresh()
+        try:
+            frequencies, domains = await asyncio.gather(
+                client.frequencies.list(), client.holographic.domains.list(), return_exceptions=True
+            )
+            if isinstance(frequencies, BaseException):
+                raise frequencies
+            if isinstance(domains, BaseException):
+                logger.debug(f"Could not list holographic domains: {domains}")
+                domains = None
+        except Exception as e:
+            self._refresh_failed(e)
+            if not self.loaded:
+                raise
+            return
+        self.install(frequencies, domains)
+
+    async def async_lookup(self, client: AsyncPapr, name: str) -> Optional[FrequencyRetrieveResponse]:
+        schema = self.get(name)
+        if schema is not None or self.is_known_missing(name):
+            return schema
+        try:
+            schema = await client.frequencies.retrieve(self.resolve(name))
+        except NotFoundError:
+            schema = None
+        self.add(name, schema)
+        return schema
+
+    async def async_ensure(self, client: AsyncPapr) -> SchemaRegistry:
+        if not self.loaded:
+            await self.async_load(client)
+        elif self.needs_refresh():
+            self._start_refresh()
+            task = asyncio.get_running_loop().create_task(self.async_load(client))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+        return self
+
+
+_registries: Dict[ClientKey, SchemaRegistry] = {}
+_registries_lock = threading.Lock()
+# Keeps background refresh tasks referenced until they finish
+_background_tasks: Set[asyncio.Task[None]] = set()
+
+
+def _ttl_from_env() -> float:
+    try:
+        return float(os.environ.get("PAPR_SCHEMA_CACHE_TTL", DEFAULT_TTL))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def registry_for(client: Union[Papr, AsyncPapr]) -> SchemaRegistry:
+    """The registry shared by every client talking to the same host with the same credentials."""
+    key = client_key(client)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = SchemaRegistry(ttl=_ttl_from_env())
+        return registry
+
+
+def schema_registry(client: Papr) -> SchemaRegistry:
+    """The loaded registry for `client`, scheduling a background refresh if it is stale."""
+    return registry_for(client).ensure(client)
+
+
+async def async_schema_registry(client: AsyncPapr) -> SchemaRegistry:
+    return await registry_for(client).async_ensure(client)
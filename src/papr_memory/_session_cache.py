@@ -0,0 +1,301 @@
+"""
+Local cache of conversation context for `sessions.compress_cached` and
+`sessions.retrieve_history_cached`.
+
+Agents typically fetch `sessions.compress(session_id)` (and often the recent history) before
+every LLM call, although the server only regenerates summaries every 15 messages. This cache
+keeps both per session, shared by every client with the same host and credentials:
+
+    context = client.messages.sessions.compress_cached(session_id)  # API call on first use
+    history = client.messages.sessions.retrieve_history_cached(session_id, limit=20)
+    client.messages.store_cached(session_id=session_id, role="user", content=question)
+    history = client.messages.sessions.retrieve_history_cached(session_id, limit=20)  # fetches 1 message
+
+- Compressed context is reused until the session's message count crosses the next multiple
+  of 15 (the summary watermark). Messages stored with `messages.store_cached` or
+  `messages.buffered` advance the count, and history fetches correct it with the server's
+  `total_count`. The generated `messages.store` does not know about the cache; its writes
+  are picked up when the entry is revalidated.
+- History is extended incrementally: after new messages, only the newest page is fetched and
+  merged on top of the cached messages; asking for more than is cached fetches just the
+  older remainder.
+- Entries older than `PAPR_SESSION_CACHE_TTL` seconds (default 300) are revalidated, which
+  picks up messages written by other processes.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import asyncio
+import weakref
+import threading
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union, Optional, Generator
+from collections import OrderedDict
+
+from ._compat import model_copy
+from ._logging import get_logger
+from ._client_identity import ClientKey, client_key
+from .types.messages.session_compress_response import SessionCompressResponse
+from .types.messages.session_retrieve_history_response import Message, SessionRetrieveHistoryResponse
+
+if TYPE_CHECKING:
+    from ._client import Papr, AsyncPapr
+    from .resources.messages.sessions import SessionsResource, AsyncSessionsResource
+
+__all__ = ["SessionCache", "session_cache_for"]
+
+logger = get_logger(__name__)
+
+SUMMARY_INTERVAL = 15
+DEFAULT_TTL = 300.0
+DEFAULT_HISTORY_LIMIT = 20
+MAX_SESSIONS = 1000
+MAX_MESSAGES = 500
+# Smallest page used to catch up, so writes from elsewhere are usually covered in one request
+CATCH_UP_PAGE = 10
+
+# (limit, skip) of a retrieve_history request
+HistoryRequest = Tuple[int, int]
+HistorySteps = Generator[HistoryRequest, SessionRetrieveHistoryResponse, SessionRetrieveHistoryResponse]
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.count: Optional[int] = None  # best known number of messages in the session
+        self.compressed: Optional[SessionCompressResponse] = None
+        self.compressed_at = 0.0
+        self.compressed_mark: Optional[int] = None  # summary watermark the compressed context belongs to
+        self.history: Optional[SessionRetrieveHistoryResponse] = None  # last response, for summaries/context
+        self.messages: List[Message] = []  # newest first, a contiguous run from the newest message
+        self.total = 0  # server total when `messages` was last synced
+        self.unseen = 0  # messages stored through this SDK since then
+        self.fetched_at = 0.0
+        self.lock = threading.Lock()
+        self.async_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+            weakref.WeakKeyDictionary()
+        )
+
+
+def _mark(count: Optional[int]) -> Optional[int]:
+    return None if count is None else count // SUMMARY_INTERVAL
+
+
+class SessionCache:
+    """Per-session compressed context and message history, kept for `ttl` seconds."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_sessions: int = MAX_SESSIONS) -> None:
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters for debugging / metrics
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, session_id: str) -> _Session:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = self._sessions[session_id] = _Session()
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            return entry
+
+    def invalidate(self, session_id: Optional[str] = None) -> None:
+        """Forget one session, or every session."""
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(session_id, None)
+
+    def note_stored(self, session_id: str) -> None:
+        """Account for a message stored through this SDK."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return
+            entry.unseen += 1
+            if entry.count is not None:
+                entry.count += 1
+            self._check_watermark(entry)
+
+    def _set_count(self, entry: _Session, count: int) -> None:
+        with self._lock:
+            entry.count = count
+            self._check_watermark(entry)
+
+    def _check_watermark(self, entry: _Session) -> None:
+        if entry.compressed is not None and (entry.count is None or _mark(entry.count) != entry.compressed_mark):
+            entry.compressed = None
+
+    # compress
+
+    def compressed(self, session_id: str) -> Optional[SessionCompressResponse]:
+        """The cached compressed context, if it is still current."""
+        entry = self._entry(session_id)
+        if entry.compressed is None or time.monotonic() - entry.compressed_at > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.compressed
+
+    def record_compress(self, session_id: str, response: SessionCompressResponse) -> None:
+        entry = self._entry(session_id)
+        if response.message_count is not None:
+            self._set_count(entry, response.message_count)
+        with self._lock:
+            entry.compressed = response
+            entry.compressed_at = time.monotonic()
+            entry.compressed_mark = _mark(entry.count)
+
+    # history
+
+    def history_steps(self, session_id: str, limit: int) -> HistorySteps:
+        """Yields the `retrieve_history` requests needed to answer from the cache, then returns the answer.
+
+        Drive it with the session's lock held; see `cached_history`.
+        """
+        entry = self._entry(session_id)
+        fresh = entry.history is not None and time.monotonic() - entry.fetched_at <= self.ttl
+        wanted = min(limit, entry.total) if entry.history is not None else limit
+        if fresh and not entry.unseen and len(entry.messages) >= wanted:
+            self.hits += 1
+            return self._view(entry, limit)
+        self.misses += 1
+
+        seen = entry.unseen
+        if entry.history is None:
+            self._replace(entry, (yield (limit, 0)), seen)
+        elif not fresh or entry.unseen:
+            page = yield (max(entry.unseen, CATCH_UP_PAGE), 0)
+            if not self._merge(entry, page, seen):
+                logger.debug("Cached history for session %s is out of date; refetching", session_id)
+                if len(page.messages) < min(limit, page.total_count):
+                    page = yield (limit, 0)
+                self._replace(entry, page, seen)
+
+        wanted = min(limit, entry.total)
+        if len(entry.messages) < wanted:
+            older = yield (wanted - len(entry.messages), len(entry.messages))
+            if older.total_count == entry.total:
+                entry.messages.extend(older.messages)
+            else:  # messages arrived in between, so `skip` no longer points past the cached run
+                self._replace(entry, (yield (limit, 0)), 0)
+        del entry.messages[MAX_MESSAGES:]
+        return self._view(entry, limit)
+
+    def _replace(self, entry: _Session, page: SessionRetrieveHistoryResponse, seen: int) -> None:
+        entry.messages = list(page.messages)
+        self._synced(entry, page, seen)
+
+    def _merge(self, entry: _Session, page: SessionRetrieveHistoryResponse, seen: int) -> bool:
+        """Put the messages added since the last sync on top; False if the page doesn't line up with the cache."""
+        added = page.total_count - entry.total
+        if added < 0 or added > len(page.messages):
+            return False
+        if entry.messages and added < len(page.messages):
+            if page.messages[added].object_id != entry.messages[0].object_id:
+                return False
+        entry.messages[:0] = page.messages[:added]
+        self._synced(entry, page, seen)
+        return True
+
+    def _synced(self, entry: _Session, page: SessionRetrieveHistoryResponse, seen: int) -> None:
+        entry.history = page
+        entry.total = page.total_count
+        entry.fetched_at = time.monotonic()
+        with self._lock:
+            # Stores that finished while the request was in flight may not be in the page
+            entry.unseen = max(0, entry.unseen - seen)
+        self._set_count(entry, page.total_count + entry.unseen)
+
+    def _view(self, entry: _Session, limit: int) -> SessionRetrieveHistoryResponse:
+        assert entry.history is not None
+        view = model_copy(entry.history)
+        view.messages = entry.messages[:limit]
+        view.total_count = entry.total
+        return view
+
+
+_caches: Dict[ClientKey, SessionCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _ttl_from_env() -> float:
+    try:
+        return float(os.environ.get("PAPR_SESSION_CACHE_TTL", DEFAULT_TTL))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def session_cache_for(client: Union[Papr, AsyncPapr]) -> SessionCache:
+    """The cache shared by every client talking to the same host with the same credentials."""
+    key = client_key(client)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = SessionCache(ttl=_ttl_from_env())
+        return cache
+
+
+def note_stored(client: Union[Papr, AsyncPapr], session_id: str) -> None:
+    """Called after a message was stored; a no-op until the cache has been used."""
+    if not _caches:
+        return
+    cache = _caches.get(client_key(client))
+    if cache is not None:
+        cache.note_stored(session_id)
+
+
+def cached_compress(resource: SessionsResource, session_id: str) -> SessionCompressResponse:
+    cache = session_cache_for(resource._client)
+    response = cache.compressed(session_id)
+    if response is None:
+        response = resource.compress(session_id)
+        cache.record_compress(session_id, response)
+    return response
+
+
+async def async_cached_compress(resource: AsyncSessionsResource, session_id: str) -> SessionCompressResponse:
+    cache = session_cache_for(resource._client)
+    response = cache.compressed(session_id)
+    if response is None:
+        response = await resource.compress(session_id)
+        cache.record_compress(session_id, response)
+    return response
+
+
+def cached_history(resource: SessionsResource, session_id: str, limit: int) -> SessionRetrieveHistoryResponse:
+    cache = session_cache_for(resource._client)
+    with cache._entry(session_id).lock:
+        steps = cache.history_steps(session_id, limit)
+        try:
+            limit_, skip = next(steps)
+            while True:
+                limit_, skip = steps.send(resource.retrieve_history(session_id, limit=limit_, skip=skip))
+        except StopIteration as done:
+            return done.value  # type: ignore[no-any-return]
+
+
+async def async_cached_history(
+    resource: AsyncSessionsResource, session_id: str, limit: int
+) -> SessionRetrieveHistoryResponse:
+    cache = session_cache_for(resource._client)
+    locks = cache._entry(session_id).async_locks
+    loop = asyncio.get_running_loop()
+    lock = locks.get(loop)
+    if lock is None:
+        lock = locks[loop] = asyncio.Lock()
+    async with lock:
+        steps = cache.history_steps(session_id, limit)
+        try:
+            limit_, skip = next(steps)
+            while True:
+                limit_, skip = steps.send(await resource.retrieve_history(session_id, limit=limit_, skip=skip))
+        except StopIteration as done:
+            return done.value  # type: ignore[no-any-return]
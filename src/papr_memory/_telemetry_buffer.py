@@ -0,0 +1,416 @@
+"""
+Fire-and-forget telemetry for `client.telemetry.buffered`.
+
+`telemetry.track_event` is one blocking POST per call, which is too expensive to emit from
+hot paths. A telemetry buffer records events in a bounded in-memory ring buffer and a
+background flusher sends them to `telemetry.track_event` in batches:
+
+    telemetry = client.telemetry.buffered(sample_rate=0.1, anonymous_id=session_id)
+    telemetry.track("search_performed", {"mode": "fast"})  # never blocks on the network
+    ...
+    print(telemetry.sent, telemetry.dropped, telemetry.sampled_out)
+    telemetry.close()
+
+`track` never waits: events are sampled with `sample_rate` (overridable per call), and
+when `capacity` events are already buffered the oldest one is discarded and counted in
+`dropped`. A batch is sent once `batch_size` events are buffered or `flush_interval`
+seconds after the first one arrived. While the endpoint is unreachable (connection
+errors, 429s, 5xx) unsent events go back into the buffer and flushes back off
+exponentially, or for as long as the server's `Retry-After` asks, so an outage costs at
+most `capacity` events of memory. Buffers still
+open at interpreter exit get one last flush from an `atexit` hook.
+"""
+
+from __future__ import annotations
+
+import time
+import random
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Deque, Optional
+from collections import deque
+
+from ._logging import get_logger
+from ._retries import retry_after, is_retryable, without_client_retries
+from ._background_buffer import BackgroundBuffer, SyncBackgroundBuffer, AsyncBackgroundBuffer
+from .types.telemetry_track_event_params import Event
+from .types.telemetry_track_event_response import TelemetryTrackEventResponse
+
+if TYPE_CHECKING:
+    from .resources.telemetry import TelemetryResource, AsyncTelemetryResource
+
+__all__ = ["TelemetryBuffer", "AsyncTelemetryBuffer"]
+
+logger = get_logger(__name__)
+
+DEFAULT_CAPACITY = 10_000
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 5.0
+DEFAULT_CLOSE_TIMEOUT = 5.0
+MAX_RETRY_DELAY = 60.0
+
+
+class _TelemetryState(BackgroundBuffer):
+    """Ring buffer and flush scheduling shared by the sync and async buffers."""
+
+    _counters = ("sent", "dropped", "failed", "sampled_out")
+    _backlog_name = "buffered"
+    _item_name = "telemetry event"
+    sent: int
+    dropped: int
+    failed: int
+    sampled_out: int
+
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        batch_size: int,
+        flush_interval: float,
+        sample_rate: float,
+        anonymous_id: Optional[str],
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        if capacity < batch_size:
+            raise ValueError(f"capacity ({capacity}) must be at least batch_size ({batch_size})")
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be between 0 and 1, got {sample_rate}")
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self.anonymous_id = anonymous_id
+
+        self._events: Deque[Event] = deque(maxlen=capacity)
+        self._in_flight = 0
+        self._due = 0.0
+        self._failures = 0  # consecutive flushes that could not reach the endpoint
+        self._retry_after: Optional[float] = None  # Retry-After of the last failed flush
+        self._flush_requested = False
+        self._closed = False
+        super().__init__()
+
+    @property
+    def buffered(self) -> int:
+        """Events waiting to be sent, including the batch currently in flight."""
+        return len(self._events) + self._in_flight
+
+    def _unsent(self) -> int:
+        return self.buffered
+
+    def _event(
+        self,
+        event_name: str,
+        properties: Optional[Dict[str, object]],
+        user_id: Optional[str],
+        timestamp: Optional[int],
+        sample_rate: Optional[float],
+    ) -> Optional[Event]:
+        rate = self.sample_rate if sample_rate is None else sample_rate
+        if rate < 1.0 and random.random() >= rate:
+            self.sampled_out += 1
+            return None
+        event: Event = {
+            "event_name": event_name,
+            "timestamp": timestamp if timestamp is not None else int(time.time() * 1000),
+        }
+        if properties is not None:
+            event["properties"] = properties
+        if user_id is not None:
+            event["user_id"] = user_id
+        return event
+
+    def _push(self, event: Event) -> bool:
+        """Buffer an event, evicting the oldest when full; returns whether a flush is due now."""
+        if not self._events and not self._in_flight and not self._failures:
+            self._due = time.monotonic() + self.flush_interval
+        if len(self._events) == self.capacity:
+            self.dropped += 1
+        self._events.append(event)
+        return self._ready()
+
+    def _ready(self) -> bool:
+        if self._closed:
+            return True
+        return not self._failures and (self._flush_requested or len(self._events) >= self.batch_size)
+
+    def _time_left(self) -> float:
+        return max(0.0, self._due - time.monotonic())
+
+    def _take_batch(self) -> List[Event]:
+        batch = [self._events.popleft() for _ in range(min(len(self._events), self.batch_size))]
+        self._in_flight = len(batch)
+        return batch
+
+    def _record(self, batch: List[Event], response: TelemetryTrackEventResponse) -> None:
+        processed = min(response.events_processed, len(batch))
+        self.sent += processed
+        self.failed += len(batch) - processed
+
+    def _reject(self, batch: List[Event], error: Exception) -> None:
+        self.failed += len(batch)
+        logger.warning(f"Telemetry endpoint rejected {len(batch)} event(s): {error}")
+
+    def _finish(self, batch: List[Event], delivered: bool) -> None:
+        """Reschedule after a flush attempt; undelivered events go back to the front of the buffer."""
+        self._in_flight = 0
+        now = time.monotonic()
+        if delivered:
+            self._failures = 0
+            self._due = now + self.flush_interval
+            if not self._events:
+                self._flush_requested = False
+            return
+
+        self._failures += 1
+        if self._closed:
+            lost = len(batch) + len(self._events)
+            self._events.clear()
+            self.dropped += lost
+            logger.warning(f"Telemetry endpoint unreachable at shutdown; dropped {lost} event(s)")
+            return
+        room = self.capacity - len(self._events)
+        keep = batch[max(0, len(batch) - room) :]
+        self.dropped += len(batch) - len(keep)
+        self._events.extendleft(reversed(keep))
+        delay = self._retry_after or min(MAX_RETRY_DELAY, self.flush_interval * 2**self._failures)
+        self._due = now + delay
+        log = logger.warning if self._failures == 1 else logger.debug
+        log(f"Telemetry endpoint unreachable; retrying {len(self._events)} event(s) in {self._due - now:.1f}s")
+
+
+class TelemetryBuffer(_TelemetryState, SyncBackgroundBuffer):
+    """Buffers telemetry events and sends them with `telemetry.track_event` from a background thread.
+
+    Create one with `client.telemetry.buffered()`. Also usable as a context manager, which
+    closes (and flushes) the buffer on exit.
+    """
+
+    def __init__(
+        self,
+        resource: TelemetryResource,
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        sample_rate: float = 1.0,
+        anonymous_id: Optional[str] = None,
+    ) -> None:
+        super().__init__(
+            capacity=capacity,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            sample_rate=sample_rate,
+            anonymous_id=anonymous_id,
+        )
+        self._resource = without_client_retries(resource)
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+    def track(
+        self,
+        event_name: str,
+        properties: Optional[Dict[str, object]] = None,
+        *,
+        user_id: Optional[str] = None,
+        timestamp: Optional[int] = None,
+        sample_rate: Optional[float] = None,
+    ) -> bool:
+        """Record an event without waiting for the network.
+
+        Returns False if the event was sampled out or the buffer is closed.
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            event = self._event(event_name, properties, user_id, timestamp, sample_rate)
+            if event is None:
+                return False
+            if self._push(event):
+                self._cond.notify_all()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="PaprTelemetryFlusher", daemon=True)
+                self._worker.start()
+        return True
+
+    def flush(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> bool:
+        """Send everything buffered so far; returns False if events are still buffered after `timeout`."""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self.buffered, timeout)
+
+    def close(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """Make a last attempt to send the buffered events and stop the flusher."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout)
+        self._unregister()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: bool(self._events) or self._closed)
+                if not self._events:
+                    return
+                self._cond.wait_for(self._ready, self._time_left())
+                batch = self._take_batch()
+            delivered = self._send(batch)
+            with self._cond:
+                self._finish(batch, delivered)
+                self._cond.notify_all()
+
+    def _send(self, batch: List[Event]) -> bool:
+        kwargs: Dict[str, Any] = {} if self.anonymous_id is None else {"anonymous_id": self.anonymous_id}
+        try:
+            response = self._resource.track_event(events=batch, **kwargs)
+        except Exception as e:
+            if is_retryable(e):
+                self._retry_after = retry_after(e)
+                return False
+            self._reject(batch, e)
+            return True
+        self._record(batch, response)
+        return True
+
+
+class AsyncTelemetryBuffer(_TelemetryState, AsyncBackgroundBuffer):
+    """Async counterpart of `TelemetryBuffer`; the flusher runs as a task on the caller's event loop.
+
+    `track` is a plain method so it can be called from sync and async code alike. Close the
+    buffer with `await buffer.close()` (or `async with`) before the loop stops.
+    """
+
+    def __init__(
+        self,
+        resource: AsyncTelemetryResource,
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        sample_rate: float = 1.0,
+        anonymous_id: Optional[str] = None,
+    ) -> None:
+        super().__init__(
+            capacity=capacity,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            sample_rate=sample_rate,
+            anonymous_id=anonymous_id,
+        )
+        self._resource = without_client_retries(resource)
+        # Created once a loop is running so they bind to it
+        self._wakeup: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task[None]] = None
+
+    def track(
+        self,
+        event_name: str,
+        properties: Optional[Dict[str, object]] = None,
+        *,
+        user_id: Optional[str] = None,
+        timestamp: Optional[int] = None,
+        sample_rate: Optional[float] = None,
+    ) -> bool:
+        """Record an event without waiting for the network.
+
+        Events tracked outside a running event loop stay buffered until the flusher can start.
+        Returns False if the event was sampled out or the buffer is closed.
+        """
+        if self._closed:
+            return False
+        event = self._event(event_name, properties, user_id, timestamp, sample_rate)
+        if event is None:
+            return False
+        ready = self._push(event)
+        if self._ensure_worker() and ready:
+            self._wake()
+        return True
+
+    async def flush(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> bool:
+        """Send everything buffered so far; returns False if events are still buffered after `timeout`."""
+        if not self.buffered or not self._ensure_worker():
+            return not self.buffered
+        assert self._idle is not None
+        self._flush_requested = True
+        self._idle.clear()
+        self._wake()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return not self.buffered
+
+    async def close(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """Make a last attempt to send the buffered events and stop the flusher."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._ensure_worker():
+            assert self._worker is not None
+            self._wake()
+            done, _ = await asyncio.wait({self._worker}, timeout=timeout)
+            if not done:
+                self._worker.cancel()
+        self._unregister()
+
+    def _ensure_worker(self) -> bool:
+        """Start the flusher on the running loop; returns False when called outside one."""
+        if self._worker is not None and not self._worker.done():
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+            self._idle = asyncio.Event()
+        self._worker = loop.create_task(self._run())
+        return True
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _wait(self, timeout: Optional[float]) -> None:
+        assert self._wakeup is not None
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self) -> None:
+        assert self._idle is not None
+        while True:
+            while not self._events and not self._closed:
+                self._flush_requested = False
+                self._idle.set()
+                await self._wait(None)
+            if not self._events:
+                self._idle.set()
+                return
+            while not self._ready() and self._time_left() > 0:
+                await self._wait(self._time_left())
+            batch = self._take_batch()
+            self._finish(batch, await self._send(batch))
+
+    async def _send(self, batch: List[Event]) -> bool:
+        kwargs: Dict[str, Any] = {} if self.anonymous_id is None else {"anonymous_id": self.anonymous_id}
+        try:
+            response = await self._resource.track_event(events=batch, **kwargs)
+        except Exception as e:
+            if is_retryable(e):
+                self._retry_after = retry_after(e)
+                return False
+            self._reject(batch, e)
+            return True
+        self._record(batch, response)
+        return True
@@ -0,0 +1,212 @@
+"""
+Metadata pre-filtering for local tier0 search.
+
+`memory.search(metadata=..., omo_filter=..., search_acl=...)` must not return tier0 items the
+server would filter out. So every stored tier0 record carries flat facet keys next to its
+vector, and the filters compile to one conjunction over them. The filter is applied before
+any vector is scored: it becomes a ChromaDB `where` clause for the shared collection, and a
+boolean row mask over per-facet postings for tenant indexes (see `_tier0_tenants`):
+
+    where = Tier0Filter.compile(metadata={"topics": ["okr"]}, omo_filter={"max_risk": "sensitive"})
+    where.to_where()  # {"$and": [{"$or": [{"papr_topic:okr": True}]}, {"papr_risk": {"$in": [...]}}]}
+
+Indexed facets (ChromaDB metadata values must be scalars, so lists become one key per entry):
+
+- `papr_type`: the item's type (goal, okr, use case, ...).
+- `papr_consent`: the item's consent level, "implicit" when unset.
+- `papr_risk`: the item's risk level, "none" when unset.
+- `papr_topic:<topic>`: one key per topic.
+- `papr_read:<entity>` / `papr_write:<entity>`: one key per ACL entry, e.g.
+  `papr_read:external_user:alice`. Entries come from `acl`, the `*_read_access` /
+  `*_write_access` lists and the owner (`external_user_id`, `user_id`). Unprefixed
+  entries are `external_user:` entries, as on the server.
+
+How the filters apply:
+
+- `metadata`: `topics` matches items with any of the given topics. Other scalar fields
+  must equal the item's value. `None` values are ignored.
+- `omo_filter`: consent and risk levels. Consent is ordered explicit > implicit > terms >
+  none, and risk none < sensitive < flagged.
+- `search_acl`: items must grant `read` (and `write`, if given) to at least one of the
+  listed entities.
+
+Any other filter (nested metadata, list-valued fields other than topics, access lists)
+raises `UnsupportedFilter`, and the search goes to the server instead of guessing.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple, Mapping, Iterable, Optional
+
+__all__ = ["Tier0Filter", "UnsupportedFilter", "tier0_facets"]
+
+CONSENT_LEVELS = ("explicit", "implicit", "terms", "none")
+RISK_LEVELS = ("none", "sensitive", "flagged")
+DEFAULT_CONSENT = "implicit"
+DEFAULT_RISK = "none"
+
+ACL_PREFIXES = ("user", "external_user", "organization", "namespace", "workspace", "role")
+
+TYPE_KEY = "papr_type"
+CONSENT_KEY = "papr_consent"
+RISK_KEY = "papr_risk"
+TOPIC_PREFIX = "papr_topic:"
+READ_PREFIX = "papr_read:"
+WRITE_PREFIX = "papr_write:"
+
+# One facet value a record either has or not, e.g. ("papr_risk", "none") or ("papr_topic:okr", True)
+Term = Tuple[str, Any]
+
+
+class UnsupportedFilter(ValueError):
+    """The filter cannot be evaluated exactly against local tier0 metadata."""
+
+
+def _entity(value: str) -> str:
+    prefix, _, rest = value.partition(":")
+    if rest and prefix in ACL_PREFIXES:
+        return value
+    return f"external_user:{value}"
+
+
+def _strings(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, Iterable):
+        return [str(v) for v in value if v is not None]
+    return [str(value)]
+
+
+def _acl_entries(source: Mapping[str, Any], access: str) -> List[str]:
+    acl = source.get("acl")
+    entries = _strings(acl.get(access)) if isinstance(acl, Mapping) else []
+    for prefix in ACL_PREFIXES:
+        entries.extend(f"{prefix}:{value}" for value in _strings(source.get(f"{prefix}_{access}_access")))
+    # Owners can read and write their own memories
+    if source.get("external_user_id"):
+        entries.append(f"external_user:{source['external_user_id']}")
+    if source.get("user_id"):
+        entries.append(f"user:{source['user_id']}")
+    return [_entity(entry) for entry in entries]
+
+
+def tier0_facets(item: Mapping[str, Any]) -> Dict[str, Any]:
+    """Flat, scalar-only filter facets of a sync_tiers tier0 item (and its nested `metadata`)."""
+    metadata = item.get("metadata") if isinstance(item.get("metadata"), Mapping) else {}
+    merged: Dict[str, Any] = {**metadata, **{k: v for k, v in item.items() if v is not None}}
+    facets: Dict[str, Any] = {
+        TYPE_KEY: str(item.get("type", "unknown")),
+        CONSENT_KEY: str(merged.get("consent") or DEFAULT_CONSENT),
+        RISK_KEY: str(merged.get("risk") or DEFAULT_RISK),
+    }
+    for topic in _strings(item.get("topics", metadata.get("topics"))):
+        facets[f"{TOPIC_PREFIX}{topic}"] = True
+    for access, prefix in (("read", READ_PREFIX), ("write", WRITE_PREFIX)):
+        for entity in _acl_entries(merged, access):
+            facets[f"{prefix}{entity}"] = True
+    return facets
+
+
+def _given(value: Any) -> Any:
+    # NotGiven / Omit sentinels are falsy
+    return value if value else None
+
+
+def _levels_at_or_above(levels: Tuple[str, ...], floor: str) -> List[str]:
+    if floor not in levels:
+        raise UnsupportedFilter(f"unknown level {floor!r}")
+    return list(levels[: levels.index(floor) + 1])
+
+
+class Tier0Filter:
+    """A conjunction of any-of groups of facet terms: a record matches when it has a term from every group."""
+
+    def __init__(self, groups: Optional[List[List[Term]]] = None) -> None:
+        self.groups: List[List[Term]] = groups or []
+
+    def __bool__(self) -> bool:
+        return bool(self.groups)
+
+    def __repr__(self) -> str:
+        return f"Tier0Filter({self.groups!r})"
+
+    @property
+    def matches_nothing(self) -> bool:
+        """True when a group has no terms left, e.g. every risk level was excluded."""
+        return any(not group for group in self.groups)
+
+    @classmethod
+    def compile(cls, *, metadata: Any = None, omo_filter: Any = None, search_acl: Any = None) -> "Tier0Filter":
+        """Filter equivalent to the search params; raises `UnsupportedFilter` if it cannot be exact locally."""
+        groups: List[List[Term]] = []
+        for key, value in (_given(metadata) or {}).items():
+            if value is None:
+                continue
+            if key == "topics":
+                topics = _strings(value)
+                if topics:
+                    groups.append([(f"{TOPIC_PREFIX}{topic}", True) for topic in topics])
+            elif key in ("consent", "risk"):
+                groups.append([(CONSENT_KEY if key == "consent" else RISK_KEY, str(value))])
+            elif key == "type":
+                groups.append([(TYPE_KEY, str(value))])
+            elif isinstance(value, (str, int, float, bool)):
+                groups.append([(key, value)])
+            else:
+                raise UnsupportedFilter(f"metadata field {key!r} cannot be filtered locally")
+
+        omo = _given(omo_filter) or {}
+        consent = set(CONSENT_LEVELS)
+        risk = set(RISK_LEVELS)
+        if omo.get("min_consent"):
+            consent &= set(_levels_at_or_above(CONSENT_LEVELS, omo["min_consent"]))
+        if omo.get("require_consent"):
+            consent.discard("none")
+        consent -= set(omo.get("exclude_consent") or ())
+        if omo.get("max_risk"):
+            risk &= set(_levels_at_or_above(RISK_LEVELS, omo["max_risk"]))
+        if omo.get("exclude_flagged"):
+            risk.discard("flagged")
+        risk -= set(omo.get("exclude_risk") or ())
+        if consent != set(CONSENT_LEVELS):
+            groups.append([(CONSENT_KEY, level) for level in CONSENT_LEVELS if level in consent])
+        if risk != set(RISK_LEVELS):
+            groups.append([(RISK_KEY, level) for level in RISK_LEVELS if level in risk])
+
+        acl = _given(search_acl) or {}
+        for access, prefix in (("read", READ_PREFIX), ("write", WRITE_PREFIX)):
+            entities = _strings(acl.get(access))
+            if entities:
+                groups.append([(f"{prefix}{_entity(entity)}", True) for entity in entities])
+        return cls(groups)
+
+    def to_where(self) -> Optional[Dict[str, Any]]:
+        """ChromaDB `where` clause for the filter (None when it matches everything); check `matches_nothing` first."""
+        clauses: List[Dict[str, Any]] = []
+        for group in self.groups:
+            by_key: Dict[str, List[Any]] = {}
+            for key, value in group:
+                by_key.setdefault(key, []).append(value)
+            alternatives = [
+                {key: values[0]} if len(values) == 1 else {key: {"$in": values}} for key, values in by_key.items()
+            ]
+            clauses.append(alternatives[0] if len(alternatives) == 1 else {"$or": alternatives})
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    def mask(self, postings: Mapping[Term, Any], rows: int) -> Any:
+        """Boolean row mask from per-term postings (numpy bool arrays of length `rows`)."""
+        import numpy as np  # type: ignore
+
+        selected = np.ones(rows, dtype=bool)
+        for group in self.groups:
+            matches = np.zeros(rows, dtype=bool)
+            for term in group:
+                posting = postings.get(term)
+                if posting is not None:
+                    matches |= posting
+            selected &= matches
+        return selected
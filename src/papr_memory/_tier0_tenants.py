@@ -0,0 +1,498 @@
+"""
+Tenant-partitioned local tier0 indexes for on-device search.
+
+The shared ChromaDB collection (`tier0_goals_okrs`) holds the tier0 of the API key's owner.
+A multi-tenant server searching on behalf of many end users must never answer one tenant's
+query from another tenant's tier0. So `memory.search` calls that name a tenant
+(`external_user_id`, `user_id`, `namespace_id` and/or `organization_id`) are served from
+that tenant's own index, kept here:
+
+- **Partitioning:** each tenant is keyed by API host, credentials and its ids, and has a
+  separate index. A tenant with no local index yet is answered by the server, never by
+  another index.
+- **Per-tenant sync:** the first search for a tenant, and the first search after its data
+  is older than `PAPR_SYNC_INTERVAL`, schedule a `sync.get_tiers` call scoped to that tenant on a small
+  worker pool (`PAPR_TIER0_SYNC_WORKERS`). Searches keep using the previous index meanwhile,
+  and only one sync per tenant runs at a time. A failed sync is not retried for
+  `RETRY_AFTER_FAILURE` seconds.
+- **RAM budget:** indexes live in an LRU bounded by `PAPR_TIER0_MAX_TENANTS` and
+  `PAPR_TIER0_MEMORY_BUDGET_MB`. Cold tenants are evicted from RAM but stay in
+  `tier0_tenants.sqlite` under `PAPR_CHROMADB_PATH`, so bringing one back is a local read,
+  not a network sync.
+
+A tenant's tier0 is small (`PAPR_MAX_TIER0` items), so an index is a normalized float32
+matrix searched by one matrix-vector product. That is faster than an ANN graph at this size
+and takes no memory beyond the vectors.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union, Mapping, Callable, Optional, Sequence, NamedTuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ._logging import get_logger
+from ._client_identity import client_key_string
+from ._tier0_filter import Term, Tier0Filter, tier0_facets
+from ._index_manifest import IndexManifest
+
+if TYPE_CHECKING:
+    from ._client import Papr, AsyncPapr
+    from .lib._embedders import Embedder
+
+__all__ = ["TenantKey", "Tier0Index", "Tier0TenantStore", "tenant_key", "tier0_records", "tier0_tenants"]
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_TENANTS = 1000
+DEFAULT_MEMORY_BUDGET_MB = 256
+DEFAULT_SYNC_WORKERS = 2
+RETRY_AFTER_FAILURE = 30.0
+
+
+def _numpy() -> Any:
+    try:
+        import numpy as np  # type: ignore
+    except ImportError:
+        return None
+    return np
+
+
+class TenantKey(NamedTuple):
+    """Identity of one tenant's local tier0; `scope` separates API hosts and credentials."""
+
+    scope: str
+    external_user_id: str = ""
+    user_id: str = ""
+    namespace_id: str = ""
+    organization_id: str = ""
+
+    @property
+    def id(self) -> str:
+        return hashlib.sha256(json.dumps(list(self)).encode()).hexdigest()[:32]
+
+
+def tenant_key(
+    client: Union[Papr, AsyncPapr],
+    *,
+    external_user_id: Any = None,
+    user_id: Any = None,
+    namespace_id: Any = None,
+    organization_id: Any = None,
+) -> Optional[TenantKey]:
+    """Tenant a search is scoped to, or None for the API key owner's own (unscoped) tier0."""
+    values = (external_user_id, user_id, namespace_id, organization_id)
+    ids = [value if isinstance(value, str) else "" for value in values]
+    if not any(ids):
+        return None
+    return TenantKey(client_key_string(client), *ids)
+
+
+def tier0_records(tier0_data: Sequence[Any]) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+    """Ids, documents and metadata (with filter facets) of sync_tiers tier0 items, as stored in the local indexes."""
+    ids: List[str] = []
+    documents: List[str] = []
+    metadatas: List[Dict[str, Any]] = []
+    for i, item in enumerate(tier0_data):
+        if isinstance(item, dict):
+            content = str(item.get("content", item.get("description", str(item))))
+            # Start with the item's own metadata, then add/override the standard fields
+            metadata = dict(item.get("metadata") or {})
+            metadata.update(
+                {
+                    "source": "sync_tiers",
+                    "tier": 0,
+                    "type": str(item.get("type", "unknown")),
+                    "topics": str(item.get("topics", [])),
+                    "id": str(item.get("id", f"tier0_{i}")),
+                    "updatedAt": str(item.get("updatedAt", "")),
+                }
+            )
+            metadata.update(tier0_facets(item))
+            item_id = f"tier0_{i}_{item['id']}" if "id" in item else f"tier0_{i}"
+        else:
+            content = str(item)
+            metadata = {"source": "sync_tiers", "tier": 0, "type": "unknown", "topics": "unknown", **tier0_facets({})}
+            item_id = f"tier0_{i}"
+        ids.append(item_id)
+        documents.append(content)
+        metadatas.append(metadata)
+    return ids, documents, metadatas
+
+
+def tier0_vectors(
+    tier0_data: Sequence[Any], documents: Sequence[str], embedder: Embedder, *, dimensions: int
+) -> List[Optional[List[float]]]:
+    """Vectors for tier0 items: the server's embedding when it fits the index, else embedded locally."""
+    from ._onnx_embedder import onnx_enabled, matryoshka_truncate, get_matryoshka_dimensions
+
+    matryoshka_dims = get_matryoshka_dimensions() if onnx_enabled() else None
+    vectors: List[Optional[List[float]]] = []
+    for item in tier0_data:
+        embedding = item.get("embedding") if isinstance(item, dict) else None
+        if isinstance(embedding, list) and embedding and isinstance(embedding[0], (int, float)):
+            if matryoshka_dims is not None:
+                embedding = matryoshka_truncate(embedding, matryoshka_dims)
+            if len(embedding) == dimensions:
+                vectors.append([float(v) for v in embedding])
+                continue
+        vectors.append(None)
+
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    step = max(1, embedder.batch_size)
+    for start in range(0, len(missing), step):
+        chunk = missing[start : start + step]
+        try:
+            for i, vector in zip(chunk, embedder.embed_documents([documents[i] for i in chunk])):
+                vectors[i] = list(vector)
+        except Exception as e:
+            logger.warning(f"Failed to embed tier0 items {chunk} locally: {e}")
+    return vectors
+
+
+class Tier0Index:
+    """One tenant's tier0: row-normalized float32 vectors with their ids, documents and metadata."""
+
+    def __init__(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        vectors: Any,
+        manifest: Optional[IndexManifest],
+        *,
+        synced_at: Optional[float] = None,
+    ) -> None:
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.vectors = vectors
+        self.manifest = manifest
+        self.synced_at = time.time() if synced_at is None else synced_at
+        self.postings = self._build_postings(metadatas)
+        self.nbytes = (
+            int(vectors.nbytes)
+            + sum(len(doc) for doc in documents)
+            + sum(len(json.dumps(metadata, default=str)) for metadata in metadatas)
+            + sum(int(posting.nbytes) for posting in self.postings.values())
+        )
+
+    @staticmethod
+    def _build_postings(metadatas: List[Dict[str, Any]]) -> Dict[Term, Any]:
+        """Row bitmap per scalar metadata value, so filters select rows without touching the vectors."""
+        np = _numpy()
+        postings: Dict[Term, Any] = {}
+        for row, metadata in enumerate(metadatas):
+            for key, value in metadata.items():
+                if isinstance(value, (str, int, float, bool)):
+                    posting = postings.get((key, value))
+                    if posting is None:
+                        posting = postings[(key, value)] = np.zeros(len(metadatas), dtype=bool)
+                    posting[row] = True
+        return postings
+
+    @classmethod
+    def build(
+        cls,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        embeddings: Sequence[Optional[Sequence[float]]],
+        manifest: Optional[IndexManifest],
+        *,
+        synced_at: Optional[float] = None,
+    ) -> "Tier0Index":
+        """Index the items that have an embedding; vectors are normalized so a dot product is cosine similarity."""
+        np = _numpy()
+        if np is None:
+            raise RuntimeError("numpy is required for tenant tier0 indexes")
+        keep = [i for i, embedding in enumerate(embeddings) if embedding is not None]
+        dims = manifest.dimensions if manifest is not None and manifest.dimensions else 0
+        if keep:
+            vectors = np.asarray([embeddings[i] for i in keep], dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1.0, norms)
+        else:
+            vectors = np.zeros((0, dims), dtype=np.float32)
+        return cls(
+            [ids[i] for i in keep],
+            [documents[i] for i in keep],
+            [dict(metadatas[i]) for i in keep],
+            vectors,
+            manifest,
+            synced_at=synced_at,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def incompatibility(self, query_embedding: Sequence[float], embedder: Optional[Embedder]) -> Optional[str]:
+        """Why this index cannot answer a query vector from `embedder` (None if it can)."""
+        if len(self.ids) and len(query_embedding) != self.vectors.shape[1]:
+            return f"query has {len(query_embedding)} dimensions, index has {self.vectors.shape[1]}"
+        if embedder is not None:
+            return IndexManifest.for_embedder(embedder, dimensions=len(query_embedding)).incompatibility(self.manifest)
+        return None
+
+    def query(
+        self, query_embedding: Sequence[float], n_results: int, where: Optional[Tier0Filter] = None
+    ) -> Dict[str, List[List[Any]]]:
+        """Nearest items by cosine distance among those matching `where`, in the shape of a ChromaDB `query` result."""
+        np = _numpy()
+        rows = np.flatnonzero(where.mask(self.postings, len(self.ids))) if where else np.arange(len(self.ids))
+        if not len(rows) or n_results <= 0:
+            return {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        # Only the rows that passed the filter are scored
+        vectors = self.vectors if len(rows) == len(self.ids) else self.vectors[rows]
+        scores = vectors @ (query / norm if norm else query)
+        k = min(n_results, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        scores = scores[top]
+        top = rows[top]
+        return {
+            "ids": [[self.ids[i] for i in top]],
+            "documents": [[self.documents[i] for i in top]],
+            "metadatas": [[self.metadatas[i] for i in top]],
+            "distances": [[1.0 - float(score) for score in scores]],
+        }
+
+
+def _sync_interval() -> float:
+    try:
+        return float(os.environ.get("PAPR_SYNC_INTERVAL", "300"))
+    except ValueError:
+        return 300.0
+
+
+class Tier0TenantStore:
+    """Thread-safe LRU of tenant indexes bounded by tenant count and bytes, with a SQLite second level."""
+
+    def __init__(
+        self,
+        *,
+        max_tenants: int = DEFAULT_MAX_TENANTS,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024,
+        path: Optional[str] = None,
+        sync_workers: int = DEFAULT_SYNC_WORKERS,
+    ) -> None:
+        self.max_tenants = max_tenants
+        self.memory_budget = memory_budget
+        self.path = os.path.expanduser(path) if path else None
+        self.sync_workers = sync_workers
+        self.evictions = 0
+        self.nbytes = 0
+        self._indexes: OrderedDict[TenantKey, Tier0Index] = OrderedDict()
+        self._syncing: Dict[TenantKey, Future[Optional[Tier0Index]]] = {}
+        self._failed: Dict[TenantKey, float] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._db: Optional[sqlite3.Connection] = None
+        if self.path:
+            self._open_db(self.path)
+
+    def _open_db(self, path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tenants (key TEXT PRIMARY KEY, synced_at REAL NOT NULL, "
+                "manifest TEXT, records TEXT NOT NULL, dims INTEGER NOT NULL, vectors BLOB NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Tenant tier0 store {path} unavailable, keeping indexes in memory only: {e}")
+            self._db = None
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._indexes
+
+    def get(self, key: TenantKey) -> Optional[Tier0Index]:
+        """The tenant's index from RAM, else from disk (it then becomes the most recently used)."""
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+            index = self._load(key)
+            if index is not None:
+                self._remember(key, index)
+            return index
+
+    def put(self, key: TenantKey, index: Tier0Index) -> None:
+        with self._lock:
+            self._remember(key, index)
+            self._persist(key, index)
+
+    def drop(self, key: TenantKey) -> None:
+        """Forget a tenant's index in RAM and on disk, e.g. after the embedder changed."""
+        with self._lock:
+            index = self._indexes.pop(key, None)
+            if index is not None:
+                self.nbytes -= index.nbytes
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM tenants WHERE key = ?", (key.id,))
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not delete tenant tier0 index: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+            self._failed.clear()
+            self.nbytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM tenants")
+                self._db.commit()
+
+    def lookup(self, key: TenantKey, sync: Callable[[], Optional[Tier0Index]]) -> Optional[Tier0Index]:
+        """Index to search for a tenant right now; schedules `sync` in the background if it is missing or stale."""
+        index = self.get(key)
+        if index is None or time.time() - index.synced_at >= _sync_interval():
+            self.schedule_sync(key, sync)
+        return index
+
+    def schedule_sync(
+        self, key: TenantKey, sync: Callable[[], Optional[Tier0Index]]
+    ) -> Optional[Future[Optional[Tier0Index]]]:
+        """Run `sync` for a tenant on the worker pool unless one is already running (returns its future)."""
+        with self._lock:
+            running = self._syncing.get(key)
+            if running is not None:
+                return running
+            if time.monotonic() < self._failed.get(key, 0.0):
+                return None
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, self.sync_workers), thread_name_prefix="PaprTenantSync"
+                )
+            future = self._executor.submit(self._run_sync, key, sync)
+            self._syncing[key] = future
+            return future
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until the tenant syncs running now have finished (or `timeout` seconds passed)."""
+        with self._lock:
+            running = list(self._syncing.values())
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in running:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                future.result(timeout=remaining)
+            except Exception:
+                return
+
+    def _run_sync(self, key: TenantKey, sync: Callable[[], Optional[Tier0Index]]) -> Optional[Tier0Index]:
+        try:
+            index = sync()
+        except Exception as e:
+            logger.warning(f"Tier0 sync for tenant {key.id} failed: {e}")
+            index = None
+        with self._lock:
+            self._syncing.pop(key, None)
+            if index is None:
+                self._failed[key] = time.monotonic() + RETRY_AFTER_FAILURE
+                return None
+            self._failed.pop(key, None)
+        self.put(key, index)
+        logger.info(f"Synced tier0 for tenant {key.id}: {len(index)} items")
+        return index
+
+    def _remember(self, key: TenantKey, index: Tier0Index) -> None:
+        previous = self._indexes.pop(key, None)
+        if previous is not None:
+            self.nbytes -= previous.nbytes
+        self._indexes[key] = index
+        self.nbytes += index.nbytes
+        # The newest index always stays, even if it alone exceeds the budget
+        while len(self._indexes) > 1 and (len(self._indexes) > self.max_tenants or self.nbytes > self.memory_budget):
+            _, evicted = self._indexes.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+    def _persist(self, key: TenantKey, index: Tier0Index) -> None:
+        if self._db is None:
+            return
+        records = {"ids": index.ids, "documents": index.documents, "metadatas": index.metadatas}
+        manifest = json.dumps(index.manifest.to_metadata()) if index.manifest is not None else None
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO tenants (key, synced_at, manifest, records, dims, vectors) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key.id,
+                    index.synced_at,
+                    manifest,
+                    json.dumps(records, default=str),
+                    int(index.vectors.shape[1]),
+                    index.vectors.tobytes(),
+                ),
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not persist tenant tier0 index: {e}")
+
+    def _load(self, key: TenantKey) -> Optional[Tier0Index]:
+        np = _numpy()
+        if self._db is None or np is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT synced_at, manifest, records, dims, vectors FROM tenants WHERE key = ?", (key.id,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read tenant tier0 index: {e}")
+            return None
+        if row is None:
+            return None
+        synced_at, manifest, records, dims, vectors = row
+        parsed: Mapping[str, Any] = json.loads(records)
+        return Tier0Index(
+            list(parsed["ids"]),
+            list(parsed["documents"]),
+            list(parsed["metadatas"]),
+            np.frombuffer(vectors, dtype=np.float32).reshape(-1, dims),
+            IndexManifest.from_metadata(json.loads(manifest)) if manifest else None,
+            synced_at=synced_at,
+        )
+
+
+def _from_env() -> Tier0TenantStore:
+    def _int(name: str, default: int) -> int:
+        try:
+            return int(os.environ.get(name, str(default)))
+        except ValueError:
+            return default
+
+    chroma_path = os.environ.get("PAPR_CHROMADB_PATH", "./chroma_db")
+    return Tier0TenantStore(
+        max_tenants=_int("PAPR_TIER0_MAX_TENANTS", DEFAULT_MAX_TENANTS),
+        memory_budget=_int("PAPR_TIER0_MEMORY_BUDGET_MB", DEFAULT_MEMORY_BUDGET_MB) * 1024 * 1024,
+        path=os.path.join(chroma_path, "tier0_tenants.sqlite"),
+        sync_workers=_int("PAPR_TIER0_SYNC_WORKERS", DEFAULT_SYNC_WORKERS),
+    )
+
+
+_store: Optional[Tier0TenantStore] = None
+_store_lock = threading.Lock()
+
+
+def tier0_tenants() -> Tier0TenantStore:
+    """Process-wide tenant store shared by all clients, so the memory budget covers every tenant."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = _from_env()
+        return _store
@@ -0,0 +1,317 @@
+"""
+Content-addressed cache of holographic transform outputs.
+
+`/v1/holographic/rerank` takes a fast path (~2-5ms per candidate) when candidates carry
+the `phases` and `metadata_embeddings` returned by a prior `/transform`, and a cold path
+with LLM extraction (~100ms) otherwise. Every `transform.create_cached` /
+`create_batch_cached` / `create_many` response is recorded here, keyed by the API host and
+credentials, and a hash of the content, its context metadata and the frequency schema.
+`holographic.rerank_cached` and `rerank_local` fill in `phases`, `metadata_embeddings`,
+`query_phases` and `query_metadata_embeddings` from it, so candidates and queries that have
+been transformed before by the same account always take the fast path. The generated
+`transform.create`, `create_batch` and `holographic.rerank` (and `with_raw_response`) neither
+record nor fill in anything. The async methods read and write the cache in a worker thread,
+so a SQLite-backed cache does not block the event loop.
+
+The cache is an in-memory LRU, optionally backed by a SQLite file so it survives restarts:
+
+    PAPR_TRANSFORM_CACHE_SIZE=50000
+    PAPR_TRANSFORM_CACHE_PATH=~/.cache/papr_memory/transforms.sqlite
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union, Mapping, Iterable, Optional
+from collections import OrderedDict
+
+from ._utils import is_given
+from ._logging import get_logger
+from ._client_identity import ClientKey, client_key
+from .types.holographic.transform_data import TransformData
+from .types.holographic.transform_create_response import TransformCreateResponse
+from .types.holographic.transform_create_batch_response import TransformCreateBatchResponse
+
+if TYPE_CHECKING:
+    from ._client import Papr, AsyncPapr
+
+__all__ = ["TransformCache", "TransformOutputs", "transform_cache"]
+
+logger = get_logger(__name__)
+
+# Fields of a transform output that rerank can reuse
+TransformOutputs = Dict[str, Any]
+
+# API host and a hash of the credentials; outputs are never shared across accounts
+
+_CACHED_FIELDS = ("phases", "metadata_embeddings")
+
+
+def _given(value: Any) -> Any:
+    return value if is_given(value) else None
+
+
+def schema_scope(domain: Optional[str] = None, frequency_schema_id: Optional[str] = None) -> str:
+    """Cache namespace for a request; an explicit schema id takes precedence over the domain, as on the server."""
+    if frequency_schema_id:
+        return f"schema:{frequency_schema_id}"
+    return f"domain:{domain or ''}"
+
+
+def content_key(
+    client: ClientKey, content: str, scope: str, context_metadata: Optional[Mapping[str, object]] = None
+) -> str:
+    digest = hashlib.sha256()
+    for part in client:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(scope.encode())
+    digest.update(b"\0")
+    digest.update(content.encode())
+    if context_metadata:
+        # Context metadata (dates, source type) changes what the LLM extracts
+        digest.update(b"\0")
+        digest.update(json.dumps(context_metadata, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class TransformCache:
+    """Thread-safe LRU of transform outputs with an optional SQLite second level."""
+
+    def __init__(self, max_entries: int = 10_000, path: Optional[str] = None) -> None:
+        self.max_entries = max_entries
+        self.path = os.path.expanduser(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, TransformOutputs] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if self.path:
+            self._open_db(self.path)
+
+    def _open_db(self, path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS transforms (key TEXT PRIMARY KEY, outputs TEXT NOT NULL)")
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Transform cache file {path} unavailable, using memory only: {e}")
+            self._db = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[TransformOutputs]:
+        with self._lock:
+            outputs = self._entries.get(key)
+            if outputs is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return outputs
+            if self._db is not None:
+                row = self._db.execute("SELECT outputs FROM transforms WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    outputs = json.loads(row[0])
+                    self._remember(key, outputs)
+                    self.hits += 1
+                    return outputs
+            self.misses += 1
+            return None
+
+    def put(self, key: str, outputs: TransformOutputs) -> None:
+        self.put_many([(key, outputs)])
+
+    def put_many(self, entries: Iterable[Tuple[str, TransformOutputs]]) -> None:
+        entries = [(key, outputs) for key, outputs in entries if outputs]
+        if not entries:
+            return
+        with self._lock:
+            for key, outputs in entries:
+                self._remember(key, {**self._entries.get(key, {}), **outputs})
+            if self._db is not None:
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO transforms (key, outputs) VALUES (?, ?)",
+                        [(key, json.dumps(self._entries[key])) for key, _ in entries if key in self._entries],
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not persist transform outputs: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM transforms")
+                self._db.commit()
+
+    def _remember(self, key: str, outputs: TransformOutputs) -> None:
+        self._entries[key] = outputs
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # -- transform / rerank integration --
+
+    def record(
+        self,
+        content: str,
+        data: TransformData,
+        *,
+        client: ClientKey,
+        domain: Optional[str] = None,
+        frequency_schema_id: Optional[str] = None,
+        context_metadata: Optional[Mapping[str, object]] = None,
+    ) -> None:
+        """Remember the reusable outputs of one transform (no-op if `phases` were not requested)."""
+        self.record_many(
+            [(content, context_metadata, data)], client=client, domain=domain, frequency_schema_id=frequency_schema_id
+        )
+
+    def record_many(
+        self,
+        transformed: Iterable[Tuple[str, Optional[Mapping[str, object]], TransformData]],
+        *,
+        client: ClientKey,
+        domain: Optional[str] = None,
+        frequency_schema_id: Optional[str] = None,
+    ) -> None:
+        entries: List[Tuple[str, TransformOutputs]] = []
+        requested = schema_scope(domain, frequency_schema_id)
+        for content, context_metadata, data in transformed:
+            outputs = {field: getattr(data, field) for field in _CACHED_FIELDS if getattr(data, field, None)}
+            if "phases" not in outputs:
+                continue
+            # Also file under the schema the server resolved, so later requests naming it directly hit too
+            for scope in {requested, schema_scope(frequency_schema_id=data.frequency_schema_id)}:
+                entries.append((content_key(client, content, scope, context_metadata), outputs))
+        self.put_many(entries)
+
+    def enrich_rerank(
+        self,
+        candidates: Iterable[Mapping[str, Any]],
+        query: str,
+        query_params: Dict[str, Any],
+        *,
+        client: ClientKey,
+        domain: Optional[str] = None,
+        frequency_schema_id: Optional[str] = None,
+    ) -> List[Mapping[str, Any]]:
+        """Fill cached phases into candidates (and the query params, in place) that don't carry them."""
+        scope = schema_scope(_given(domain), _given(frequency_schema_id))
+        enriched: List[Mapping[str, Any]] = []
+        for candidate in candidates:
+            content = candidate.get("content")
+            # Candidates are TypedDicts; never mutate the caller's dicts
+            if candidate.get("phases") is None and isinstance(content, str):
+                outputs = self.get(content_key(client, content, scope, candidate.get("context_metadata")))
+                if outputs is not None:
+                    candidate = {**candidate, "phases": outputs["phases"]}
+                    if candidate.get("metadata_embeddings") is None and outputs.get("metadata_embeddings"):
+                        candidate["metadata_embeddings"] = outputs["metadata_embeddings"]
+            enriched.append(candidate)
+
+        if _given(query_params.get("query_phases")) is None:
+            outputs = self.get(content_key(client, query, scope))
+            if outputs is not None:
+                query_params["query_phases"] = outputs["phases"]
+                if _given(query_params.get("query_metadata_embeddings")) is None and outputs.get("metadata_embeddings"):
+                    query_params["query_metadata_embeddings"] = outputs["metadata_embeddings"]
+        return enriched
+
+
+def record_transform(
+    client: Union[Papr, AsyncPapr],
+    response: TransformCreateResponse,
+    content: str,
+    *,
+    domain: Any = None,
+    frequency_schema_id: Any = None,
+    context_metadata: Any = None,
+) -> None:
+    """Record a `transform.create` response in the process-wide cache (if enabled)."""
+    if transform_cache is None:
+        return
+    try:
+        transform_cache.record(
+            content,
+            response.data,
+            client=client_key(client),
+            domain=_given(domain),
+            frequency_schema_id=_given(frequency_schema_id),
+            context_metadata=_given(context_metadata),
+        )
+    except Exception as e:
+        logger.debug(f"Could not cache transform output: {e}")
+
+
+def record_transform_batch(
+    client: Union[Papr, AsyncPapr],
+    response: TransformCreateBatchResponse,
+    items: Iterable[Mapping[str, Any]],
+    *,
+    domain: Any = None,
+    frequency_schema_id: Any = None,
+) -> None:
+    """Record a `transform.create_batch` response in the process-wide cache (if enabled)."""
+    if transform_cache is None:
+        return
+    try:
+        by_id = {item["id"]: item for item in items}
+        transform_cache.record_many(
+            [
+                (by_id[result.id]["content"], by_id[result.id].get("context_metadata"), result.data)
+                for result in response.results
+                if result.id in by_id
+            ],
+            client=client_key(client),
+            domain=_given(domain),
+            frequency_schema_id=_given(frequency_schema_id),
+        )
+    except Exception as e:
+        logger.debug(f"Could not cache transform outputs: {e}")
+
+
+def enrich_rerank(
+    client: Union[Papr, AsyncPapr],
+    candidates: Iterable[Any],
+    query: str,
+    *,
+    query_phases: Any,
+    query_metadata_embeddings: Any,
+    domain: Any = None,
+    frequency_schema_id: Any = None,
+) -> Tuple[Any, Any, Any]:
+    """Rerank inputs with cached phases filled in; returns `(candidates, query_phases, query_metadata_embeddings)`."""
+    if transform_cache is None:
+        return candidates, query_phases, query_metadata_embeddings
+    query_params = {"query_phases": query_phases, "query_metadata_embeddings": query_metadata_embeddings}
+    enriched = transform_cache.enrich_rerank(
+        candidates,
+        query,
+        query_params,
+        client=client_key(client),
+        domain=domain,
+        frequency_schema_id=frequency_schema_id,
+    )
+    return enriched, query_params["query_phases"], query_params["query_metadata_embeddings"]
+
+
+def _from_env() -> Optional[TransformCache]:
+    if os.environ.get("PAPR_TRANSFORM_CACHE", "true").lower() not in ("true", "1", "yes", "on"):
+        return None
+    try:
+        size = int(os.environ.get("PAPR_TRANSFORM_CACHE_SIZE", "10000"))
+    except ValueError:
+        size = 10_000
+    return TransformCache(max_entries=size, path=os.environ.get("PAPR_TRANSFORM_CACHE_PATH") or None)
+
+
+# Process-wide cache shared by all clients; None when disabled with PAPR_TRANSFORM_CACHE=false
+transform_cache: Optional[TransformCache] = _from_env()
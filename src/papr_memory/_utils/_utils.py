@@ -15,7 +15,6 @@ from typing import (
     cast,
     overload,
 )
-from pathlib import Path
 from datetime import date, datetime
 from typing_extensions import TypeGuard, get_args
 
@@ -375,10 +374,15 @@ def removesuffix(string: str, suffix: str) -> str:
     return string
 
 
-def file_from_path(path: str) -> FileTypes:
-    contents = Path(path).read_bytes()
+def file_from_path(path: str, *, on_progress: Callable[[int, int], None] | None = None) -> FileTypes:
+    """Upload the file at `path`, streaming it from disk in chunks.
+
+    `on_progress` is called with `(bytes_sent, total_bytes)` as the request body is sent.
+    """
+    from .._files import StreamingFile
+
     file_name = os.path.basename(path)
-    return (file_name, contents)
+    return (file_name, StreamingFile(path, on_progress=on_progress))
 
 
 def get_required_header(headers: HeadersLike, header: str) -> str:
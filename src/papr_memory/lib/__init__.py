@@ -38,6 +38,10 @@ Quick Start::
         content="John fixed the auth bug",
         link_to=build_link_to(MySchema.Task.title, MySchema.Person.email),
     )
+
+    # Plug a custom embedder into on-device search
+    register_embedder("in-house", lambda: InHouseEmbedder())
+    client.memory.use_embedder("in-house")
 """
 
 # Decorators
@@ -52,6 +56,17 @@ from ._conditions import Or, And, Not
 # Property/search helpers
 from ._properties import Auto, PropertyRef, edge, prop, exact, fuzzy, semantic
 
+# On-device embedders
+from ._embedders import (
+    Embedder,
+    BaseEmbedder,
+    as_embedder,
+    list_embedders,
+    create_embedder,
+    register_embedder,
+    unregister_embedder,
+)
+
 __all__ = [
     # Decorators
     "schema",
@@ -77,4 +92,12 @@ __all__ = [
     "build_schema_params",
     "build_memory_policy",
     "serialize_set_values",
+    # On-device embedders
+    "Embedder",
+    "BaseEmbedder",
+    "as_embedder",
+    "register_embedder",
+    "unregister_embedder",
+    "list_embedders",
+    "create_embedder",
 ]
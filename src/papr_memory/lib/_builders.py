@@ -1,16 +1,25 @@
 """
 Builder functions that convert decorated schemas and property refs
 to API-compatible dicts (SchemaCreateParams, link_to, memory_policy).
+
+``build_link_to`` is memoized on its (immutable, hashable) refs, and the DSL
+objects cache their own compiled dicts, so calling the builders per memory
+reuses compiled values; the returned lists and dicts are shared and must not
+be modified.
 """
 
-from typing import Any, Dict, List, Union, Optional
+from typing import Any, Dict, List, Tuple, Union, Optional
 from typing_extensions import Literal
 
+from .._utils import lru_cache
 from ._conditions import Or, And, Not
 from ._schema import NodeMetadata, SchemaMetadata
 from ._properties import Auto, PropertyRef, EdgeDescriptor
 from ..types.shared_params import EdgeConstraintInput, MemoryPolicy, NodeConstraintInput
 
+# Distinct multi-ref link specs remembered by build_link_to
+_CACHE_SIZE = 4096
+
 
 def build_link_to(
     *refs: PropertyRef,
@@ -39,12 +48,27 @@ def build_link_to(
     Returns:
         A single string or list of strings for the ``link_to`` parameter.
     """
+    if len(refs) == 1:
+        return refs[0].to_link_to_string()
+    try:
+        return _cached_link_to(refs)
+    except TypeError:
+        # A ref holding an unhashable value
+        return _link_to(refs)
+
+
+def _link_to(refs: Tuple[PropertyRef, ...]) -> Union[str, List[str]]:
     strings = [ref.to_link_to_string() for ref in refs]
     if len(strings) == 1:
         return strings[0]
     return strings
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
+def _cached_link_to(refs: Tuple[PropertyRef, ...]) -> Union[str, List[str]]:
+    return _link_to(refs)
+
+
 def build_schema_params(schema_cls: type) -> Dict[str, Any]:
     """Convert a ``@schema``-decorated class to a ``SchemaCreateParams`` dict.
 
@@ -2,14 +2,26 @@
 Logical operators for conditional constraints.
 
 Provides ``And``, ``Or``, ``Not`` for building ``when`` conditions
-with full composability.
+with full composability. Operators are immutable and hashable, and each
+compiles its dict once; ``to_dict()`` returns that shared dict.
 """
 
-from typing import Any, Dict, Union
+from typing import Any, Dict, Tuple, Union
+
+from ._frozen import Frozen
 
 Condition = Union[Dict[str, Any], "And", "Or", "Not"]
 
 
+def _copy(value: Any) -> Any:
+    """Copy the dicts and lists in a condition; operators are immutable and kept as-is."""
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
 def _condition_to_dict(condition: Condition) -> Dict[str, Any]:
     """Convert a condition (dict or operator) to its dict representation."""
     if isinstance(condition, (And, Or, Not)):
@@ -17,7 +29,7 @@ def _condition_to_dict(condition: Condition) -> Dict[str, Any]:
     return condition
 
 
-class And:
+class And(Frozen):
     """Logical AND for ``when`` conditions.
 
     All conditions must match.
@@ -32,17 +44,25 @@ class And:
         {"_and": [{"priority": "high"}, {"status": "active"}]}
     """
 
+    __slots__ = ("conditions",)
+
+    conditions: Tuple[Condition, ...]
+
     def __init__(self, *conditions: Condition) -> None:
-        self.conditions = list(conditions)
+        # Copied so later changes to the caller's dicts cannot reach the compiled dict
+        self._init(conditions=tuple(_copy(c) for c in conditions))
+
+    def _args(self) -> Tuple[Any, ...]:
+        return self.conditions
 
     def __repr__(self) -> str:
         return f"And({', '.join(repr(c) for c in self.conditions)})"
 
     def to_dict(self) -> Dict[str, Any]:
-        return {"_and": [_condition_to_dict(c) for c in self.conditions]}
+        return self._compile("dict", lambda: {"_and": [_condition_to_dict(c) for c in self.conditions]})
 
 
-class Or:
+class Or(Frozen):
     """Logical OR for ``when`` conditions.
 
     Any condition must match.
@@ -57,17 +77,25 @@ class Or:
         {"_or": [{"status": "active"}, {"status": "pending"}]}
     """
 
+    __slots__ = ("conditions",)
+
+    conditions: Tuple[Condition, ...]
+
     def __init__(self, *conditions: Condition) -> None:
-        self.conditions = list(conditions)
+        # Copied so later changes to the caller's dicts cannot reach the compiled dict
+        self._init(conditions=tuple(_copy(c) for c in conditions))
+
+    def _args(self) -> Tuple[Any, ...]:
+        return self.conditions
 
     def __repr__(self) -> str:
         return f"Or({', '.join(repr(c) for c in self.conditions)})"
 
     def to_dict(self) -> Dict[str, Any]:
-        return {"_or": [_condition_to_dict(c) for c in self.conditions]}
+        return self._compile("dict", lambda: {"_or": [_condition_to_dict(c) for c in self.conditions]})
 
 
-class Not:
+class Not(Frozen):
     """Logical NOT for ``when`` conditions.
 
     Negates the condition.
@@ -82,11 +110,18 @@ class Not:
         {"_not": {"status": "completed"}}
     """
 
+    __slots__ = ("condition",)
+
+    condition: Condition
+
     def __init__(self, condition: Condition) -> None:
-        self.condition = condition
+        self._init(condition=_copy(condition))
+
+    def _args(self) -> Tuple[Any, ...]:
+        return (self.condition,)
 
     def __repr__(self) -> str:
         return f"Not({self.condition!r})"
 
     def to_dict(self) -> Dict[str, Any]:
-        return {"_not": _condition_to_dict(self.condition)}
+        return self._compile("dict", lambda: {"_not": _condition_to_dict(self.condition)})
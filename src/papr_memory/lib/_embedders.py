@@ -0,0 +1,268 @@
+"""
+Pluggable embedders for on-device search.
+
+Defines the ``Embedder`` protocol the local search pipeline dispatches to,
+a ``BaseEmbedder`` helper class, and a process-wide registry so custom
+embedders (an in-house model, a small distilled model, ...) can be plugged in
+by name or per client.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Union, Callable, Optional
+from typing_extensions import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class Embedder(Protocol):
+    """Interface used by on-device search to turn text into vectors.
+
+    Implementations declare their output shape up front so the pipeline can
+    validate local indexes and size batches without probing the model.
+
+    Attributes:
+        name: Identifier recorded alongside the local index.
+        dimensions: Length of every returned vector.
+        batch_size: Preferred number of texts per forward pass.
+        dtype: Numeric precision of the model weights (e.g. ``"float32"``, ``"int8"``).
+        normalized: Whether returned vectors are L2-normalized.
+
+    Embedders may also set ``model_id``, the weights they load (a model name or
+    path). It is recorded in the local index manifest so switching models behind
+    the same backend ``name`` rebuilds the index; ``name`` is used when it is unset.
+    """
+
+    name: str
+    dimensions: int
+    batch_size: int
+    dtype: str
+    normalized: bool
+
+    def embed_documents(self, input: List[str]) -> List[List[float]]: ...
+
+    def embed_query(self, input: str) -> List[float]: ...
+
+    def warmup(self) -> None: ...
+
+
+def to_vectors(output: Any) -> List[List[float]]:
+    """Convert model output (ndarray, tensor, nested lists) to ``List[List[float]]``."""
+    vectors: List[List[float]] = []
+    for row in output:
+        tolist = getattr(row, "tolist", None)
+        values: Any = tolist() if callable(tolist) else row
+        vectors.append([float(x) for x in values])
+    return vectors
+
+
+def _to_vector(output: Any) -> List[float]:
+    """Convert a single-query output to ``List[float]``, unwrapping a leading batch dimension."""
+    tolist = getattr(output, "tolist", None)
+    values: Any = tolist() if callable(tolist) else output
+    if values and isinstance(values[0], (list, tuple)):
+        values = values[0]
+    return [float(x) for x in values]
+
+
+class BaseEmbedder(ABC):
+    """Convenience base class for ``Embedder`` implementations.
+
+    Subclasses only need to implement ``embed_documents``; a subclass without it
+    cannot be instantiated. Instances are also
+    callable so they can be passed to ChromaDB as an embedding function.
+
+    Usage::
+
+        class MyEmbedder(BaseEmbedder):
+            name = "my-distilled-model"
+            dimensions = 384
+
+            def embed_documents(self, input):
+                return my_model.encode(input).tolist()
+
+        client.memory.use_embedder(MyEmbedder())
+    """
+
+    name: str = "custom"
+    # Weights identifier for the index manifest; falls back to ``name`` when empty
+    model_id: str = ""
+    dimensions: int = 0
+    batch_size: int = 32
+    dtype: str = "float32"
+    normalized: bool = True
+    warmup_text: str = "warmup"
+
+    @abstractmethod
+    def embed_documents(self, input: List[str]) -> List[List[float]]: ...
+
+    def embed_query(self, input: str) -> List[float]:
+        return self.embed_documents([input])[0]
+
+    def warmup(self) -> None:
+        """Run one forward pass so the first real query does not pay compilation/caching costs."""
+        self.embed_query(self.warmup_text)
+
+    def __call__(self, input: Union[str, List[str]]) -> List[List[float]]:
+        if isinstance(input, str):
+            input = [input]
+        return self.embed_documents(list(input))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r}, dimensions={self.dimensions}, dtype={self.dtype!r})"
+
+
+class _AdaptedEmbedder(BaseEmbedder):
+    """Wraps a duck-typed model/embedding function; the call path is chosen once at wrap time."""
+
+    def __init__(
+        self,
+        wrapped: Any,
+        batch_fn: Callable[[List[str]], List[List[float]]],
+        query_fn: Optional[Callable[[str], List[float]]],
+        *,
+        name: str,
+        dimensions: int,
+    ) -> None:
+        self.wrapped = wrapped
+        self._batch_fn = batch_fn
+        self._query_fn = query_fn
+        self.name = name
+        self.dimensions = dimensions
+
+    def embed_documents(self, input: List[str]) -> List[List[float]]:
+        return self._batch_fn(input)
+
+    def embed_query(self, input: str) -> List[float]:
+        if self._query_fn is not None:
+            return self._query_fn(input)
+        return self._batch_fn([input])[0]
+
+
+def as_embedder(obj: Any, *, name: Optional[str] = None, dimensions: Optional[int] = None) -> Embedder:
+    """Return ``obj`` as an ``Embedder``.
+
+    Objects that already satisfy the protocol are returned unchanged. Chroma-style
+    embedding functions (``embed_documents``), sentence-transformers models
+    (``encode``) and plain callables are wrapped once, so later calls dispatch
+    directly instead of re-inspecting the object.
+    """
+    if isinstance(obj, Embedder) and not isinstance(obj, type):
+        return obj
+
+    if dimensions is None:
+        get_dim = getattr(obj, "get_sentence_embedding_dimension", None)
+        dimensions = int(get_dim() or 0) if callable(get_dim) else int(getattr(obj, "dimensions", 0) or 0)
+    label = name or getattr(obj, "name", None) or type(obj).__name__
+    if not isinstance(label, str):
+        label = type(obj).__name__
+
+    if hasattr(obj, "embed_documents"):
+        embed_documents = obj.embed_documents
+        embed_query = getattr(obj, "embed_query", None)
+
+        def batch_fn(texts: List[str]) -> List[List[float]]:
+            return to_vectors(embed_documents(texts))
+
+        def query_fn(text: str) -> List[float]:
+            return _to_vector(embed_query(text))  # type: ignore[misc]
+
+        return _AdaptedEmbedder(
+            obj, batch_fn, query_fn if callable(embed_query) else None, name=label, dimensions=dimensions
+        )
+
+    if hasattr(obj, "encode"):
+        encode = obj.encode
+        return _AdaptedEmbedder(obj, lambda texts: to_vectors(encode(texts)), None, name=label, dimensions=dimensions)
+
+    if callable(obj):
+        return _AdaptedEmbedder(obj, lambda texts: to_vectors(obj(texts)), None, name=label, dimensions=dimensions)
+
+    raise TypeError(f"Cannot use {type(obj)!r} as an embedder: expected embed_documents(), encode() or a callable")
+
+
+EmbedderFactory = Callable[[], Optional[Embedder]]
+
+_registry: Dict[str, EmbedderFactory] = {}
+_registry_lock = threading.Lock()
+# Reentrant: registering the built-ins goes through register_embedder, which calls _ensure_builtins
+_builtins_lock = threading.RLock()
+_builtins_loaded = False
+_builtins_loading = False
+
+
+def _ensure_builtins() -> None:
+    global _builtins_loaded, _builtins_loading
+    if _builtins_loaded:
+        return
+    with _builtins_lock:
+        # Only the thread registering the built-ins can see them loading; others wait on the lock
+        if _builtins_loaded or _builtins_loading:
+            return
+        _builtins_loading = True
+        try:
+            # Registers "coreml", "mlx", "onnx" and "sentence-transformers"
+            from .._embedder_backends import register_builtin_embedders
+
+            register_builtin_embedders()
+            # Set only once they are all registered, so no thread sees a partial registry
+            _builtins_loaded = True
+        finally:
+            _builtins_loading = False
+
+
+def _constant_factory(embedder: Embedder) -> EmbedderFactory:
+    return lambda: embedder
+
+
+def register_embedder(name: str, factory: Union[EmbedderFactory, Embedder], *, replace: bool = False) -> None:
+    """Register an embedder under ``name``.
+
+    ``factory`` is either a ready ``Embedder`` instance or a zero-argument callable
+    that builds one (called lazily, e.g. to defer loading model weights).
+
+    Usage::
+
+        register_embedder("in-house", lambda: InHouseEmbedder(path="/models/emb"))
+        client.memory.use_embedder("in-house")
+
+    Raises:
+        ValueError: If ``name`` is already registered and ``replace`` is False.
+    """
+    _ensure_builtins()
+    # Embedder classes also satisfy the protocol structurally; they are factories, not instances
+    if isinstance(factory, Embedder) and not isinstance(factory, type):
+        factory = _constant_factory(factory)
+    with _registry_lock:
+        if name in _registry and not replace:
+            raise ValueError(f"An embedder named {name!r} is already registered; pass replace=True to override it")
+        _registry[name] = factory
+
+
+def unregister_embedder(name: str) -> None:
+    """Remove a registered embedder (no-op if unknown)."""
+    with _registry_lock:
+        _registry.pop(name, None)
+
+
+def list_embedders() -> List[str]:
+    """Names of all registered embedders, built-ins included."""
+    _ensure_builtins()
+    with _registry_lock:
+        return sorted(_registry)
+
+
+def create_embedder(name: str) -> Optional[Embedder]:
+    """Build the embedder registered under ``name``.
+
+    Returns None if the factory could not produce one (e.g. the backend is
+    unavailable on this platform).
+
+    Raises:
+        KeyError: If no embedder is registered under ``name``.
+    """
+    _ensure_builtins()
+    with _registry_lock:
+        factory = _registry.get(name)
+    if factory is None:
+        raise KeyError(f"No embedder registered as {name!r}; known embedders: {', '.join(list_embedders())}")
+    return factory()
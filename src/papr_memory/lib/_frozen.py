@@ -0,0 +1,90 @@
+"""
+Base class for the immutable, hashable DSL values (``Auto``, ``SearchMode``,
+``PropertyRef``, ``And``, ``Or``, ``Not``).
+
+Instances compare and hash by their constructor arguments, so equal values share
+cache entries in the builders, and each caches the dict or string it compiles to::
+
+    And({"priority": "high"}) == And({"priority": "high"})  # True
+    cond.to_dict() is cond.to_dict()                         # True - compiled once
+
+Compiled dicts are shared between callers and must not be modified.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Tuple, Callable
+
+
+def freeze(value: Any) -> Any:
+    """Hashable stand-in for ``value``: dicts, lists and sets become tuples/frozensets."""
+    if isinstance(value, dict):
+        return (dict, tuple((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(freeze(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(v) for v in value)
+    # Keeps True, 1 and 1.0 apart; they compare equal but serialize differently
+    return (type(value), value)
+
+
+class Frozen(ABC):
+    """Immutable value object; subclasses assign fields in ``__init__`` with ``_init``."""
+
+    __slots__ = ("_key", "_hash", "_compiled")
+
+    def _init(self, **fields: Any) -> None:
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "_key", None)
+        object.__setattr__(self, "_hash", None)
+        object.__setattr__(self, "_compiled", {})
+
+    @abstractmethod
+    def _args(self) -> Tuple[Any, ...]:
+        """Constructor arguments that recreate this value."""
+
+    def _compile(self, kind: str, build: Callable[[], Any]) -> Any:
+        # Benign race: two threads may both build, the values are equal
+        compiled: Dict[str, Any] = self._compiled
+        result = compiled.get(kind)
+        if result is None:
+            result = compiled[kind] = build()
+        return result
+
+    def _frozen_key(self) -> Any:
+        key = self._key
+        if key is None:
+            key = (type(self), freeze(self._args()))
+            object.__setattr__(self, "_key", key)
+        return key
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Frozen):
+            return NotImplemented
+        return self._frozen_key() == other._frozen_key()
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self) -> int:
+        result = self._hash
+        if result is None:
+            result = hash(self._frozen_key())
+            object.__setattr__(self, "_hash", result)
+        return result
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), self._args())
+
+    def __copy__(self) -> "Frozen":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Frozen":
+        return self
@@ -2,13 +2,16 @@
 Core primitives for the Papr SDK builder API.
 
 Provides type-safe property references, search mode helpers, and descriptors
-for defining node schemas with full IDE support.
+for defining node schemas with full IDE support. ``Auto``, ``SearchMode`` and
+``PropertyRef`` are immutable and hashable, and cache what they compile to.
 """
 
 from typing import Any, Dict, List, Tuple, Union, Optional
 
+from ._frozen import Frozen
 
-class Auto:
+
+class Auto(Frozen):
     """Sentinel indicating the LLM should extract this value from content.
 
     Optionally accepts a prompt to guide extraction::
@@ -24,8 +27,15 @@ class Auto:
     Serializes to ``{"mode": "auto"}`` (or ``{"mode": "auto", "prompt": "..."}``).
     """
 
+    __slots__ = ("prompt",)
+
+    prompt: Optional[str]
+
     def __init__(self, prompt: Optional[str] = None) -> None:
-        self.prompt = prompt
+        self._init(prompt=prompt)
+
+    def _args(self) -> Tuple[Any, ...]:
+        return (self.prompt,)
 
     def __repr__(self) -> str:
         if self.prompt is not None:
@@ -36,27 +46,37 @@ class Auto:
         return True
 
     def to_dict(self) -> Dict[str, str]:
+        return self._compile("dict", self._build_dict)
+
+    def _build_dict(self) -> Dict[str, str]:
         result: Dict[str, str] = {"mode": "auto"}
         if self.prompt is not None:
             result["prompt"] = self.prompt
         return result
 
 
-class SearchMode:
+class SearchMode(Frozen):
     """Describes how a property should be matched during node search.
 
     Not typically constructed directly - use ``exact()``, ``semantic()``, or ``fuzzy()``.
     """
 
+    __slots__ = ("mode", "threshold", "value")
+
+    mode: str
+    threshold: Optional[float]
+    value: object
+
     def __init__(
         self,
         mode: str,
         threshold: Optional[float] = None,
         value: object = None,
     ) -> None:
-        self.mode = mode
-        self.threshold = threshold
-        self.value = value
+        self._init(mode=mode, threshold=threshold, value=value)
+
+    def _args(self) -> Tuple[Any, ...]:
+        return (self.mode, self.threshold, self.value)
 
     def __repr__(self) -> str:
         parts = [f"mode={self.mode!r}"]
@@ -68,6 +88,9 @@ class SearchMode:
 
     def to_search_property(self, name: str) -> Dict[str, Any]:
         """Convert to a SearchConfigInput.Property dict."""
+        return self._compile(f"search:{name}", lambda: self._build_search_property(name))
+
+    def _build_search_property(self, name: str) -> Dict[str, Any]:
         result: Dict[str, Any] = {"name": name, "mode": self.mode}
         if self.threshold is not None:
             result["threshold"] = self.threshold
@@ -108,7 +131,7 @@ def fuzzy(threshold: float = 0.80, value: object = None) -> SearchMode:
     return SearchMode("fuzzy", threshold=threshold, value=value)
 
 
-class PropertyRef:
+class PropertyRef(Frozen):
     """Type-safe reference to a property on a node type.
 
     Created automatically when accessing properties on ``@node``-decorated classes::
@@ -119,6 +142,14 @@ class PropertyRef:
     Used with ``build_link_to()`` to generate ``link_to`` DSL strings.
     """
 
+    __slots__ = ("_node_type", "_prop_name", "_mode", "_threshold", "_value")
+
+    _node_type: str
+    _prop_name: str
+    _mode: Optional[str]
+    _threshold: Optional[float]
+    _value: object
+
     def __init__(
         self,
         node_type: str,
@@ -127,11 +158,10 @@ class PropertyRef:
         threshold: Optional[float] = None,
         value: object = None,
     ) -> None:
-        self._node_type = node_type
-        self._prop_name = prop_name
-        self._mode = mode
-        self._threshold = threshold
-        self._value = value
+        self._init(_node_type=node_type, _prop_name=prop_name, _mode=mode, _threshold=threshold, _value=value)
+
+    def _args(self) -> Tuple[Any, ...]:
+        return (self._node_type, self._prop_name, self._mode, self._threshold, self._value)
 
     def __repr__(self) -> str:
         return f"PropertyRef({self._node_type!r}, {self._prop_name!r})"
@@ -174,6 +204,9 @@ class PropertyRef:
             "Task:id=TASK-123"
             "Task:title~auth bug"
         """
+        return self._compile("link_to", self._build_link_to_string)
+
+    def _build_link_to_string(self) -> str:
         base = f"{self._node_type}:{self._prop_name}"
         if self._value is not None:
             if self._mode == "exact":
@@ -184,6 +217,9 @@ class PropertyRef:
 
     def to_search_property(self) -> Dict[str, Any]:
         """Convert to a SearchConfigInput.Property dict."""
+        return self._compile("search", self._build_search_property)
+
+    def _build_search_property(self) -> Dict[str, Any]:
         result: Dict[str, Any] = {"name": self._prop_name}
         if self._mode is not None:
             result["mode"] = self._mode
@@ -218,16 +254,21 @@ class PropDescriptor:
         self.search = search
         self._name: Optional[str] = None
         self._owner_name: Optional[str] = None
+        # PropertyRefs are immutable, so one per owner class is handed out on every access
+        self._refs: Dict[str, PropertyRef] = {}
 
     def __set_name__(self, owner: type, name: str) -> None:
         self._name = name
         self._owner_name = owner.__name__
+        self._refs.clear()
 
     def __get__(self, obj: Any, objtype: Optional[type] = None) -> "PropertyRef":
         """Return a PropertyRef when accessed on the class."""
-        owner = objtype if objtype is not None else type(obj)
-        name = self._name or ""
-        return PropertyRef(owner.__name__, name)
+        owner = (objtype if objtype is not None else type(obj)).__name__
+        ref = self._refs.get(owner)
+        if ref is None:
+            ref = self._refs[owner] = PropertyRef(owner, self._name or "")
+        return ref
 
     def __repr__(self) -> str:
         return f"PropDescriptor(name={self._name!r}, type={self.type!r})"
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Mapping, Optional, cast
+import os
+from typing import Any, Mapping, Callable, Iterable, Iterator, Optional, AsyncIterator, cast
 from typing_extensions import Literal
 
 import httpx
@@ -10,7 +11,7 @@ import httpx
 from ..types import document_upload_params
 from .._files import deepcopy_with_paths
 from .._types import Body, Omit, Query, Headers, NotGiven, FileTypes, omit, not_given
-from .._utils import extract_files, path_template, maybe_transform, async_maybe_transform
+from .._utils import asyncify, extract_files, path_template, maybe_transform, async_maybe_transform
 from .._compat import cached_property
 from .._resource import SyncAPIResource, AsyncAPIResource
 from .._response import (
@@ -20,6 +21,15 @@ from .._response import (
     async_to_streamed_response_wrapper,
 )
 from .._base_client import make_request_options
+from .._document_ingest import IngestResult, ingest_many, async_ingest_many
+from .._resumable_upload import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_CONCURRENCY,
+    UploadLedger,
+    ResumableUpload,
+    AsyncResumableUpload,
+    plan_upload,
+)
 from ..types.document_upload_response import DocumentUploadResponse
 from ..types.document_get_status_response import DocumentGetStatusResponse
 from ..types.document_cancel_processing_response import DocumentCancelProcessingResponse
@@ -214,6 +224,95 @@ class DocumentResource(SyncAPIResource):
             cast_to=DocumentUploadResponse,
         )
 
+    def ingest_many(
+        self,
+        paths: Iterable[str | os.PathLike[str]],
+        *,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        **params: Any,
+    ) -> Iterator[IngestResult]:
+        """
+        Upload many documents and yield each one as soon as its processing finishes.
+
+        At most `concurrency` uploads run at a time. Accepted uploads are tracked by a single
+        polling scheduler: each document is checked again after `poll_interval` seconds, with the
+        interval growing with the document's age up to `max_poll_interval`, and checks that come
+        due together are sent as one batch. Upload errors are reported as results with
+        `state="upload_failed"` rather than raised.
+
+        Stopping early (`break`, an exception or Ctrl-C) cancels processing of every document
+        that has not finished yet via `cancel_processing`.
+
+        Args:
+          paths: Files to upload.
+
+          concurrency: Maximum number of uploads in flight.
+
+          poll_interval: Initial (and minimum) seconds between status checks of a document.
+
+          max_poll_interval: Upper bound for the status check interval.
+
+          **params: Any other `upload` parameter, applied to every document.
+        """
+        return ingest_many(
+            self,
+            paths,
+            concurrency=concurrency,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+            params=params,
+        )
+
+    def upload_resumable(
+        self,
+        *,
+        file: str | os.PathLike[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        resume: bool = True,
+        chunked: bool = False,
+        **params: Any,
+    ) -> DocumentUploadResponse:
+        """
+        Upload a document from disk, skipping files the local upload ledger has already seen.
+
+        By default the file is sent as one streamed `upload` request. With `chunked=True` it
+        is sent in content-addressed chunks over parallel connections, using upload session
+        endpoints that are not part of the published API: only enable it for servers that
+        implement them. If a chunked upload fails part-way, calling this again with the same
+        file and parameters re-sends only the chunks the server has not acknowledged, and a
+        file the server already knows is not sent again. Servers without the session
+        endpoints receive a single streamed `upload` request instead.
+
+        Args:
+          file: Path of the document to upload.
+
+          chunk_size: Bytes per chunk; at most `concurrency` chunks are held in memory.
+
+          concurrency: Number of chunks uploaded at the same time.
+
+          on_progress: Called with `(bytes_sent, total_bytes)` as bytes are sent.
+
+          resume: Record sessions and completed uploads in the local ledger
+              (`PAPR_UPLOAD_LEDGER`) so interrupted uploads resume and repeated uploads are skipped.
+
+          chunked: Use the resumable chunked upload protocol.
+
+          **params: Any other `upload` parameter, e.g. `namespace_id` or `enable_holographic`.
+        """
+        return ResumableUpload(
+            self,
+            plan_upload(file, chunk_size),
+            params,
+            concurrency=concurrency,
+            ledger=UploadLedger() if resume else None,
+            on_progress=on_progress,
+            chunked=chunked,
+        ).run()
+
 
 class AsyncDocumentResource(AsyncAPIResource):
     @cached_property
@@ -402,6 +501,97 @@ class AsyncDocumentResource(AsyncAPIResource):
             cast_to=DocumentUploadResponse,
         )
 
+    def ingest_many(
+        self,
+        paths: Iterable[str | os.PathLike[str]],
+        *,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        **params: Any,
+    ) -> AsyncIterator[IngestResult]:
+        """
+        Upload many documents and yield each one as soon as its processing finishes.
+
+        At most `concurrency` uploads run at a time. Accepted uploads are tracked by a single
+        polling scheduler: each document is checked again after `poll_interval` seconds, with the
+        interval growing with the document's age up to `max_poll_interval`, and checks that come
+        due together are sent as one batch. Upload errors are reported as results with
+        `state="upload_failed"` rather than raised.
+
+        Closing the iterator early (`await results.aclose()`, or `contextlib.aclosing`) or
+        cancelling the consuming task cancels processing of every document that has not
+        finished yet via `cancel_processing`.
+
+        Args:
+          paths: Files to upload.
+
+          concurrency: Maximum number of uploads in flight.
+
+          poll_interval: Initial (and minimum) seconds between status checks of a document.
+
+          max_poll_interval: Upper bound for the status check interval.
+
+          **params: Any other `upload` parameter, applied to every document.
+        """
+        return async_ingest_many(
+            self,
+            paths,
+            concurrency=concurrency,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+            params=params,
+        )
+
+    async def upload_resumable(
+        self,
+        *,
+        file: str | os.PathLike[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        resume: bool = True,
+        chunked: bool = False,
+        **params: Any,
+    ) -> DocumentUploadResponse:
+        """
+        Upload a document from disk, skipping files the local upload ledger has already seen.
+
+        By default the file is sent as one streamed `upload` request. With `chunked=True` it
+        is sent in content-addressed chunks over parallel connections, using upload session
+        endpoints that are not part of the published API: only enable it for servers that
+        implement them. If a chunked upload fails part-way, calling this again with the same
+        file and parameters re-sends only the chunks the server has not acknowledged, and a
+        file the server already knows is not sent again. Servers without the session
+        endpoints receive a single streamed `upload` request instead.
+
+        Args:
+          file: Path of the document to upload.
+
+          chunk_size: Bytes per chunk; at most `concurrency` chunks are held in memory.
+
+          concurrency: Number of chunks uploaded at the same time.
+
+          on_progress: Called with `(bytes_sent, total_bytes)` as bytes are sent.
+
+          resume: Record sessions and completed uploads in the local ledger
+              (`PAPR_UPLOAD_LEDGER`) so interrupted uploads resume and repeated uploads are skipped.
+
+          chunked: Use the resumable chunked upload protocol.
+
+          **params: Any other `upload` parameter, e.g. `namespace_id` or `enable_holographic`.
+        """
+        plan = await asyncify(plan_upload)(file, chunk_size)
+        return await AsyncResumableUpload(
+            self,  # type: ignore[arg-type]
+            plan,
+            params,
+            concurrency=concurrency,
+            ledger=UploadLedger() if resume else None,
+            on_progress=on_progress,
+            chunked=chunked,
+        ).run()
+
 
 class DocumentResourceWithRawResponse:
     def __init__(self, document: DocumentResource) -> None:
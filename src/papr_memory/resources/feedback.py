@@ -18,6 +18,14 @@ from .._response import (
     async_to_streamed_response_wrapper,
 )
 from .._base_client import make_request_options
+from .._feedback_buffer import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_FLUSH_INTERVAL,
+    DEFAULT_MAX_QUEUE_SIZE,
+    ErrorCallback,
+    FeedbackBuffer,
+    AsyncFeedbackBuffer,
+)
 from ..types.batch_response import BatchResponse
 from ..types.feedback_response import FeedbackResponse
 from ..types.feedback_request_param import FeedbackRequestParam
@@ -229,6 +237,51 @@ class FeedbackResource(SyncAPIResource):
             cast_to=BatchResponse,
         )
 
+    def buffered(
+        self,
+        *,
+        max_batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        full_timeout: Optional[float] = None,
+        max_attempts: int = 3,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> FeedbackBuffer:
+        """
+        Create a buffer that queues feedback and sends it with `submit_batch` in the background.
+
+        `buffer.submit(...)` takes the same arguments as `submit` but only queues the event
+        and returns immediately. A batch is sent once `max_batch_size` events are queued or
+        `flush_interval` seconds after the oldest one arrived. When `max_queue_size` events
+        are waiting, `submit` blocks until there is room, or drops the event once
+        `full_timeout` seconds have passed. Batches that fail with a connection error, 429 or
+        5xx are retried up to `max_attempts` times; undeliverable events are logged and
+        passed to `on_error`. `buffer.close()` sends whatever is
+        still queued; buffers left open are drained at interpreter exit.
+
+        Args:
+          max_batch_size: Events per `submit_batch` request.
+
+          flush_interval: Longest time, in seconds, an event waits in the queue.
+
+          max_queue_size: Queued events at which `submit` starts applying backpressure.
+
+          full_timeout: Seconds `submit` waits for room before dropping the event (None waits indefinitely).
+
+          max_attempts: Attempts per batch for retryable errors.
+
+          on_error: Called with the events and the exception when a batch cannot be delivered.
+        """
+        return FeedbackBuffer(
+            self,
+            max_batch_size=max_batch_size,
+            flush_interval=flush_interval,
+            max_queue_size=max_queue_size,
+            full_timeout=full_timeout,
+            max_attempts=max_attempts,
+            on_error=on_error,
+        )
+
 
 class AsyncFeedbackResource(AsyncAPIResource):
     @cached_property
@@ -434,6 +487,51 @@ class AsyncFeedbackResource(AsyncAPIResource):
             cast_to=BatchResponse,
         )
 
+    def buffered(
+        self,
+        *,
+        max_batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        full_timeout: Optional[float] = None,
+        max_attempts: int = 3,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> AsyncFeedbackBuffer:
+        """
+        Create a buffer that queues feedback and sends it with `submit_batch` in the background.
+
+        `buffer.submit(...)` takes the same arguments as `submit` but only queues the event
+        and returns immediately. A batch is sent once `max_batch_size` events are queued or
+        `flush_interval` seconds after the oldest one arrived. When `max_queue_size` events
+        are waiting, `submit` blocks until there is room, or drops the event once
+        `full_timeout` seconds have passed. Batches that fail with a connection error, 429 or
+        5xx are retried up to `max_attempts` times; undeliverable events are logged and
+        passed to `on_error`. `await buffer.close()` sends whatever is
+        still queued and must run before the event loop stops.
+
+        Args:
+          max_batch_size: Events per `submit_batch` request.
+
+          flush_interval: Longest time, in seconds, an event waits in the queue.
+
+          max_queue_size: Queued events at which `submit` starts applying backpressure.
+
+          full_timeout: Seconds `submit` waits for room before dropping the event (None waits indefinitely).
+
+          max_attempts: Attempts per batch for retryable errors.
+
+          on_error: Called with the events and the exception when a batch cannot be delivered.
+        """
+        return AsyncFeedbackBuffer(
+            self,
+            max_batch_size=max_batch_size,
+            flush_interval=flush_interval,
+            max_queue_size=max_queue_size,
+            full_timeout=full_timeout,
+            max_attempts=max_attempts,
+            on_error=on_error,
+        )
+
 
 class FeedbackResourceWithRawResponse:
     def __init__(self, feedback: FeedbackResource) -> None:
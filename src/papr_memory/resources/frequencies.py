@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Optional
+
 import httpx
 
 from .._types import Body, Query, Headers, NotGiven, not_given
@@ -16,6 +18,7 @@ from .._response import (
 )
 from .._base_client import make_request_options
 from ..types.frequency_list_response import FrequencyListResponse
+from .._schema_registry import schema_registry, async_schema_registry
 from ..types.frequency_retrieve_response import FrequencyRetrieveResponse
 
 __all__ = ["FrequenciesResource", "AsyncFrequenciesResource"]
@@ -100,6 +103,16 @@ class FrequenciesResource(SyncAPIResource):
             cast_to=FrequencyListResponse,
         )
 
+    def lookup(self, frequency_schema_id: str) -> Optional[FrequencyRetrieveResponse]:
+        """Look up a frequency schema by full ID, shorthand alias or domain, from memory.
+
+        Schemas come from a process-wide registry that is loaded with `list` on first use
+        and refreshed in the background every `PAPR_SCHEMA_CACHE_TTL` seconds. Schemas
+        missing from the list (e.g. custom domains) are fetched once with `retrieve`.
+        Returns None if the server does not know the schema.
+        """
+        return schema_registry(self._client).lookup(self._client, frequency_schema_id)
+
 
 class AsyncFrequenciesResource(AsyncAPIResource):
     @cached_property
@@ -180,6 +193,17 @@ class AsyncFrequenciesResource(AsyncAPIResource):
             cast_to=FrequencyListResponse,
         )
 
+    async def lookup(self, frequency_schema_id: str) -> Optional[FrequencyRetrieveResponse]:
+        """Look up a frequency schema by full ID, shorthand alias or domain, from memory.
+
+        Schemas come from a process-wide registry that is loaded with `list` on first use
+        and refreshed in the background every `PAPR_SCHEMA_CACHE_TTL` seconds. Schemas
+        missing from the list (e.g. custom domains) are fetched once with `retrieve`.
+        Returns None if the server does not know the schema.
+        """
+        registry = await async_schema_registry(self._client)
+        return await registry.async_lookup(self._client, frequency_schema_id)
+
 
 class FrequenciesResourceWithRawResponse:
     def __init__(self, frequencies: FrequenciesResource) -> None:
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Any, List, Tuple, Union, Mapping, Iterable, Optional
+
 import httpx
 
 from .._types import Body, Query, Headers, NotGiven, not_given
@@ -14,6 +16,7 @@ from .._response import (
     async_to_streamed_response_wrapper,
 )
 from .._base_client import make_request_options
+from .._graphql_client import GraphQLRequest, GraphQLResponse, execute_graphql, async_execute_graphql
 
 __all__ = ["GraphqlResource", "AsyncGraphqlResource"]
 
@@ -111,6 +114,46 @@ class GraphqlResource(SyncAPIResource):
             cast_to=object,
         )
 
+    def execute(
+        self,
+        query: str,
+        variables: Optional[Mapping[str, Any]] = None,
+        *,
+        operation_name: Optional[str] = None,
+        result_type: Optional[type] = None,
+        cache_ttl: Optional[float] = None,
+        persisted_queries: bool = False,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> GraphQLResponse:
+        """
+        Execute one GraphQL operation and decode its result.
+
+        With `persisted_queries=True` the query is sent as an automatic persisted query (its
+        SHA-256 hash), falling back to the full text when the server does not know it or does
+        not support persisted queries. With `cache_ttl`, successful results are cached
+        locally for that many seconds per query and variables. `data` is decoded into
+        attribute-accessible `GraphQLObject`s, or constructed as `result_type` (a `BaseModel`
+        subclass) without validation. GraphQL errors are returned on the response; call
+        `raise_for_errors()` to raise them.
+        """
+        request = GraphQLRequest(query, variables, operation_name, result_type, cache_ttl, persisted_queries)
+        return execute_graphql(self, [request], timeout=timeout)[0]
+
+    def execute_batch(
+        self,
+        requests: Iterable[Union[GraphQLRequest, str, Tuple[Any, ...]]],
+        *,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> List[GraphQLResponse]:
+        """
+        Like `execute`, for several operations sent together in one HTTP request.
+
+        Cached results are served locally and the rest are posted as one JSON array; if the
+        server does not accept batches they are sent one by one. Responses are returned in
+        the order of `requests`.
+        """
+        return execute_graphql(self, requests, timeout=timeout)
+
 
 class AsyncGraphqlResource(AsyncAPIResource):
     @cached_property
@@ -205,6 +248,46 @@ class AsyncGraphqlResource(AsyncAPIResource):
             cast_to=object,
         )
 
+    async def execute(
+        self,
+        query: str,
+        variables: Optional[Mapping[str, Any]] = None,
+        *,
+        operation_name: Optional[str] = None,
+        result_type: Optional[type] = None,
+        cache_ttl: Optional[float] = None,
+        persisted_queries: bool = False,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> GraphQLResponse:
+        """
+        Execute one GraphQL operation and decode its result.
+
+        With `persisted_queries=True` the query is sent as an automatic persisted query (its
+        SHA-256 hash), falling back to the full text when the server does not know it or does
+        not support persisted queries. With `cache_ttl`, successful results are cached
+        locally for that many seconds per query and variables. `data` is decoded into
+        attribute-accessible `GraphQLObject`s, or constructed as `result_type` (a `BaseModel`
+        subclass) without validation. GraphQL errors are returned on the response; call
+        `raise_for_errors()` to raise them.
+        """
+        request = GraphQLRequest(query, variables, operation_name, result_type, cache_ttl, persisted_queries)
+        return (await async_execute_graphql(self, [request], timeout=timeout))[0]
+
+    async def execute_batch(
+        self,
+        requests: Iterable[Union[GraphQLRequest, str, Tuple[Any, ...]]],
+        *,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> List[GraphQLResponse]:
+        """
+        Like `execute`, for several operations sent together in one HTTP request.
+
+        Cached results are served locally and the rest are posted as one JSON array; if the
+        server does not accept batches they are sent one by one. Responses are returned in
+        the order of `requests`.
+        """
+        return await async_execute_graphql(self, requests, timeout=timeout)
+
 
 class GraphqlResourceWithRawResponse:
     def __init__(self, graphql: GraphqlResource) -> None:
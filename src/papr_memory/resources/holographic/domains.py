@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Optional
+from typing import Any, Iterable, Optional
 
 import httpx
 
@@ -17,6 +17,7 @@ from ..._response import (
     async_to_streamed_response_wrapper,
 )
 from ..._base_client import make_request_options
+from ..._schema_registry import registry_for, validate_fields
 from ...types.holographic import domain_create_params
 from ...types.holographic.domain_list_response import DomainListResponse
 from ...types.holographic.domain_create_response import DomainCreateResponse
@@ -95,6 +96,27 @@ class DomainsResource(SyncAPIResource):
             cast_to=DomainCreateResponse,
         )
 
+    def create_validated(
+        self, *, fields: Iterable[domain_create_params.Field], **params: Any
+    ) -> DomainCreateResponse:
+        """Same as `create`, and checks `fields` first and marks the schema registry stale after.
+
+        Fields whose frequencies the server would reject (not one of the 14 standard bands,
+        a band used twice, or more than 14 fields) raise `ValueError` without a request. Once
+        the domain is created, the next `frequencies.lookup` refreshes the registry so the
+        new schema is found. See `_schema_registry`.
+
+        Args:
+          fields: Frequency field definitions, as for `create`.
+
+          **params: Any other `create` argument.
+        """
+        fields = list(fields)
+        validate_fields(fields)
+        response = self.create(fields=fields, **params)
+        registry_for(self._client).invalidate()
+        return response
+
     def list(
         self,
         *,
@@ -190,6 +212,27 @@ class AsyncDomainsResource(AsyncAPIResource):
             cast_to=DomainCreateResponse,
         )
 
+    async def create_validated(
+        self, *, fields: Iterable[domain_create_params.Field], **params: Any
+    ) -> DomainCreateResponse:
+        """Same as `create`, and checks `fields` first and marks the schema registry stale after.
+
+        Fields whose frequencies the server would reject (not one of the 14 standard bands,
+        a band used twice, or more than 14 fields) raise `ValueError` without a request. Once
+        the domain is created, the next `frequencies.lookup` refreshes the registry so the
+        new schema is found. See `_schema_registry`.
+
+        Args:
+          fields: Frequency field definitions, as for `create`.
+
+          **params: Any other `create` argument.
+        """
+        fields = list(fields)
+        validate_fields(fields)
+        response = await self.create(fields=fields, **params)
+        registry_for(self._client).invalidate()
+        return response
+
     async def list(
         self,
         *,
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Optional
 
 import httpx
 
@@ -16,7 +16,7 @@ from .domains import (
     AsyncDomainsResourceWithStreamingResponse,
 )
 from ..._types import Body, Omit, Query, Headers, NotGiven, omit, not_given
-from ..._utils import maybe_transform, async_maybe_transform
+from ..._utils import asyncify, maybe_transform, async_maybe_transform
 from ..._compat import cached_property
 from .transform import (
     TransformResource,
@@ -34,6 +34,17 @@ from ..._response import (
     async_to_streamed_response_wrapper,
 )
 from ..._base_client import make_request_options
+from ..._local_rerank import (
+    DEFAULT_PHASE_WEIGHT,
+    needs_schema,
+    note_fallback,
+    score_locally,
+    schema_id_for,
+    resolve_schema,
+    fallback_reason,
+    async_resolve_schema,
+)
+from ..._transform_cache import enrich_rerank
 from ...types.holographic_rerank_response import HolographicRerankResponse
 from ...types.holographic_extract_metadata_response import HolographicExtractMetadataResponse
 
@@ -203,6 +214,120 @@ class HolographicResource(SyncAPIResource):
             cast_to=HolographicRerankResponse,
         )
 
+    def rerank_cached(
+        self, *, candidates: Iterable[holographic_rerank_params.Candidate], query: str, **params: Any
+    ) -> HolographicRerankResponse:
+        """Same as `rerank`, and fills in `phases` and `metadata_embeddings` recorded by earlier transforms.
+
+        Candidates and a query whose content was transformed by the same account with
+        `transform.create_cached`, `create_batch_cached` or `create_many` (same context
+        metadata and schema) are sent with the recorded `phases` and `metadata_embeddings`
+        (`query_phases` and `query_metadata_embeddings` for the query), so they take the fast
+        path. Values passed explicitly are kept. See `_transform_cache`.
+
+        Args:
+          candidates: Candidates to rerank, as for `rerank`.
+
+          query: The query, as for `rerank`.
+
+          **params: Any other `rerank` argument.
+        """
+        candidates, params["query_phases"], params["query_metadata_embeddings"] = enrich_rerank(
+            self._client,
+            candidates,
+            query,
+            query_phases=params.get("query_phases", omit),
+            query_metadata_embeddings=params.get("query_metadata_embeddings", omit),
+            domain=params.get("domain", omit),
+            frequency_schema_id=params.get("frequency_schema_id", omit),
+        )
+        return self.rerank(candidates=candidates, query=query, **params)
+
+    def rerank_local(
+        self,
+        *,
+        candidates: Iterable[holographic_rerank_params.Candidate],
+        query: str,
+        domain: Optional[str] | Omit = omit,
+        frequency_schema_id: Optional[str] | Omit = omit,
+        options: Optional[holographic_rerank_params.Options] | Omit = omit,
+        query_embedding: Optional[Iterable[float]] | Omit = omit,
+        query_metadata_embeddings: Optional[Dict[str, Iterable[float]]] | Omit = omit,
+        query_phases: Optional[Iterable[float]] | Omit = omit,
+        top_k: int | Omit = omit,
+        phase_weight: float = DEFAULT_PHASE_WEIGHT,
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> HolographicRerankResponse:
+        """Rank fast-path candidates locally with NumPy, using an approximation of `rerank`'s scoring.
+
+        This is not a substitute for `rerank`: the local formula is reconstructed from the
+        server's documented fast path and has not been verified against it, so scores and
+        rankings may differ. When the query has `query_embedding` and `query_phases` and
+        every candidate has `embedding` and `phases` (given, or filled in from earlier
+        transforms), cosine similarity and per-frequency phase alignment are computed
+        in-process, honouring `options.frequency_filters`, `options.return_scores`,
+        `options.include_frequency_scores` and `top_k`. Rankings report
+        `ensemble_used="local_hcond"`.
+
+        Anything the local scorer cannot reproduce (cold-path candidates, cross-encoder
+        scoring, a specific `scoring_method` or ensemble, NumPy not installed) is sent to
+        `rerank` unchanged.
+
+        Args:
+          phase_weight: Share of the score taken by phase alignment; the rest is cosine
+              similarity.
+        """
+        candidates, query_phases, query_metadata_embeddings = enrich_rerank(
+            self._client,
+            candidates,
+            query,
+            query_phases=query_phases,
+            query_metadata_embeddings=query_metadata_embeddings,
+            domain=domain,
+            frequency_schema_id=frequency_schema_id,
+        )
+        candidates = list(candidates)
+        reason = fallback_reason(
+            candidates, query_embedding=query_embedding, query_phases=query_phases, options=options
+        )
+        schema = None
+        schema_id = schema_id_for(domain, frequency_schema_id)
+        if reason is None and schema_id is not None:
+            schema = resolve_schema(self._client.frequencies, schema_id)
+        if reason is None and schema is None and needs_schema(options):
+            reason = "frequency_filters need the frequency schema"
+        if reason is not None:
+            note_fallback(reason)
+            return self.rerank(
+                candidates=candidates,
+                query=query,
+                domain=domain,
+                frequency_schema_id=frequency_schema_id,
+                options=options,
+                query_embedding=query_embedding,
+                query_metadata_embeddings=query_metadata_embeddings,
+                query_phases=query_phases,
+                top_k=top_k,
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+                timeout=timeout,
+            )
+        return score_locally(
+            candidates,
+            query_embedding=query_embedding,  # type: ignore[arg-type]
+            query_phases=query_phases,
+            query_metadata_embeddings=query_metadata_embeddings,
+            domain=domain,
+            options=options,
+            top_k=top_k,
+            schema=schema,
+            phase_weight=phase_weight,
+        )
+
 
 class AsyncHolographicResource(AsyncAPIResource):
     @cached_property
@@ -367,6 +492,120 @@ class AsyncHolographicResource(AsyncAPIResource):
             cast_to=HolographicRerankResponse,
         )
 
+    async def rerank_cached(
+        self, *, candidates: Iterable[holographic_rerank_params.Candidate], query: str, **params: Any
+    ) -> HolographicRerankResponse:
+        """Same as `rerank`, and fills in `phases` and `metadata_embeddings` recorded by earlier transforms.
+
+        Candidates and a query whose content was transformed by the same account with
+        `transform.create_cached`, `create_batch_cached` or `create_many` (same context
+        metadata and schema) are sent with the recorded `phases` and `metadata_embeddings`
+        (`query_phases` and `query_metadata_embeddings` for the query), so they take the fast
+        path. Values passed explicitly are kept. See `_transform_cache`.
+
+        Args:
+          candidates: Candidates to rerank, as for `rerank`.
+
+          query: The query, as for `rerank`.
+
+          **params: Any other `rerank` argument.
+        """
+        candidates, params["query_phases"], params["query_metadata_embeddings"] = await asyncify(enrich_rerank)(
+            self._client,
+            candidates,
+            query,
+            query_phases=params.get("query_phases", omit),
+            query_metadata_embeddings=params.get("query_metadata_embeddings", omit),
+            domain=params.get("domain", omit),
+            frequency_schema_id=params.get("frequency_schema_id", omit),
+        )
+        return await self.rerank(candidates=candidates, query=query, **params)
+
+    async def rerank_local(
+        self,
+        *,
+        candidates: Iterable[holographic_rerank_params.Candidate],
+        query: str,
+        domain: Optional[str] | Omit = omit,
+        frequency_schema_id: Optional[str] | Omit = omit,
+        options: Optional[holographic_rerank_params.Options] | Omit = omit,
+        query_embedding: Optional[Iterable[float]] | Omit = omit,
+        query_metadata_embeddings: Optional[Dict[str, Iterable[float]]] | Omit = omit,
+        query_phases: Optional[Iterable[float]] | Omit = omit,
+        top_k: int | Omit = omit,
+        phase_weight: float = DEFAULT_PHASE_WEIGHT,
+        extra_headers: Headers | None = None,
+        extra_query: Query | None = None,
+        extra_body: Body | None = None,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    ) -> HolographicRerankResponse:
+        """Rank fast-path candidates locally with NumPy, using an approximation of `rerank`'s scoring.
+
+        This is not a substitute for `rerank`: the local formula is reconstructed from the
+        server's documented fast path and has not been verified against it, so scores and
+        rankings may differ. When the query has `query_embedding` and `query_phases` and
+        every candidate has `embedding` and `phases` (given, or filled in from earlier
+        transforms), cosine similarity and per-frequency phase alignment are computed
+        in-process, honouring `options.frequency_filters`, `options.return_scores`,
+        `options.include_frequency_scores` and `top_k`. Rankings report
+        `ensemble_used="local_hcond"`.
+
+        Anything the local scorer cannot reproduce (cold-path candidates, cross-encoder
+        scoring, a specific `scoring_method` or ensemble, NumPy not installed) is sent to
+        `rerank` unchanged.
+
+        Args:
+          phase_weight: Share of the score taken by phase alignment; the rest is cosine
+              similarity.
+        """
+        candidates, query_phases, query_metadata_embeddings = await asyncify(enrich_rerank)(
+            self._client,
+            candidates,
+            query,
+            query_phases=query_phases,
+            query_metadata_embeddings=query_metadata_embeddings,
+            domain=domain,
+            frequency_schema_id=frequency_schema_id,
+        )
+        candidates = list(candidates)
+        reason = fallback_reason(
+            candidates, query_embedding=query_embedding, query_phases=query_phases, options=options
+        )
+        schema = None
+        schema_id = schema_id_for(domain, frequency_schema_id)
+        if reason is None and schema_id is not None:
+            schema = await async_resolve_schema(self._client.frequencies, schema_id)
+        if reason is None and schema is None and needs_schema(options):
+            reason = "frequency_filters need the frequency schema"
+        if reason is not None:
+            note_fallback(reason)
+            return await self.rerank(
+                candidates=candidates,
+                query=query,
+                domain=domain,
+                frequency_schema_id=frequency_schema_id,
+                options=options,
+                query_embedding=query_embedding,
+                query_metadata_embeddings=query_metadata_embeddings,
+                query_phases=query_phases,
+                top_k=top_k,
+                extra_headers=extra_headers,
+                extra_query=extra_query,
+                extra_body=extra_body,
+                timeout=timeout,
+            )
+        return score_locally(
+            candidates,
+            query_embedding=query_embedding,  # type: ignore[arg-type]
+            query_phases=query_phases,
+            query_metadata_embeddings=query_metadata_embeddings,
+            domain=domain,
+            options=options,
+            top_k=top_k,
+            schema=schema,
+            phase_weight=phase_weight,
+        )
+
 
 class HolographicResourceWithRawResponse:
     def __init__(self, holographic: HolographicResource) -> None:
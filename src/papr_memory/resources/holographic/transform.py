@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Iterable, Optional
+from typing import Any, Dict, List, Iterable, Iterator, Optional, AsyncIterator
 from typing_extensions import Literal
 
 import httpx
 
 from ..._types import Body, Omit, Query, Headers, NotGiven, omit, not_given
-from ..._utils import maybe_transform, async_maybe_transform
+from ..._utils import asyncify, maybe_transform, async_maybe_transform
 from ..._compat import cached_property
 from ..._resource import SyncAPIResource, AsyncAPIResource
 from ..._response import (
@@ -18,9 +18,11 @@ from ..._response import (
     async_to_streamed_response_wrapper,
 )
 from ..._base_client import make_request_options
+from ..._transform_cache import record_transform, record_transform_batch
+from ..._bulk_transform import MAX_BATCH_SIZE, transform_many, async_transform_many
 from ...types.holographic import transform_create_params, transform_create_batch_params
 from ...types.holographic.transform_create_response import TransformCreateResponse
-from ...types.holographic.transform_create_batch_response import TransformCreateBatchResponse
+from ...types.holographic.transform_create_batch_response import Result, TransformCreateBatchResponse
 
 __all__ = ["TransformResource", "AsyncTransformResource"]
 
@@ -190,6 +192,86 @@ class TransformResource(SyncAPIResource):
             cast_to=TransformCreateBatchResponse,
         )
 
+    def create_cached(self, *, content: str, **params: Any) -> TransformCreateResponse:
+        """Same as `create`, and remembers the returned `phases` and `metadata_embeddings`.
+
+        `holographic.rerank_cached` fills them into later candidates and queries with the
+        same content, context metadata and schema, so those take the fast path. Nothing is
+        remembered unless `output` includes `phases`. See `_transform_cache`.
+
+        Args:
+          content: Text to transform.
+
+          **params: Any other `create` argument.
+        """
+        response = self.create(content=content, **params)
+        record_transform(
+            self._client,
+            response,
+            content,
+            domain=params.get("domain"),
+            frequency_schema_id=params.get("frequency_schema_id"),
+            context_metadata=params.get("context_metadata"),
+        )
+        return response
+
+    def create_batch_cached(
+        self, *, items: Iterable[transform_create_batch_params.Item], **params: Any
+    ) -> TransformCreateBatchResponse:
+        """Same as `create_batch`, and remembers each item's outputs like `create_cached`.
+
+        Args:
+          items: Items to transform (max 50).
+
+          **params: Any other `create_batch` argument.
+        """
+        items = list(items)
+        response = self.create_batch(items=items, **params)
+        record_transform_batch(
+            self._client,
+            response,
+            items,
+            domain=params.get("domain"),
+            frequency_schema_id=params.get("frequency_schema_id"),
+        )
+        return response
+
+    def create_many(
+        self,
+        items: Iterable[transform_create_batch_params.Item],
+        *,
+        batch_size: int = MAX_BATCH_SIZE,
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        **params: Any,
+    ) -> Iterator[Result]:
+        """Transform any number of items, streaming the results back in input order.
+
+        Items are sent as `create_batch_cached` requests of up to 50, with at most `concurrency`
+        requests in flight; the input iterable is consumed lazily. A sub-batch that fails
+        with a connection error, 429 or 5xx, or that comes back with items missing, is
+        retried on its own (only the missing items) up to `max_attempts` times.
+
+        Args:
+          items: Items to transform; ids should be unique.
+
+          batch_size: Items per request (1-50).
+
+          concurrency: Maximum number of batch requests in flight.
+
+          max_attempts: Attempts per sub-batch before its error is raised.
+
+          **params: `domain`, `frequency_schema_id` and `output`, applied to every batch.
+        """
+        return transform_many(
+            self,
+            items,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            max_attempts=max_attempts,
+            params=params,
+        )
+
 
 class AsyncTransformResource(AsyncAPIResource):
     @cached_property
@@ -356,6 +438,86 @@ class AsyncTransformResource(AsyncAPIResource):
             cast_to=TransformCreateBatchResponse,
         )
 
+    async def create_cached(self, *, content: str, **params: Any) -> TransformCreateResponse:
+        """Same as `create`, and remembers the returned `phases` and `metadata_embeddings`.
+
+        `holographic.rerank_cached` fills them into later candidates and queries with the
+        same content, context metadata and schema, so those take the fast path. Nothing is
+        remembered unless `output` includes `phases`. See `_transform_cache`.
+
+        Args:
+          content: Text to transform.
+
+          **params: Any other `create` argument.
+        """
+        response = await self.create(content=content, **params)
+        await asyncify(record_transform)(
+            self._client,
+            response,
+            content,
+            domain=params.get("domain"),
+            frequency_schema_id=params.get("frequency_schema_id"),
+            context_metadata=params.get("context_metadata"),
+        )
+        return response
+
+    async def create_batch_cached(
+        self, *, items: Iterable[transform_create_batch_params.Item], **params: Any
+    ) -> TransformCreateBatchResponse:
+        """Same as `create_batch`, and remembers each item's outputs like `create_cached`.
+
+        Args:
+          items: Items to transform (max 50).
+
+          **params: Any other `create_batch` argument.
+        """
+        items = list(items)
+        response = await self.create_batch(items=items, **params)
+        await asyncify(record_transform_batch)(
+            self._client,
+            response,
+            items,
+            domain=params.get("domain"),
+            frequency_schema_id=params.get("frequency_schema_id"),
+        )
+        return response
+
+    def create_many(
+        self,
+        items: Iterable[transform_create_batch_params.Item],
+        *,
+        batch_size: int = MAX_BATCH_SIZE,
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        **params: Any,
+    ) -> AsyncIterator[Result]:
+        """Transform any number of items, streaming the results back in input order.
+
+        Items are sent as `create_batch_cached` requests of up to 50, with at most `concurrency`
+        requests in flight; the input iterable is consumed lazily. A sub-batch that fails
+        with a connection error, 429 or 5xx, or that comes back with items missing, is
+        retried on its own (only the missing items) up to `max_attempts` times.
+
+        Args:
+          items: Items to transform; ids should be unique.
+
+          batch_size: Items per request (1-50).
+
+          concurrency: Maximum number of batch requests in flight.
+
+          max_attempts: Attempts per sub-batch before its error is raised.
+
+          **params: `domain`, `frequency_schema_id` and `output`, applied to every batch.
+        """
+        return async_transform_many(
+            self,
+            items,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            max_attempts=max_attempts,
+            params=params,
+        )
+
 
 class TransformResourceWithRawResponse:
     def __init__(self, transform: TransformResource) -> None:
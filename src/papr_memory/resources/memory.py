@@ -26,6 +26,11 @@ from papr_memory.types import (
     memory_add_batch_params,
     memory_delete_all_params,
 )
+from papr_memory._ondevice import OnDevice, AsyncOnDevice, lifecycle as _ondevice_lifecycle
+from papr_memory._index_manifest import IndexManifest
+from papr_memory._tier0_filter import Tier0Filter, UnsupportedFilter
+from papr_memory._tier0_tenants import TenantKey, Tier0Index, tenant_key, tier0_records, tier0_tenants, tier0_vectors
+from papr_memory.lib._embedders import Embedder, as_embedder, create_embedder
 from papr_memory._base_client import make_request_options
 from papr_memory.types.search_response import SearchResponse
 from papr_memory.types.add_memory_param import AddMemoryParam
@@ -82,11 +87,22 @@ _global_sync_lock: Optional[threading.Lock] = None
 _background_sync_task: Optional[threading.Thread] = None
 _background_model_loading_task: Optional[threading.Thread] = None
 _background_initialization_task: Optional[threading.Thread] = None
-_model_loading_complete = False
-_model_loading_callback = None
+_global_query_batcher: Optional[object] = None
+_global_query_batcher_embedder: Optional[object] = None
+_global_query_batcher_lock = threading.Lock()
+_background_index_rebuild_task: Optional[threading.Thread] = None
+_background_index_rebuild_lock = threading.Lock()
 _sync_interval = int(os.environ.get("PAPR_SYNC_INTERVAL", "300"))  # 5 minutes default
 
 
+def _expected_embedding_dimensions() -> int:
+    """Dimension of local tier0 vectors: Qwen3-4B (2560) unless ONNX Matryoshka truncation is configured"""
+    from papr_memory._onnx_embedder import onnx_enabled, get_matryoshka_dimensions
+
+    dims = get_matryoshka_dimensions() if onnx_enabled() else None
+    return dims or 2560
+
+
 class MemoryResource(SyncAPIResource):
     @cached_property
     def with_raw_response(self) -> MemoryResourceWithRawResponse:
@@ -107,6 +123,11 @@ class MemoryResource(SyncAPIResource):
         """
         return MemoryResourceWithStreamingResponse(self)
 
+    @cached_property
+    def ondevice(self) -> OnDevice:
+        """Warm-up and readiness controls for on-device search (see `OnDevice`)."""
+        return OnDevice(self)
+
     def update(
         self,
         memory_id: str,
@@ -976,6 +997,33 @@ class MemoryResource(SyncAPIResource):
             else:
                 logger.error(f"Sync_tiers failed with error: {e}")
 
+    def _sync_tier0_tenant(self, tenant: TenantKey) -> Tier0Index | None:
+        """Fetch one tenant's tier0 and build its local index (runs on the tenant store's sync workers)"""
+        embedder = self._resolve_query_embedder()
+        if embedder is None:
+            return None
+        try:
+            max_tier0 = int(os.environ.get("PAPR_MAX_TIER0", "30"))
+        except ValueError:
+            max_tier0 = 30
+        # The typed endpoint sends the tenant ids as declared fields, so the server scopes the tiers to them
+        sync_response = self._client.sync.get_tiers(
+            external_user_id=tenant.external_user_id or omit,
+            user_id=tenant.user_id or omit,
+            namespace_id=tenant.namespace_id or omit,
+            organization_id=tenant.organization_id or omit,
+            include_embeddings=True,
+            embed_limit=max_tier0,
+            max_tier0=max_tier0,
+            max_tier1=0,
+            timeout=60.0,
+        )
+        tier0_data = [item.to_dict(mode="json") for item in sync_response.tier0 or []]
+        manifest = IndexManifest.for_embedder(embedder, dimensions=self._expected_embedding_dimensions())
+        ids, documents, metadatas = tier0_records(tier0_data)
+        vectors = tier0_vectors(tier0_data, documents, embedder, dimensions=manifest.dimensions)
+        return Tier0Index.build(ids, documents, metadatas, vectors, manifest)
+
     def _is_old_platform(self) -> bool:
         """Detect if platform is too old for efficient local processing"""
         from papr_memory._logging import get_logger
@@ -1064,92 +1112,9 @@ class MemoryResource(SyncAPIResource):
             enable_coreml = os.environ.get("PAPR_ENABLE_COREML", "false").lower() in ("true", "1", "yes", "on")
             if ("Apple" in device_name or device == "mps") and enable_coreml:
                 try:
-                    import numpy as np  # type: ignore
-                    import coremltools as ct  # type: ignore
-                    from transformers import AutoTokenizer  # type: ignore
-
-                    from papr_memory._model_cache import resolve_coreml_model_path
-
-                    # Auto-download from HuggingFace if not found locally
-                    coreml_path_env = os.environ.get("PAPR_COREML_MODEL")
-                    coreml_path = resolve_coreml_model_path(coreml_path_env)
-                    tok_id = os.environ.get("PAPR_EMBEDDING_MODEL", "Qwen/Qwen3-Embedding-4B")
-
-                    logger.info(f"Loading Core ML model from {coreml_path}")
-                    # Use ALL compute units to enable Neural Engine (ANE) for fast inference
-                    mlmodel = ct.models.MLModel(coreml_path, compute_units=ct.ComputeUnit.ALL)
-                    tokenizer = AutoTokenizer.from_pretrained(tok_id)
-
-                    class CoreMLEmbeddingFunction:
-                        def __init__(self, model: object, tokenizer: object):
-                            self.model = model
-                            self.tokenizer = tokenizer
-
-                        def _encode(self, texts: list[str]) -> list[list[float]]:
-                            # Normalize inputs to list[str]
-                            if isinstance(texts, str):
-                                texts = [texts]
-                            texts = ["" if t is None else str(t) for t in texts]
-
-                            # Use fixed padding to match Core ML conversion (max_length=32)
-                            enc = tokenizer(
-                                texts,
-                                padding="max_length",
-                                max_length=32,
-                                truncation=True,
-                                return_tensors="np",
-                            )
-                            # Core ML expects int32 inputs typically
-                            feed = {
-                                "input_ids": enc["input_ids"].astype(np.int32),
-                                "attention_mask": enc["attention_mask"].astype(np.int32),
-                            }
-                            out = mlmodel.predict(feed)
-
-                            # Select the most likely embedding tensor among outputs
-                            candidates = []
-                            for v in out.values():
-                                arr = np.asarray(v)
-                                candidates.append(arr)
-
-                            # Prefer tensors with last dim == 2560, else highest last-dim, else highest ndim
-                            def score(a: np.ndarray) -> tuple[int, int, int]:  # type: ignore[name-defined]
-                                last_dim = a.shape[-1] if a.ndim >= 1 else 0
-                                return (
-                                    2 if last_dim == 2560 else (1 if a.ndim >= 2 else 0),
-                                    last_dim,
-                                    a.size,
-                                )
-
-                            best = max(candidates, key=score)
-
-                            # Pool to [batch, dim]
-                            if best.ndim == 3:
-                                pooled = best.mean(axis=1).astype(np.float32)
-                            elif best.ndim == 2:
-                                pooled = best.astype(np.float32)
-                            elif best.ndim == 1:
-                                pooled = best.astype(np.float32)[None, :]
-                            else:
-                                raise TypeError(f"Unexpected Core ML output shape: {best.shape}")
-
-                            return pooled.tolist()
-
-                        def embed_query(self, input: str) -> list[float]:
-                            return self._encode([input])[0]
-
-                        def embed_documents(self, input: list[str]) -> list[list[float]]:
-                            return self._encode(input)
-
-                        # Compatibility: some callsites expect encode() or __call__
-                        def encode(self, inputs: list[str]) -> list[list[float]]:  # type: ignore[override]
-                            return self._encode(inputs)
-
-                        def __call__(self, inputs: list[str]) -> list[list[float]]:  # type: ignore[override]
-                            return self._encode(inputs)
-
+                    coreml_func = create_embedder("coreml")
                     logger.info("Using Core ML embedding function (ANE/GPU capable)")
-                    return CoreMLEmbeddingFunction(mlmodel, tokenizer)
+                    return coreml_func
                 except Exception as coreml_e:  # pragma: no cover
                     logger.info(f"Core ML path unavailable, will try MLX/ST: {coreml_e}")
 
@@ -1157,101 +1122,22 @@ class MemoryResource(SyncAPIResource):
             enable_mlx = os.environ.get("PAPR_ENABLE_MLX", "false").lower() in ("true", "1", "yes", "on")
             if ("Apple" in device_name or device == "mps") and enable_mlx:
                 try:
-                    from mlx_lm import load as mlx_load  # type: ignore
-
-                    mlx_model_name = os.environ.get(
-                        "PAPR_EMBEDDING_MODEL", "mlx-community/Qwen3-Embedding-4B-4bit-DWQ"
-                    )
-                    logger.info(f"Attempting MLX native embedder: {mlx_model_name}")
-
-                    mlx_model, mlx_tokenizer = mlx_load(mlx_model_name)
-
-                    class MlxQwenEmbeddingFunction:  # Chroma-compatible
-                        def __init__(self, model: object, tokenizer: object):
-                            self.model = model
-                            self.tokenizer = tokenizer
-
-                        def _encode_texts(self, inputs: list[str]) -> list[list[float]]:
-                            try:
-                                # Prefer HF tokenizer for MLX models when available
-                                from typing import Any, Callable, cast
-                                try:
-                                    from transformers import AutoTokenizer  # type: ignore
-                                    hf_tok = AutoTokenizer.from_pretrained(
-                                        os.environ.get("PAPR_EMBEDDING_MODEL", "Qwen/Qwen3-Embedding-4B")
-                                    )
-                                    enc: Any = hf_tok(inputs, padding=True, truncation=True, return_tensors=None)
-                                except Exception:
-                                    if not callable(self.tokenizer):
-                                        raise TypeError("MLX tokenizer is not callable; falling back to ST embedder") from None
-                                    tok: Callable[..., Any] = cast(Callable[..., Any], self.tokenizer)
-                                    enc = tok(inputs, return_tensors=None, padding=True, truncation=True)
-                                # Some MLX models expose a nested .model; try both
-                                mdl: object = getattr(self.model, "model", self.model)
-
-                                # Request hidden states if supported
-                                if not callable(mdl):  # type: ignore[misc]
-                                    raise TypeError("MLX model is not callable; using fallback embedder")
-                                mdl_callable: Callable[..., Any] = cast(Callable[..., Any], mdl)
-                                outputs: Any = mdl_callable(
-                                    **{k: enc[k] for k in enc if isinstance(enc[k], list)},
-                                    output_hidden_states=True,
-                                )
-                                hidden: object | None = None
-                                if hasattr(outputs, "hidden_states") and outputs.hidden_states:
-                                    hidden = outputs.hidden_states[-1]
-                                elif hasattr(outputs, "last_hidden_state"):
-                                    hidden = outputs.last_hidden_state
-
-                                if hidden is None:
-                                    raise RuntimeError("MLX model did not return hidden states for pooling")
-
-                                # Normalize to ndarray then mean-pool
-                                import numpy as np  # local import to avoid global dependency changes
-                                arr = np.asarray(hidden)
-                                if arr.ndim == 3:  # [batch, seq_len, dim]
-                                    pooled = arr.mean(axis=1).tolist()
-                                elif arr.ndim == 2:  # [seq_len, dim] -> single item
-                                    pooled = [arr.mean(axis=0).tolist()]
-                                else:
-                                    raise TypeError(f"Unexpected hidden shape: {arr.shape}")
-                                return pooled
-                            except Exception as e:  # pragma: no cover
-                                logger.warning(f"MLX embedding failed, falling back to ST: {e}")
-                                # Fallback: sentence-transformers on local device
-                                try:
-                                    import torch  # type: ignore[import-not-found]
-                                    from sentence_transformers import (  # type: ignore[import-not-found]
-                                        SentenceTransformer,
-                                    )
-
-                                    device = (
-                                        "mps"
-                                        if hasattr(torch.backends, "mps") and torch.backends.mps.is_available()
-                                        else ("cuda" if torch.cuda.is_available() else "cpu")
-                                    )
-                                    fallback_name = os.environ.get(
-                                        "PAPR_EMBEDDING_FALLBACK_MODEL", "Qwen/Qwen3-Embedding-4B"
-                                    )
-                                    st_model = SentenceTransformer(fallback_name, device=device)
-                                    embs = st_model.encode(inputs)
-                                    return embs.tolist()  # type: ignore
-                                except Exception as e2:
-                                    logger.error(f"Fallback ST embedding failed: {e2}")
-                                    return [[] for _ in inputs]
-
-                        def embed_query(self, input: str) -> list[float]:
-                            return self._encode_texts([input])[0]
-
-                        def embed_documents(self, input: list[str]) -> list[list[float]]:
-                            return self._encode_texts(input)
-
-                    mlx_func = MlxQwenEmbeddingFunction(mlx_model, mlx_tokenizer)
+                    mlx_func = create_embedder("mlx")
                     logger.info("Using native MLX embedding function for Qwen (quantized)")
                     return mlx_func
                 except Exception as mlx_e:  # pragma: no cover
                     logger.info(f"MLX path unavailable, will try sentence-transformers: {mlx_e}")
 
+            # ONNX Runtime int8 backend for CPU hosts (Linux x86 servers) where Core ML/MLX don't exist
+            from papr_memory._onnx_embedder import onnx_enabled
+
+            if onnx_enabled() and "Apple" not in device_name and device in ("cpu", "xpu", "hip"):
+                onnx_func = create_embedder("onnx")
+                if onnx_func is not None:
+                    logger.info("Using ONNX Runtime embedding function (CPU, quantized)")
+                    return onnx_func
+                logger.info("ONNX Runtime path unavailable, will try sentence-transformers")
+
             from sentence_transformers import SentenceTransformer  # type: ignore[import-not-found]
             
             # Platform-specific model selection (using sentence-transformers compatible models)
@@ -1321,7 +1207,9 @@ class MemoryResource(SyncAPIResource):
                         logger.info(f"Loaded quantized {model_name}")
                     else:
                         logger.info(f"Loaded original {model_name}")
-                    return model
+                    from papr_memory._embedder_backends import SentenceTransformerEmbedder
+
+                    return SentenceTransformerEmbedder(model)
                 except Exception as e:
                     logger.warning(f"Failed to load {model_name}: {e}")
                     # Try CPU fallback for CUDA errors
@@ -1347,6 +1235,10 @@ class MemoryResource(SyncAPIResource):
         from papr_memory._logging import get_logger
 
         logger = get_logger(__name__)
+
+        override = self._get_embedder_override()
+        if override is not None:
+            return override
         
         try:
             # Check if platform is too old for local processing
@@ -1357,7 +1249,16 @@ class MemoryResource(SyncAPIResource):
             import platform
             import subprocess
 
-            import torch
+            try:
+                import torch
+            except ImportError:
+                # The ONNX Runtime CPU backend does not need torch
+                from papr_memory._onnx_embedder import onnx_enabled
+
+                if not onnx_enabled():
+                    raise
+                logger.info("Using CPU for embeddings (ONNX Runtime, torch not installed)")
+                return self._get_optimized_quantized_model("cpu", "CPU")
             
             # Detect platform and set optimal device (NPU first, then GPU, then CPU)
             device = None
@@ -1433,17 +1334,13 @@ class MemoryResource(SyncAPIResource):
 
         logger = get_logger(__name__)
         
-        # Use cached embedder if available, otherwise get new one
-        if not hasattr(self, "_local_embedder") or self._local_embedder is None:  # type: ignore
-            self._local_embedder = self._get_local_embedder()
-        
-        embedder = self._local_embedder
+        embedder = self._resolve_query_embedder()
         if embedder:
             try:
                 import time
 
                 start_time = time.time()
-                embedding = getattr(embedder, 'encode', lambda _: None)([query])[0].tolist()  # type: ignore
+                embedding = embedder.embed_query(query)
                 generation_time = time.time() - start_time
                 logger.info(f"Generated local query embedding (dim: {len(embedding)}) in {generation_time:.2f}s")
                 return embedding  # type: ignore
@@ -1520,7 +1417,7 @@ class MemoryResource(SyncAPIResource):
 
     def _start_background_model_loading(self) -> None:
         """Start background model loading for non-blocking initialization"""
-        global _background_model_loading_task, _model_loading_complete, _global_sync_lock, _global_qwen_model
+        global _background_model_loading_task, _global_sync_lock
 
         from papr_memory._logging import get_logger
 
@@ -1533,37 +1430,22 @@ class MemoryResource(SyncAPIResource):
         # Use thread-safe singleton pattern
         with _global_sync_lock:
             # Check if model loading is already complete
-            if _model_loading_complete:
+            if _ondevice_lifecycle.is_ready():
                 logger.info("Model loading already complete")
                 return
 
-            # Check if model is already loaded globally
-            if _global_qwen_model is not None:
-                logger.info("Model already loaded globally, marking as complete")
-                _model_loading_complete = True
-                return
-            
-            # Check if model is already loaded in ChromaDB collection
-            if hasattr(self, "_chroma_collection") and self._chroma_collection is not None:
-                embedding_function = getattr(self._chroma_collection, "_embedding_function", None)
-                if embedding_function is not None and hasattr(embedding_function, "model"):
-                    logger.info("Model already loaded in ChromaDB collection, marking as complete")
-                    _global_qwen_model = embedding_function.model
-                    _model_loading_complete = True
-                    return
-
             # Check if background model loading task exists and is alive
             if _background_model_loading_task is None:
                 logger.info("Starting background model loading...")
             elif not _background_model_loading_task.is_alive():
-                logger.warning("Background model loading task died, will restart")
+                logger.warning("Background model loading task finished without a ready model, will restart")
                 _background_model_loading_task = None
             else:
                 logger.info("Background model loading already running (shared across clients)")
                 return
 
             # Start new background model loading task
-            _model_loading_complete = False
+            _ondevice_lifecycle.begin()
             
             _background_model_loading_task = threading.Thread(
                 target=self._background_model_loading_worker,
@@ -1572,13 +1454,19 @@ class MemoryResource(SyncAPIResource):
             )
             _background_model_loading_task.start()
             logger.info("Background model loading started")
-        
-        # Set completion callback for better user experience
-        def on_model_loading_complete():
-            logger.info("🎉 Background model loading finished - local search is now optimized!")
-        
-        global _model_loading_callback
-        _model_loading_callback = on_model_loading_complete
+
+    def _start_ondevice_warmup(self) -> None:
+        """Kick off (or join) the shared sync -> model -> warm-up pipeline used by `ondevice.warmup()`"""
+        ondevice_processing = os.environ.get("PAPR_ONDEVICE_PROCESSING", "false").lower() in ("true", "1", "yes", "on")
+        if not ondevice_processing or getattr(self, "_ondevice_processing_disabled", False):
+            _ondevice_lifecycle.mark_failed("on-device processing is disabled (set PAPR_ONDEVICE_PROCESSING=true)")
+            return
+
+        _ondevice_lifecycle.begin()
+        if getattr(self, "_chroma_collection", None) is not None:
+            self._start_background_model_loading()
+        else:
+            self._start_background_initialization()
 
     def _start_background_initialization(self) -> None:
         """Start complete background initialization (sync_tiers + ChromaDB + model loading)"""
@@ -1600,19 +1488,23 @@ class MemoryResource(SyncAPIResource):
                 return
 
             # Check if initialization is already complete
-            if hasattr(self, "_collection_initialized") and self._collection_initialized:  # type: ignore
-                logger.info("Background initialization already completed")
-                return
+            already_initialized = hasattr(self, "_collection_initialized") and self._collection_initialized  # type: ignore
+            if not already_initialized:
+                logger.info("Starting complete background initialization...")
+                
+                # Start background initialization worker
+                _background_initialization_task = threading.Thread(
+                    target=self._background_initialization_worker,
+                    name="PaprBackgroundInit",
+                    daemon=True
+                )
+                _background_initialization_task.start()
 
-            logger.info("Starting complete background initialization...")
-            
-            # Start background initialization worker
-            _background_initialization_task = threading.Thread(
-                target=self._background_initialization_worker,
-                name="PaprBackgroundInit",
-                daemon=True
-            )
-            _background_initialization_task.start()
+        if already_initialized:
+            # Collection is in place; only the model may still need loading (no-op once ready)
+            logger.info("Background initialization already completed")
+            self._start_background_model_loading()
+            return
         logger.info("Background initialization started")
 
     def _background_initialization_worker(self) -> None:
@@ -1626,7 +1518,10 @@ class MemoryResource(SyncAPIResource):
             
             # Step 1: Initialize sync_tiers and ChromaDB collection (immediate)
             logger.info("📡 Initializing sync_tiers and ChromaDB collection...")
-            self._process_sync_tiers_and_store()
+            with _ondevice_lifecycle.stage("sync"):
+                self._process_sync_tiers_and_store()
+                if getattr(self, "_chroma_collection", None) is None:
+                    raise RuntimeError("local tier0 collection could not be initialized")
             logger.info("✅ Sync_tiers and ChromaDB collection initialized")
             
             # Step 2: Start background model loading
@@ -1644,83 +1539,57 @@ class MemoryResource(SyncAPIResource):
 
     def _get_model_loading_status(self) -> dict[str, any]:  # type: ignore
         """Get model loading status for debugging"""
-        global _background_model_loading_task, _model_loading_complete
-
-        from papr_memory._logging import get_logger
-
-        logger = get_logger(__name__)
-
-        if _background_model_loading_task is None:
-            return {"status": "not_started", "complete": False, "alive": False}
-        elif _background_model_loading_task.is_alive():
-            return {
-                "status": "loading",
-                "complete": _model_loading_complete,
-                "alive": True,
-                "name": _background_model_loading_task.name,
-            }
-        else:
-            return {
-                "status": "completed" if _model_loading_complete else "failed",
-                "complete": _model_loading_complete,
-                "alive": False,
-                "name": _background_model_loading_task.name,
-            }
+        global _background_model_loading_task
+
+        status = _ondevice_lifecycle.status()
+        info: dict[str, any] = {  # type: ignore
+            "status": status.state,
+            "complete": status.ready,
+            "alive": _background_model_loading_task is not None and _background_model_loading_task.is_alive(),
+            "stages": status.stages,
+        }
+        if _background_model_loading_task is not None:
+            info["name"] = _background_model_loading_task.name
+        if status.error:
+            info["error"] = status.error
+        return info
 
     def _background_model_loading_worker(self) -> None:
         """Background worker for model loading"""
         import time
-        global _model_loading_complete, _global_qwen_model
 
         from papr_memory._logging import get_logger
 
         logger = get_logger(__name__)
 
+        model_load_start = time.time()
         try:
             logger.info("Background model loading worker started")
-            
-            # Check if model is already loaded
-            if _global_qwen_model is not None:
-                logger.info("Model already loaded globally, marking as complete")
-                _model_loading_complete = True
-                logger.info("🚀 Model is now ready for fast local search!")
-                return
-            
-            # Start timing
-            model_load_start = time.time()
             logger.info(f"⏱️ Model loading started at {time.strftime('%H:%M:%S', time.localtime(model_load_start))}")
             
-            # Load the embedding model in the background
-            self._preload_embedding_model()
-            
-            # Calculate timing
-            model_load_end = time.time()
-            model_load_duration = model_load_end - model_load_start
+            # Load the embedding model in the background (no-op when already loaded or not needed)
+            with _ondevice_lifecycle.stage("model"):
+                self._preload_embedding_model()
+                embedder = self._resolve_query_embedder()
+                if embedder is None:
+                    raise RuntimeError("no local embedder is available on this platform")
+
+            # One forward pass so the first real query does not pay compilation/caching costs
+            with _ondevice_lifecycle.stage("warmup"):
+                embedder.warmup()
             
-            _model_loading_complete = True
+            model_load_duration = time.time() - model_load_start
+            _ondevice_lifecycle.mark_ready(embedder.name)
             logger.info(f"✅ Background model loading completed successfully in {model_load_duration:.2f}s")
-            logger.info(f"⏱️ Model loading finished at {time.strftime('%H:%M:%S', time.localtime(model_load_end))}")
-            logger.info("🚀 Model is now ready for fast local search!")
-            
-            # Call completion callback if set
-            global _model_loading_callback
-            if _model_loading_callback:
-                try:
-                    _model_loading_callback()
-                except Exception as callback_error:
-                    logger.warning(f"Model loading callback failed: {callback_error}")
-            
             logger.info("🎉 Background model loading finished - local search is now optimized!")
             
         except Exception as e:
-            # Calculate timing even on failure
             model_load_end = time.time()
-            model_load_duration = model_load_end - model_load_start if 'model_load_start' in locals() else 0
+            model_load_duration = model_load_end - model_load_start
             
             logger.error(f"❌ Background model loading FAILED after {model_load_duration:.2f}s: {e}")
             logger.error(f"⏱️ Model loading failed at {time.strftime('%H:%M:%S', time.localtime(model_load_end))}")
             logger.warning("⚠️ Local search will fallback to server-side processing")
-            _model_loading_complete = False
 
     def _get_background_sync_status(self) -> dict[str, any]:  # type: ignore
         """Get background sync task status for debugging"""
@@ -1809,6 +1678,12 @@ class MemoryResource(SyncAPIResource):
         if os.environ.get("PAPR_ENABLE_MLX", "").lower() == "true":
             logger.info("⏭️  Skipping ST preload: MLX is enabled (faster, less memory)")
             return
+        if os.environ.get("PAPR_ENABLE_ONNX", "").lower() == "true":
+            logger.info("⏭️  Skipping ST preload: ONNX Runtime is enabled (faster, less memory)")
+            return
+        if getattr(self, "_embedder_override", None) is not None or os.environ.get("PAPR_EMBEDDER"):
+            logger.info("⏭️  Skipping ST preload: a custom embedder is selected")
+            return
         if os.environ.get("PAPR_DISABLE_ST_PRELOAD", "").lower() == "true":
             logger.info("⏭️  Skipping ST preload: PAPR_DISABLE_ST_PRELOAD=true")
             return
@@ -1921,6 +1796,12 @@ class MemoryResource(SyncAPIResource):
         if os.environ.get("PAPR_ENABLE_MLX", "").lower() == "true":
             logger.info("⏭️  Skipping ST preload: MLX is enabled (faster, less memory)")
             return
+        if os.environ.get("PAPR_ENABLE_ONNX", "").lower() == "true":
+            logger.info("⏭️  Skipping ST preload: ONNX Runtime is enabled (faster, less memory)")
+            return
+        if getattr(self, "_embedder_override", None) is not None or os.environ.get("PAPR_EMBEDDER"):
+            logger.info("⏭️  Skipping ST preload: a custom embedder is selected")
+            return
         if os.environ.get("PAPR_DISABLE_ST_PRELOAD", "").lower() == "true":
             logger.info("⏭️  Skipping ST preload: PAPR_DISABLE_ST_PRELOAD=true")
             return
@@ -2017,6 +1898,7 @@ class MemoryResource(SyncAPIResource):
 
     def _get_qwen_embedding_function(self) -> object:
         """Get Qwen-based embedding function for ChromaDB using the correct interface with timeout protection"""
+        global _global_qwen_model
         import threading
 
         from papr_memory._logging import get_logger
@@ -2025,6 +1907,21 @@ class MemoryResource(SyncAPIResource):
         
         try:
             logger.info("Creating Qwen embedding function...")
+
+            # An explicitly selected embedder is used for the collection as well as for queries
+            override = self._get_embedder_override()
+            if override is not None:
+                logger.info(f"Using selected embedder {override.name!r} as collection embedding function")
+                return override
+
+            # ONNX Runtime embedder already implements the Chroma embedding-function interface
+            from papr_memory._onnx_embedder import onnx_enabled
+
+            if onnx_enabled():
+                onnx_func = create_embedder("onnx")
+                if onnx_func is not None:
+                    logger.info("Using ONNX Runtime embedder as collection embedding function")
+                    return onnx_func
             
             # Use the preloaded global model if available (fastest path)
             if _global_qwen_model is not None:
@@ -2108,53 +2005,11 @@ class MemoryResource(SyncAPIResource):
                 logger.warning("Falling back to default ChromaDB embedding function")
                 return None
             
-            # Create a proper ChromaDB embedding function class
-            class QwenEmbeddingFunction:
-                def __init__(self, model: any) -> None:  # type: ignore
-                    self.model = model
-                    # Set global model reference to avoid redundant loading
-                    global _global_qwen_model
-                    _global_qwen_model = model
-                
-                def __call__(self, input: any) -> any:  # type: ignore
-                    # Handle both single string and list of strings
-                    if isinstance(input, str):
-                        input = [input]
-                    # Support either ST model or embedding-function interface
-                    if hasattr(self.model, "embed_documents"):
-                        embs = self.model.embed_documents(input)  # type: ignore
-                        return embs  # already a list[list[float]]
-                    embeddings = self.model.encode(input)  # type: ignore
-                    return embeddings.tolist()  # type: ignore
-
-                def embed_query(self, input: any) -> any:  # type: ignore
-                    # Method required by ChromaDB for query embedding
-                    try:
-                        if hasattr(self.model, "embed_documents"):
-                            embs = self.model.embed_documents([input])  # type: ignore
-                            return embs[0]
-                        embeddings = self.model.encode([input])  # type: ignore
-                        if len(embeddings) > 0:
-                            return embeddings[0].tolist()  # type: ignore
-                            # Fallback: encode single input directly
-                        return self.model.encode(input).tolist()  # type: ignore
-                    except Exception as e:
-                        # Fallback: encode single input directly
-                        return self.model.encode(input).tolist()  # type: ignore
-                
-                def embed_documents(self, input: any) -> any:  # type: ignore
-                    # Method required by ChromaDB for document embedding
-                    try:
-                        if isinstance(input, str):
-                            input = [input]
-                        if hasattr(self.model, "embed_documents"):
-                            return self.model.embed_documents(input)  # type: ignore
-                        return self.model.encode(input).tolist()  # type: ignore
-                    except Exception as e:
-                        # Fallback: handle single string
-                        return self.model.encode([input]).tolist()  # type: ignore
-            
-            embedding_function = QwenEmbeddingFunction(model)  # type: ignore
+            from papr_memory._embedder_backends import SentenceTransformerEmbedder
+
+            # Set global model reference to avoid redundant loading
+            _global_qwen_model = model
+            embedding_function = SentenceTransformerEmbedder(model)
             logger.info(f"Qwen embedding function created successfully: {embedding_function is not None}")
             return embedding_function
             
@@ -2168,9 +2023,16 @@ class MemoryResource(SyncAPIResource):
         n_results: int = 5,
         metadata: Optional[MemoryMetadataParam] | NotGiven = not_given,
         user_id: Optional[str] | NotGiven = not_given,
-        external_user_id: Optional[str] | NotGiven = not_given
+        external_user_id: Optional[str] | NotGiven = not_given,
+        tenant: TenantKey | None = None,
+        omo_filter: Optional[memory_search_params.OmoFilter] | NotGiven = not_given,
+        search_acl: Optional[ACLConfig] | NotGiven = not_given,
     ) -> list[str] | None:
-        """Search tier0 data using local vector search"""
+        """Search tier0 data using local vector search (the tenant's own index when `tenant` is given).
+
+        `metadata`, `omo_filter` and `search_acl` are applied as a pre-filter on the indexed tier0 facets;
+        filters that cannot be evaluated exactly on-device return no local results (server-side search).
+        """
         import time
 
         from papr_memory._logging import get_logger
@@ -2178,7 +2040,21 @@ class MemoryResource(SyncAPIResource):
 
         logger = get_logger(__name__)
         
-        if not hasattr(self, "_chroma_collection") or self._chroma_collection is None:  # type: ignore
+        try:
+            where = Tier0Filter.compile(metadata=metadata, omo_filter=omo_filter, search_acl=search_acl)
+        except UnsupportedFilter as e:
+            logger.info(f"Filter cannot be applied on-device ({e}) - using server-side search")
+            return []
+        if where.matches_nothing:
+            return []
+
+        tenant_index: Tier0Index | None = None
+        if tenant is not None:
+            # Never fall back to the shared collection: it holds another tenant's tier0
+            tenant_index = tier0_tenants().lookup(tenant, lambda: self._sync_tier0_tenant(tenant))
+            if tenant_index is None or not len(tenant_index):
+                return []
+        elif not hasattr(self, "_chroma_collection") or self._chroma_collection is None:  # type: ignore
             return []
         
         # Start retrieval metrics tracking
@@ -2189,68 +2065,19 @@ class MemoryResource(SyncAPIResource):
             retrieval_logging_service.start_embedding_timing(metrics)
             embedding_start = time.time()
 
-            # Prefer Core ML/collection embedder if available; otherwise use local embedder; final fallback: ST preload
-            embedder: object | None = None
-            coll_func = getattr(self, "_chroma_collection", None)
-            if coll_func is not None and hasattr(self._chroma_collection, "_embedding_function"):
-                ef = getattr(self._chroma_collection, "_embedding_function", None)
-                # Avoid using Chroma DefaultEmbeddingFunction (384-dim) for local query
-                ef_is_default = False
-                if ef is not None and hasattr(ef, "__class__") and "DefaultEmbeddingFunction" in str(ef.__class__):
-                    ef_is_default = True
-                if ef is not None and not ef_is_default and (
-                    hasattr(ef, "embed_query") or hasattr(ef, "encode") or callable(ef)
-                ):
-                    embedder = ef
-
-            if embedder is None:
-                embedder = getattr(self, "_local_embedder", None)
-                if embedder is None:
-                    embedder = self._get_local_embedder()
-
-            def _embed_with(obj: object, text: str) -> list[float] | None:
-                try:
-                    if hasattr(obj, "embed_query"):
-                        out = obj.embed_query(text)  # type: ignore
-                        import numpy as _np  # local import
-                        if isinstance(out, _np.ndarray):
-                            return out.astype(_np.float32).tolist()
-                        if isinstance(out, list):
-                            # If list[list[float]], take first
-                            if out and isinstance(out[0], list):
-                                return [float(x) for x in out[0]]
-                            return [float(x) for x in out]
-                        return None
-                    if hasattr(obj, "encode"):
-                        enc = obj.encode([text])  # type: ignore
-                        import numpy as _np
-                        if isinstance(enc, _np.ndarray):
-                            return enc[0].astype(_np.float32).tolist()
-                        if isinstance(enc, list) and enc:
-                            first = enc[0]
-                            if isinstance(first, _np.ndarray):
-                                return first.astype(_np.float32).tolist()
-                            if isinstance(first, list):
-                                return [float(x) for x in first]
-                        return None
-                    if callable(obj):
-                        out = obj([text])  # type: ignore
-                        import numpy as _np
-                        if out and isinstance(out, list):
-                            first = out[0]
-                            if isinstance(first, _np.ndarray):
-                                return first.astype(_np.float32).tolist()
-                            if isinstance(first, list):
-                                return [float(x) for x in first]
-                        return None
-                except Exception as e:  # pragma: no cover
-                    logger.debug(f"Local embedder failed, will fallback: {e}")
-                return None
+            # Prefer an explicit/collection embedder (Core ML if enabled); final fallback: ST preload
+            embedder = self._resolve_query_embedder()
 
             query_embedding: list[float] | None = None
             if embedder is not None:
                 logger.info("Using local embedder for query (prefers Core ML if enabled)")
-                query_embedding = _embed_with(embedder, query)
+                # Share one forward pass with concurrent searches when micro-batching is enabled
+                query_embedding = self._embed_query_batched(embedder, query)
+                if query_embedding is None:
+                    try:
+                        query_embedding = embedder.embed_query(query)
+                    except Exception as e:  # pragma: no cover
+                        logger.debug(f"Local embedder failed, will fallback: {e}")
 
             if not query_embedding:
                 logger.info("Local embedder unavailable or failed; using preloaded Qwen3-4B model")
@@ -2272,8 +2099,17 @@ class MemoryResource(SyncAPIResource):
             if not query_embedding:
                 return []
             
-            # Check for dimension mismatch before querying
-            self._check_embedding_dimensions_before_query(query_embedding)
+            # Validate against the index manifest before querying (rebuilds happen in the background)
+            if tenant is not None and tenant_index is not None:
+                reason = tenant_index.incompatibility(query_embedding, embedder)
+                if reason is not None:
+                    logger.warning(f"Tenant tier0 index cannot serve this query ({reason}) - using server-side search")
+                    if embedder is not None:
+                        tier0_tenants().drop(tenant)
+                        tier0_tenants().schedule_sync(tenant, lambda: self._sync_tier0_tenant(tenant))
+                    return []
+            elif not self._check_embedding_dimensions_before_query(query_embedding, embedder):
+                return []
 
             # Start ChromaDB timing
             retrieval_logging_service.start_chromadb_timing(metrics)
@@ -2281,39 +2117,24 @@ class MemoryResource(SyncAPIResource):
             
             # Perform vector search in ChromaDB
             try:
-                # Optimized ChromaDB query with performance settings
-                                results = self._chroma_collection.query(  # type: ignore
-                    query_embeddings=[query_embedding],
-                    n_results=n_results,
-                    # Performance optimizations
-                    include=["documents", "metadatas", "distances"],
-                    # Use optimized search parameters
-                    where=None,  # No filtering for faster search
-                )
+                if tenant_index is not None:
+                    results = tenant_index.query(query_embedding, n_results, where)  # type: ignore[assignment]
+                else:
+                    # Optimized ChromaDB query with performance settings
+                    results = self._chroma_collection.query(  # type: ignore
+                        query_embeddings=[query_embedding],
+                        n_results=n_results,
+                        # Performance optimizations
+                        include=["documents", "metadatas", "distances"],
+                        # Pre-filter on the indexed facets before the vector search
+                        where=where.to_where(),
+                    )
             except Exception as e:
                 if "dimension" in str(e).lower():
                     logger.error(f"Embedding dimension mismatch: {e}")
-                    logger.info("Attempting to fix dimension mismatch by recreating collection...")
-                    
-                    # Try to fix the dimension mismatch immediately
-                    if self._fix_dimension_mismatch_immediately():
-                        logger.info("Collection recreated successfully, retrying search...")
-                        # Retry the search with the new collection
-                        try:
-                                results = self._chroma_collection.query(  # type: ignore  # type: ignore
-                                query_embeddings=[query_embedding],
-                                n_results=n_results,
-                                # Performance optimizations
-                                include=["documents", "metadatas", "distances"],
-                                where=None,  # No filtering for faster search
-                            )
-                        except Exception as retry_e:
-                            logger.error(f"Search still failed after collection recreation: {retry_e}")
-                            return []
-                    else:
-                        logger.error("Failed to fix dimension mismatch")
-                        logger.info("Falling back to API-only search")
-                        return []
+                    logger.info("Falling back to API-only search; the local index will be rebuilt in the background")
+                    self._schedule_index_rebuild(f"query failed: {e}")
+                    return []
                 else:
                     raise e
             
@@ -2360,191 +2181,206 @@ class MemoryResource(SyncAPIResource):
             logger.error(f"Error in local tier0 search: {e}")
             return []
 
-    def _fix_dimension_mismatch_immediately(self) -> bool:
-        """Fix dimension mismatch by immediately recreating the collection"""
+    def use_embedder(self, embedder: str | Embedder | None, *, warmup: bool = True) -> Embedder | None:
+        """Select the embedder used for on-device search by this client.
+
+        Args:
+            embedder: A registered embedder name (see `papr_memory.lib.list_embedders()`),
+                an object implementing `papr_memory.lib.Embedder`, or None to restore the
+                platform default.
+            warmup: Run one forward pass now so the first search does not pay model warm-up costs.
+
+        Returns:
+            The active embedder, or None when the platform default was restored.
+
+        Raises:
+            KeyError: If `embedder` is a name that is not registered.
+            RuntimeError: If the registered factory could not build the embedder.
+        """
+        if embedder is None:
+            self._embedder_override = None
+            self._query_embedder_cache = None
+            return None
+
+        if isinstance(embedder, str):
+            resolved = create_embedder(embedder)
+            if resolved is None:
+                raise RuntimeError(f"Embedder {embedder!r} is not available on this platform")
+        else:
+            resolved = as_embedder(embedder)
+
+        if warmup:
+            resolved.warmup()
+        self._embedder_override = resolved
+        self._query_embedder_cache = None
+        return resolved
+
+    def _get_embedder_override(self) -> Embedder | None:
+        """Embedder chosen via `use_embedder()` or the `PAPR_EMBEDDER` environment variable"""
+        override = getattr(self, "_embedder_override", None)
+        if override is not None:
+            return cast(Embedder, override)
+
+        name = os.environ.get("PAPR_EMBEDDER")
+        if not name:
+            return None
         from papr_memory._logging import get_logger
 
         logger = get_logger(__name__)
-        
         try:
-            if not hasattr(self, "_chroma_collection") or self._chroma_collection is None:  # type: ignore
-                return False
-            
-            collection_name = self._chroma_collection.name  # type: ignore
-            logger.info(f"Recreating collection '{collection_name}' with correct embedding dimensions...")
-            
-            # Delete existing collection
-            try:
-                self._chroma_client.delete_collection(name=collection_name)
-                logger.info(f"Deleted existing collection: {collection_name}")
-            except Exception as delete_e:
-                logger.warning(f"Error deleting collection (may not exist): {delete_e}")
-            
-            # Create new collection with Qwen3-4B embedding function
-            embedding_function = self._get_qwen_embedding_function()
-            if embedding_function:
-                # Cast to Any to satisfy ChromaDB's EmbeddingFunction protocol
-                from typing import Any
-
-                self._chroma_collection = self._chroma_client.create_collection(
-                    name=collection_name,
-                    embedding_function=cast(Any, embedding_function),
-                    metadata={"description": "Tier0 goals, OKRs, and use-cases from sync_tiers"},
-                )
-                logger.info(f"Recreated collection with Qwen3-4B embeddings: {collection_name}")
-                return True
-            else:
-                logger.error("Failed to get Qwen3-4B embedding function")
-                return False
-                
+            return self.use_embedder(name, warmup=False)
         except Exception as e:
-            logger.error(f"Error fixing dimension mismatch: {e}")
-            return False
+            logger.warning(f"PAPR_EMBEDDER={name!r} unavailable, using platform default: {e}")
+            return None
+
+    def _resolve_query_embedder(self) -> Embedder | None:
+        """Embedder for local queries: explicit selection, then the collection's function, then the platform default.
+
+        The adapted embedder is cached so repeated searches dispatch directly instead of re-inspecting the model.
+        """
+        source: object | None = self._get_embedder_override()
+        if source is None:
+            coll = getattr(self, "_chroma_collection", None)
+            ef = getattr(coll, "_embedding_function", None) if coll is not None else None
+            # Avoid using Chroma DefaultEmbeddingFunction (384-dim) for local query
+            if ef is not None and "DefaultEmbeddingFunction" not in str(ef.__class__):
+                source = ef
+        if source is None:
+            source = getattr(self, "_local_embedder", None)
+            if source is None:
+                source = self._local_embedder = self._get_local_embedder()
+        if source is None:
+            return None
 
-    def _check_embedding_dimensions_before_query(self, query_embedding: list[float]) -> None:
-        """Check embedding dimensions before querying to prevent dimension mismatch errors"""
+        cached = getattr(self, "_query_embedder_cache", None)
+        if cached is not None and cached[0] is source:
+            return cast(Embedder, cached[1])
+        try:
+            embedder = as_embedder(source)
+        except TypeError:
+            return None
+        self._query_embedder_cache = (source, embedder)
+        return embedder
+
+    def _expected_embedding_dimensions(self) -> int:
+        """Dimension of local tier0 vectors, preferring the declared size of a selected embedder"""
+        override = self._get_embedder_override()
+        if override is not None and override.dimensions > 0:
+            return override.dimensions
+        return _expected_embedding_dimensions()
+
+    def _embed_query_batched(self, embedder: Embedder, query: str) -> list[float] | None:
+        """Embed a query through the shared micro-batcher so concurrent searches share one forward pass"""
+        global _global_query_batcher, _global_query_batcher_embedder
         from papr_memory._logging import get_logger
+        from papr_memory._embedding_batcher import EmbeddingMicroBatcher, micro_batching_enabled
 
         logger = get_logger(__name__)
-        
+
+        if not micro_batching_enabled():
+            return None
+
+        with _global_query_batcher_lock:
+            # The batcher is bound to one embedder; rebuild it if the collection/model was swapped
+            if _global_query_batcher is None or _global_query_batcher_embedder is not embedder:
+                if _global_query_batcher is not None:
+                    cast(EmbeddingMicroBatcher, _global_query_batcher).close()
+                _global_query_batcher = EmbeddingMicroBatcher(
+                    embedder.embed_documents, max_batch_size=embedder.batch_size
+                )
+                _global_query_batcher_embedder = embedder
+            batcher = cast(EmbeddingMicroBatcher, _global_query_batcher)
+
         try:
-            if not hasattr(self, "_chroma_collection") or self._chroma_collection is None:  # type: ignore
-                return
-            
-            # Get query embedding dimension
-            query_dim = len(query_embedding)
-            logger.debug(f"Query embedding dimension: {query_dim}")
-            
-            # Check if collection has custom embedding function (using correct attribute name)
-            if hasattr(self._chroma_collection, "_embedding_function") and self._chroma_collection._embedding_function:
-                # Collection has custom embedding function (should be 2560 dimensions for Qwen3-4B)
-                expected_dim = 2560
-                if query_dim != expected_dim:
-                    logger.warning(
-                        f"Potential dimension mismatch: query has {query_dim} dimensions, collection expects {expected_dim}"
-                    )
-                    logger.info("This will cause a dimension mismatch error during query")
-                    logger.info("The collection needs to be recreated with correct embedding dimensions")
-                else:
-                    logger.debug(f"Query dimensions match collection: {query_dim} dimensions")
-            else:
-                # Collection uses default embedding function (384 dimensions)
-                expected_dim = 384
-                if query_dim != expected_dim:
-                    logger.warning(
-                        f"Potential dimension mismatch: query has {query_dim} dimensions, collection expects {expected_dim}"
-                    )
-                    logger.info("This will cause a dimension mismatch error during query")
-                    logger.info("The collection needs to be recreated with correct embedding dimensions")
-                else:
-                    logger.debug(f"Query dimensions match collection: {query_dim} dimensions")
-                
+            return batcher.embed(query)
         except Exception as e:
-            logger.debug(f"Error checking embedding dimensions: {e}")
+            logger.debug(f"Micro-batched embedding failed, will fallback: {e}")
+            return None
+
+    def _expected_index_manifest(self, embedding_function: object | None) -> IndexManifest | None:
+        """Manifest an index built with `embedding_function` would carry (None if it is not a usable embedder)"""
+        if embedding_function is None:
+            return None
+        try:
+            embedder = as_embedder(embedding_function)
+        except TypeError:
+            return None
+        return IndexManifest.for_embedder(embedder, dimensions=self._expected_embedding_dimensions())
+
+    def _get_existing_collection(self, collection_name: str, embedding_function: object | None) -> object:
+        """Open a persisted collection bound to the active embedding function"""
+        from typing import Any
+
+        if embedding_function is not None:
+            try:
+                return self._chroma_client.get_collection(  # type: ignore
+                    name=collection_name, embedding_function=cast(Any, embedding_function)
+                )
+            except ValueError:
+                # Some ChromaDB versions reject an embedding function that differs from the persisted config
+                pass
+        return self._chroma_client.get_collection(name=collection_name)  # type: ignore
+
+    def _check_embedding_dimensions_before_query(
+        self, query_embedding: list[float], embedder: Embedder | None = None
+    ) -> bool:
+        """O(1) check of a query vector (and the embedder that produced it) against the index manifest.
 
-    def _check_and_fix_embedding_dimensions(self, collection: object, tier0_data: list[dict[str, any]]) -> None:  # type: ignore
-        """Check for embedding dimension mismatches and fix by recreating collection if needed"""
+        Returns False when the local index cannot answer the query; a rebuild is then scheduled in the
+        background and the caller falls back to server-side search.
+        """
         from papr_memory._logging import get_logger
 
         logger = get_logger(__name__)
-        
-        try:
-            # Get expected embedding dimension from tier0 data
-            expected_dim = None
-            if tier0_data and isinstance(tier0_data[0], dict) and "embedding" in tier0_data[0]:
-                expected_dim = len(tier0_data[0]["embedding"])
-                logger.info(f"Expected embedding dimension from tier0 data: {expected_dim}")
-            
-            # If we have server embeddings, check if collection dimensions match
-            if expected_dim is not None:
-                try:
-                    # Try to get collection metadata to check dimensions
-                    collection_metadata = getattr(collection, 'metadata', {})  # type: ignore
-                    if hasattr(collection, "_embedding_function") and getattr(collection, '_embedding_function', None):
-                        # Collection has custom embedding function
-                        logger.info("Collection has custom embedding function")
-                    else:
-                        # Collection uses default embedding function (384 dimensions)
-                        logger.info("Collection uses default embedding function (384 dimensions)")
-                        
-                        # If expected dimension is not 384, we need to recreate the collection
-                        if expected_dim != 384:
-                            logger.warning(
-                                f"Dimension mismatch detected: collection expects 384, tier0 data has {expected_dim}"
-                            )
-                            logger.info("Recreating collection with correct embedding dimensions...")
-                            
-                            # Delete existing collection
-                            collection_name = getattr(collection, 'name', 'unknown')  # type: ignore
-                            self._chroma_client.delete_collection(name=collection_name)
-                            logger.info(f"Deleted existing collection: {collection_name}")
-                            
-                            # Create new collection with Qwen3-4B embedding function
-                            embedding_function = self._get_qwen_embedding_function()
-                            logger.info(f"Embedding function created: {embedding_function is not None}")
-                            if embedding_function:
-                                try:
-                                    # Cast to Any to satisfy ChromaDB's EmbeddingFunction protocol
-                                    from typing import Any
-
-                                    self._chroma_collection = self._chroma_client.create_collection(
-                                        name=collection_name,
-                                        embedding_function=cast(Any, embedding_function),
-                                        metadata={"description": "Tier0 goals, OKRs, and use-cases from sync_tiers"},
-                                    )
-                                    logger.info(f"Recreated collection with Qwen3-4B embeddings: {collection_name}")
-                                    # Verify the collection has the embedding function
-                                    if (
-                                        hasattr(self._chroma_collection, "_embedding_function")
-                                        and self._chroma_collection._embedding_function
-                                    ):
-                                        logger.info(
-                                            "Collection created with custom embedding function (2560 dimensions)"
-                                        )
-                                    else:
-                                        logger.warning("Collection created but without custom embedding function")
-                                    # Update the collection reference
-                                    collection = self._chroma_collection
-                                except Exception as create_e:
-                                    error_msg = str(create_e)
-                                    if "already exists" in error_msg.lower():
-                                        logger.warning(f"Collection already exists: {create_e}")
-                                        logger.info("Using existing collection...")
-                                        try:
-                                            self._chroma_collection = self._chroma_client.get_collection(name=collection_name)
-                                            logger.info(f"Successfully retrieved existing collection: {collection_name}")
-                                            collection = self._chroma_collection
-                                        except Exception as get_e:
-                                            logger.error(f"Failed to get existing collection: {get_e}")
-                                            logger.info("Falling back to collection without embedding function...")
-                                            self._chroma_collection = self._chroma_client.create_collection(
-                                                name=collection_name,
-                                                metadata={"description": "Tier0 goals, OKRs, and use-cases from sync_tiers"},
-                                            )
-                                            logger.warning("Collection created without embedding function (384 dimensions)")
-                                            collection = self._chroma_collection
-                                    else:
-                                        logger.error(f"Failed to create collection with embedding function: {create_e}")
-                                        logger.info("Falling back to collection without embedding function...")
-                                        self._chroma_collection = self._chroma_client.create_collection(
-                                            name=collection_name,
-                                            metadata={"description": "Tier0 goals, OKRs, and use-cases from sync_tiers"},
-                                        )
-                                    logger.warning("Collection created without embedding function (384 dimensions)")
-                                    collection = self._chroma_collection
-                            else:
-                                logger.error(
-                                    "Failed to get Qwen3-4B embedding function - cannot fix dimension mismatch"
-                                )
-                                return
-                        
-                except Exception as e:
-                    logger.debug(f"Could not check collection dimensions: {e}")
-                    # If we can't check dimensions, try to proceed and let ChromaDB handle the error
-                    pass
-                    
-        except Exception as e:
-            logger.error(f"Error checking embedding dimensions: {e}")
+
+        manifest: IndexManifest | None = getattr(self, "_index_manifest", None)
+        if manifest is None:
+            # Index opened before a manifest was recorded; let ChromaDB validate the query
+            return True
+
+        if len(query_embedding) != manifest.dimensions:
+            reason: str | None = (
+                f"query has {len(query_embedding)} dimensions, index has {manifest.dimensions}"
+            )
+        elif embedder is not None:
+            reason = IndexManifest.for_embedder(embedder, dimensions=len(query_embedding)).incompatibility(manifest)
+        else:
+            reason = None
+
+        if reason is None:
+            return True
+
+        logger.warning(f"Local index cannot serve this query ({reason}) - using server-side search")
+        if embedder is not None:
+            # Only rebuild when the query came from the embedder that would also fill the new index
+            self._schedule_index_rebuild(reason)
+        return False
+
+    def _schedule_index_rebuild(self, reason: str) -> None:
+        """Rebuild an incompatible local index off the search path; searches use the server meanwhile"""
+        global _background_index_rebuild_task
+        from papr_memory._logging import get_logger
+
+        logger = get_logger(__name__)
+
+        with _background_index_rebuild_lock:
+            if _background_index_rebuild_task is not None and _background_index_rebuild_task.is_alive():
+                return
+            attempted: set[str] = self.__dict__.setdefault("_index_rebuild_reasons", set())
+            if reason in attempted:
+                # A rebuild for this reason already ran without fixing it; don't loop on every query
+                return
+            attempted.add(reason)
+
+            logger.info(f"Scheduling background rebuild of the local index: {reason}")
+            # Stop local queries against the stale index until the rebuild finishes
+            self._collection_initialized = False
+            self._chroma_collection = None  # type: ignore
+            self._index_manifest = None
+            _background_index_rebuild_task = threading.Thread(
+                target=self._process_sync_tiers_and_store, name="PaprIndexRebuild", daemon=True
+            )
+            _background_index_rebuild_task.start()
 
     def _compare_tier0_data(self, collection: object, _tier0_data: list[dict], documents: list[str], metadatas: list[dict], ids: list[str]) -> dict[str, any]:  # type: ignore
         """Compare new tier0 data with existing data to detect changes"""
@@ -2725,7 +2561,6 @@ class MemoryResource(SyncAPIResource):
             logger.info(f"Attempting to get/create collection: {collection_name}")
             
             # Check if we have a valid collection with proper embedding function
-            collection_needs_recreation = False
             if (
                 hasattr(self, "_chroma_collection")
                 and self._chroma_collection is not None
@@ -2735,263 +2570,137 @@ class MemoryResource(SyncAPIResource):
                 # Collection is already validated and initialized
                 return
             
-            # Check if the existing collection has the correct embedding function
-            if hasattr(self, "_chroma_collection") and self._chroma_collection is not None:
-                embedding_function = getattr(self._chroma_collection, "_embedding_function", None)
-                if embedding_function is not None:
-                    # Check if it's a default embedding function by testing dimensions
-                    try:
-                        # Test the embedding function to see if it produces 384-dim (default) or 2560-dim (Qwen3-4B) embeddings
-                        test_embedding = embedding_function.embed_query("test")
-                        if len(test_embedding) == 384:
-                            logger.warning("Existing collection uses default embedding function (384 dims)")
-                            collection_needs_recreation = True
-                        elif len(test_embedding) == 2560:
-                            logger.info("Existing collection has correct Qwen3-4B embedding function (2560 dims)")
-                            # Verify it has the required methods
-                            if not hasattr(embedding_function, "embed_documents"):
-                                logger.warning("Collection has correct dimensions but missing embed_documents method - will recreate")
-                                collection_needs_recreation = True
-                        else:
-                            logger.warning(f"Existing collection has unexpected embedding dimensions: {len(test_embedding)} - will recreate")
-                            collection_needs_recreation = True
-                    except Exception as e:
-                        logger.warning(f"Could not test embedding function: {e}")
-                        # Fallback to class name check
-                        if hasattr(embedding_function, "__class__") and "DefaultEmbeddingFunction" in str(
-                            embedding_function.__class__
-                        ):
-                            logger.warning("Existing collection uses default embedding function (384 dims)")
-                            collection_needs_recreation = True
-                    else:
-                        # It's a custom embedding function - test it
-                        try:
-                            if hasattr(embedding_function, "embed_documents"):
-                                test_embedding = embedding_function.embed_documents(["test"])[0]
-                                if len(test_embedding) != 2560:
-                                    logger.warning(
-                                        f"Existing collection has wrong embedding dimensions: {len(test_embedding)} (expected 2560)"
-                                    )
-                                    collection_needs_recreation = True
-                                else:
-                                    logger.info(
-                                        "Existing collection has correct Qwen3-4B embedding function (2560 dims)"
-                                    )
-                            else:
-                                logger.warning(
-                                    "Existing collection has custom embedding function but missing embed_documents method"
-                                )
-                                collection_needs_recreation = True
-                        except Exception as embed_test_e:
-                            logger.warning(f"Existing collection embedding function test failed: {embed_test_e}")
-                            collection_needs_recreation = True
-                else:
-                    logger.warning("Existing collection has no embedding function (384 dims)")
-                    collection_needs_recreation = True
+            # The active embedder's manifest decides whether an existing index can be reused (O(1), no test embeddings)
+            embedding_function = self._get_qwen_embedding_function()
+            logger.info(f"Qwen embedding function result: {embedding_function is not None}")
+            expected_manifest = self._expected_index_manifest(embedding_function)
             
             # Try to get existing collection first
             if not hasattr(self, "_chroma_collection") or self._chroma_collection is None:  # type: ignore
                 try:
                     logger.info("Trying to get existing collection...")
-                    self._chroma_collection = self._chroma_client.get_collection(name=collection_name)
+                    self._chroma_collection = self._get_existing_collection(collection_name, embedding_function)
                     logger.info(f"Using existing ChromaDB collection: {collection_name}")
+                except Exception as e:
+                    logger.info(f"Collection doesn't exist or error getting collection: {e}")
+                    self._chroma_collection = None  # type: ignore
+            
+            if self._chroma_collection is not None:
+                stored_manifest = IndexManifest.from_metadata(getattr(self._chroma_collection, "metadata", None))
+                if expected_manifest is None:
+                    reason: str | None = "no local embedder available"
+                else:
+                    reason = expected_manifest.incompatibility(stored_manifest)
+                if reason is None:
+                    logger.info(f"Existing collection matches the active embedder: {stored_manifest}")
+                    self._index_manifest = stored_manifest
+                    self._collection_initialized = True
+                    return
+                logger.warning(f"Existing collection is incompatible ({reason}) - will rebuild")
+            
+            # Create or recreate the collection, recording the manifest of the embedder that fills it
+            logger.info("Creating local index collection")
+            # Delete the existing collection first
+            try:
+                self._chroma_client.delete_collection(name=collection_name)
+                logger.info(f"Deleted existing collection: {collection_name}")
+            except Exception as delete_e:
+                logger.debug(f"No existing collection to delete: {delete_e}")
+            
+            # Create collection with consistent embedding function
+            logger.info("Creating collection with consistent embedding function...")
+            if embedding_function and expected_manifest is not None:
+                try:
+                    # Create collection with optimized settings for performance
+                    # Cast to Any to satisfy ChromaDB's EmbeddingFunction protocol
+                    from typing import Any
                     
-                    # Validate the loaded collection's embedding function
-                    embedding_function = getattr(self._chroma_collection, "_embedding_function", None)
-                    
-                    # Check collection metadata first for embedding model info
-                    collection_metadata = getattr(self._chroma_collection, "metadata", {})
-                    has_qwen_metadata = (
-                        collection_metadata.get("embedding_model") == "Qwen3-4B" or
-                        collection_metadata.get("embedding_dimensions") == "2560"
+                    self._chroma_collection = self._chroma_client.create_collection(
+                        name=collection_name,
+                        embedding_function=cast(Any, embedding_function),
+                        metadata={
+                            "description": "Tier0 goals, OKRs, and use-cases from sync_tiers",
+                            "embedding_model": expected_manifest.model_id,
+                            "embedding_dimensions": str(expected_manifest.dimensions),
+                            # Simplified metadata to avoid parsing errors
+                            "optimized": "true",
+                            "space": "cosine",
+                            **expected_manifest.to_metadata(),
+                        },
                     )
+                    self._index_manifest = expected_manifest
+                    logger.info(f"Created new ChromaDB collection: {collection_name} ({expected_manifest})")
                     
-                    if embedding_function is not None:
-                        # Test the embedding function to see if it produces the correct dimensions
-                        try:
-                            test_embedding = embedding_function.embed_query("test")
-                            if len(test_embedding) == 384:
-                                if has_qwen_metadata:
-                                    logger.info("Collection has Qwen3-4B metadata but default embedding function - will recreate")
-                                else:
-                                    logger.warning(
-                                        "Loaded collection uses default embedding function (384 dims) - will recreate"
-                                    )
-                                collection_needs_recreation = True
-                            elif len(test_embedding) == 2560:
-                                logger.info("Collection has correct Qwen3-4B embedding function (2560 dims)")
-                            else:
-                                logger.warning(f"Collection has unexpected embedding dimensions: {len(test_embedding)} - will recreate")
-                                collection_needs_recreation = True
-                        except Exception as e:
-                            logger.warning(f"Could not test embedding function: {e}")
-                            # Fallback to class name check
-                            if hasattr(embedding_function, "__class__") and "DefaultEmbeddingFunction" in str(
-                                embedding_function.__class__
-                            ):
-                                if has_qwen_metadata:
-                                    logger.info("Collection has Qwen3-4B metadata but default embedding function - will recreate")
-                                else:
-                                    logger.warning(
-                                        "Loaded collection uses default embedding function (384 dims) - will recreate"
-                                    )
-                            collection_needs_recreation = True
-                        else:
-                            try:
-                                if hasattr(embedding_function, "embed_documents"):
-                                    test_embedding = embedding_function.embed_documents(["test"])[0]
-                                    if len(test_embedding) != 2560:
-                                        logger.warning(
-                                            f"Loaded collection has wrong embedding dimensions: {len(test_embedding)} (expected 2560) - will recreate"
-                                        )
-                                        collection_needs_recreation = True
-                                    else:
-                                        logger.info(
-                                            "Loaded collection has correct Qwen3-4B embedding function (2560 dims)"
-                                        )
-                                        # Collection is already properly configured, no need to recreate
-                                        collection_needs_recreation = False
-                                else:
-                                    logger.warning(
-                                        "Loaded collection has custom embedding function but missing embed_documents method - will recreate"
-                                    )
-                                    collection_needs_recreation = True
-                            except Exception as embed_test_e:
-                                logger.warning(
-                                    f"Loaded collection embedding function test failed: {embed_test_e} - will recreate"
-                                )
-                                collection_needs_recreation = True
+                    # Verify the embedding function was properly stored
+                    stored_embedding_function = getattr(self._chroma_collection, "_embedding_function", None)
+                    if stored_embedding_function:
+                        logger.info("✅ Embedding function properly stored in collection")
                     else:
-                        if has_qwen_metadata:
-                            logger.warning("Loaded collection has Qwen3-4B metadata but no embedding function - will recreate")
-                            collection_needs_recreation = True
-                        else:
-                            logger.warning("Loaded collection has no embedding function (384 dims) - will recreate")
-                            collection_needs_recreation = True
+                        logger.warning("⚠️ Embedding function not properly stored in collection")
+
+                    # Optimize the collection for better performance
+                    self._optimize_chromadb_collection()
                     
-                    # If collection is valid, we can skip creation
-                    if not collection_needs_recreation:
-                        self._collection_initialized = True
-                        return
-                        
-                except Exception as e:
-                    logger.info(f"Collection doesn't exist or error getting collection: {e}")
-                    collection_needs_recreation = True
-            
-            # Create or recreate collection if needed
-            if collection_needs_recreation:
-                logger.info("Collection needs recreation due to embedding function mismatch")
-                # Delete the existing collection first
-                try:
-                    self._chroma_client.delete_collection(name=collection_name)
-                    logger.info(f"Deleted existing collection: {collection_name}")
-                except Exception as delete_e:
-                    logger.debug(f"No existing collection to delete: {delete_e}")
-                
-                # Create collection with consistent embedding function
-                logger.info("Creating collection with consistent embedding function...")
-                embedding_function = self._get_qwen_embedding_function()
-                logger.info(f"Qwen embedding function result: {embedding_function is not None}")
-                if embedding_function:
+                    # Log ChromaDB collection metrics
+                    from papr_memory._retrieval_logging import retrieval_logging_service
                     try:
-                        # Test the embedding function to ensure it works
-                        test_embedding = getattr(embedding_function, 'embed_documents', lambda _: [None])(["test"])[0]  # type: ignore
-                        logger.info(f"Embedding function test successful (dim: {len(test_embedding) if test_embedding else 0})")
-
-                        # Create collection with optimized settings for performance
-                        # Cast to Any to satisfy ChromaDB's EmbeddingFunction protocol
-                        from typing import Any
-                        
-                        self._chroma_collection = self._chroma_client.create_collection(
-                            name=collection_name,
-                            embedding_function=cast(Any, embedding_function),
-                            metadata={
-                                "description": "Tier0 goals, OKRs, and use-cases from sync_tiers",
-                                "embedding_model": "Qwen3-4B",
-                                "embedding_dimensions": "2560",
-                                # Simplified metadata to avoid parsing errors
-                                "optimized": "true",
-                                "space": "cosine",
-                            },
+                        collection_info = self._chroma_collection.get()  # type: ignore
+                        documents = collection_info.get("documents", []) if collection_info else []
+                        num_documents = len(documents) if documents is not None else 0
+                        embedding_function_name = "Qwen3-4B" if embedding_function else "DefaultEmbeddingFunction"
+                        retrieval_logging_service.log_chromadb_metrics(
+                            collection_name, 
+                            num_documents, 
+                            embedding_function_name
                         )
-                        logger.info(f"Created new ChromaDB collection with Qwen3-4B embeddings: {collection_name}")
-                        
-                        # Verify the embedding function was properly stored
-                        stored_embedding_function = getattr(self._chroma_collection, "_embedding_function", None)
-                        if stored_embedding_function:
-                            logger.info("✅ Embedding function properly stored in collection")
-                        else:
-                            logger.warning("⚠️ Embedding function not properly stored in collection")
-
-                        # Optimize the collection for better performance
-                        self._optimize_chromadb_collection()
-                        
-                        # Log ChromaDB collection metrics
-                        from papr_memory._retrieval_logging import retrieval_logging_service
+                    except Exception as metrics_e:
+                        logger.warning(f"Could not log ChromaDB metrics: {metrics_e}")
+                except Exception as create_e:
+                    error_msg = str(create_e)
+                    if "already exists" in error_msg.lower():
+                        logger.warning(f"Collection already exists: {create_e}")
+                        logger.info("Using existing collection...")
                         try:
-                            collection_info = self._chroma_collection.get()  # type: ignore
-                            documents = collection_info.get("documents", []) if collection_info else []
-                            num_documents = len(documents) if documents is not None else 0
-                            embedding_function_name = "Qwen3-4B" if embedding_function else "DefaultEmbeddingFunction"
-                            retrieval_logging_service.log_chromadb_metrics(
-                                collection_name, 
-                                num_documents, 
-                                embedding_function_name
-                            )
-                        except Exception as metrics_e:
-                            logger.warning(f"Could not log ChromaDB metrics: {metrics_e}")
-                    except Exception as create_e:
-                        error_msg = str(create_e)
-                        if "already exists" in error_msg.lower():
-                            logger.warning(f"Collection already exists: {create_e}")
-                            logger.info("Using existing collection...")
-                            try:
-                                self._chroma_collection = self._chroma_client.get_collection(name=collection_name)
-                                logger.info(f"Successfully retrieved existing collection: {collection_name}")
-                            except Exception as get_e:
-                                logger.error(f"Failed to get existing collection: {get_e}")
-                                logger.info("Falling back to collection without embedding function...")
-                                self._chroma_collection = self._chroma_client.create_collection(
-                                    name=collection_name,
-                                    metadata={"description": "Tier0 goals, OKRs, and use-cases from sync_tiers"},
-                                )
-                                logger.info(f"Created new ChromaDB collection without embedding function: {collection_name}")
-                        else:
-                            logger.error(f"Failed to create collection with embedding function: {create_e}")
+                            self._chroma_collection = self._chroma_client.get_collection(name=collection_name)
+                            logger.info(f"Successfully retrieved existing collection: {collection_name}")
+                        except Exception as get_e:
+                            logger.error(f"Failed to get existing collection: {get_e}")
                             logger.info("Falling back to collection without embedding function...")
                             self._chroma_collection = self._chroma_client.create_collection(
                                 name=collection_name,
                                 metadata={"description": "Tier0 goals, OKRs, and use-cases from sync_tiers"},
                             )
                             logger.info(f"Created new ChromaDB collection without embedding function: {collection_name}")
-                else:
-                    # Fallback: create without custom embedding function
-                    logger.warning(
-                        "Qwen3-4B embedding function not available, creating collection without custom embedding function..."
-                    )
-                    logger.warning(
-                        "This will result in a collection with DefaultEmbeddingFunction (384 dims) instead of Qwen3-4B (2560 dims)"
-                    )
-                    self._chroma_collection = self._chroma_client.create_collection(
-                        name=collection_name,
-                        metadata={"description": "Tier0 goals, OKRs, and use-cases from sync_tiers"},
-                    )
-                    logger.info(f"Created new ChromaDB collection without custom embedding function: {collection_name}")
-                
-                # Verify collection was created successfully
-                if self._chroma_collection is None:
-                    logger.error("Failed to create ChromaDB collection - collection is None")  # type: ignore
-                    # Set to None to indicate failure
-                    self._chroma_collection = None  # type: ignore
-                else:
-                    logger.info(f"ChromaDB collection created successfully: {self._chroma_collection.name}")
-            
-            collection = self._chroma_collection
+                    else:
+                        logger.error(f"Failed to create collection with embedding function: {create_e}")
+                        logger.info("Falling back to collection without embedding function...")
+                        self._chroma_collection = self._chroma_client.create_collection(
+                            name=collection_name,
+                            metadata={"description": "Tier0 goals, OKRs, and use-cases from sync_tiers"},
+                        )
+                        logger.info(f"Created new ChromaDB collection without embedding function: {collection_name}")
+            else:
+                # Fallback: create without custom embedding function
+                logger.warning(
+                    "Qwen3-4B embedding function not available, creating collection without custom embedding function..."
+                )
+                logger.warning(
+                    "This will result in a collection with DefaultEmbeddingFunction (384 dims) instead of Qwen3-4B (2560 dims)"
+                )
+                self._chroma_collection = self._chroma_client.create_collection(
+                    name=collection_name,
+                    metadata={"description": "Tier0 goals, OKRs, and use-cases from sync_tiers"},
+                )
+                logger.info(f"Created new ChromaDB collection without custom embedding function: {collection_name}")
             
-            # Check for dimension mismatch and fix if needed
-            self._check_and_fix_embedding_dimensions(collection, tier0_data)
+            # Verify collection was created successfully
+            if self._chroma_collection is None:
+                logger.error("Failed to create ChromaDB collection - collection is None")  # type: ignore
+                # Set to None to indicate failure
+                self._chroma_collection = None  # type: ignore
+            else:
+                logger.info(f"ChromaDB collection created successfully: {self._chroma_collection.name}")
             
-            # Update collection reference in case it was recreated
             collection = self._chroma_collection
             
             # Verify collection is still valid
@@ -3003,48 +2712,19 @@ class MemoryResource(SyncAPIResource):
             
             logger.info(f"Using ChromaDB collection: {collection.name}")
             
-            # Prepare documents for ChromaDB
-            documents = []
-            metadatas = []
-            ids = []
-            
-            for i, item in enumerate(tier0_data):
-                # Extract content for embedding
-                content = str(item)
-                if isinstance(item, dict):
-                    content = str(item.get("content", item.get("description", str(item))))
-                
-                # Create metadata - use item's metadata if exists, otherwise create default
-                if isinstance(item, dict):
-                    # Start with item's metadata if it exists
-                    metadata = dict(item.get("metadata", {}))
-                    
-                    # Add/override with our standard fields
-                    metadata.update(
-                        {
-                        "source": "sync_tiers",
-                        "tier": 0,
-                            "type": str(item.get("type", "unknown")),
-                            "topics": str(item.get("topics", [])),
-                            "id": str(item.get("id", f"tier0_{i}")),
-                            "updatedAt": str(item.get("updatedAt", "")),
-                        }
-                    )
-                else:
-                    # Fallback for non-dict items
-                    metadata = {"source": "sync_tiers", "tier": 0, "type": "unknown", "topics": "unknown"}  # type: ignore
-                
-                documents.append(content)
-                metadatas.append(metadata)
-                item_id = f"tier0_{i}"
-                if isinstance(item, dict) and "id" in item:
-                    item_id = f"tier0_{i}_{item['id']}"
-                ids.append(item_id)
+            # Prepare documents for ChromaDB (same records as the tenant indexes)
+            ids, documents, metadatas = tier0_records(tier0_data)
             
             # Extract embeddings from server response
             embeddings = []
             if tier0_data and isinstance(tier0_data[0], dict) and "embedding" in tier0_data[0]:
                 logger.info("Using embeddings from server response...")
+                # Server vectors are full-size; truncate them to match a Matryoshka-truncated local embedder
+                from papr_memory._onnx_embedder import onnx_enabled, matryoshka_truncate, get_matryoshka_dimensions
+
+                matryoshka_dims = get_matryoshka_dimensions() if onnx_enabled() else None
+                index_manifest = getattr(self, "_index_manifest", None)
+                index_dims = index_manifest.dimensions if index_manifest is not None else 0
                 for i, item in enumerate(tier0_data):
                     if isinstance(item, dict) and "embedding" in item:
                         embedding = item["embedding"]
@@ -3054,6 +2734,14 @@ class MemoryResource(SyncAPIResource):
                             and len(embedding) > 0
                                 and isinstance(embedding[0], (int, float))  # type: ignore
                         ):
+                            if matryoshka_dims is not None:
+                                embedding = matryoshka_truncate(embedding, matryoshka_dims)
+                            if index_dims and len(embedding) != index_dims:
+                                logger.warning(
+                                    f"Server embedding for item {i} has {len(embedding)} dims, index expects {index_dims} - will use local generation"
+                                )
+                                embeddings.append(None)
+                                continue
                             embeddings.append(embedding)
                             logger.info(f"Valid server embedding for item {i} (dim: {len(embedding)})")
                         else:
@@ -3073,52 +2761,28 @@ class MemoryResource(SyncAPIResource):
 
                     start_time = time.time()
                     
-                    # Use the same embedding function as the collection to ensure dimension consistency
-                    if hasattr(self, "_chroma_collection") and self._chroma_collection is not None:
-                        # Prefer the collection's embedding function only if it provides a usable API
-                        coll_func = getattr(self._chroma_collection, "_embedding_function", None)
-                        if coll_func is not None and (
-                            hasattr(coll_func, "embed_documents") or hasattr(coll_func, "encode") or callable(coll_func)
-                        ):
-                            embedder = coll_func
-                            logger.info("Using collection's embedding function for consistency")
-                        else:
-                            embedder = self._get_local_embedder()  # type: ignore
-                            logger.info("Using local embedder (collection has no usable embedding function)")
-                    else:
-                        # No collection available, use local embedder
-                        embedder = self._get_local_embedder()  # type: ignore
-                        logger.info("Using local embedder (no collection available)")
+                    # Use the same embedder as local queries to ensure dimension consistency
+                    embedder = self._resolve_query_embedder()
                     
                     if embedder:
+                        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
                         local_embedding_count = 0
-                        for i, embedding in enumerate(embeddings):
-                            if embedding is None:
-                                try:
-                                    item_start_time = time.time()
-                                    
-                                    # Use the appropriate embedding method based on embedder type
-                                    if hasattr(embedder, "embed_documents"):
-                                        # ChromaDB embedding function
-                                        local_embedding = embedder.embed_documents([documents[i]])[0]  # type: ignore
-                                    else:
-                                        # SentenceTransformer model
-                                        local_embedding = embedder.encode([documents[i]])[0].tolist()  # type: ignore
-                                    
-                                    item_time = time.time() - item_start_time
-                                    embeddings[i] = local_embedding
+                        # One batched forward pass per embedder.batch_size items instead of one per item
+                        for start in range(0, len(missing), max(1, embedder.batch_size)):
+                            chunk = missing[start : start + max(1, embedder.batch_size)]
+                            try:
+                                vectors = embedder.embed_documents([documents[i] for i in chunk])
+                                for i, vector in zip(chunk, vectors):
+                                    embeddings[i] = vector
                                     local_embedding_count += 1
-                                    logger.info(
-                                        f"Generated local embedding for item {i} (dim: {len(local_embedding)}) in {item_time:.2f}s"
-                                    )
-                                except Exception as e:
-                                    logger.error(f"Failed to generate local embedding for item {i}: {e}")
+                            except Exception as e:
+                                logger.error(f"Failed to generate local embeddings for items {chunk}: {e}")
                         
                         total_time = time.time() - start_time
                         if local_embedding_count > 0:
                             avg_time = total_time / local_embedding_count
                             logger.info(
-                                f"Generated {local_embedding_count} local embeddings in {total_time:.2f}s (avg: {avg_time:.2f}s per embedding)"
+                                f"Generated {local_embedding_count} local embeddings with {embedder.name!r} in {total_time:.2f}s (avg: {avg_time:.2f}s per embedding)"
                             )
                     else:
                         logger.warning("No local embedder available for missing embeddings")
@@ -3241,66 +2905,12 @@ class MemoryResource(SyncAPIResource):
                 else:
                     logger.info(f"No changes detected in tier0 data - ChromaDB collection unchanged")  # type: ignore
                 
-                # Query to verify storage (use safe query method)
+                # Verify storage without running the model (the manifest already guarantees compatible vectors)
                 try:
-                    # Check if we can safely query without dimension mismatch
-                    if hasattr(collection, "_embedding_function") and collection._embedding_function:
-                        # Collection has custom embedding function - should be safe to query
-                        # But first, let's ensure the embedding function is working correctly
-                        try:
-                            # Test the embedding function to ensure it produces the right dimensions
-                            test_embedding = collection._embedding_function.embed_documents(["test"])[0]  # type: ignore
-                            logger.info(f"Collection embedding function test successful (dim: {len(test_embedding)})")
-                            
-                            # Now query using the collection's embedding function
-                            results = collection.query(
-                                query_texts=["goals objectives"], n_results=min(3, len(documents))
-                            )
-                            if (
-                                results
-                                and results.get("documents")
-                                and results["documents"]
-                                and results["documents"][0]
-                            ):  # type: ignore
-                                logger.info(f"ChromaDB query test returned {len(results['documents'][0])} results")
-                        except Exception as embed_test_e:
-                            logger.warning(f"Collection embedding function test failed: {embed_test_e}")
-                            logger.info("Skipping query test to avoid dimension mismatch")
-                            count = collection.count()
-                            logger.info(f"ChromaDB collection contains {count} documents (verified via count)")
-                    else:
-                        # Collection uses default embedding function - might have dimension issues
-                        logger.info(
-                            "Collection uses default embedding function - skipping query test to avoid dimension mismatch"
-                        )
-                        count = collection.count()
-                        logger.info(f"ChromaDB collection contains {count} documents (verified via count)")
-                except Exception as query_e:
-                    logger.warning(f"ChromaDB query test failed (likely dimension mismatch): {query_e}")
-                    logger.info(
-                        "This indicates the collection was created with different embedding dimensions than expected"
-                    )
-                    logger.info("The collection will need to be recreated with the correct embedding function")
-                    
-                    # Try alternative verification method
-                    try:
-                        count = collection.count()
-                        logger.info(f"ChromaDB collection contains {count} documents (verified via count)")
-                    except Exception as count_e:
-                        logger.warning(f"Could not verify collection via count: {count_e}")
-                    
-                    # Mark collection as needing recreation due to dimension mismatch
-                    logger.warning("Collection has dimension mismatch - will be recreated on next run")
-                    if hasattr(self, "_chroma_collection"):
-                        # Delete the problematic collection
-                        try:
-                            collection_name = "tier0_goals_okrs"
-                            self._chroma_client.delete_collection(name=collection_name)
-                            logger.info(f"Deleted collection {collection_name} due to dimension mismatch")
-                            # Clear the collection reference so it gets recreated
-                            self._chroma_collection = None  # type: ignore
-                        except Exception as delete_e:
-                            logger.warning(f"Could not delete problematic collection: {delete_e}")
+                    count = collection.count()
+                    logger.info(f"ChromaDB collection contains {count} documents (verified via count)")
+                except Exception as count_e:
+                    logger.warning(f"Could not verify collection via count: {count_e}")
                 
         except ImportError:
             logger.warning("ChromaDB not available - install with: pip install chromadb")
@@ -3556,7 +3166,17 @@ class MemoryResource(SyncAPIResource):
             f"DEBUG: ondevice_processing={ondevice_processing}, hasattr={hasattr(self, '_chroma_collection')}, collection_not_none={getattr(self, '_chroma_collection', None) is not None}"
         )
         
-        if ondevice_processing and hasattr(self, "_chroma_collection") and self._chroma_collection is not None:
+        # Tenant-scoped searches are answered from that tenant's own local index, never the shared one
+        tenant = tenant_key(
+            self._client,
+            external_user_id=external_user_id,
+            user_id=user_id,
+            namespace_id=namespace_id,
+            organization_id=organization_id,
+        )
+        local_index_available = tenant is not None or getattr(self, "_chroma_collection", None) is not None
+
+        if ondevice_processing and local_index_available:
             import time
 
             start_time = time.time()
@@ -3566,17 +3186,19 @@ class MemoryResource(SyncAPIResource):
             assert isinstance(n_results, int), "n_results must be an int"
             
             # Check if model is loaded, fallback to server-side search if not
-            global _model_loading_complete
-            if not _model_loading_complete:
+            if not _ondevice_lifecycle.is_ready():
                 logger.info("Model still loading in background, using server-side search for optimal UX")
                 tier0_context = []
             else:
                 tier0_context = self._search_tier0_locally(
                     query, 
                     n_results=n_results,
-                    metadata=cast(Optional[MemoryMetadataParam] | NotGiven, metadata if metadata is not omit else not_given),
-                    user_id=cast(Optional[str] | NotGiven, user_id if user_id is not omit else not_given),
-                    external_user_id=cast(Optional[str] | NotGiven, external_user_id if external_user_id is not omit else not_given)
+                    metadata=cast("Optional[MemoryMetadataParam] | NotGiven", metadata if metadata is not omit else not_given),
+                    user_id=cast("Optional[str] | NotGiven", user_id if user_id is not omit else not_given),
+                    external_user_id=cast("Optional[str] | NotGiven", external_user_id if external_user_id is not omit else not_given),
+                    tenant=tenant,
+                    omo_filter=cast("Optional[memory_search_params.OmoFilter] | NotGiven", omo_filter if omo_filter is not omit else not_given),
+                    search_acl=cast("Optional[ACLConfig] | NotGiven", search_acl if search_acl is not omit else not_given),
                 ) or []
             
             search_time = time.time() - start_time
@@ -3585,7 +3207,7 @@ class MemoryResource(SyncAPIResource):
                 logger.info(f"Using {len(tier0_context)} tier0 items for search context enhancement")
                 # Convert tier0_context (list of documents) to Memory objects
                 from papr_memory.types.shared.memory import Memory
-                from papr_memory.types.search_response import Data
+                from papr_memory.types.search_result import SearchResult
 
                 memories = []
                 for i, item in enumerate(tier0_context):
@@ -3631,7 +3253,7 @@ class MemoryResource(SyncAPIResource):
                             continue
                 
                 # Return search results with proper SearchResponse structure
-                return SearchResponse(data=Data(memories=memories, nodes=[]), status="success")  # type: ignore[arg-type]
+                return SearchResponse(data=SearchResult(memories=memories, nodes=[]), status="success")
         elif not ondevice_processing:
             logger.info("On-device processing disabled - using API-only search")
         else:
@@ -3698,6 +3320,11 @@ class AsyncMemoryResource(AsyncAPIResource):
         """
         return AsyncMemoryResourceWithStreamingResponse(self)
 
+    @cached_property
+    def ondevice(self) -> AsyncOnDevice:
+        """Awaitable readiness of on-device search (see `AsyncOnDevice`)."""
+        return AsyncOnDevice()
+
     async def update(
         self,
         memory_id: str,
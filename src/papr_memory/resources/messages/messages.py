@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, Union, Iterable, Optional
+from typing import Any, Dict, Union, Iterable, Optional
 from typing_extensions import Literal
 
 import httpx
@@ -27,6 +27,14 @@ from ..._response import (
     async_to_streamed_response_wrapper,
 )
 from ..._base_client import make_request_options
+from ..._session_cache import note_stored
+from ..._message_buffer import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_PENDING,
+    ErrorCallback,
+    MessageBuffer,
+    AsyncMessageBuffer,
+)
 from ...types.memory_metadata_param import MemoryMetadataParam
 from ...types.graph_generation_param import GraphGenerationParam
 from ...types.message_store_response import MessageStoreResponse
@@ -187,6 +195,59 @@ class MessagesResource(SyncAPIResource):
             cast_to=MessageStoreResponse,
         )
 
+    def store_cached(self, *, session_id: str, **params: Any) -> MessageStoreResponse:
+        """Same as `store`, and counts the message in the session cache.
+
+        `sessions.compress_cached` and `sessions.retrieve_history_cached` then refresh the
+        session on their next call instead of waiting for `PAPR_SESSION_CACHE_TTL`. `store`
+        itself does not touch the cache. See `_session_cache`.
+
+        Args:
+          session_id: Session ID to group related messages in a conversation
+
+          **params: Any other `store` argument.
+        """
+        response = self.store(session_id=session_id, **params)
+        note_stored(self._client, session_id)
+        return response
+
+    def buffered(
+        self,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        journal: Optional[str] = None,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> MessageBuffer:
+        """
+        Create a buffer that stores messages in the background, in order within each session.
+
+        `buffer.store(...)` takes the same arguments as `store`, queues the message and
+        returns its id immediately. Each session has at most one request in flight, and up
+        to `concurrency` sessions are written in parallel. Connection errors, 429s and 5xx
+        responses are retried with backoff until the message is stored, and other errors are
+        logged and passed to `on_error`. `buffer.close()` stores what is still queued;
+        buffers left open are drained at interpreter exit.
+
+        The API has no idempotency header, so before a message is sent again after an attempt
+        that may have reached the server, the newest message of its session is fetched with
+        `sessions.retrieve_history`; if it has the same role and content, the message counts
+        as stored. A retry is therefore skipped when an identical message was stored just
+        before it.
+
+        Args:
+          concurrency: Maximum number of sessions written at the same time.
+
+          max_pending: Queued messages at which `buffer.store` starts waiting.
+
+          journal: Path of a local file recording queued messages. Messages left in it by a
+              crash or restart are sent again, with their original ids, by the next buffer.
+
+          on_error: Called with the message id, its parameters and the exception when a
+              message cannot be stored.
+        """
+        return MessageBuffer(self, concurrency=concurrency, max_pending=max_pending, journal=journal, on_error=on_error)
+
 
 class AsyncMessagesResource(AsyncAPIResource):
     @cached_property
@@ -340,6 +401,59 @@ class AsyncMessagesResource(AsyncAPIResource):
             cast_to=MessageStoreResponse,
         )
 
+    async def store_cached(self, *, session_id: str, **params: Any) -> MessageStoreResponse:
+        """Same as `store`, and counts the message in the session cache.
+
+        `sessions.compress_cached` and `sessions.retrieve_history_cached` then refresh the
+        session on their next call instead of waiting for `PAPR_SESSION_CACHE_TTL`. `store`
+        itself does not touch the cache. See `_session_cache`.
+
+        Args:
+          session_id: Session ID to group related messages in a conversation
+
+          **params: Any other `store` argument.
+        """
+        response = await self.store(session_id=session_id, **params)
+        note_stored(self._client, session_id)
+        return response
+
+    def buffered(
+        self,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        journal: Optional[str] = None,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> AsyncMessageBuffer:
+        """
+        Create a buffer that stores messages in the background, in order within each session.
+
+        `buffer.store(...)` takes the same arguments as `store`, queues the message and
+        returns its id immediately. Each session has at most one request in flight, and up
+        to `concurrency` sessions are written in parallel. Connection errors, 429s and 5xx
+        responses are retried with backoff until the message is stored, and other errors are
+        logged and passed to `on_error`. `await buffer.close()` stores what is still queued
+        and must run before the event loop stops.
+
+        The API has no idempotency header, so before a message is sent again after an attempt
+        that may have reached the server, the newest message of its session is fetched with
+        `sessions.retrieve_history`; if it has the same role and content, the message counts
+        as stored. A retry is therefore skipped when an identical message was stored just
+        before it.
+
+        Args:
+          concurrency: Maximum number of sessions written at the same time.
+
+          max_pending: Queued messages at which `buffer.store` starts waiting.
+
+          journal: Path of a local file recording queued messages. Messages left in it by a
+              crash or restart are sent again, with their original ids, by the next buffer.
+
+          on_error: Called with the message id, its parameters and the exception when a
+              message cannot be stored.
+        """
+        return AsyncMessageBuffer(self, concurrency=concurrency, max_pending=max_pending, journal=journal, on_error=on_error)
+
 
 class MessagesResourceWithRawResponse:
     def __init__(self, messages: MessagesResource) -> None:
@@ -16,10 +16,24 @@ from ..._response import (
     async_to_raw_response_wrapper,
     async_to_streamed_response_wrapper,
 )
+from ..._auto_paginate import (
+    DEFAULT_PAGE_SIZE,
+    PageIterator,
+    AsyncPageIterator,
+    history_pages,
+    async_history_pages,
+)
 from ..._base_client import make_request_options
+from ..._session_cache import (
+    DEFAULT_HISTORY_LIMIT,
+    cached_history,
+    cached_compress,
+    async_cached_history,
+    async_cached_compress,
+)
 from ...types.messages import session_update_params, session_retrieve_history_params
 from ...types.messages.session_compress_response import SessionCompressResponse
-from ...types.messages.session_retrieve_history_response import SessionRetrieveHistoryResponse
+from ...types.messages.session_retrieve_history_response import Message, SessionRetrieveHistoryResponse
 
 __all__ = ["SessionsResource", "AsyncSessionsResource"]
 
@@ -310,6 +324,61 @@ class SessionsResource(SyncAPIResource):
             cast_to=object,
         )
 
+    def compress_cached(self, session_id: str) -> SessionCompressResponse:
+        """
+        Like `compress`, but served from a local per-session cache while the summaries are current.
+
+        The server regenerates summaries every 15 messages, so the cached context is reused
+        until the session's message count crosses the next multiple of 15. Messages stored
+        with `messages.store_cached` or `messages.buffered` advance the count; cache entries
+        are revalidated after `PAPR_SESSION_CACHE_TTL` seconds (default 300) to pick up
+        writes from elsewhere, including plain `messages.store` calls.
+        """
+        if not session_id:
+            raise ValueError(f"Expected a non-empty value for `session_id` but received {session_id!r}")
+        return cached_compress(self, session_id)
+
+    def retrieve_history_cached(
+        self, session_id: str, *, limit: int = DEFAULT_HISTORY_LIMIT
+    ) -> SessionRetrieveHistoryResponse:
+        """
+        Like `retrieve_history`, returning the newest `limit` messages from a local per-session cache.
+
+        The cache is extended instead of refetched: after new messages, only the newest page
+        is requested and merged on top of the cached messages, and a larger `limit` fetches
+        just the older remainder. Messages stored with `messages.store_cached` or
+        `messages.buffered` mark the entry as stale; entries are also revalidated after
+        `PAPR_SESSION_CACHE_TTL` seconds.
+        """
+        if not session_id:
+            raise ValueError(f"Expected a non-empty value for `session_id` but received {session_id!r}")
+        return cached_history(self, session_id, limit)
+
+    def retrieve_history_all(
+        self,
+        session_id: str,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        concurrency: int = 1,
+    ) -> PageIterator[Message, SessionRetrieveHistoryResponse]:
+        """
+        Iterate over every message of a session, newest first, fetching pages of
+        `retrieve_history` as iteration reaches them.
+
+        `iter_pages()` yields the raw pages instead of the messages.
+
+        Args:
+          page_size: Messages per request.
+
+          prefetch: Fetch the next page in the background while the current one is consumed.
+
+          concurrency: Pages fetched in parallel once the total is known (they are still yielded in order).
+        """
+        return history_pages(
+            self, session_id, page_size=page_size, prefetch=prefetch, concurrency=concurrency
+        )
+
 
 class AsyncSessionsResource(AsyncAPIResource):
     @cached_property
@@ -597,6 +666,61 @@ class AsyncSessionsResource(AsyncAPIResource):
             cast_to=object,
         )
 
+    async def compress_cached(self, session_id: str) -> SessionCompressResponse:
+        """
+        Like `compress`, but served from a local per-session cache while the summaries are current.
+
+        The server regenerates summaries every 15 messages, so the cached context is reused
+        until the session's message count crosses the next multiple of 15. Messages stored
+        with `messages.store_cached` or `messages.buffered` advance the count; cache entries
+        are revalidated after `PAPR_SESSION_CACHE_TTL` seconds (default 300) to pick up
+        writes from elsewhere, including plain `messages.store` calls.
+        """
+        if not session_id:
+            raise ValueError(f"Expected a non-empty value for `session_id` but received {session_id!r}")
+        return await async_cached_compress(self, session_id)
+
+    async def retrieve_history_cached(
+        self, session_id: str, *, limit: int = DEFAULT_HISTORY_LIMIT
+    ) -> SessionRetrieveHistoryResponse:
+        """
+        Like `retrieve_history`, returning the newest `limit` messages from a local per-session cache.
+
+        The cache is extended instead of refetched: after new messages, only the newest page
+        is requested and merged on top of the cached messages, and a larger `limit` fetches
+        just the older remainder. Messages stored with `messages.store_cached` or
+        `messages.buffered` mark the entry as stale; entries are also revalidated after
+        `PAPR_SESSION_CACHE_TTL` seconds.
+        """
+        if not session_id:
+            raise ValueError(f"Expected a non-empty value for `session_id` but received {session_id!r}")
+        return await async_cached_history(self, session_id, limit)
+
+    def retrieve_history_all(
+        self,
+        session_id: str,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        concurrency: int = 1,
+    ) -> AsyncPageIterator[Message, SessionRetrieveHistoryResponse]:
+        """
+        Iterate over every message of a session, newest first, fetching pages of
+        `retrieve_history` as iteration reaches them.
+
+        `iter_pages()` yields the raw pages instead of the messages.
+
+        Args:
+          page_size: Messages per request.
+
+          prefetch: Fetch the next page in the background while the current one is consumed.
+
+          concurrency: Pages fetched in parallel once the total is known (they are still yielded in order).
+        """
+        return async_history_pages(
+            self, session_id, page_size=page_size, prefetch=prefetch, concurrency=concurrency
+        )
+
 
 class SessionsResourceWithRawResponse:
     def __init__(self, sessions: SessionsResource) -> None:
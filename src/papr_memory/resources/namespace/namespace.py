@@ -26,7 +26,15 @@ from ..._response import (
     async_to_raw_response_wrapper,
     async_to_streamed_response_wrapper,
 )
+from ..._auto_paginate import (
+    DEFAULT_PAGE_SIZE,
+    PageIterator,
+    AsyncPageIterator,
+    namespace_pages,
+    async_namespace_pages,
+)
 from ..._base_client import make_request_options
+from ...types.namespace_item import NamespaceItem
 from ...types.namespace_list_response import NamespaceListResponse
 from ...types.namespace_create_response import NamespaceCreateResponse
 from ...types.namespace_delete_response import NamespaceDeleteResponse
@@ -298,6 +306,27 @@ class NamespaceResource(SyncAPIResource):
             cast_to=NamespaceDeleteResponse,
         )
 
+    def list_all(
+        self,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        concurrency: int = 1,
+    ) -> PageIterator[NamespaceItem, NamespaceListResponse]:
+        """
+        Iterate over every namespace, fetching pages of `list` as iteration reaches them.
+
+        `iter_pages()` yields the raw pages instead of the namespaces.
+
+        Args:
+          page_size: Namespaces per request.
+
+          prefetch: Fetch the next page in the background while the current one is consumed.
+
+          concurrency: Pages fetched in parallel once the total is known (they are still yielded in order).
+        """
+        return namespace_pages(self, page_size=page_size, prefetch=prefetch, concurrency=concurrency)
+
 
 class AsyncNamespaceResource(AsyncAPIResource):
     @cached_property
@@ -561,6 +590,27 @@ class AsyncNamespaceResource(AsyncAPIResource):
             cast_to=NamespaceDeleteResponse,
         )
 
+    def list_all(
+        self,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        concurrency: int = 1,
+    ) -> AsyncPageIterator[NamespaceItem, NamespaceListResponse]:
+        """
+        Iterate over every namespace, fetching pages of `list` as iteration reaches them.
+
+        `iter_pages()` yields the raw pages instead of the namespaces.
+
+        Args:
+          page_size: Namespaces per request.
+
+          prefetch: Fetch the next page in the background while the current one is consumed.
+
+          concurrency: Pages fetched in parallel once the total is known (they are still yielded in order).
+        """
+        return async_namespace_pages(self, page_size=page_size, prefetch=prefetch, concurrency=concurrency)
+
 
 class NamespaceResourceWithRawResponse:
     def __init__(self, namespace: NamespaceResource) -> None:
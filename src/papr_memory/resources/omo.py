@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable
+import os
+from typing import IO, Dict, Union, Iterable, Optional
 
 import httpx
 
@@ -17,6 +18,16 @@ from .._response import (
     async_to_raw_response_wrapper,
     async_to_streamed_response_wrapper,
 )
+from .._omo_export import DEFAULT_SHARD_SIZE, OmoExportReport, export_omo, async_export_omo
+from .._omo_import import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_CHUNK_BYTES,
+    OmoImportReport,
+    ProgressCallback,
+    import_omo,
+    async_import_omo,
+)
 from .._base_client import make_request_options
 from ..types.omo_export_memories_response import OmoExportMemoriesResponse
 from ..types.omo_import_memories_response import OmoImportMemoriesResponse
@@ -169,6 +180,110 @@ class OmoResource(SyncAPIResource):
             cast_to=OmoImportMemoriesResponse,
         )
 
+    def import_stream(
+        self,
+        source: Union[str, os.PathLike[str], Iterable[Dict[str, object]]],
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        skip_duplicates: bool = True,
+        checkpoint: Optional[str] = None,
+        max_attempts: int = 3,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> OmoImportReport:
+        """
+        Import a large OMO export in chunks, reading it incrementally instead of all at once.
+
+        `source` is a path to a JSON Lines file, a JSON array of memories or an export object
+        with a `memories` array, or any iterable of memory dicts. Memories are grouped into
+        chunks of at most `chunk_size` memories and `max_chunk_bytes` of JSON, and up to
+        `concurrency` chunks are sent with `import_memories` at a time. Chunks that fail
+        with a connection error, 429 or 5xx are retried up to `max_attempts` times; any
+        other failure stops the import and is raised once the chunks in flight finish.
+
+        With `checkpoint`, progress is written to that file after every committed chunk,
+        and running the same import again skips the chunks already recorded there.
+
+        Args:
+          source: OMO file path or iterable of memories.
+
+          chunk_size: Maximum memories per request.
+
+          max_chunk_bytes: Maximum encoded size of the memories in one request.
+
+          concurrency: Maximum number of requests in flight.
+
+          skip_duplicates: Skip memories with IDs that already exist; keeps re-sent chunks harmless on resume.
+
+          checkpoint: File recording committed chunks so an interrupted import can resume.
+
+          max_attempts: Attempts per chunk for retryable errors.
+
+          on_progress: Called with `(memories committed, memories read)` after each chunk.
+        """
+        return import_omo(
+            self,
+            source,
+            chunk_size=chunk_size,
+            max_chunk_bytes=max_chunk_bytes,
+            concurrency=concurrency,
+            skip_duplicates=skip_duplicates,
+            checkpoint=checkpoint,
+            max_attempts=max_attempts,
+            on_progress=on_progress,
+        )
+
+    def export_stream(
+        self,
+        memory_ids: Iterable[str],
+        output: Union[str, os.PathLike[str], IO[str]],
+        *,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_attempts: int = 3,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> OmoExportReport:
+        """
+        Export many memories as OMO JSON Lines, in parallel shards of `export_memories` requests.
+
+        `memory_ids` is split into shards of `shard_size` ids, up to `concurrency` shards are
+        exported at a time, and the memories are written to `output` (a path or text file)
+        in input order, one JSON object per line, skipping repeated ids. A shard that fails
+        with a connection error, 429 or 5xx is retried up to `max_attempts` times; one that
+        times out or is too large is split in half. Shards that still fail are listed in
+        the report's `failures` and the export continues.
+
+        The endpoint selects memories by id only: to shard by namespace, organization or
+        created-at range, pass the ids grouped in that order.
+
+        Args:
+          memory_ids: Ids of the memories to export.
+
+          output: Path of the JSON Lines file to write, or an open text file.
+
+          shard_size: Memory ids per `export_memories` request.
+
+          concurrency: Maximum number of requests in flight.
+
+          max_attempts: Attempts per shard for retryable errors.
+
+          timeout: Override the client-level default timeout for each shard request.
+
+          on_progress: Called with `(memories written, memory ids requested so far)` after each shard.
+        """
+        return export_omo(
+            self,
+            memory_ids,
+            output,
+            shard_size=shard_size,
+            concurrency=concurrency,
+            max_attempts=max_attempts,
+            timeout=timeout,
+            on_progress=on_progress,
+        )
+
 
 class AsyncOmoResource(AsyncAPIResource):
     @cached_property
@@ -317,6 +432,110 @@ class AsyncOmoResource(AsyncAPIResource):
             cast_to=OmoImportMemoriesResponse,
         )
 
+    async def import_stream(
+        self,
+        source: Union[str, os.PathLike[str], Iterable[Dict[str, object]]],
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        skip_duplicates: bool = True,
+        checkpoint: Optional[str] = None,
+        max_attempts: int = 3,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> OmoImportReport:
+        """
+        Import a large OMO export in chunks, reading it incrementally instead of all at once.
+
+        `source` is a path to a JSON Lines file, a JSON array of memories or an export object
+        with a `memories` array, or any iterable of memory dicts. Memories are grouped into
+        chunks of at most `chunk_size` memories and `max_chunk_bytes` of JSON, and up to
+        `concurrency` chunks are sent with `import_memories` at a time. Chunks that fail
+        with a connection error, 429 or 5xx are retried up to `max_attempts` times; any
+        other failure stops the import and is raised once the chunks in flight finish.
+
+        With `checkpoint`, progress is written to that file after every committed chunk,
+        and running the same import again skips the chunks already recorded there.
+
+        Args:
+          source: OMO file path or iterable of memories.
+
+          chunk_size: Maximum memories per request.
+
+          max_chunk_bytes: Maximum encoded size of the memories in one request.
+
+          concurrency: Maximum number of requests in flight.
+
+          skip_duplicates: Skip memories with IDs that already exist; keeps re-sent chunks harmless on resume.
+
+          checkpoint: File recording committed chunks so an interrupted import can resume.
+
+          max_attempts: Attempts per chunk for retryable errors.
+
+          on_progress: Called with `(memories committed, memories read)` after each chunk.
+        """
+        return await async_import_omo(
+            self,
+            source,
+            chunk_size=chunk_size,
+            max_chunk_bytes=max_chunk_bytes,
+            concurrency=concurrency,
+            skip_duplicates=skip_duplicates,
+            checkpoint=checkpoint,
+            max_attempts=max_attempts,
+            on_progress=on_progress,
+        )
+
+    async def export_stream(
+        self,
+        memory_ids: Iterable[str],
+        output: Union[str, os.PathLike[str], IO[str]],
+        *,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_attempts: int = 3,
+        timeout: float | httpx.Timeout | None | NotGiven = not_given,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> OmoExportReport:
+        """
+        Export many memories as OMO JSON Lines, in parallel shards of `export_memories` requests.
+
+        `memory_ids` is split into shards of `shard_size` ids, up to `concurrency` shards are
+        exported at a time, and the memories are written to `output` (a path or text file)
+        in input order, one JSON object per line, skipping repeated ids. A shard that fails
+        with a connection error, 429 or 5xx is retried up to `max_attempts` times; one that
+        times out or is too large is split in half. Shards that still fail are listed in
+        the report's `failures` and the export continues.
+
+        The endpoint selects memories by id only: to shard by namespace, organization or
+        created-at range, pass the ids grouped in that order.
+
+        Args:
+          memory_ids: Ids of the memories to export.
+
+          output: Path of the JSON Lines file to write, or an open text file.
+
+          shard_size: Memory ids per `export_memories` request.
+
+          concurrency: Maximum number of requests in flight.
+
+          max_attempts: Attempts per shard for retryable errors.
+
+          timeout: Override the client-level default timeout for each shard request.
+
+          on_progress: Called with `(memories written, memory ids requested so far)` after each shard.
+        """
+        return await async_export_omo(
+            self,
+            memory_ids,
+            output,
+            shard_size=shard_size,
+            concurrency=concurrency,
+            max_attempts=max_attempts,
+            timeout=timeout,
+            on_progress=on_progress,
+        )
+
 
 class OmoResourceWithRawResponse:
     def __init__(self, omo: OmoResource) -> None:
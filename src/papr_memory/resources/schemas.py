@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, Union, Optional
+from typing import Any, Dict, Union, Mapping, Optional
 from datetime import datetime
 from typing_extensions import Literal
 
@@ -20,6 +20,13 @@ from .._response import (
     async_to_streamed_response_wrapper,
 )
 from .._base_client import make_request_options
+from .._schema_deploy import (
+    DEFAULT_LOCK_TIMEOUT,
+    DEFAULT_STALE_AFTER,
+    SchemaDeployResult,
+    deploy_schema,
+    async_deploy_schema,
+)
 from ..types.schema_list_response import SchemaListResponse
 from ..types.schema_create_response import SchemaCreateResponse
 from ..types.schema_update_response import SchemaUpdateResponse
@@ -390,6 +397,32 @@ class SchemasResource(SyncAPIResource):
             cast_to=object,
         )
 
+    def deploy(
+        self,
+        schema: Union[type, Mapping[str, Any]],
+        *,
+        state_path: Optional[str] = None,
+        force: bool = False,
+        lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+        stale_after: float = DEFAULT_STALE_AFTER,
+    ) -> SchemaDeployResult:
+        """
+        Create or update a schema only if it changed since it was last deployed from here.
+
+        `schema` is a `@schema`-decorated class or a `build_schema_params` dict. Its content
+        hash is compared with a local record (`state_path`, default `PAPR_SCHEMA_DEPLOY_STATE`
+        or `~/.cache/papr_memory/schemas.json`); when it matches, no API call is made. Otherwise
+        the schema is updated by its recorded id, or found by name with `list` and updated, or
+        created. Deploys that need the API hold a lock file next to the record, so processes
+        sharing the record deploy a change once: the others wait up to `lock_timeout` seconds
+        and then find it recorded. The holder refreshes its lock while it deploys, and a lock
+        not refreshed for `stale_after` seconds is broken, so keep `lock_timeout` longer than
+        `stale_after`. `force` deploys even when the hash matches.
+        """
+        return deploy_schema(
+            self, schema, state_path=state_path, force=force, lock_timeout=lock_timeout, stale_after=stale_after
+        )
+
 
 class AsyncSchemasResource(AsyncAPIResource):
     @cached_property
@@ -753,6 +786,32 @@ class AsyncSchemasResource(AsyncAPIResource):
             cast_to=object,
         )
 
+    async def deploy(
+        self,
+        schema: Union[type, Mapping[str, Any]],
+        *,
+        state_path: Optional[str] = None,
+        force: bool = False,
+        lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+        stale_after: float = DEFAULT_STALE_AFTER,
+    ) -> SchemaDeployResult:
+        """
+        Create or update a schema only if it changed since it was last deployed from here.
+
+        `schema` is a `@schema`-decorated class or a `build_schema_params` dict. Its content
+        hash is compared with a local record (`state_path`, default `PAPR_SCHEMA_DEPLOY_STATE`
+        or `~/.cache/papr_memory/schemas.json`); when it matches, no API call is made. Otherwise
+        the schema is updated by its recorded id, or found by name with `list` and updated, or
+        created. Deploys that need the API hold a lock file next to the record, so processes
+        sharing the record deploy a change once: the others wait up to `lock_timeout` seconds
+        and then find it recorded. The holder refreshes its lock while it deploys, and a lock
+        not refreshed for `stale_after` seconds is broken, so keep `lock_timeout` longer than
+        `stale_after`. `force` deploys even when the hash matches.
+        """
+        return await async_deploy_schema(
+            self, schema, state_path=state_path, force=force, lock_timeout=lock_timeout, stale_after=stale_after
+        )
+
 
 class SchemasResourceWithRawResponse:
     def __init__(self, schemas: SchemasResource) -> None:
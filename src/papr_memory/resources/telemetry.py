@@ -18,6 +18,13 @@ from .._response import (
     async_to_streamed_response_wrapper,
 )
 from .._base_client import make_request_options
+from .._telemetry_buffer import (
+    DEFAULT_CAPACITY,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_FLUSH_INTERVAL,
+    TelemetryBuffer,
+    AsyncTelemetryBuffer,
+)
 from ..types.telemetry_track_event_response import TelemetryTrackEventResponse
 
 __all__ = ["TelemetryResource", "AsyncTelemetryResource"]
@@ -114,6 +121,47 @@ class TelemetryResource(SyncAPIResource):
             cast_to=TelemetryTrackEventResponse,
         )
 
+    def buffered(
+        self,
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        sample_rate: float = 1.0,
+        anonymous_id: Optional[str] = None,
+    ) -> TelemetryBuffer:
+        """
+        Create a non-blocking buffer that sends events with `track_event` in the background.
+
+        `buffer.track(event_name, properties)` records an event and returns immediately; it
+        never waits on the network. Each event is kept with probability `sample_rate`. When
+        `capacity` events are buffered the oldest is discarded and counted in
+        `buffer.dropped`. A batch is sent once `batch_size` events are buffered or
+        `flush_interval` seconds after the first one arrived; while the endpoint is
+        unreachable, events stay buffered (up to `capacity`) and flushes back off
+        exponentially. `buffer.close()` sends what is left;
+        buffers left open are flushed at interpreter exit.
+
+        Args:
+          capacity: Maximum number of buffered events.
+
+          batch_size: Events per `track_event` request.
+
+          flush_interval: Longest time, in seconds, an event waits before being sent.
+
+          sample_rate: Fraction of events to keep, between 0 and 1.
+
+          anonymous_id: Anonymous session ID sent with every batch.
+        """
+        return TelemetryBuffer(
+            self,
+            capacity=capacity,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            sample_rate=sample_rate,
+            anonymous_id=anonymous_id,
+        )
+
 
 class AsyncTelemetryResource(AsyncAPIResource):
     @cached_property
@@ -206,6 +254,47 @@ class AsyncTelemetryResource(AsyncAPIResource):
             cast_to=TelemetryTrackEventResponse,
         )
 
+    def buffered(
+        self,
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        sample_rate: float = 1.0,
+        anonymous_id: Optional[str] = None,
+    ) -> AsyncTelemetryBuffer:
+        """
+        Create a non-blocking buffer that sends events with `track_event` in the background.
+
+        `buffer.track(event_name, properties)` records an event and returns immediately; it
+        never waits on the network. Each event is kept with probability `sample_rate`. When
+        `capacity` events are buffered the oldest is discarded and counted in
+        `buffer.dropped`. A batch is sent once `batch_size` events are buffered or
+        `flush_interval` seconds after the first one arrived; while the endpoint is
+        unreachable, events stay buffered (up to `capacity`) and flushes back off
+        exponentially. `await buffer.close()` sends what is
+        left and must run before the event loop stops.
+
+        Args:
+          capacity: Maximum number of buffered events.
+
+          batch_size: Events per `track_event` request.
+
+          flush_interval: Longest time, in seconds, an event waits before being sent.
+
+          sample_rate: Fraction of events to keep, between 0 and 1.
+
+          anonymous_id: Anonymous session ID sent with every batch.
+        """
+        return AsyncTelemetryBuffer(
+            self,
+            capacity=capacity,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            sample_rate=sample_rate,
+            anonymous_id=anonymous_id,
+        )
+
 
 class TelemetryResourceWithRawResponse:
     def __init__(self, telemetry: TelemetryResource) -> None:
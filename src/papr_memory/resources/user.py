@@ -24,6 +24,15 @@ from .._response import (
     async_to_raw_response_wrapper,
     async_to_streamed_response_wrapper,
 )
+from .._user_sync import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_BATCH_SIZE,
+    UserSyncReport,
+    ProgressCallback,
+    sync_users,
+    async_sync_users,
+)
+from .._auto_paginate import PageIterator, AsyncPageIterator, user_pages, async_user_pages
 from .._base_client import make_request_options
 from ..types.user_type import UserType
 from ..types.user_response import UserResponse
@@ -296,6 +305,89 @@ class UserResource(SyncAPIResource):
             cast_to=UserResponse,
         )
 
+    def sync(
+        self,
+        users: Iterable[user_create_batch_params.User],
+        *,
+        delete_missing: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        dry_run: bool = False,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> UserSyncReport:
+        """
+        Bring the developer's users in line with `users`, matched by `external_id`.
+
+        Existing users are read with `list`, fetching pages concurrently while `users` is
+        consumed. Missing users are created with `create_batch` in chunks of `batch_size`,
+        users whose `email` or `metadata` differ are updated with `update`, and with
+        `delete_missing=True` users not in `users` are deleted. Unchanged users cost no
+        request. At most `concurrency` calls run at a time; calls that fail with a
+        connection error, 429 or 5xx are retried up to `max_attempts` times, and failures
+        are collected in the returned report rather than raised.
+
+        Args:
+          users: The complete set of users that should exist (for `delete_missing`).
+
+          delete_missing: Delete existing users that are not in `users`.
+
+          batch_size: Users per `create_batch` request.
+
+          page_size: Users per `list` page.
+
+          concurrency: Maximum number of requests in flight.
+
+          max_attempts: Attempts per request for retryable errors.
+
+          dry_run: Only compute the plan; the report shows what would change.
+
+          on_progress: Called with `(users done, users to change)` as calls finish.
+        """
+        return sync_users(
+            self,
+            users,
+            delete_missing=delete_missing,
+            batch_size=batch_size,
+            page_size=page_size,
+            concurrency=concurrency,
+            max_attempts=max_attempts,
+            dry_run=dry_run,
+            on_progress=on_progress,
+        )
+
+    def list_all(
+        self,
+        *,
+        email: Optional[str] | Omit = omit,
+        external_id: Optional[str] | Omit = omit,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        concurrency: int = 1,
+    ) -> PageIterator[UserResponse, UserListResponse]:
+        """
+        Iterate over every user, fetching pages of `list` as iteration reaches them.
+
+        `email` and `external_id` filter as in `list`; `iter_pages()` yields the raw pages
+        instead of the users.
+
+        Args:
+          page_size: Users per request.
+
+          prefetch: Fetch the next page in the background while the current one is consumed.
+
+          concurrency: Pages fetched in parallel once the total is known (they are still yielded in order).
+        """
+        return user_pages(
+            self,
+            email=email,
+            external_id=external_id,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+        )
+
 
 class AsyncUserResource(AsyncAPIResource):
     @cached_property
@@ -559,6 +651,89 @@ class AsyncUserResource(AsyncAPIResource):
             cast_to=UserResponse,
         )
 
+    async def sync(
+        self,
+        users: Iterable[user_create_batch_params.User],
+        *,
+        delete_missing: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        dry_run: bool = False,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> UserSyncReport:
+        """
+        Bring the developer's users in line with `users`, matched by `external_id`.
+
+        Existing users are read with `list`, fetching pages concurrently while `users` is
+        consumed. Missing users are created with `create_batch` in chunks of `batch_size`,
+        users whose `email` or `metadata` differ are updated with `update`, and with
+        `delete_missing=True` users not in `users` are deleted. Unchanged users cost no
+        request. At most `concurrency` calls run at a time; calls that fail with a
+        connection error, 429 or 5xx are retried up to `max_attempts` times, and failures
+        are collected in the returned report rather than raised.
+
+        Args:
+          users: The complete set of users that should exist (for `delete_missing`).
+
+          delete_missing: Delete existing users that are not in `users`.
+
+          batch_size: Users per `create_batch` request.
+
+          page_size: Users per `list` page.
+
+          concurrency: Maximum number of requests in flight.
+
+          max_attempts: Attempts per request for retryable errors.
+
+          dry_run: Only compute the plan; the report shows what would change.
+
+          on_progress: Called with `(users done, users to change)` as calls finish.
+        """
+        return await async_sync_users(
+            self,
+            users,
+            delete_missing=delete_missing,
+            batch_size=batch_size,
+            page_size=page_size,
+            concurrency=concurrency,
+            max_attempts=max_attempts,
+            dry_run=dry_run,
+            on_progress=on_progress,
+        )
+
+    def list_all(
+        self,
+        *,
+        email: Optional[str] | Omit = omit,
+        external_id: Optional[str] | Omit = omit,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        concurrency: int = 1,
+    ) -> AsyncPageIterator[UserResponse, UserListResponse]:
+        """
+        Iterate over every user, fetching pages of `list` as iteration reaches them.
+
+        `email` and `external_id` filter as in `list`; `iter_pages()` yields the raw pages
+        instead of the users.
+
+        Args:
+          page_size: Users per request.
+
+          prefetch: Fetch the next page in the background while the current one is consumed.
+
+          concurrency: Pages fetched in parallel once the total is known (they are still yielded in order).
+        """
+        return async_user_pages(
+            self,
+            email=email,
+            external_id=external_id,
+            page_size=page_size,
+            prefetch=prefetch,
+            concurrency=concurrency,
+        )
+
 
 class UserResourceWithRawResponse:
     def __init__(self, user: UserResource) -> None:
@@ -26,21 +26,11 @@ client = Papr(
 
 print("✅ Client initialized\n")
 
-# Warm-up: Run 3 searches to ensure model is compiled and cached
-print("🔥 Warming up CoreML model (3 warm-up searches)...")
-warmup_queries = ["warmup 1", "warmup 2", "warmup 3"]
-
-for i, query in enumerate(warmup_queries, 1):
-    start = time.perf_counter()
-    response = client.memory.search(
-        query=query,
-        max_memories=5,
-        max_nodes=10,
-        enable_agentic_graph=False,
-        timeout=180.0
-    )
-    elapsed_ms = (time.perf_counter() - start) * 1000
-    print(f"  Warm-up {i}: {elapsed_ms:.0f}ms")
+# Warm-up: sync the local index, load the model and run one forward pass
+print("🔥 Warming up CoreML model...")
+status = client.memory.ondevice.warmup(timeout=180.0)
+for stage, seconds in status.stages.items():
+    print(f"  {stage}: {seconds * 1000:.0f}ms")
 
 print("\n" + "="*60)
 print("📊 Running 10 test searches (model should be warm now)...")
@@ -48,6 +48,12 @@ base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
 x_api_key = "My X API Key"
 
 
+@pytest.fixture
+def no_retry_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Makes the SDK helpers' own retries (see `papr_memory._retries`) immediate."""
+    monkeypatch.setattr("papr_memory._retries.INITIAL_RETRY_DELAY", 0.0)
+
+
 @pytest.fixture(scope="session")
 def client(request: FixtureRequest) -> Iterator[Papr]:
     strict = getattr(request, "param", True)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import time
+import threading
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import pytest
+
+from tests.utils import mock_client, async_mock_client
+
+
+class StandInServer:
+    """Serves `n` users, namespaces and session messages; records paging params and concurrency."""
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.report_total = True
+        self.max_page_size = 1000
+        self.delay = 0.0
+        self.requests: List[Tuple[str, int, int]] = []  # (path, limit or page_size, skip or page)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        path = request.url.path
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if path == "/v1/user":
+                size, page = min(int(params["page_size"]), self.max_page_size), int(params["page"])
+                self.requests.append((path, size, page))
+                users = [_user(i) for i in range((page - 1) * size, min(page * size, self.n))]
+                return self._page({"code": 200, "status": "success", "data": users, "page": page, "page_size": size})
+            size, skip = int(params["limit"]), int(params["skip"])
+            self.requests.append((path, size, skip))
+            if path == "/v1/namespace":
+                namespaces = [{"id": f"ns{i}", "name": f"ns{i}"} for i in range(skip, min(skip + size, self.n))]
+                return self._page({"code": 200, "status": "success", "data": namespaces})
+            messages = [_message(self.n - 1 - i) for i in range(skip, min(skip + size, self.n))]
+            return httpx.Response(200, json={"messages": messages, "sessionId": "s", "total_count": self.n})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _page(self, body: Dict[str, Any]) -> httpx.Response:
+        if self.report_total:
+            body["total"] = self.n
+        return httpx.Response(200, json=body)
+
+
+def _user(i: int) -> Dict[str, Any]:
+    return {"code": 200, "status": "success", "user_id": f"u{i}", "external_id": f"ext{i}"}
+
+
+def _message(i: int) -> Dict[str, Any]:
+    return {
+        "content": f"m{i}",
+        "createdAt": "2026-01-01T00:00:00Z",
+        "objectId": f"o{i}",
+        "role": "user",
+        "sessionId": "s",
+    }
+
+
+def test_history_is_iterated_lazily() -> None:
+    server = StandInServer(25)
+    messages = mock_client(server.handle).messages.sessions.retrieve_history_all("s", page_size=10, prefetch=False)
+
+    assert server.requests == []
+    iterator = iter(messages)
+    assert next(iterator).content == "m24"
+    assert len(server.requests) == 1
+    assert [m.content for m in iterator] == [f"m{i}" for i in range(23, -1, -1)]
+    assert [skip for _path, _size, skip in server.requests] == [0, 10, 20]
+    assert messages.total == 25
+
+
+def test_next_page_is_prefetched_while_the_current_one_is_consumed() -> None:
+    server = StandInServer(30)
+    pages = mock_client(server.handle).namespace.list_all(page_size=10).iter_pages()
+
+    first = next(pages)
+    deadline = time.monotonic() + 5
+    while len(server.requests) < 2:
+        assert time.monotonic() < deadline, "next page was not prefetched"
+        time.sleep(0.005)
+
+    assert [item.id for item in first.data or []] == [f"ns{i}" for i in range(10)]
+    assert [len(page.data or []) for page in pages] == [10, 10]
+    assert len(server.requests) == 3
+
+
+def test_pages_are_fetched_in_parallel_and_yielded_in_order() -> None:
+    server = StandInServer(95)
+    server.delay = 0.02
+
+    users = list(mock_client(server.handle).user.list_all(page_size=10, concurrency=4))
+
+    assert [user.external_id for user in users] == [f"ext{i}" for i in range(95)]
+    assert sorted(page for _path, _size, page in server.requests) == list(range(1, 11))
+    assert 2 < server.max_in_flight <= 4
+
+
+def test_page_count_uses_the_page_size_the_server_served() -> None:
+    server = StandInServer(25)
+    server.max_page_size = 5
+
+    users = list(mock_client(server.handle).user.list_all(page_size=10, concurrency=4))
+
+    assert [user.external_id for user in users] == [f"ext{i}" for i in range(25)]
+    assert sorted(page for _path, _size, page in server.requests) == [1, 2, 3, 4, 5]
+
+
+def test_without_a_total_paging_stops_at_a_short_page() -> None:
+    server = StandInServer(20)
+    server.report_total = False
+
+    users = list(mock_client(server.handle).user.list_all(page_size=10, concurrency=4))
+
+    assert len(users) == 20
+    assert [page for _path, _size, page in server.requests] == [1, 2, 3]
+    assert server.max_in_flight == 1
+
+
+def test_abandoned_iteration_stops_requesting_pages() -> None:
+    server = StandInServer(1000)
+    server.delay = 0.01
+    messages = mock_client(server.handle).messages.sessions.retrieve_history_all("s", page_size=10, concurrency=3)
+
+    for i, _message in enumerate(messages):
+        if i == 15:
+            break
+    time.sleep(0.1)
+
+    assert len(server.requests) <= 5
+
+
+def test_invalid_options() -> None:
+    client = mock_client(StandInServer(0).handle)
+
+    with pytest.raises(ValueError, match="page_size"):
+        client.namespace.list_all(page_size=0)
+    with pytest.raises(ValueError, match="concurrency"):
+        client.namespace.list_all(concurrency=0)
+    assert list(client.namespace.list_all()) == []
+
+
+async def test_async_iterators() -> None:
+    server = StandInServer(45)
+    client = async_mock_client(server.handle)
+
+    users = [user.user_id async for user in client.user.list_all(page_size=10, concurrency=3)]
+    namespaces = [page async for page in client.namespace.list_all(page_size=20, prefetch=False).iter_pages()]
+    messages = [m.content async for m in client.messages.sessions.retrieve_history_all("s", page_size=50)]
+
+    assert users == [f"u{i}" for i in range(45)]
+    assert [len(page.data or []) for page in namespaces] == [20, 20, 5]
+    assert messages == [f"m{i}" for i in range(44, -1, -1)]
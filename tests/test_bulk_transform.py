@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+from typing import Any, Set, Dict, List, Iterator
+
+import httpx
+import pytest
+
+from tests.utils import mock_client, async_mock_client
+from papr_memory import PaprError, BadRequestError, InternalServerError
+
+pytestmark = pytest.mark.usefixtures("no_retry_delay")
+
+
+def _items(n: int) -> Iterator[Dict[str, Any]]:
+    for i in range(n):
+        yield {"id": f"m{i}", "content": f"memory {i}", "embedding": [float(i), 1.0]}
+
+
+class StandInServer:
+    def __init__(self) -> None:
+        self.batch_sizes: List[int] = []
+        self.fail_once: Set[str] = set()  # first item ids of batches that fail with a 500 once
+        self.drop_once: Set[str] = set()  # item ids left out of the response once
+        self.reject = False
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        ids = [item["id"] for item in body["items"]]
+        with self._lock:
+            self.batch_sizes.append(len(ids))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            # Finish batches out of order
+            threading.Event().wait(random.uniform(0, 0.02))
+            if self.reject:
+                return httpx.Response(400, json={"detail": "bad embedding"})
+            if ids[0] in self.fail_once:
+                self.fail_once.discard(ids[0])
+                return httpx.Response(500, json={"detail": "overloaded"})
+            results = []
+            for item in body["items"]:
+                if item["id"] in self.drop_once:
+                    self.drop_once.discard(item["id"])
+                    continue
+                data = {
+                    "base_dim": 2,
+                    "domain": body.get("domain") or "general",
+                    "frequency_schema_id": "default",
+                    "timing_ms": 1.0,
+                    "phases": [item["embedding"][0]] * 14,
+                }
+                results.append({"id": item["id"], "data": data})
+            return httpx.Response(200, json={"results": results, "timing_ms": 1.0, "total": len(results)})
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_splits_and_preserves_order() -> None:
+    server = StandInServer()
+
+    client = mock_client(server.handle)
+    results = list(client.holographic.transform.create_many(_items(230), concurrency=3, domain="code"))
+
+    assert [r.id for r in results] == [f"m{i}" for i in range(230)]
+    assert results[7].data.phases == [7.0] * 14
+    assert results[0].data.domain == "code"
+    assert sorted(server.batch_sizes) == [30, 50, 50, 50, 50]
+    assert 1 < server.max_active <= 3
+
+
+def test_retries_failed_and_partial_sub_batches() -> None:
+    server = StandInServer()
+    server.fail_once = {"m50"}
+    server.drop_once = {"m3", "m120"}
+
+    results = list(mock_client(server.handle).holographic.transform.create_many(_items(150), batch_size=50))
+
+    assert [r.id for r in results] == [f"m{i}" for i in range(150)]
+    # Three full batches, one repeat of the failed batch and two single-item resends
+    assert sorted(server.batch_sizes) == [1, 1, 50, 50, 50, 50]
+
+
+def test_gives_up_after_max_attempts() -> None:
+    server = StandInServer()
+    server.drop_once = {"m1"}
+
+    with pytest.raises(PaprError, match="no result for 1 item"):
+        list(mock_client(server.handle).holographic.transform.create_many(_items(5), max_attempts=1))
+
+    server.fail_once = {"m0"}
+    with pytest.raises(InternalServerError):
+        list(mock_client(server.handle).holographic.transform.create_many(_items(5), max_attempts=1))
+
+
+def test_client_errors_are_not_retried() -> None:
+    server = StandInServer()
+    server.reject = True
+
+    with pytest.raises(BadRequestError):
+        list(mock_client(server.handle).holographic.transform.create_many(_items(10)))
+    assert server.batch_sizes == [10]
+
+
+def test_validates_batch_size() -> None:
+    with pytest.raises(ValueError):
+        list(mock_client(StandInServer().handle).holographic.transform.create_many(_items(1), batch_size=51))
+
+
+async def test_async_create_many() -> None:
+    server = StandInServer()
+    server.fail_once = {"m100"}
+    client = async_mock_client(server.handle)
+
+    ids = [r.id async for r in client.holographic.transform.create_many(_items(120), batch_size=25, concurrency=2)]
+
+    assert ids == [f"m{i}" for i in range(120)]
+    assert sorted(server.batch_sizes) == [20, 20, 25, 25, 25, 25]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Set, Dict, List
+from pathlib import Path
+
+import httpx
+import pytest
+
+from tests.utils import mock_client, async_mock_client
+from papr_memory._document_ingest import PollSchedule, _Tracked, status_state
+
+
+class StandInServer:
+    """Accepts uploads and reports each document completed after a number of status checks."""
+
+    def __init__(self, polls_needed: Dict[str, int], failing: Set[str] = set()) -> None:
+        self.polls_needed = polls_needed
+        self.failing = failing
+        self.polls: Dict[str, int] = {}
+        self.cancelled: List[str] = []
+        self.active_uploads = 0
+        self.max_active_uploads = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST" and path == "/v1/document":
+            body = request.read()
+            name = next(n for n in self.polls_needed if f'filename="{n}"'.encode() in body)
+            if name in self.failing:
+                return httpx.Response(400, json={"detail": "unsupported file"})
+            with self._lock:
+                self.active_uploads += 1
+                self.max_active_uploads = max(self.max_active_uploads, self.active_uploads)
+            threading.Event().wait(0.02)
+            with self._lock:
+                self.active_uploads -= 1
+            return httpx.Response(
+                200,
+                json={"document_status": {"progress": 0.0, "upload_id": f"up-{name}", "status_type": "queued"}},
+            )
+        if request.method == "GET" and path.startswith("/v1/document/status/"):
+            upload_id = path.rsplit("/", 1)[1]
+            with self._lock:
+                self.polls[upload_id] = self.polls.get(upload_id, 0) + 1
+                polls = self.polls[upload_id]
+            done = polls >= self.polls_needed[upload_id[3:]]
+            return httpx.Response(200, json={"status_type": "completed" if done else "processing", "upload_id": upload_id})
+        if request.method == "DELETE":
+            self.cancelled.append(path.rsplit("/", 1)[1])
+            return httpx.Response(200, json={"status": "cancelled"})
+        return httpx.Response(404)
+
+
+def _files(tmp_path: Path, names: List[str]) -> List[Path]:
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_bytes(b"%PDF " + name.encode())
+        paths.append(path)
+    return paths
+
+
+def test_poll_interval_grows_with_age() -> None:
+    schedule = PollSchedule(poll_interval=1.0, max_poll_interval=10.0)
+    tracked = _Tracked(Path("a.pdf"), "up-a", started=0.0)
+
+    assert schedule.interval(tracked, now=0.5) == 1.0
+    assert schedule.interval(tracked, now=20.0) == 5.0
+    assert schedule.interval(tracked, now=600.0) == 10.0
+
+
+def test_status_state() -> None:
+    assert status_state({"document_status": {"status_type": "completed"}, "status": "success"}) == "completed"
+    assert status_state({"status_type": "failed"}) == "failed"
+    assert status_state({"status": "processing"}) == "processing"
+    assert status_state({}) is None
+
+
+def test_yields_in_completion_order(tmp_path: Path) -> None:
+    server = StandInServer({"slow.pdf": 10, "fast.pdf": 1, "medium.pdf": 2, "bad.pdf": 1}, failing={"bad.pdf"})
+    paths = _files(tmp_path, ["slow.pdf", "fast.pdf", "medium.pdf", "bad.pdf"])
+
+    results = list(
+        mock_client(server.handle).document.ingest_many(
+            paths, concurrency=2, poll_interval=0.01, max_poll_interval=0.02, namespace_id="ns_1"
+        )
+    )
+
+    by_name = {r.path.name: r for r in results}
+    assert by_name["bad.pdf"].state == "upload_failed"
+    assert by_name["bad.pdf"].error is not None
+    assert [r.path.name for r in results if r.ok] == ["fast.pdf", "medium.pdf", "slow.pdf"]
+    assert by_name["slow.pdf"].upload_id == "up-slow.pdf"
+    assert by_name["slow.pdf"].status == {"status_type": "completed", "upload_id": "up-slow.pdf"}
+    assert server.max_active_uploads <= 2
+    assert server.cancelled == []
+
+
+def test_abort_cancels_unfinished_documents(tmp_path: Path) -> None:
+    server = StandInServer({"a.pdf": 1, "b.pdf": 1000, "c.pdf": 1000})
+    paths = _files(tmp_path, ["a.pdf", "b.pdf", "c.pdf"])
+
+    results = mock_client(server.handle).document.ingest_many(paths, concurrency=3, poll_interval=0.01)
+    first = next(results)
+    results.close()
+
+    assert first.path.name == "a.pdf"
+    assert sorted(server.cancelled) == ["up-b.pdf", "up-c.pdf"]
+
+
+async def test_async_ingest_many(tmp_path: Path) -> None:
+    server = StandInServer({"a.pdf": 3, "b.pdf": 1, "c.pdf": 1000})
+    paths = _files(tmp_path, ["a.pdf", "b.pdf", "c.pdf"])
+    client = async_mock_client(server.handle)
+
+    results: Any = client.document.ingest_many(paths, concurrency=2, poll_interval=0.01, max_poll_interval=0.02)
+    names = [(await results.__anext__()).path.name for _ in range(2)]
+    await results.aclose()
+
+    assert names == ["b.pdf", "a.pdf"]
+    assert server.cancelled == ["up-c.pdf"]
+
+
+@pytest.mark.parametrize("concurrency", [0, 1])
+def test_serial_ingest(tmp_path: Path, concurrency: int) -> None:
+    server = StandInServer({"a.pdf": 1, "b.pdf": 1})
+    paths = _files(tmp_path, ["a.pdf", "b.pdf"])
+
+    results = list(mock_client(server.handle).document.ingest_many(paths, concurrency=concurrency, poll_interval=0.01))
+
+    assert [r.state for r in results] == ["completed", "completed"]
+    assert server.max_active_uploads == 1
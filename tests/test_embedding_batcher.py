@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import time
+import threading
+from typing import List
+
+import pytest
+
+from papr_memory._embedding_batcher import EmbeddingMicroBatcher
+
+
+class RecordingEmbedder:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.batches: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.batches.append(list(texts))
+        time.sleep(self.delay)
+        return [[float(len(t)), float(i)] for i, t in enumerate(texts)]
+
+
+def test_single_request_roundtrip() -> None:
+    embedder = RecordingEmbedder()
+    batcher = EmbeddingMicroBatcher(embedder, max_wait_ms=0)
+    try:
+        assert batcher.embed("hello", timeout=5) == [5.0, 0.0]
+        assert embedder.batches == [["hello"]]
+    finally:
+        batcher.close()
+
+
+def test_concurrent_requests_are_coalesced() -> None:
+    embedder = RecordingEmbedder(delay=0.05)
+    batcher = EmbeddingMicroBatcher(embedder, max_batch_size=64, max_wait_ms=20)
+    texts = [f"query {'x' * i}" for i in range(16)]
+    results: dict[str, List[float]] = {}
+    barrier = threading.Barrier(len(texts))
+
+    def worker(text: str) -> None:
+        barrier.wait()
+        results[text] = batcher.embed(text, timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in texts]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        batcher.close()
+
+    # every caller gets the vector for its own text
+    assert all(results[t][0] == float(len(t)) for t in texts)
+    # and the model saw fewer forward passes than callers
+    assert len(embedder.batches) < len(texts)
+    assert sum(len(b) for b in embedder.batches) == len(texts)
+    assert batcher.items_embedded == len(texts)
+
+
+def test_max_batch_size_is_respected() -> None:
+    embedder = RecordingEmbedder()
+    batcher = EmbeddingMicroBatcher(embedder, max_batch_size=3, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(str(i)) for i in range(7)]
+        for f in futures:
+            f.result(timeout=5)
+    finally:
+        batcher.close()
+
+    assert all(len(b) <= 3 for b in embedder.batches)
+
+
+def test_errors_propagate_to_every_caller() -> None:
+    def failing(_texts: List[str]) -> List[List[float]]:
+        raise ValueError("boom")
+
+    batcher = EmbeddingMicroBatcher(failing, max_wait_ms=10)
+    try:
+        futures = [batcher.submit("a"), batcher.submit("b")]
+        for f in futures:
+            with pytest.raises(ValueError, match="boom"):
+                f.result(timeout=5)
+    finally:
+        batcher.close()
+
+
+def test_submit_after_close_raises() -> None:
+    batcher = EmbeddingMicroBatcher(RecordingEmbedder())
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit("late")
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import time
+import threading
+from typing import Any, Dict, List, Callable
+
+import httpx
+import pytest
+
+from papr_memory import _background_buffer
+from tests.utils import mock_client, async_mock_client
+
+pytestmark = pytest.mark.usefixtures("no_retry_delay")
+
+THUMBS_UP: Any = {"feedback_source": "inline", "feedback_type": "thumbs_up"}
+
+
+class StandInServer:
+    """Records `submit_batch` bodies; can hold requests back or fail them."""
+
+    def __init__(self) -> None:
+        self.batches: List[List[Dict[str, Any]]] = []
+        self.statuses: List[int] = []  # served (and consumed) before any successful response
+        self.reject = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self.received = threading.Event()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/feedback/batch"
+        self.received.set()
+        self.gate.wait(5)
+        if self.statuses:
+            return httpx.Response(self.statuses.pop(0), json={"detail": "nope"})
+        items = json.loads(request.content)["feedback_items"]
+        self.batches.append(items)
+        body = {
+            "code": 200,
+            "message": "ok",
+            "status": "success",
+            "successful_count": len(items) - self.reject,
+            "failed_count": self.reject,
+        }
+        return httpx.Response(200, json=body)
+
+    @property
+    def sizes(self) -> List[int]:
+        return [len(batch) for batch in self.batches]
+
+
+def _eventually(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_full_batches_are_sent_without_waiting() -> None:
+    server = StandInServer()
+
+    with mock_client(server.handle).feedback.buffered(max_batch_size=5, flush_interval=60) as feedback:
+        for i in range(12):
+            assert feedback.submit(search_id=f"s{i}", feedback_data=THUMBS_UP)
+        _eventually(lambda: feedback.sent == 10)
+        assert feedback.pending == 2
+
+    assert server.sizes == [5, 5, 2]
+    assert server.batches[0][0] == {
+        "search_id": "s0",
+        "feedbackData": {"feedbackSource": "inline", "feedbackType": "thumbs_up"},
+    }
+    assert (feedback.sent, feedback.batches, feedback.pending) == (12, 3, 0)
+
+
+def test_partial_batches_are_sent_after_the_interval() -> None:
+    server = StandInServer()
+    feedback = mock_client(server.handle).feedback.buffered(flush_interval=0.05)
+
+    for i in range(3):
+        feedback.submit(search_id=f"s{i}", feedback_data=THUMBS_UP, user_id="u1")
+
+    _eventually(lambda: server.sizes == [3])
+    assert server.batches[0][2]["user_id"] == "u1"
+    feedback.close()
+
+
+def test_submit_does_not_wait_for_the_request() -> None:
+    server = StandInServer()
+    server.gate.clear()
+    feedback = mock_client(server.handle).feedback.buffered(max_batch_size=1)
+
+    feedback.submit(search_id="s0", feedback_data=THUMBS_UP)
+    assert server.received.wait(5)
+    feedback.submit(search_id="s1", feedback_data=THUMBS_UP)
+    assert server.batches == []
+
+    server.gate.set()
+    assert feedback.flush(timeout=5)
+    assert server.sizes == [1, 1]
+    feedback.close()
+
+
+def test_full_queue_applies_backpressure() -> None:
+    server = StandInServer()
+    server.gate.clear()
+    feedback = mock_client(server.handle).feedback.buffered(max_batch_size=2, max_queue_size=2, full_timeout=0.05)
+
+    for i in range(2):
+        feedback.submit(search_id=f"s{i}", feedback_data=THUMBS_UP)
+    assert server.received.wait(5)
+    for i in range(2, 4):
+        assert feedback.submit(search_id=f"s{i}", feedback_data=THUMBS_UP)
+
+    # Both batches' worth of events are queued or in flight; the next one waits, then is dropped
+    assert not feedback.submit(search_id="s4", feedback_data=THUMBS_UP)
+    assert feedback.dropped == 1
+
+    server.gate.set()
+    feedback.close()
+    assert server.sizes == [2, 2]
+
+
+def test_transient_errors_are_retried_and_failures_reported() -> None:
+    server = StandInServer()
+    errors: List[Any] = []
+    feedback = mock_client(server.handle).feedback.buffered(
+        max_batch_size=2, on_error=lambda batch, e: errors.append((batch, e))
+    )
+
+    server.statuses = [503]
+    feedback.submit(search_id="s0", feedback_data=THUMBS_UP)
+    feedback.submit(search_id="s1", feedback_data=THUMBS_UP)
+    assert feedback.flush(timeout=5)
+    assert server.sizes == [2] and feedback.sent == 2
+
+    server.statuses = [400]
+    feedback.submit(search_id="s2", feedback_data=THUMBS_UP)
+    assert feedback.flush(timeout=5)
+    assert [item["search_id"] for item in errors[0][0]] == ["s2"]
+    assert "400" in str(errors[0][1])
+
+    server.reject = 1
+    feedback.submit(search_id="s3", feedback_data=THUMBS_UP)
+    feedback.close()
+
+    assert (feedback.sent, feedback.failed) == (2, 2)
+
+
+def test_closed_buffer_rejects_events() -> None:
+    feedback = mock_client(StandInServer().handle).feedback.buffered()
+    feedback.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        feedback.submit(search_id="s0", feedback_data=THUMBS_UP)
+
+
+def test_open_buffers_are_drained_at_exit() -> None:
+    server = StandInServer()
+    feedback = mock_client(server.handle).feedback.buffered(flush_interval=60)
+    feedback.submit(search_id="s0", feedback_data=THUMBS_UP)
+
+    _background_buffer._close_open_buffers()
+
+    assert server.sizes == [1]
+    assert feedback not in _background_buffer._open_buffers
+
+
+async def test_async_buffer() -> None:
+    server = StandInServer()
+    client = async_mock_client(server.handle)
+    server.statuses = [502]
+
+    async with client.feedback.buffered(max_batch_size=4, flush_interval=60) as feedback:
+        for i in range(10):
+            assert await feedback.submit(search_id=f"s{i}", feedback_data=THUMBS_UP)
+        assert await feedback.flush(timeout=5)
+        assert server.sizes == [4, 4, 2]
+        await feedback.submit(search_id="s10", feedback_data=THUMBS_UP)
+
+    assert server.sizes == [4, 4, 2, 1]
+    assert (feedback.sent, feedback.pending) == (11, 0)
+    with pytest.raises(RuntimeError, match="closed"):
+        await feedback.submit(search_id="s11", feedback_data=THUMBS_UP)
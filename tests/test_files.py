@@ -1,10 +1,12 @@
 from pathlib import Path
 
 import anyio
+import httpx
 import pytest
-from dirty_equals import IsDict, IsList, IsBytes, IsTuple
+from dirty_equals import IsDict, IsList, IsBytes, IsTuple, IsInstance
 
-from papr_memory._files import to_httpx_files, deepcopy_with_paths, async_to_httpx_files
+from papr_memory import _files, file_from_path
+from papr_memory._files import StreamingFile, to_httpx_files, deepcopy_with_paths, async_to_httpx_files
 from papr_memory._utils import extract_files
 
 readme_path = Path(__file__).parent.parent.joinpath("README.md")
@@ -146,3 +148,49 @@ class TestDeepcopyWithPaths:
             ],
             "title": "example",
         }
+
+
+def test_large_paths_are_streamed(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_files, "STREAMING_THRESHOLD", 0)
+
+    result = to_httpx_files({"file": readme_path})
+    name, content = result["file"]  # type: ignore[misc]
+    assert name == "README.md"
+    assert isinstance(content, StreamingFile)
+    assert content.size == readme_path.stat().st_size
+
+
+@pytest.mark.asyncio
+async def test_async_large_paths_are_streamed(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_files, "STREAMING_THRESHOLD", 0)
+
+    result = await async_to_httpx_files([("file", anyio.Path(readme_path))])
+    assert result == IsList(IsTuple("file", IsTuple("README.md", IsInstance(StreamingFile))))
+
+
+def test_streaming_file_multipart_body_and_progress(tmp_path: Path) -> None:
+    data = bytes(range(256)) * 1024  # larger than httpx's 64KiB chunk size
+    path = tmp_path / "doc.bin"
+    path.write_bytes(data)
+    progress: list[tuple[int, int]] = []
+
+    name, stream = file_from_path(str(path), on_progress=lambda sent, total: progress.append((sent, total)))  # type: ignore[misc]
+    assert name == "doc.bin"
+
+    request = httpx.Request("POST", "https://example.com/upload", files={"file": (name, stream)})
+    # The body length is known up front without reading the file
+    assert int(request.headers["Content-Length"]) > len(data)
+    assert progress == []
+
+    body = b"".join(request.stream)  # type: ignore[arg-type]
+    assert data in body
+    assert len(progress) > 1
+    assert progress[-1] == (len(data), len(data))
+    assert [sent for sent, _ in progress] == sorted(sent for sent, _ in progress)
+    assert stream._handle is None  # type: ignore[attr-defined]
+
+    # A retry re-renders the body from the start
+    progress.clear()
+    assert b"".join(request.stream) == body  # type: ignore[arg-type]
+    assert progress[0][0] < len(data)
+    assert progress[-1] == (len(data), len(data))
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+from papr_memory import BaseModel
+from tests.utils import mock_client, async_mock_client
+from papr_memory._graphql_client import GraphQLError, GraphQLRequest
+
+PROJECT = "query GetProject($id: ID!) { project(id: $id) { name tasks { title } } }"
+RENAME = "mutation Rename($id: ID!, $name: String!) { rename(id: $id, name: $name) { name } }"
+
+
+class StandInServer:
+    """A GraphQL endpoint with Apollo-style persisted queries and batching."""
+
+    def __init__(self, *, persisted: bool = True, extensions: bool = True, batching: bool = True) -> None:
+        self.persisted = persisted
+        # False: ignore the persistedQuery extension altogether, like a server that never heard of it
+        self.extensions = extensions
+        self.batching = batching
+        self.known: Dict[str, str] = {}
+        self.names = {"p1": "Apollo"}
+        self.requests: List[Any] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/graphql"
+        body = json.loads(request.content)
+        self.requests.append(body)
+        if isinstance(body, list):
+            if not self.batching:
+                return httpx.Response(400, json={"detail": "batching is not supported"})
+            return httpx.Response(200, json=[self._execute(operation) for operation in body])
+        if not self.extensions and "query" not in body:
+            return httpx.Response(400, json={"errors": [{"message": "Must provide query string."}]})
+        return httpx.Response(200, json=self._execute(body))
+
+    def _execute(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        query: Optional[str] = body.get("query")
+        persisted = (body.get("extensions") or {}).get("persistedQuery") if self.extensions else None
+        if persisted:
+            if not self.persisted:
+                return {"errors": [{"message": "PersistedQueryNotSupported"}]}
+            if query is not None:
+                assert hashlib.sha256(query.encode()).hexdigest() == persisted["sha256Hash"]
+                self.known[persisted["sha256Hash"]] = query
+            elif persisted["sha256Hash"] not in self.known:
+                error = {"message": "PersistedQueryNotFound", "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"}}
+                return {"errors": [error]}
+            query = self.known[persisted["sha256Hash"]]
+        assert query is not None
+        variables = body.get("variables") or {}
+        if query.startswith("mutation"):
+            self.names[variables["id"]] = variables["name"]
+            return {"data": {"rename": {"name": variables["name"]}}}
+        if variables["id"] not in self.names:
+            return {"data": {"project": None}, "errors": [{"message": "project not found", "path": ["project"]}]}
+        name = self.names[variables["id"]]
+        return {"data": {"project": {"name": name, "tasks": [{"title": "launch"}]}}}
+
+
+def test_queries_are_sent_as_text_by_default() -> None:
+    server = StandInServer(extensions=False)
+    client = mock_client(server.handle, x_api_key="text")
+
+    response = client.graphql.execute(PROJECT, {"id": "p1"})
+
+    assert response.data.project.name == "Apollo"
+    assert len(server.requests) == 1 and server.requests[0]["query"] == PROJECT
+    assert "extensions" not in server.requests[0]
+
+
+def test_queries_are_sent_as_persisted_queries() -> None:
+    server = StandInServer()
+    client = mock_client(server.handle, x_api_key="apq")
+
+    first = client.graphql.execute(PROJECT, {"id": "p1"}, persisted_queries=True)
+    second = client.graphql.execute(PROJECT, {"id": "p1"}, persisted_queries=True)
+
+    assert (first.data.project.name, second.data.project.tasks[0].title) == ("Apollo", "launch")
+    assert ["query" in body for body in server.requests] == [False, True, False]
+    assert all(body["extensions"]["persistedQuery"]["version"] == 1 for body in server.requests)
+
+
+def test_servers_without_persisted_queries_get_the_query_text() -> None:
+    server = StandInServer(persisted=False)
+    client = mock_client(server.handle, x_api_key="no-apq")
+
+    client.graphql.execute(PROJECT, {"id": "p1"}, persisted_queries=True)
+    response = client.graphql.execute(PROJECT, {"id": "p1"}, persisted_queries=True)
+
+    assert response.data.project.name == "Apollo"
+    assert ["query" in body for body in server.requests] == [False, True, True]
+    assert ["extensions" in body for body in server.requests] == [True, False, False]
+
+
+def test_any_error_on_a_hash_only_request_falls_back_to_the_query_text() -> None:
+    server = StandInServer(extensions=False)
+    client = mock_client(server.handle, x_api_key="unaware")
+
+    first = client.graphql.execute(PROJECT, {"id": "p1"}, persisted_queries=True)
+    second = client.graphql.execute(PROJECT, {"id": "p1"}, persisted_queries=True)
+
+    assert first.ok and (first.data.project.name, second.data.project.name) == ("Apollo", "Apollo")
+    assert ["query" in body for body in server.requests] == [False, True, True]
+
+
+def test_results_are_cached_per_variables_until_a_mutation() -> None:
+    server = StandInServer()
+    server.names["p2"] = "Gemini"
+    client = mock_client(server.handle, x_api_key="cache")
+
+    assert not client.graphql.execute(PROJECT, {"id": "p1"}, cache_ttl=60).from_cache
+    cached = client.graphql.execute(PROJECT, {"id": "p1"}, cache_ttl=60)
+    other = client.graphql.execute(PROJECT, {"id": "p2"}, cache_ttl=60)
+    assert (cached.from_cache, cached.data.project.name, other.from_cache) == (True, "Apollo", False)
+    sent = len(server.requests)
+
+    client.graphql.execute(RENAME, {"id": "p1", "name": "Artemis"}, cache_ttl=60)
+    renamed = client.graphql.execute(PROJECT, {"id": "p1"}, cache_ttl=60)
+
+    assert (renamed.from_cache, renamed.data.project.name) == (False, "Artemis")
+    assert len(server.requests) > sent + 1
+
+
+def test_errors_are_returned_and_not_cached() -> None:
+    client = mock_client(StandInServer().handle, x_api_key="errors")
+
+    response = client.graphql.execute(PROJECT, {"id": "missing"}, cache_ttl=60)
+    again = client.graphql.execute(PROJECT, {"id": "missing"}, cache_ttl=60)
+
+    assert not response.ok and response.data.project is None and not again.from_cache
+    with pytest.raises(GraphQLError, match="project not found"):
+        response.raise_for_errors()
+
+
+def test_batches_are_sent_in_one_request() -> None:
+    server = StandInServer()
+    server.names["p2"] = "Gemini"
+    client = mock_client(server.handle, x_api_key="batch")
+    client.graphql.execute(PROJECT, {"id": "p1"}, cache_ttl=60)
+    sent = len(server.requests)
+
+    responses = client.graphql.execute_batch(
+        [
+            GraphQLRequest(PROJECT, {"id": "p1"}, cache_ttl=60),
+            GraphQLRequest(PROJECT, {"id": "p2"}),
+            (PROJECT, {"id": "missing"}),
+        ]
+    )
+
+    assert [r.data.project and r.data.project.name for r in responses] == ["Apollo", "Gemini", None]
+    assert [r.from_cache for r in responses] == [True, False, False]
+    assert len(server.requests) == sent + 1 and len(server.requests[-1]) == 2
+
+
+def test_rejected_batches_are_sent_one_by_one() -> None:
+    server = StandInServer(batching=False)
+    server.names["p2"] = "Gemini"
+    client = mock_client(server.handle, x_api_key="no-batch")
+    client.graphql.execute(PROJECT, {"id": "p1"})
+
+    responses = client.graphql.execute_batch([(PROJECT, {"id": "p1"}), (PROJECT, {"id": "p2"})])
+    again = client.graphql.execute_batch([(PROJECT, {"id": "p2"}), (PROJECT, {"id": "p1"})])
+
+    assert [r.data.project.name for r in responses + again] == ["Apollo", "Gemini", "Gemini", "Apollo"]
+    assert [isinstance(body, list) for body in server.requests] == [False, True, False, False, False, False]
+
+
+class Task(BaseModel):
+    title: str
+
+
+class Project(BaseModel):
+    name: str
+    tasks: List[Task]
+
+
+class ProjectData(BaseModel):
+    project: Optional[Project] = None
+
+
+async def test_async_execute_with_result_type() -> None:
+    server = StandInServer()
+    client = async_mock_client(server.handle, x_api_key="async")
+
+    response = await client.graphql.execute(PROJECT, {"id": "p1"}, result_type=ProjectData)
+    responses = await client.graphql.execute_batch(
+        [GraphQLRequest(PROJECT, {"id": "p1"}, result_type=ProjectData), (PROJECT, {"id": "p2"})]
+    )
+
+    assert isinstance(response.data, ProjectData) and response.data.project is not None
+    assert response.data.project.tasks[0].title == "launch"
+    assert isinstance(responses[0].data, ProjectData) and responses[1].data.project is None
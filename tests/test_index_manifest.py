@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from papr_memory import Papr
+from tests.utils import TinyEmbedder
+from papr_memory._index_manifest import INDEX_SCHEMA_VERSION, IndexManifest
+
+base_url = "http://127.0.0.1:4010"
+
+
+class UnsizedEmbedder(TinyEmbedder):
+    name = "unsized"
+    dimensions = 0
+
+
+def test_metadata_round_trip() -> None:
+    manifest = IndexManifest.for_embedder(TinyEmbedder())
+    metadata = manifest.to_metadata()
+
+    assert all(isinstance(v, (str, int, float, bool)) for v in metadata.values())
+    restored = IndexManifest.from_metadata({"description": "tier0", **metadata})
+    assert restored is not None
+    assert restored.model_id == "tiny"
+    assert restored.dimensions == 2
+    assert restored.dtype == "float32"
+    assert restored.normalized is manifest.normalized
+    assert restored.schema_version == INDEX_SCHEMA_VERSION
+    assert manifest.incompatibility(restored) is None
+
+
+def test_legacy_collections_have_no_manifest() -> None:
+    assert IndexManifest.from_metadata(None) is None
+    assert IndexManifest.from_metadata({"embedding_model": "Qwen/Qwen3-Embedding-4B"}) is None
+    assert IndexManifest.from_metadata({"papr_index_model_id": "x", "papr_index_dimensions": "n/a"}) is None
+    assert IndexManifest.for_embedder(TinyEmbedder()).incompatibility(None) == "index has no manifest"
+
+
+@pytest.mark.parametrize(
+    "field, value, expected",
+    [
+        ("model_id", "other", "built with 'other'"),
+        ("dimensions", 4, "4 dimensions"),
+        ("dtype", "int8", "int8 weights"),
+        ("normalized", "false", "normalization"),
+        ("schema_version", 0, "schema version 0"),
+    ],
+)
+def test_incompatibility_reasons(field: str, value: object, expected: str) -> None:
+    manifest = IndexManifest(model_id="tiny", dimensions=2, dtype="float32", normalized=True)
+    metadata = manifest.to_metadata()
+    metadata[f"papr_index_{field}"] = value
+
+    reason = manifest.incompatibility(IndexManifest.from_metadata(metadata))
+    assert reason is not None and expected in reason
+
+
+def test_for_embedder_falls_back_to_given_dimensions() -> None:
+    assert IndexManifest.for_embedder(UnsizedEmbedder(), dimensions=384).dimensions == 384
+    # Declared dimensions win over the fallback
+    assert IndexManifest.for_embedder(TinyEmbedder(), dimensions=384).dimensions == 2
+
+
+def test_query_check_uses_manifest_without_embedding(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = Papr(base_url=base_url, x_api_key="test")
+    memory = client.memory
+    embedder = TinyEmbedder()
+    rebuilds: List[str] = []
+    monkeypatch.setattr(memory, "_schedule_index_rebuild", rebuilds.append)
+
+    # No manifest recorded (index opened by an older SDK): defer to ChromaDB
+    assert memory._check_embedding_dimensions_before_query([1.0, 0.0], embedder) is True
+
+    memory._index_manifest = IndexManifest.for_embedder(embedder)
+    assert memory._check_embedding_dimensions_before_query([1.0, 0.0], embedder) is True
+    assert rebuilds == []
+
+    # Wrong size from an unknown source: fall back to the server without rebuilding
+    assert memory._check_embedding_dimensions_before_query([1.0, 0.0, 0.0]) is False
+    assert rebuilds == []
+
+    # A different active embedder makes the index stale and schedules a rebuild
+    class OtherEmbedder(TinyEmbedder):
+        name = "other"
+
+    assert memory._check_embedding_dimensions_before_query([1.0, 0.0], OtherEmbedder()) is False
+    assert len(rebuilds) == 1 and "'other'" in rebuilds[0]
+
+
+def test_model_swap_behind_the_same_backend_is_incompatible() -> None:
+    from papr_memory._embedder_backends import SentenceTransformerEmbedder
+
+    class Model:
+        def get_sentence_embedding_dimension(self) -> int:
+            return 1024
+
+    built = IndexManifest.for_embedder(SentenceTransformerEmbedder(Model(), model_id="Qwen/Qwen3-Embedding-0.6B"))
+    swapped = IndexManifest.for_embedder(SentenceTransformerEmbedder(Model(), model_id="BAAI/bge-large-en-v1.5"))
+
+    assert built.model_id == "Qwen/Qwen3-Embedding-0.6B"
+    reason = swapped.incompatibility(IndexManifest.from_metadata(built.to_metadata()))
+    assert reason is not None and "'Qwen/Qwen3-Embedding-0.6B'" in reason and "bge-large" in reason
+    # Embedders without a model id are identified by their backend name
+    assert IndexManifest.for_embedder(TinyEmbedder()).model_id == "tiny"
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+from pathlib import Path
+
+import httpx
+import pytest
+
+from tests.utils import mock_client, async_mock_client
+from papr_memory import _local_rerank, _schema_registry
+
+FIXTURES = json.loads((Path(__file__).parent / "fixtures" / "holographic_rerank.json").read_text())
+SCHEMA = FIXTURES["schema"]
+CASES = {case["name"]: case for case in FIXTURES["cases"]}
+
+
+class StandInServer:
+    """Replays a rerank response and serves the cosqa frequency schema."""
+
+    domains = {"domains": [], "total": 0}
+
+    def __init__(self, response: Dict[str, Any] | None = None) -> None:
+        self.response = response
+        self.rerank_bodies: List[Dict[str, Any]] = []
+        self.schema_requests = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/holographic/rerank":
+            self.rerank_bodies.append(json.loads(request.content))
+            return httpx.Response(200, json=self.response)
+        if request.url.path == "/v1/frequencies":
+            self.schema_requests += 1
+            listing = {"schemas": [SCHEMA], "total": 1, "shortcuts": {"cosqa": SCHEMA["schema_id"]}}
+            return httpx.Response(200, json=listing)
+        if request.url.path == "/v1/holographic/domains":
+            return httpx.Response(200, json=self.domains)
+        if request.url.path.startswith("/v1/frequencies/"):
+            return httpx.Response(404, json={"detail": "unknown schema"})
+        return httpx.Response(404)
+
+
+@pytest.fixture(autouse=True)
+def fresh_schemas(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_schema_registry, "_registries", {})
+    monkeypatch.setattr("papr_memory._transform_cache.transform_cache", None)
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_local_formula_regression(name: str) -> None:
+    # Regression test for the local formula only: the expected rankings were computed by hand
+    # from it, not recorded from the server, so they say nothing about agreement with `rerank`
+    case = CASES[name]
+    expected = case["response"]["data"]["rankings"]
+    server = StandInServer()
+
+    local = mock_client(server.handle).holographic.rerank_local(**case["request"])
+
+    assert server.rerank_bodies == [], "rerank_local should not call the rerank endpoint"
+    assert [r.id for r in local.data.rankings] == [r["id"] for r in expected]
+    assert [r.rank for r in local.data.rankings] == [r["rank"] for r in expected]
+    assert {r.path for r in local.data.rankings} <= {"fast"}
+    assert local.data.ensemble_used == "local_hcond"
+    scores = [r.score for r in local.data.rankings]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_frequency_scores_use_schema_field_names() -> None:
+    case = CASES["frequency_filter_drops_mismatch"]
+    server = StandInServer()
+    client = mock_client(server.handle)
+    options = {**case["request"]["options"], "return_scores": True, "include_frequency_scores": True}
+
+    response = client.holographic.rerank_local(**{**case["request"], "options": options})
+    client.holographic.rerank_local(**case["request"])
+
+    top = response.data.rankings[0]
+    assert top.frequency_scores is not None
+    assert list(top.frequency_scores) == [field["name"] for field in SCHEMA["frequencies"]]
+    assert top.frequency_scores["language"] == pytest.approx(1.0)
+    assert top.scores is not None and set(top.scores) == {"cosine", "phase_alignment"}
+    assert response.data.domain == "code_search"
+    # The schema is fetched once and reused
+    assert server.schema_requests == 1
+
+
+def test_cold_path_candidates_go_to_the_server() -> None:
+    case = CASES["cosine_and_phase_agree"]
+    server = StandInServer(case["response"])
+    request = {**case["request"], "candidates": [*case["request"]["candidates"], {"id": "e", "content": "new doc"}]}
+
+    response = mock_client(server.handle).holographic.rerank_local(**request)
+
+    assert len(server.rerank_bodies) == 1
+    assert server.rerank_bodies[0]["candidates"][-1] == {"id": "e", "content": "new doc"}
+    assert server.rerank_bodies[0]["top_k"] == 3
+    assert response.data.ensemble_used == "caesar_8"
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"options": {"use_cross_encoder": True}},
+        {"options": {"scoring_method": "egr_rerank"}},
+        {"query_phases": None},
+        {"query_embedding": None},
+    ],
+)
+def test_unsupported_requests_go_to_the_server(change: Dict[str, Any]) -> None:
+    case = CASES["cosine_and_phase_agree"]
+    server = StandInServer(case["response"])
+
+    mock_client(server.handle).holographic.rerank_local(**{**case["request"], **change})
+
+    assert len(server.rerank_bodies) == 1
+
+
+def test_filters_without_schema_go_to_the_server() -> None:
+    case = CASES["frequency_filter_drops_mismatch"]
+    server = StandInServer(case["response"])
+
+    mock_client(server.handle).holographic.rerank_local(**{**case["request"], "frequency_schema_id": "unknown"})
+
+    assert server.rerank_bodies[0]["options"] == {"frequency_filters": {"language": 0.9}}
+
+
+def test_without_numpy_goes_to_the_server(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_local_rerank, "_numpy", lambda: None)
+    case = CASES["cosine_and_phase_agree"]
+    server = StandInServer(case["response"])
+
+    mock_client(server.handle).holographic.rerank_local(**case["request"])
+
+    assert len(server.rerank_bodies) == 1
+
+
+def test_unknown_filter_field() -> None:
+    case = CASES["frequency_filter_drops_mismatch"]
+    request = {**case["request"], "options": {"frequency_filters": {"nope": 0.5}}}
+
+    with pytest.raises(ValueError, match="nope"):
+        mock_client(StandInServer().handle).holographic.rerank_local(**request)
+
+
+async def test_async_rerank_local() -> None:
+    case = CASES["metadata_embeddings_break_tie"]
+    server = StandInServer(case["response"])
+    client = async_mock_client(server.handle)
+
+    response = await client.holographic.rerank_local(**case["request"])
+
+    assert [r.id for r in response.data.rankings] == ["same_library", "other_library"]
+    assert server.rerank_bodies == []
+    assert server.schema_requests == 1
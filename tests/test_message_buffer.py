@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Dict, List
+from pathlib import Path
+from datetime import datetime, timezone, timedelta
+from collections import Counter
+
+import httpx
+import pytest
+
+from papr_memory import Papr, _background_buffer
+from papr_memory._message_buffer import MessageJournal
+from tests.utils import mock_client, async_mock_client
+
+pytestmark = pytest.mark.usefixtures("no_retry_delay")
+
+
+class StandInServer:
+    """Stores messages and serves their history, tracking per-session concurrency."""
+
+    def __init__(self) -> None:
+        self.attempts: List[str] = []  # content of every store request
+        self.stored: Dict[str, List[str]] = {}
+        self.history: Dict[str, List[Dict[str, Any]]] = {}
+        self.history_checks: List[str] = []
+        self.failures: Dict[str, List[int]] = {}  # content -> statuses served before success
+        self.lost: Dict[str, int] = {}  # content -> times it is stored but answered with a 503
+        self.down = False
+        self.gate = threading.Event()
+        self.gate.set()
+        self.in_flight: Counter[str] = Counter()
+        self.max_per_session = 0
+        self.max_total = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            session = request.url.path.rsplit("/", 1)[-1]
+            self.history_checks.append(session)
+            messages = list(reversed(self.history.get(session, [])))  # newest first
+            return httpx.Response(200, json={"messages": messages, "sessionId": session, "total_count": len(messages)})
+        assert request.url.path == "/v1/messages"
+        body = json.loads(request.content)
+        session, content = body["sessionId"], body["content"]
+        with self._lock:
+            self.attempts.append(content)
+            self.in_flight[session] += 1
+            self.max_per_session = max(self.max_per_session, self.in_flight[session])
+            self.max_total = max(self.max_total, sum(self.in_flight.values()))
+        try:
+            self.gate.wait(5)
+            threading.Event().wait(0.002)
+            with self._lock:
+                if self.down:
+                    return httpx.Response(503, json={"detail": "down"})
+                statuses = self.failures.get(content)
+                if statuses:
+                    return httpx.Response(statuses.pop(0), json={"detail": "nope"})
+                stored = {
+                    "content": content,
+                    "createdAt": (
+                        datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=len(self.attempts))
+                    ).isoformat(),
+                    "objectId": f"o{len(self.attempts)}",
+                    "role": body["role"],
+                    "sessionId": session,
+                }
+                self.stored.setdefault(session, []).append(content)
+                self.history.setdefault(session, []).append(stored)
+                if self.lost.get(content):
+                    self.lost[content] -= 1
+                    return httpx.Response(503, json={"detail": "timed out"})
+            return httpx.Response(200, json=stored)
+        finally:
+            with self._lock:
+                self.in_flight[session] -= 1
+
+
+def test_messages_are_stored_in_order_per_session() -> None:
+    server = StandInServer()
+
+    with mock_client(server.handle).messages.buffered(concurrency=3) as messages:
+        for turn in range(10):
+            for session in range(5):
+                role = "user" if turn % 2 == 0 else "assistant"
+                messages.store(session_id=f"s{session}", role=role, content=f"s{session}-{turn}")
+        assert messages.flush(timeout=5)
+
+    assert server.stored == {f"s{session}": [f"s{session}-{turn}" for turn in range(10)] for session in range(5)}
+    assert server.max_per_session == 1
+    assert 1 < server.max_total <= 3
+    assert (messages.stored, messages.pending) == (50, 0)
+
+
+def test_store_does_not_wait_for_the_request() -> None:
+    server = StandInServer()
+    server.gate.clear()
+    messages = mock_client(server.handle).messages.buffered()
+
+    messages.store(session_id="s", role="user", content="hi", process_messages=False)
+
+    assert messages.pending == 1 and server.stored == {}
+    server.gate.set()
+    assert messages.flush(timeout=5)
+    assert server.attempts == ["hi"] and server.history_checks == []
+    messages.close()
+
+
+def test_retries_check_the_history_before_resending() -> None:
+    server = StandInServer()
+    server.failures = {"flaky": [503, 502]}
+    messages = mock_client(server.handle).messages.buffered()
+
+    messages.store(session_id="s", role="user", content="flaky")
+    messages.store(session_id="s", role="assistant", content="after")
+    assert messages.flush(timeout=5)
+
+    assert server.attempts.count("flaky") == 3 and server.history_checks == ["s", "s"]
+    assert server.stored == {"s": ["flaky", "after"]}
+    assert messages.retries == 2
+    messages.close()
+
+
+def test_messages_stored_despite_an_error_are_not_sent_again() -> None:
+    server = StandInServer()
+    server.lost = {"lost": 1}
+    messages = mock_client(server.handle).messages.buffered()
+
+    messages.store(session_id="s", role="user", content="lost")
+    messages.store(session_id="s", role="assistant", content="after")
+    assert messages.flush(timeout=5)
+
+    assert server.stored == {"s": ["lost", "after"]}
+    assert server.attempts == ["lost", "after"] and server.history_checks == ["s"]
+    assert (messages.stored, messages.retries) == (2, 1)
+    messages.close()
+
+
+def test_store_sends_the_message_id_as_the_idempotency_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = StandInServer()
+    sent: List[Any] = []
+    original = Papr._build_request
+
+    def build_request(self: Papr, options: Any, **kwargs: Any) -> httpx.Request:
+        sent.append(options.idempotency_key)
+        return original(self, options, **kwargs)
+
+    monkeypatch.setattr(Papr, "_build_request", build_request)
+    with mock_client(server.handle).messages.buffered() as messages:
+        message_id = messages.store(session_id="s", role="user", content="hi")
+
+    assert sent == [message_id]
+
+
+def test_rejected_messages_are_reported_and_skipped() -> None:
+    server = StandInServer()
+    server.failures = {"bad": [422]}
+    errors: List[Any] = []
+    messages = mock_client(server.handle).messages.buffered(on_error=lambda *args: errors.append(args))
+
+    bad = messages.store(session_id="s", role="user", content="bad")
+    messages.store(session_id="s", role="user", content="good")
+    messages.close()
+
+    assert server.stored == {"s": ["good"]}
+    assert errors[0][0] == bad and errors[0][1]["content"] == "bad" and "422" in str(errors[0][2])
+    assert messages.failed == 1
+
+
+def test_journal_resends_unsent_messages_after_restart(tmp_path: Path) -> None:
+    journal = str(tmp_path / "messages.jsonl")
+    server = StandInServer()
+    server.down = True
+
+    crashed = mock_client(server.handle).messages.buffered(journal=journal)
+    for i in range(3):
+        crashed.store(session_id="s", role="user", content=f"m{i}")
+    crashed.close(timeout=0.2)
+    with open(journal, "a") as f:
+        f.write('{"id": "half-writ')  # the process died mid-write
+
+    server.down = False
+    restarted = mock_client(server.handle).messages.buffered(journal=journal)
+    assert restarted.pending == 3
+    assert restarted.flush(timeout=5)
+    restarted.close()
+
+    assert server.stored == {"s": ["m0", "m1", "m2"]}
+    assert server.attempts[-3:] == ["m0", "m1", "m2"]
+    assert MessageJournal(journal).pending() == []
+
+
+def test_journal_replay_skips_a_message_stored_before_the_crash(tmp_path: Path) -> None:
+    journal = MessageJournal(str(tmp_path / "messages.jsonl"))
+    server = StandInServer()
+    server.history["s"] = [
+        {"content": "m0", "createdAt": "2026-01-01T00:00:00Z", "objectId": "o0", "role": "user", "sessionId": "s"}
+    ]
+    journal.add("id0", {"session_id": "s", "role": "user", "content": "m0"})
+    journal.add("id1", {"session_id": "s", "role": "assistant", "content": "m1"})
+
+    with mock_client(server.handle).messages.buffered(journal=journal.path) as messages:
+        assert messages.flush(timeout=5)
+
+    assert server.attempts == ["m1"] and server.history_checks == ["s"]
+    assert MessageJournal(journal.path).pending() == []
+
+
+def test_journal_is_compacted(tmp_path: Path) -> None:
+    journal = MessageJournal(str(tmp_path / "messages.jsonl"), compact_after=2)
+
+    for i in range(3):
+        journal.add(f"id{i}", {"session_id": "s", "content": f"m{i}"})
+    journal.done("id0")
+    journal.done("id2")
+
+    assert journal.pending() == [("id1", {"session_id": "s", "content": "m1"})]
+    assert len(Path(journal.path).read_text().splitlines()) == 1
+
+
+async def test_async_buffer(tmp_path: Path) -> None:
+    server = StandInServer()
+    server.failures = {"a1": [500]}
+    client = async_mock_client(server.handle)
+
+    async with client.messages.buffered(concurrency=2, journal=str(tmp_path / "j.jsonl")) as messages:
+        for turn in range(4):
+            await messages.store(session_id="a", role="user", content=f"a{turn}")
+            await messages.store(session_id="b", role="user", content=f"b{turn}")
+        assert await messages.flush(timeout=5)
+
+    assert server.stored == {"a": ["a0", "a1", "a2", "a3"], "b": ["b0", "b1", "b2", "b3"]}
+    assert server.max_per_session == 1
+    assert messages.journal is not None and messages.journal.pending() == []
+    with pytest.raises(RuntimeError, match="closed"):
+        await messages.store(session_id="a", role="user", content="late")
+
+
+def test_unclosed_async_buffer_warns_at_exit(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    journal = MessageJournal(str(tmp_path / "messages.jsonl"))
+    journal.add("id0", {"session_id": "s", "role": "user", "content": "m0"})
+    # Replayed from the journal, but no event loop ever runs the writers
+    messages = async_mock_client(StandInServer().handle).messages.buffered(journal=journal.path)
+
+    with caplog.at_level("WARNING"):
+        _background_buffer._close_open_buffers()
+
+    assert "1 message(s) were never sent (they remain in the journal)" in caplog.text
+    assert messages.pending == 1 and [message_id for message_id, _ in journal.pending()] == ["id0"]
+    messages._unregister()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+from typing import Any, Dict, List
+from pathlib import Path
+
+import httpx
+import pytest
+
+from tests.utils import mock_client, async_mock_client
+
+pytestmark = pytest.mark.usefixtures("no_retry_delay")
+
+
+class StandInServer:
+    """Exports OMO memories by id; can time out on large shards or fail given ids."""
+
+    def __init__(self) -> None:
+        self.requests: List[List[str]] = []
+        self.max_shard = 0  # shards larger than this time out (0: never)
+        self.reject: Dict[str, int] = {}  # memory id -> status of every shard containing it
+        self.flaky: Dict[str, int] = {}  # memory id -> 503s served before success
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/omo/export"
+        ids = json.loads(request.content)["memory_ids"]
+        with self._lock:
+            self.requests.append(ids)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            threading.Event().wait(0.002 * len(ids))
+            if self.max_shard and len(ids) > self.max_shard:
+                raise httpx.ReadTimeout("timed out", request=request)
+            for memory_id in ids:
+                if memory_id in self.reject:
+                    return httpx.Response(self.reject[memory_id], json={"detail": "nope"})
+                with self._lock:
+                    if self.flaky.get(memory_id):
+                        self.flaky[memory_id] -= 1
+                        return httpx.Response(503, json={"detail": "busy"})
+            memories = [{"id": memory_id, "content": f"content of {memory_id}"} for memory_id in ids]
+            return httpx.Response(200, json={"count": len(memories), "memories": memories})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _lines(text: str) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_shards_are_exported_in_parallel_and_written_in_order(tmp_path: Path) -> None:
+    server = StandInServer()
+    ids = [f"m{i}" for i in range(95)]
+    progress: List[Any] = []
+
+    report = mock_client(server.handle).omo.export_stream(
+        ids, tmp_path / "export.jsonl", shard_size=10, concurrency=4, on_progress=lambda *a: progress.append(a)
+    )
+
+    assert [memory["id"] for memory in _lines((tmp_path / "export.jsonl").read_text())] == ids
+    assert sorted(len(shard) for shard in server.requests) == [5] + [10] * 9
+    assert 1 < server.max_in_flight <= 4
+    assert (report.exported, report.shards, report.ok) == (95, 10, True)
+    assert progress[-1] == (95, 95)
+
+
+def test_duplicates_are_skipped() -> None:
+    server = StandInServer()
+    output = io.StringIO()
+
+    report = mock_client(server.handle).omo.export_stream(["a", "b", "a", "c", "b"], output, shard_size=2)
+
+    assert [memory["id"] for memory in _lines(output.getvalue())] == ["a", "b", "c"]
+    assert sorted(sum(server.requests, [])) == ["a", "b", "c"]
+    assert (report.exported, report.duplicates) == (3, 2)
+
+
+def test_timed_out_shards_are_split() -> None:
+    server = StandInServer()
+    server.max_shard = 3
+    output = io.StringIO()
+
+    report = mock_client(server.handle).omo.export_stream([f"m{i}" for i in range(12)], output, shard_size=12)
+
+    assert [memory["id"] for memory in _lines(output.getvalue())] == [f"m{i}" for i in range(12)]
+    assert [len(shard) for shard in server.requests] == [12, 6, 3, 3, 6, 3, 3]
+    assert (report.exported, report.shards, report.ok) == (12, 4, True)
+
+
+def test_failed_shards_are_retried_then_reported() -> None:
+    server = StandInServer()
+    server.flaky = {"m3": 2}
+    server.reject = {"m7": 400}
+    output = io.StringIO()
+
+    client = mock_client(server.handle)
+    report = client.omo.export_stream([f"m{i}" for i in range(10)], output, shard_size=5, max_attempts=3)
+
+    assert [memory["id"] for memory in _lines(output.getvalue())] == [f"m{i}" for i in range(5)]
+    assert len(report.failures) == 1
+    assert report.failures[0].memory_ids == [f"m{i}" for i in range(5, 10)] and "400" in report.failures[0].error
+    assert not report.ok and len(server.requests) == 4
+
+
+def test_invalid_shard_size_is_rejected_before_writing(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="shard_size"):
+        mock_client(StandInServer().handle).omo.export_stream(["a"], tmp_path / "export.jsonl", shard_size=0)
+    assert not (tmp_path / "export.jsonl").exists()
+
+
+async def test_async_export(tmp_path: Path) -> None:
+    server = StandInServer()
+    server.max_shard = 4
+    client = async_mock_client(server.handle)
+
+    report = await client.omo.export_stream(
+        (f"m{i}" for i in range(40)), str(tmp_path / "export.jsonl"), shard_size=8, concurrency=3
+    )
+
+    assert [memory["id"] for memory in _lines((tmp_path / "export.jsonl").read_text())] == [f"m{i}" for i in range(40)]
+    assert (report.exported, report.shards) == (40, 10)
+    assert server.max_in_flight <= 3
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Dict, List
+from pathlib import Path
+
+import httpx
+import pytest
+
+from papr_memory import _omo_import
+from papr_memory._omo_import import read_omo
+from tests.utils import mock_client, async_mock_client
+
+pytestmark = pytest.mark.usefixtures("no_retry_delay")
+
+
+def _memory(i: int, padding: int = 0) -> Dict[str, Any]:
+    return {"id": f"m{i}", "content": f"memory {i}" + "x" * padding, "type": "text"}
+
+
+class StandInServer:
+    """Imports OMO memories, skipping ids it has seen; can fail a given request."""
+
+    def __init__(self) -> None:
+        self.stored: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[List[str]] = []
+        self.fail_on: Dict[int, int] = {}  # request number -> status
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/omo/import"
+        body = json.loads(request.content)
+        with self._lock:
+            number = len(self.requests)
+            self.requests.append([memory["id"] for memory in body["memories"]])
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            threading.Event().wait(0.005)
+            status = self.fail_on.pop(number, None)
+            if status:
+                return httpx.Response(status, json={"detail": "nope"})
+            imported = skipped = 0
+            with self._lock:
+                for memory in body["memories"]:
+                    if memory["id"] in self.stored and body.get("skip_duplicates"):
+                        skipped += 1
+                    else:
+                        self.stored[memory["id"]] = memory
+                        imported += 1
+            return httpx.Response(200, json={"imported": imported, "skipped": skipped, "status": "success"})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _write_jsonl(path: Path, n: int) -> str:
+    path.write_text("".join(json.dumps(_memory(i)) + "\n" for i in range(n)))
+    return str(path)
+
+
+@pytest.mark.parametrize("layout", ["jsonl", "array", "export"])
+def test_files_are_read_incrementally(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, layout: str) -> None:
+    memories = [_memory(i) for i in range(50)]
+    path = tmp_path / "export.json"
+    if layout == "jsonl":
+        path.write_text("\n".join(json.dumps(m) for m in memories) + "\n\n")
+    elif layout == "array":
+        path.write_text(json.dumps(memories, indent=2))
+    else:
+        path.write_text(json.dumps({"version": "1", "memories": memories, "count": 50, "status": "success"}))
+    monkeypatch.setattr(_omo_import, "_READ_SIZE", 7)  # values straddle every read
+
+    assert list(read_omo(str(path))) == memories
+
+
+def test_invalid_files_are_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "bad.json"
+    path.write_text('[{"id": "m0"}, 3]')
+    with pytest.raises(ValueError, match="#1 is not a JSON object"):
+        list(read_omo(path))
+
+    path.write_text('[{"id": "m0"}, {"id": ')
+    with pytest.raises(ValueError, match="bad.json"):
+        list(read_omo(path))
+
+
+def test_memories_are_sent_in_bounded_chunks_concurrently(tmp_path: Path) -> None:
+    server = StandInServer()
+    progress: List[Any] = []
+    memories = [_memory(i, padding=900 if i % 10 == 0 else 0) for i in range(100)]
+
+    report = mock_client(server.handle).omo.import_stream(
+        iter(memories), chunk_size=8, max_chunk_bytes=1500, concurrency=3, on_progress=lambda *a: progress.append(a)
+    )
+
+    assert (report.imported, report.skipped, report.complete) == (100, 0, True)
+    assert sorted(server.stored) == sorted(m["id"] for m in memories)
+    assert max(len(ids) for ids in server.requests) == 8
+    by_id = {m["id"]: m for m in memories}
+    for ids in server.requests:
+        assert sum(len(json.dumps(by_id[i], separators=(",", ":"))) + 1 for i in ids) <= 1500
+    assert 1 < server.max_in_flight <= 3
+    assert progress[-1] == (100, 100) and report.chunks == len(server.requests)
+
+
+def test_interrupted_import_resumes_at_the_last_committed_chunk(tmp_path: Path) -> None:
+    source = _write_jsonl(tmp_path / "export.jsonl", 60)
+    checkpoint = str(tmp_path / "import.checkpoint")
+    server = StandInServer()
+    server.fail_on = {3: 400}
+
+    with pytest.raises(Exception, match="400"):
+        mock_client(server.handle).omo.import_stream(source, chunk_size=10, concurrency=1, checkpoint=checkpoint)
+    state = json.loads(Path(checkpoint).read_text())
+    assert (state["committed"], state["imported"], state["complete"]) == (3, 30, False)
+
+    report = mock_client(server.handle).omo.import_stream(source, chunk_size=10, concurrency=1, checkpoint=checkpoint)
+
+    assert [ids[0] for ids in server.requests] == ["m0", "m10", "m20", "m30", "m30", "m40", "m50"]
+    assert (report.imported, report.resumed_chunks, report.chunks, report.complete) == (60, 3, 6, True)
+    again = mock_client(server.handle).omo.import_stream(source, chunk_size=10, concurrency=1, checkpoint=checkpoint)
+    assert again.complete and len(server.requests) == 7
+
+
+def test_checkpoint_for_a_different_layout_starts_over(tmp_path: Path) -> None:
+    source = _write_jsonl(tmp_path / "export.jsonl", 20)
+    checkpoint = str(tmp_path / "import.checkpoint")
+    server = StandInServer()
+    mock_client(server.handle).omo.import_stream(source, chunk_size=10, checkpoint=checkpoint)
+
+    report = mock_client(server.handle).omo.import_stream(source, chunk_size=5, checkpoint=checkpoint)
+
+    assert (report.imported, report.skipped, report.resumed_chunks) == (0, 20, 0)
+
+
+def test_retryable_failures_are_retried() -> None:
+    server = StandInServer()
+    server.fail_on = {0: 503, 1: 429}
+
+    report = mock_client(server.handle).omo.import_stream([_memory(i) for i in range(5)], chunk_size=10, concurrency=1)
+
+    assert report.imported == 5 and len(server.requests) == 3
+
+
+async def test_async_import(tmp_path: Path) -> None:
+    source = _write_jsonl(tmp_path / "export.jsonl", 45)
+    checkpoint = str(tmp_path / "import.checkpoint")
+    server = StandInServer()
+    server.fail_on = {2: 422}
+    client = async_mock_client(server.handle)
+
+    with pytest.raises(Exception, match="422"):
+        await client.omo.import_stream(source, chunk_size=10, concurrency=2, checkpoint=checkpoint)
+    report = await client.omo.import_stream(source, chunk_size=10, concurrency=2, checkpoint=checkpoint)
+
+    assert report.complete and sorted(server.stored) == sorted(f"m{i}" for i in range(45))
+    assert (report.imported, report.skipped, report.chunks) == (45, 0, 5)
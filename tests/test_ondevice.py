@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import List, Iterator
+
+import pytest
+
+from tests.utils import TinyEmbedder
+from papr_memory import Papr, AsyncPapr
+from papr_memory._ondevice import OnDeviceEvent, lifecycle
+
+base_url = "http://127.0.0.1:4010"
+
+
+@pytest.fixture(autouse=True)
+def fresh_lifecycle() -> Iterator[None]:
+    lifecycle.reset()
+    yield
+    lifecycle.reset()
+
+
+def _client_with_local_index(monkeypatch: pytest.MonkeyPatch) -> Papr:
+    monkeypatch.setenv("PAPR_ONDEVICE_PROCESSING", "true")
+    client = Papr(base_url=base_url, x_api_key="test")
+    # Pretend the tier0 collection is already synced
+    client.memory._chroma_collection = object()
+    return client
+
+
+def test_warmup_runs_stages_and_reports_timings(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _client_with_local_index(monkeypatch)
+    embedder = TinyEmbedder()
+    client.memory.use_embedder(embedder, warmup=False)
+
+    events: List[OnDeviceEvent] = []
+    unsubscribe = client.memory.ondevice.on_progress(events.append)
+    assert client.memory.ondevice.ready() is False
+
+    status = client.memory.ondevice.warmup(timeout=10)
+    unsubscribe()
+
+    assert status.ready
+    assert status.embedder == "tiny"
+    assert set(status.stages) == {"model", "warmup"}
+    assert all(t >= 0 for t in status.stages.values())
+    assert embedder.calls == [["warmup"]]
+    assert [(e.stage, e.state) for e in events] == [
+        ("model", "started"),
+        ("model", "completed"),
+        ("warmup", "started"),
+        ("warmup", "completed"),
+        ("ready", "completed"),
+    ]
+    assert client.memory.ondevice.ready() is True
+    assert client.memory._get_model_loading_status()["complete"] is True
+
+    # Already warm: returns immediately without another forward pass
+    client.memory.ondevice.warmup(timeout=1)
+    assert embedder.calls == [["warmup"]]
+
+
+def test_warmup_failure_is_reported(monkeypatch: pytest.MonkeyPatch) -> None:
+    class BrokenEmbedder(TinyEmbedder):
+        def embed_documents(self, input: List[str]) -> List[List[float]]:
+            raise ValueError("boom")
+
+    client = _client_with_local_index(monkeypatch)
+    client.memory.use_embedder(BrokenEmbedder(), warmup=False)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        client.memory.ondevice.warmup(timeout=10)
+
+    status = client.memory.ondevice.status()
+    assert status.state == "failed"
+    assert "model" in status.stages
+    assert "warmup" not in status.stages
+
+
+def test_warmup_requires_ondevice_processing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("PAPR_ONDEVICE_PROCESSING", raising=False)
+    client = Papr(base_url=base_url, x_api_key="test")
+
+    with pytest.raises(RuntimeError, match="disabled"):
+        client.memory.ondevice.warmup(timeout=1)
+    assert client.memory.ondevice.ready(timeout=0.01) is False
+
+
+def test_listener_errors_do_not_break_warmup(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _client_with_local_index(monkeypatch)
+    client.memory.use_embedder(TinyEmbedder(), warmup=False)
+
+    def bad_listener(_event: OnDeviceEvent) -> None:
+        raise RuntimeError("listener bug")
+
+    unsubscribe = client.memory.ondevice.on_progress(bad_listener)
+    try:
+        assert client.memory.ondevice.warmup(timeout=10).ready
+    finally:
+        unsubscribe()
+
+
+async def test_async_ready(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _client_with_local_index(monkeypatch)
+    client.memory.use_embedder(TinyEmbedder(), warmup=False)
+    async_client = AsyncPapr(base_url=base_url, x_api_key="test")
+
+    assert await async_client.memory.ondevice.ready() is False
+    client.memory.ondevice.warmup(timeout=10)
+    assert await async_client.memory.ondevice.ready(timeout=1) is True
+    assert async_client.memory.ondevice.status().ready
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from papr_memory._onnx_embedder import (
+    OnnxEmbeddingFunction,
+    onnx_enabled,
+    matryoshka_truncate,
+    get_matryoshka_dimensions,
+)
+
+
+def test_matryoshka_truncate_renormalizes() -> None:
+    out = matryoshka_truncate([3.0, 4.0, 12.0], 2)
+    assert out == pytest.approx([0.6, 0.8])
+    assert math.isclose(sum(x * x for x in out), 1.0)
+
+
+def test_matryoshka_truncate_noop() -> None:
+    assert matryoshka_truncate([1, 2], None) == [1.0, 2.0]
+    assert matryoshka_truncate([1, 2], 5) == [1.0, 2.0]
+
+
+def test_env_flags(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("PAPR_ENABLE_ONNX", raising=False)
+    monkeypatch.delenv("PAPR_EMBEDDING_DIMENSIONS", raising=False)
+    assert onnx_enabled() is False
+    assert get_matryoshka_dimensions() is None
+
+    monkeypatch.setenv("PAPR_ENABLE_ONNX", "1")
+    monkeypatch.setenv("PAPR_EMBEDDING_DIMENSIONS", "1024")
+    assert onnx_enabled() is True
+    assert get_matryoshka_dimensions() == 1024
+
+    monkeypatch.setenv("PAPR_EMBEDDING_DIMENSIONS", "nope")
+    assert get_matryoshka_dimensions() is None
+
+
+class _IO:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class FakeTokenizer:
+    """Right-pads each text to the longest one; token ids are word lengths."""
+
+    def __call__(self, texts: List[str], **_kwargs: Any) -> Dict[str, Any]:
+        import numpy as np
+
+        rows = [[len(w) for w in t.split()] or [0] for t in texts]
+        width = max(len(r) for r in rows)
+        ids = np.zeros((len(rows), width), dtype=np.int64)
+        mask = np.zeros((len(rows), width), dtype=np.int64)
+        for i, r in enumerate(rows):
+            ids[i, : len(r)] = r
+            mask[i, : len(r)] = 1
+        return {"input_ids": ids, "attention_mask": mask}
+
+
+class FakeSession:
+    """Emits hidden states where token t of the sequence has vector [id, 1, position]."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get_inputs(self) -> List[_IO]:
+        return [_IO("input_ids"), _IO("attention_mask")]
+
+    def get_outputs(self) -> List[_IO]:
+        return [_IO("last_hidden_state")]
+
+    def run(self, _names: Optional[List[str]], feed: Dict[str, Any]) -> List[Any]:
+        import numpy as np
+
+        self.calls += 1
+        ids = feed["input_ids"].astype(np.float32)
+        pos = np.broadcast_to(np.arange(ids.shape[1], dtype=np.float32), ids.shape)
+        return [np.stack([ids, np.ones_like(ids), pos], axis=-1)]
+
+
+def test_last_token_pooling_and_batching() -> None:
+    np = pytest.importorskip("numpy")
+
+    session = FakeSession()
+    ef = OnnxEmbeddingFunction(session, FakeTokenizer(), model_path="fake.onnx", batch_size=2)
+    vectors = ef.embed_documents(["a bb", "ccc", "dddd e ff"])
+
+    assert session.calls == 2
+    # "a bb" -> last real token is "bb" (id 2, position 1), not the padding
+    expected = np.array([2.0, 1.0, 1.0]) / np.linalg.norm([2.0, 1.0, 1.0])
+    assert vectors[0] == pytest.approx(expected.tolist(), rel=1e-5)
+    assert all(math.isclose(sum(x * x for x in v), 1.0, rel_tol=1e-5) for v in vectors)
+    assert ef.embed_query("ccc") == pytest.approx(vectors[1], rel=1e-5)
+
+
+def test_dimension_truncation() -> None:
+    pytest.importorskip("numpy")
+
+    ef = OnnxEmbeddingFunction(FakeSession(), FakeTokenizer(), model_path="fake.onnx", dimensions=2)
+    vec = ef.embed_query("abc")
+    assert len(vec) == 2
+    assert vec == pytest.approx([3 / math.sqrt(10), 1 / math.sqrt(10)], rel=1e-5)
+
+
+def test_declares_embedder_metadata() -> None:
+    from papr_memory.lib import Embedder
+
+    ef = OnnxEmbeddingFunction(FakeSession(), FakeTokenizer(), model_path="model_int8.onnx", dimensions=2)
+    assert isinstance(ef, Embedder)
+    assert (ef.name, ef.dimensions, ef.dtype, ef.normalized) == ("onnx", 2, "int8", True)
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import json
+import hashlib
+import threading
+from typing import Any, Set, Dict, List, Tuple, Optional
+from pathlib import Path
+
+import httpx
+import pytest
+
+from papr_memory import APIStatusError
+from tests.utils import mock_client, async_mock_client
+from papr_memory._resumable_upload import UploadLedger, plan_upload
+
+CHUNK = 1024
+
+
+def _document(upload_id: str) -> Dict[str, Any]:
+    return {"document_status": {"progress": 0.0, "upload_id": upload_id, "status_type": "queued"}, "status": "success"}
+
+
+class StandInServer:
+    """In-process implementation of the resumable upload protocol."""
+
+    def __init__(self, *, resumable: bool = True) -> None:
+        self.resumable = resumable
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.completed: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self.fail_chunks: Set[int] = set()
+        # Upload ids the server still has; `discard` one to simulate a deleted document
+        self.known: Set[str] = set()
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        with self._lock:
+            self.requests.append((request.method, path))
+        if path == "/v1/document" and request.method == "POST":
+            self.known.add("single-request")
+            return httpx.Response(200, json=_document("single-request"))
+        if path.startswith("/v1/document/status/") and request.method == "GET":
+            upload_id = path.rsplit("/", 1)[1]
+            if upload_id not in self.known:
+                return httpx.Response(404, json={"detail": "Not Found"})
+            return httpx.Response(200, json={"upload_id": upload_id, "status_type": "completed"})
+        if not self.resumable:
+            return httpx.Response(404, json={"detail": "Not Found"})
+
+        parts = path.split("/")[4:]  # after /v1/document/uploads
+        if request.method == "POST" and not parts:
+            body = json.loads(request.content)
+            if body["sha256"] in self.completed:
+                return httpx.Response(200, json={"document": self.completed[body["sha256"]]})
+            session_id = f"s-{body['sha256'][:8]}"
+            session = self.sessions.setdefault(session_id, {"meta": body, "chunks": {}})
+            return httpx.Response(200, json={"session_id": session_id, "received": sorted(session["chunks"])})
+
+        session = self.sessions[parts[0]]
+        if request.method == "PUT" and parts[1] == "chunks":
+            index = int(parts[2])
+            with self._lock:
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+            try:
+                threading.Event().wait(0.01)
+                if index in self.fail_chunks:
+                    self.fail_chunks.discard(index)
+                    return httpx.Response(500, json={"detail": "connection dropped"})
+                data = request.read()
+                assert hashlib.sha256(data).hexdigest() == request.headers["X-Content-SHA256"]
+                session["chunks"][index] = data
+                return httpx.Response(200, json={"index": index})
+            finally:
+                with self._lock:
+                    self.active -= 1
+
+        if request.method == "POST" and parts[1] == "complete":
+            meta = session["meta"]
+            data = b"".join(session["chunks"][i] for i in range(len(meta["chunks"])))
+            assert hashlib.sha256(data).hexdigest() == meta["sha256"]
+            document = _document(f"doc-{meta['sha256'][:8]}")
+            self.completed[meta["sha256"]] = document
+            self.known.add(document["document_status"]["upload_id"])
+            session["data"] = data
+            return httpx.Response(200, json=document)
+
+        return httpx.Response(400)
+
+    def chunk_puts(self) -> int:
+        return sum(1 for method, _ in self.requests if method == "PUT")
+
+
+@pytest.fixture
+def document(tmp_path: Path) -> Path:
+    path = tmp_path / "report.pdf"
+    path.write_bytes(bytes(range(256)) * 18 + b"tail")  # 5 chunks, the last one short
+    return path
+
+
+@pytest.fixture(autouse=True)
+def ledger_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "ledger.json"
+    monkeypatch.setenv("PAPR_UPLOAD_LEDGER", str(path))
+    return path
+
+
+def test_plan_is_content_addressed(document: Path) -> None:
+    plan = plan_upload(document, CHUNK)
+    data = document.read_bytes()
+
+    assert plan.sha256 == hashlib.sha256(data).hexdigest()
+    assert [c.size for c in plan.chunks] == [1024, 1024, 1024, 1024, 516]
+    assert plan.chunks[1].read(document) == data[1024:2048]
+    with pytest.raises(ValueError):
+        plan_upload(document, 0)
+
+
+def test_uploads_chunks_concurrently(document: Path) -> None:
+    server = StandInServer()
+    progress: List[Tuple[int, int]] = []
+
+    response = mock_client(server.handle).document.upload_resumable(
+        file=document,
+        chunk_size=CHUNK,
+        concurrency=3,
+        on_progress=lambda sent, total: progress.append((sent, total)),
+        chunked=True,
+        namespace_id="ns_1",
+    )
+
+    size = document.stat().st_size
+    session = next(iter(server.sessions.values()))
+    assert session["data"] == document.read_bytes()
+    assert session["meta"]["namespace_id"] == "ns_1"
+    assert response.document_status.upload_id == f"doc-{hashlib.sha256(document.read_bytes()).hexdigest()[:8]}"
+    assert server.chunk_puts() == 5
+    assert 1 < server.max_active <= 3
+    assert progress[-1] == (size, size)
+
+
+def test_resumes_from_acknowledged_chunks(document: Path, ledger_path: Path) -> None:
+    server = StandInServer()
+    server.fail_chunks = {3}
+    client = mock_client(server.handle)
+
+    with pytest.raises(APIStatusError):
+        client.document.upload_resumable(file=document, chunk_size=CHUNK, concurrency=1, chunked=True)
+    # The other chunks are still sent and acknowledged
+    assert server.chunk_puts() == 5
+    assert "session_id" in json.loads(ledger_path.read_text()).popitem()[1]
+
+    server.requests.clear()
+    progress: List[int] = []
+    client.document.upload_resumable(
+        file=document, chunk_size=CHUNK, on_progress=lambda sent, _total: progress.append(sent), chunked=True
+    )
+
+    # Only the chunk the server never acknowledged is re-sent
+    assert [path for method, path in server.requests if method == "PUT"] == [
+        f"/v1/document/uploads/s-{hashlib.sha256(document.read_bytes()).hexdigest()[:8]}/chunks/3"
+    ]
+    assert progress == [document.stat().st_size - CHUNK, document.stat().st_size]
+
+
+def test_skips_known_files(document: Path) -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+    first = client.document.upload_resumable(file=document, chunk_size=CHUNK, chunked=True)
+
+    # Same file and parameters: answered from the local ledger after one status check
+    server.requests.clear()
+    again = client.document.upload_resumable(file=document, chunk_size=CHUNK, chunked=True)
+    assert server.requests == [("GET", f"/v1/document/status/{first.document_status.upload_id}")]
+    assert again.document_status.upload_id == first.document_status.upload_id
+
+    # Different parameters (or no ledger): the server recognises the hash, so no chunks are sent
+    other = client.document.upload_resumable(
+        file=document, chunk_size=CHUNK, namespace_id="ns_2", resume=False, chunked=True
+    )
+    assert server.chunk_puts() == 0
+    assert other.document_status.upload_id == first.document_status.upload_id
+
+
+def test_falls_back_to_single_request(document: Path) -> None:
+    server = StandInServer(resumable=False)
+    progress: List[int] = []
+    client = mock_client(server.handle)
+
+    response = client.document.upload_resumable(
+        file=document, chunk_size=CHUNK, on_progress=lambda sent, _total: progress.append(sent), chunked=True
+    )
+
+    assert response.document_status.upload_id == "single-request"
+    assert server.requests == [("POST", "/v1/document/uploads"), ("POST", "/v1/document")]
+    assert progress[-1] == document.stat().st_size
+
+    # The single-request upload is recorded in the ledger too
+    server.requests.clear()
+    again = client.document.upload_resumable(file=document, chunk_size=CHUNK, chunked=True)
+    assert server.requests == [("GET", "/v1/document/status/single-request")]
+    assert again.document_status.upload_id == "single-request"
+
+
+def test_single_request_by_default(document: Path) -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+
+    response = client.document.upload_resumable(file=document, namespace_id="ns_1")
+    client.document.upload_resumable(file=document, namespace_id="ns_1")
+
+    assert response.document_status.upload_id == "single-request"
+    assert server.requests == [("POST", "/v1/document"), ("GET", "/v1/document/status/single-request")]
+
+
+def test_ledger_is_per_account(document: Path) -> None:
+    server = StandInServer()
+    mock_client(server.handle, x_api_key="account-a").document.upload_resumable(file=document)
+
+    # Another account sharing the ledger file does not get the first account's upload
+    server.requests.clear()
+    mock_client(server.handle, x_api_key="account-b").document.upload_resumable(file=document)
+    assert server.requests == [("POST", "/v1/document")]
+
+
+def test_uploads_again_when_the_server_lost_the_document(document: Path, ledger_path: Path) -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+    client.document.upload_resumable(file=document)
+
+    server.known.clear()
+    server.requests.clear()
+    response = client.document.upload_resumable(file=document)
+
+    assert server.requests == [("GET", "/v1/document/status/single-request"), ("POST", "/v1/document")]
+    assert response.document_status.upload_id == "single-request"
+    assert json.loads(ledger_path.read_text()).popitem()[1]["document"]["document_status"]["upload_id"] == (
+        "single-request"
+    )
+
+
+def test_ledger_ignores_corrupt_file(ledger_path: Path, document: Path) -> None:
+    ledger_path.write_text("{not json")
+    ledger = UploadLedger()
+    key = UploadLedger.key(mock_client(StandInServer().handle), plan_upload(document, CHUNK), {})
+
+    assert ledger.get(key) == {}
+    ledger.update(key, session_id="s-1")
+    assert ledger.get(key) == {"session_id": "s-1"}
+
+
+def test_concurrent_ledger_updates_are_not_lost(ledger_path: Path) -> None:
+    def write(i: int) -> None:
+        # A ledger per upload, as upload_resumable creates them
+        UploadLedger().update(f"key-{i}", session_id=f"s-{i}")
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(json.loads(ledger_path.read_text())) == sorted(f"key-{i}" for i in range(20))
+
+
+async def test_async_upload(document: Path) -> None:
+    server = StandInServer()
+    server.fail_chunks = {0}
+    client = async_mock_client(server.handle)
+    progress: List[int] = []
+    on_progress: Optional[Any] = lambda sent, _total: progress.append(sent)
+
+    with pytest.raises(APIStatusError):
+        await client.document.upload_resumable(
+            file=document, chunk_size=CHUNK, concurrency=2, on_progress=on_progress, chunked=True
+        )
+
+    response = await client.document.upload_resumable(
+        file=document, chunk_size=CHUNK, on_progress=on_progress, chunked=True
+    )
+    session = next(iter(server.sessions.values()))
+    assert session["data"] == document.read_bytes()
+    assert response.document_status.status_type == "queued"
+    assert progress[-1] == document.stat().st_size
+
+    # A recorded upload the server no longer has is sent again
+    server.known.clear()
+    server.completed.clear()
+    server.requests.clear()
+    await client.document.upload_resumable(file=document, chunk_size=CHUNK, chunked=True)
+    assert server.requests[0] == ("GET", f"/v1/document/status/{response.document_status.upload_id}")
+    assert server.chunk_puts() == 0  # the session still holds every chunk
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import httpx
+
+from papr_memory import Papr, APIStatusError, APIConnectionError
+from papr_memory._retries import retry_delay, is_retryable, without_client_retries
+
+base_url = "http://127.0.0.1:4010"
+
+
+def _error(status: int, **headers: str) -> APIStatusError:
+    request = httpx.Request("POST", f"{base_url}/v1/messages")
+    return APIStatusError("nope", response=httpx.Response(status, headers=headers, request=request), body=None)
+
+
+def test_retryable_errors_follow_the_client_rules() -> None:
+    assert is_retryable(APIConnectionError(request=httpx.Request("GET", base_url)))
+    assert [is_retryable(_error(status)) for status in (408, 409, 429, 500, 503)] == [True] * 5
+    assert not is_retryable(_error(400)) and not is_retryable(_error(422))
+    assert not is_retryable(_error(503, **{"x-should-retry": "false"}))
+    assert is_retryable(_error(400, **{"x-should-retry": "true"}))
+    assert not is_retryable(ValueError("bug"))
+
+
+def test_retry_delay_honours_retry_after() -> None:
+    assert retry_delay(1, _error(429, **{"retry-after": "3"})) == 3.0
+    assert retry_delay(1, _error(429, **{"retry-after-ms": "250"})) == 0.25
+    # Unreasonable waits fall back to backoff
+    assert retry_delay(1, _error(429, **{"retry-after": "3600"})) <= 1.25
+    assert 0.75 <= retry_delay(1) <= 1.25
+    assert retry_delay(10, max_delay=30.0) <= 37.5
+
+
+def test_helpers_send_without_client_retries() -> None:
+    client = Papr(base_url=base_url, x_api_key="test", max_retries=2)
+
+    messages = without_client_retries(client.messages)
+
+    assert messages._client.max_retries == 0 and client.max_retries == 2
+    assert messages._client._client is client._client
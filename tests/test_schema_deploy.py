@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, List, Tuple
+from pathlib import Path
+
+import httpx
+import pytest
+
+from tests.utils import mock_client, async_mock_client
+from papr_memory._schema_deploy import LockFile, DeployRecord, schema_hash
+from papr_memory.lib import node, prop, exact, schema, semantic, build_schema_params
+
+
+@schema("deploy_test")
+class DeploySchema:
+    @node
+    class Task:
+        id: str = prop(search=exact())
+        title: str = prop(required=True, search=semantic(0.85))
+
+
+class StandInServer:
+    """Stores schemas by id and records every request."""
+
+    def __init__(self) -> None:
+        self.schemas: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.requests.append((request.method, request.url.path))
+            if request.method == "GET":
+                data = [{"id": schema_id, **body} for schema_id, body in self.schemas.items()]
+                return httpx.Response(200, json={"success": True, "data": data})
+            body = json.loads(request.content)
+            if request.method == "POST":
+                schema_id = f"s{len(self.schemas) + 1}"
+            else:
+                schema_id = request.url.path.rsplit("/", 1)[-1]
+                if schema_id not in self.schemas:
+                    return httpx.Response(404, json={"detail": "not found"})
+            self.schemas[schema_id] = body
+            return httpx.Response(200, json={"success": True, "data": {"id": schema_id, **body}})
+
+
+def test_hash_is_independent_of_key_order() -> None:
+    params = build_schema_params(DeploySchema)
+    reordered = json.loads(json.dumps(params, sort_keys=True))
+
+    assert schema_hash(reordered) == schema_hash(params)
+    assert schema_hash({**params, "description": "changed"}) != schema_hash(params)
+
+
+def test_unchanged_schema_is_not_redeployed(tmp_path: Path) -> None:
+    server = StandInServer()
+    state = str(tmp_path / "schemas.json")
+
+    created = mock_client(server.handle).schemas.deploy(DeploySchema, state_path=state)
+    again = mock_client(server.handle).schemas.deploy(DeploySchema, state_path=state)
+
+    assert (created.action, created.schema_id) == ("created", "s1")
+    assert (again.action, again.schema_id, again.changed) == ("unchanged", "s1", False)
+    assert server.requests == [("GET", "/v1/schemas"), ("POST", "/v1/schemas")]
+    assert not os.path.exists(state + ".lock")
+
+
+def test_changed_schema_is_updated_by_its_recorded_id(tmp_path: Path) -> None:
+    server = StandInServer()
+    state = str(tmp_path / "schemas.json")
+    client = mock_client(server.handle)
+    params = build_schema_params(DeploySchema)
+    client.schemas.deploy(params, state_path=state)
+
+    result = client.schemas.deploy({**params, "description": "v2"}, state_path=state)
+
+    assert (result.action, result.schema_id) == ("updated", "s1")
+    assert server.requests[-1] == ("PUT", "/v1/schemas/s1")
+    assert server.schemas["s1"]["description"] == "v2"
+    assert client.schemas.deploy(DeploySchema, state_path=state, force=True).action == "updated"
+
+
+def test_existing_schema_without_a_record_is_found_by_name(tmp_path: Path) -> None:
+    server = StandInServer()
+    server.schemas["s9"] = {"name": "deploy_test"}
+    record = DeployRecord(str(tmp_path / "schemas.json"))
+
+    result = mock_client(server.handle).schemas.deploy(DeploySchema, state_path=record.path)
+
+    assert (result.action, result.schema_id) == ("updated", "s9")
+    assert server.requests == [("GET", "/v1/schemas"), ("PUT", "/v1/schemas/s9")]
+    assert record.get(next(iter(json.loads(Path(record.path).read_text()))))["schema_id"] == "s9"
+
+
+def test_waiters_pick_up_the_lock_holders_deploy(tmp_path: Path) -> None:
+    server = StandInServer()
+    state = str(tmp_path / "schemas.json")
+    holder = LockFile(state + ".lock")
+    assert holder.try_acquire()
+    results: List[Any] = []
+
+    def deploy() -> None:
+        results.append(mock_client(server.handle).schemas.deploy(DeploySchema, state_path=state))
+
+    waiters = [threading.Thread(target=deploy) for _ in range(4)]
+    for waiter in waiters:
+        waiter.start()
+    time.sleep(0.1)
+    assert server.requests == [] and not results
+
+    holder.release()
+    for waiter in waiters:
+        waiter.join()
+
+    assert sorted(result.action for result in results) == ["created", "unchanged", "unchanged", "unchanged"]
+    assert server.requests == [("GET", "/v1/schemas"), ("POST", "/v1/schemas")]
+
+
+def test_stale_locks_are_broken_and_live_ones_time_out(tmp_path: Path) -> None:
+    server = StandInServer()
+    state = str(tmp_path / "schemas.json")
+    Path(state + ".lock").write_text("crashed")
+    old = time.time() - 600
+    os.utime(state + ".lock", (old, old))
+
+    assert mock_client(server.handle).schemas.deploy(DeploySchema, state_path=state).action == "created"
+
+    Path(state + ".lock").write_text("busy")
+    with pytest.raises(TimeoutError, match="schema deploy lock"):
+        mock_client(server.handle).schemas.deploy({"name": "other"}, state_path=state, lock_timeout=0.1)
+
+
+def test_held_locks_are_refreshed_and_not_broken(tmp_path: Path) -> None:
+    path = str(tmp_path / "schemas.json.lock")
+    holder = LockFile(path, stale_after=0.2)
+    assert holder.try_acquire()
+
+    # Long after stale_after, the holder's heartbeat keeps the lock fresh
+    time.sleep(0.5)
+    assert not LockFile(path, stale_after=0.2).try_acquire()
+    assert Path(path).exists()
+
+    holder.release()
+    assert not Path(path).exists()
+
+
+def test_a_stale_lock_is_broken_by_one_waiter(tmp_path: Path) -> None:
+    path = str(tmp_path / "schemas.json.lock")
+    Path(path).write_text("crashed")
+    old = time.time() - 600
+    os.utime(path, (old, old))
+    start = threading.Barrier(8)
+    acquired: List[LockFile] = []
+
+    def wait_for_lock() -> None:
+        lock = LockFile(path)
+        start.wait()
+        for _ in range(20):
+            if lock.try_acquire():
+                acquired.append(lock)
+                return
+            time.sleep(0.01)
+
+    waiters = [threading.Thread(target=wait_for_lock) for _ in range(8)]
+    for waiter in waiters:
+        waiter.start()
+    for waiter in waiters:
+        waiter.join()
+
+    # Nobody holding the lock releases it, so exactly one waiter gets it
+    assert len(acquired) == 1
+    acquired[0].release()
+    assert sorted(p.name for p in tmp_path.iterdir()) == []
+
+
+async def test_async_deploy(tmp_path: Path) -> None:
+    server = StandInServer()
+    state = str(tmp_path / "schemas.json")
+    client = async_mock_client(server.handle)
+
+    created = await client.schemas.deploy(DeploySchema, state_path=state)
+    again = await client.schemas.deploy(DeploySchema, state_path=state)
+
+    assert (created.action, again.action, again.schema_id) == ("created", "unchanged", "s1")
+    assert len(server.requests) == 2
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from tests.utils import mock_client, async_mock_client
+from papr_memory import InternalServerError, _schema_registry
+from papr_memory._schema_registry import registry_for, validate_fields
+
+
+def _schema(schema_id: str, domain: str, names: List[str]) -> Dict[str, Any]:
+    return {
+        "schema_id": schema_id,
+        "name": schema_id.split(":")[1],
+        "version": schema_id.split(":")[2],
+        "domain": domain,
+        "num_frequencies": len(names),
+        "config": {},
+        "frequencies": [{"name": n, "frequency_hz": f, "type": "ENUM"} for n, f in zip(names, [0.1, 0.5, 2.0])],
+    }
+
+
+COSQA = _schema("code_search:cosqa:2.0.0", "code_search", ["language", "operation"])
+TICKETS = _schema("acme:support_tickets:1.0.0", "support_tickets", ["priority", "component", "product"])
+
+
+class StandInServer:
+    def __init__(self) -> None:
+        self.requests: List[str] = []
+        self.schemas = [COSQA]
+        self.custom = {TICKETS["schema_id"]: TICKETS}
+        self.fail = False
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests.append(f"{request.method} {path}")
+        if path == "/v1/frequencies":
+            self.gate.wait(5)
+            if self.fail:
+                return httpx.Response(503, json={"detail": "unavailable"})
+            body = {"schemas": self.schemas, "total": len(self.schemas), "shortcuts": {"cosqa": COSQA["schema_id"]}}
+            return httpx.Response(200, json=body)
+        if path == "/v1/holographic/domains" and request.method == "GET":
+            domains = [
+                {"domain": s["domain"], "name": s["name"], "num_frequencies": 3, "schema_id": s["schema_id"]}
+                for s in self.custom.values()
+            ]
+            return httpx.Response(200, json={"domains": domains, "total": len(domains)})
+        if path == "/v1/holographic/domains" and request.method == "POST":
+            body = json.loads(request.content)
+            return httpx.Response(200, json={"data": {"schema_id": body["name"]}, "status": "success"})
+        if path.startswith("/v1/frequencies/"):
+            schema = self.custom.get(path.rsplit("/", 1)[1])
+            return httpx.Response(200, json=schema) if schema else httpx.Response(404, json={"detail": "not found"})
+        return httpx.Response(404)
+
+    def count(self, request: str) -> int:
+        return self.requests.count(request)
+
+
+@pytest.fixture(autouse=True)
+def fresh_registries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_schema_registry, "_registries", {})
+
+
+def test_validate_fields() -> None:
+    validate_fields([{"name": "priority", "frequency": 0.1}, {"name": "component", "frequency": 70}])
+
+    with pytest.raises(ValueError, match="3 Hz; it must be one of 0.1, 0.5, 2"):
+        validate_fields([{"name": "priority", "frequency": 3.0}])
+    with pytest.raises(ValueError, match="'a' and 'b' both use frequency 4 Hz"):
+        validate_fields([{"name": "a", "frequency": 4.0}, {"name": "b", "frequency": 4}])
+    with pytest.raises(ValueError, match="between 1 and 14"):
+        validate_fields([])
+    with pytest.raises(ValueError, match="numeric"):
+        validate_fields([{"name": "a", "frequency": "fast"}])
+
+
+def test_bad_fields_never_reach_the_network() -> None:
+    server = StandInServer()
+
+    with pytest.raises(ValueError):
+        mock_client(server.handle).holographic.domains.create_validated(
+            name="acme:tickets:1.0.0", fields=iter([{"name": "priority", "frequency": 1.0, "type": "enum"}])
+        )
+    assert server.requests == []
+
+
+def test_lookups_are_served_from_memory() -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+
+    for name in ("cosqa", "code_search:cosqa:2.0.0", "code_search"):
+        schema = client.frequencies.lookup(name)
+        assert schema is not None and schema.schema_id == "code_search:cosqa:2.0.0"
+    # Another client with the same credentials shares the registry
+    assert mock_client(server.handle).frequencies.lookup("cosqa") is not None
+
+    assert server.requests == ["GET /v1/frequencies", "GET /v1/holographic/domains"]
+    assert [d.schema_id for d in registry_for(client).domains()] == ["acme:support_tickets:1.0.0"]
+
+    mock_client(server.handle, x_api_key="other").frequencies.lookup("cosqa")
+    assert server.count("GET /v1/frequencies") == 2
+
+
+def test_custom_and_unknown_schemas_are_fetched_once() -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+
+    for _ in range(3):
+        custom = client.frequencies.lookup("support_tickets")
+        assert custom is not None and [f.name for f in custom.frequencies] == ["priority", "component", "product"]
+        assert client.frequencies.lookup("nope") is None
+
+    assert server.count("GET /v1/frequencies/acme:support_tickets:1.0.0") == 1
+    assert server.count("GET /v1/frequencies/nope") == 1
+
+
+def test_stale_data_is_served_while_refreshing() -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+    client.frequencies.lookup("cosqa")
+    registry = registry_for(client)
+
+    server.schemas = [COSQA, _schema("bio:med:1.0.0", "biomedical", ["gene"])]
+    server.gate.clear()
+    registry.invalidate()
+
+    # The refresh is blocked on the server; lookups still answer from the old data
+    assert client.frequencies.lookup("cosqa") is not None
+    assert registry.get("biomedical") is None
+    assert client.frequencies.lookup("code_search") is not None
+
+    server.gate.set()
+    for _ in range(100):
+        if registry.get("biomedical") is not None:
+            break
+        threading.Event().wait(0.01)
+    assert registry.get("biomedical") is not None
+    # Only one refresh ran despite the lookups made while it was in flight
+    assert server.count("GET /v1/frequencies") == 2
+
+
+def test_failed_refresh_keeps_old_data() -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+    registry = registry_for(client)
+    client.frequencies.lookup("cosqa")
+
+    server.fail = True
+    registry.invalidate()
+    registry.load(client)
+
+    assert registry.get("cosqa") is not None
+    assert not registry.needs_refresh()
+
+
+def test_first_load_failure_raises() -> None:
+    server = StandInServer()
+    server.fail = True
+
+    with pytest.raises(InternalServerError):
+        mock_client(server.handle).frequencies.lookup("cosqa")
+
+
+def test_creating_a_domain_marks_the_registry_stale() -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+    client.frequencies.lookup("cosqa")
+    assert not registry_for(client).needs_refresh()
+
+    client.holographic.domains.create_validated(
+        name="acme:tickets:2.0.0", fields=[{"name": "priority", "frequency": 0.1, "type": "enum"}]
+    )
+
+    assert registry_for(client).needs_refresh()
+
+
+async def test_async_lookup() -> None:
+    server = StandInServer()
+    client = async_mock_client(server.handle)
+
+    schema = await client.frequencies.lookup("cosqa")
+    custom = await client.frequencies.lookup("acme:support_tickets:1.0.0")
+
+    assert schema is not None and schema.domain == "code_search"
+    assert custom is not None and custom.domain == "support_tickets"
+    assert sorted(server.requests) == [
+        "GET /v1/frequencies",
+        "GET /v1/frequencies/acme:support_tickets:1.0.0",
+        "GET /v1/holographic/domains",
+    ]
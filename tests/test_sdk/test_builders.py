@@ -1,5 +1,7 @@
 """Tests for papr_memory.lib._builders module."""
 
+import os
+
 import pytest
 
 from papr_memory.lib._schema import (
@@ -16,7 +18,7 @@ from papr_memory.lib._builders import (
     build_schema_params,
     serialize_set_values,
 )
-from papr_memory.lib._conditions import And
+from papr_memory.lib._conditions import Or, And
 from papr_memory.lib._properties import (
     Auto,
     PropertyRef,
@@ -332,3 +334,62 @@ class TestSerializeSetValues:
     def test_empty(self) -> None:
         result = serialize_set_values({})
         assert result == {}
+
+
+class TestMemoization:
+    def test_link_to_is_reused(self) -> None:
+        first = build_link_to(PropertyRef("Task", "title"), PropertyRef("Person", "email").exact("a@b.c"))
+        second = build_link_to(PropertyRef("Task", "title"), PropertyRef("Person", "email").exact("a@b.c"))
+        assert first == ["Task:title", "Person:email=a@b.c"]
+        assert second is first
+
+    def test_unhashable_values_are_not_cached(self) -> None:
+        class Value:
+            __hash__ = None  # type: ignore[assignment]
+
+            def __str__(self) -> str:
+                return "v"
+
+        refs = (PropertyRef("Task", "id").exact(Value()), PropertyRef("Task", "title"))
+        assert build_link_to(*refs) == ["Task:id=v", "Task:title"]
+        assert build_link_to(*refs) is not build_link_to(*refs)
+
+    @pytest.mark.skipif(not os.environ.get("PAPR_BENCHMARKS"), reason="timing benchmark; set PAPR_BENCHMARKS=1 to run")
+    def test_per_memory_microbenchmark(self) -> None:
+        import timeit
+
+        @node
+        class Task:
+            title: str = prop(search=semantic(0.85))
+
+        @node
+        class Person:
+            email: str = prop(search=exact())
+
+        when = And({"priority": "high"}, Or({"status": "open"}, {"status": "triage"}))
+        status = Auto("Summarize the status")
+
+        def per_memory() -> None:
+            build_link_to(Task.title, Person.email)
+            build_memory_policy(
+                schema_id="s",
+                node_constraints=[{"node_type": "Task", "when": when.to_dict(), "set": {"status": status.to_dict()}}],
+            )
+
+        def recompiled() -> None:
+            # The same work on fresh objects, so nothing compiled earlier can be reused
+            refs = (PropertyRef("Task", "title"), PropertyRef("Person", "email"))
+            [ref._build_link_to_string() for ref in refs]
+            fresh = And({"priority": "high"}, Or({"status": "open"}, {"status": "triage"}))
+            build_memory_policy(
+                schema_id="s",
+                node_constraints=[
+                    {"node_type": "Task", "when": fresh.to_dict(), "set": {"status": Auto("Summarize").to_dict()}}
+                ],
+            )
+
+        n = 2000
+        cached = min(timeit.repeat(per_memory, number=n, repeat=5)) / n
+        uncached = min(timeit.repeat(recompiled, number=n, repeat=5)) / n
+        # Reported rather than asserted: wall-clock comparisons are flaky on shared machines
+        print(f"per memory: {cached * 1e6:.2f}us memoized, {uncached * 1e6:.2f}us recompiled")
@@ -107,3 +107,31 @@ class TestDeepNesting:
                 },
             ]
         }
+
+
+class TestImmutability:
+    def test_equal_operators_hash_alike(self) -> None:
+        a = And({"a": 1}, Or({"b": 2}, Not({"c": 3})))
+        b = And({"a": 1}, Or({"b": 2}, Not({"c": 3})))
+        assert a == b and hash(a) == hash(b)
+        assert len({a, b, And({"a": 2})}) == 2
+        assert And({"a": 1}) != And({"a": True})
+
+    def test_cannot_be_modified(self) -> None:
+        cond = And({"a": 1})
+        try:
+            cond.conditions = ()  # type: ignore[misc]
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError("And should be immutable")
+
+    def test_later_changes_to_the_input_are_ignored(self) -> None:
+        when = {"a": 1}
+        cond = Not(when)
+        when["a"] = 2
+        assert cond.to_dict() == {"_not": {"a": 1}}
+
+    def test_dict_is_compiled_once(self) -> None:
+        cond = Or({"a": 1}, And({"b": 2}))
+        assert cond.to_dict() is cond.to_dict()
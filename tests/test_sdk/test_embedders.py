@@ -0,0 +1,209 @@
+"""Tests for papr_memory.lib._embedders module."""
+
+import time
+import threading
+from typing import Any, List
+
+import pytest
+
+from papr_memory import Papr, _embedder_backends
+from papr_memory.lib import _embedders
+from papr_memory.lib import (
+    Embedder,
+    BaseEmbedder,
+    as_embedder,
+    list_embedders,
+    create_embedder,
+    register_embedder,
+    unregister_embedder,
+)
+
+
+class TinyEmbedder(BaseEmbedder):
+    name = "tiny"
+    dimensions = 2
+    batch_size = 4
+
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def embed_documents(self, input: List[str]) -> List[List[float]]:
+        self.calls.append(list(input))
+        return [[float(len(t)), 1.0] for t in input]
+
+
+class TestBaseEmbedder:
+    def test_satisfies_protocol(self) -> None:
+        assert isinstance(TinyEmbedder(), Embedder)
+
+    def test_query_and_call(self) -> None:
+        emb = TinyEmbedder()
+        assert emb.embed_query("abc") == [3.0, 1.0]
+        assert emb("ab") == [[2.0, 1.0]]
+        assert emb.calls == [["abc"], ["ab"]]
+
+    def test_warmup_runs_forward_pass(self) -> None:
+        emb = TinyEmbedder()
+        emb.warmup()
+        assert emb.calls == [["warmup"]]
+
+    def test_repr(self) -> None:
+        assert repr(TinyEmbedder()) == "TinyEmbedder(name='tiny', dimensions=2, dtype='float32')"
+
+    def test_embed_documents_is_required(self) -> None:
+        class Incomplete(BaseEmbedder):
+            name = "incomplete"
+
+        with pytest.raises(TypeError, match="embed_documents"):
+            Incomplete()  # type: ignore[abstract]
+
+
+class TestAsEmbedder:
+    def test_returns_embedders_unchanged(self) -> None:
+        emb = TinyEmbedder()
+        assert as_embedder(emb) is emb
+
+    def test_prefers_embed_documents(self) -> None:
+        class EF:
+            def embed_documents(self, texts: List[str]) -> List[List[float]]:
+                return [[1.0] for _ in texts]
+
+            def encode(self, texts: List[str]) -> List[List[float]]:  # pragma: no cover
+                raise AssertionError("should not be used")
+
+        emb = as_embedder(EF())
+        assert emb.embed_documents(["a", "b"]) == [[1.0], [1.0]]
+        assert emb.embed_query("a") == [1.0]
+        assert emb.name == "EF"
+
+    def test_encode_with_array_like_rows(self) -> None:
+        class Row(list):  # type: ignore[type-arg]
+            def tolist(self) -> List[float]:
+                return [float(x) for x in self]
+
+        class Model:
+            def encode(self, texts: List[str]) -> List[Row]:
+                return [Row([1, 2]) for _ in texts]
+
+            def get_sentence_embedding_dimension(self) -> int:
+                return 2
+
+        emb = as_embedder(Model(), name="st")
+        assert emb.embed_documents(["a"]) == [[1.0, 2.0]]
+        assert emb.dimensions == 2
+        assert emb.name == "st"
+
+    def test_embed_query_unwraps_batch(self) -> None:
+        class EF:
+            def embed_documents(self, texts: List[str]) -> List[List[float]]:  # pragma: no cover
+                raise AssertionError("should not be used")
+
+            def embed_query(self, text: str) -> List[List[float]]:
+                return [[0.5, 0.5]]
+
+        assert as_embedder(EF()).embed_query("a") == [0.5, 0.5]
+
+    def test_callable(self) -> None:
+        emb = as_embedder(lambda texts: [[0.0] * 3 for _ in texts], dimensions=3)
+        assert emb.embed_query("x") == [0.0, 0.0, 0.0]
+        assert emb.dimensions == 3
+
+    def test_unsupported_type(self) -> None:
+        with pytest.raises(TypeError):
+            as_embedder(object())
+
+
+class TestRegistry:
+    def test_builtins_registered(self) -> None:
+        assert {"coreml", "mlx", "onnx", "sentence-transformers"} <= set(list_embedders())
+
+    def test_first_lookups_from_many_threads_see_every_builtin(self, monkeypatch: Any) -> None:
+        monkeypatch.setattr(_embedders, "_registry", {})
+        monkeypatch.setattr(_embedders, "_builtins_loaded", False)
+        register_builtins = _embedder_backends.register_builtin_embedders
+
+        def slow_register_builtins() -> None:
+            time.sleep(0.05)
+            register_builtins()
+
+        monkeypatch.setattr(_embedder_backends, "register_builtin_embedders", slow_register_builtins)
+        start = threading.Barrier(8)
+        seen: List[List[str]] = []
+
+        def lookup() -> None:
+            start.wait()
+            seen.append(list_embedders())
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert seen == [["coreml", "mlx", "onnx", "sentence-transformers"]] * 8
+
+    def test_register_instance_and_factory(self) -> None:
+        emb = TinyEmbedder()
+        register_embedder("test-instance", emb)
+        register_embedder("test-factory", TinyEmbedder)
+        try:
+            assert create_embedder("test-instance") is emb
+            assert isinstance(create_embedder("test-factory"), TinyEmbedder)
+            assert {"test-instance", "test-factory"} <= set(list_embedders())
+        finally:
+            unregister_embedder("test-instance")
+            unregister_embedder("test-factory")
+        assert "test-instance" not in list_embedders()
+
+    def test_duplicate_name(self) -> None:
+        register_embedder("test-dup", TinyEmbedder)
+        try:
+            with pytest.raises(ValueError):
+                register_embedder("test-dup", TinyEmbedder)
+            replacement = TinyEmbedder()
+            register_embedder("test-dup", replacement, replace=True)
+            assert create_embedder("test-dup") is replacement
+        finally:
+            unregister_embedder("test-dup")
+
+    def test_unknown_name(self) -> None:
+        with pytest.raises(KeyError):
+            create_embedder("does-not-exist")
+
+
+class TestUseEmbedder:
+    def test_selects_embedder_per_client(self, monkeypatch: Any) -> None:
+        monkeypatch.delenv("PAPR_EMBEDDER", raising=False)
+        client = Papr(base_url="http://127.0.0.1:4010", x_api_key="test")
+        other = Papr(base_url="http://127.0.0.1:4010", x_api_key="test")
+        emb = TinyEmbedder()
+
+        assert client.memory.use_embedder(emb) is emb
+        assert emb.calls == [["warmup"]]
+        assert client.memory._resolve_query_embedder() is emb
+        assert client.memory._expected_embedding_dimensions() == 2
+        assert other.memory._get_embedder_override() is None
+
+        client.memory.use_embedder(None)
+        assert client.memory._get_embedder_override() is None
+
+    def test_selects_registered_name(self, monkeypatch: Any) -> None:
+        emb = TinyEmbedder()
+        register_embedder("test-env", emb)
+        monkeypatch.setenv("PAPR_EMBEDDER", "test-env")
+        try:
+            client = Papr(base_url="http://127.0.0.1:4010", x_api_key="test")
+            assert client.memory._get_embedder_override() is emb
+            # Selected from the environment lazily, without a warm-up pass
+            assert emb.calls == []
+        finally:
+            unregister_embedder("test-env")
+
+    def test_unavailable_backend(self) -> None:
+        register_embedder("test-missing", lambda: None)
+        try:
+            client = Papr(base_url="http://127.0.0.1:4010", x_api_key="test")
+            with pytest.raises(RuntimeError):
+                client.memory.use_embedder("test-missing")
+        finally:
+            unregister_embedder("test-missing")
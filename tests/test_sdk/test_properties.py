@@ -319,3 +319,31 @@ class TestEdge:
     def test_resolve_node_name_invalid(self) -> None:
         with pytest.raises(TypeError, match="Expected a @node-decorated class"):
             _resolve_node_name(42)
+
+
+class TestImmutability:
+    def test_refs_are_hashable_and_immutable(self) -> None:
+        assert PropertyRef("Task", "id").exact("T-1") == PropertyRef("Task", "id").exact("T-1")
+        assert PropertyRef("Task", "id").exact(1) != PropertyRef("Task", "id").exact(True)
+        assert len({exact(), exact(), semantic(0.9), Auto(), Auto(), Auto("p")}) == 4
+        with pytest.raises(AttributeError, match="immutable"):
+            PropertyRef("Task", "id")._value = "x"  # type: ignore[misc]
+        with pytest.raises(AttributeError, match="immutable"):
+            Auto().prompt = "x"  # type: ignore[misc]
+
+    def test_descriptor_hands_out_one_ref_per_class(self) -> None:
+        @node
+        class Task:
+            title: str = prop()
+
+        assert Task.title is Task.title
+        assert Task.title.to_link_to_string() is Task.title.to_link_to_string()
+
+    def test_copies_and_pickles_are_equal(self) -> None:
+        import copy
+        import pickle
+
+        ref = PropertyRef("Task", "title").semantic(0.9, "auth bug")
+        assert copy.deepcopy(ref) is ref
+        assert pickle.loads(pickle.dumps(ref)) == ref
+        assert pickle.loads(pickle.dumps(Auto("p"))).to_dict() == {"mode": "auto", "prompt": "p"}
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import pytest
+
+from papr_memory import _session_cache
+from tests.utils import mock_client, async_mock_client
+from papr_memory._session_cache import session_cache_for
+
+class StandInServer:
+    """One conversation per session id; records compress calls and history pages."""
+
+    def __init__(self) -> None:
+        self.sessions: Dict[str, List[Dict[str, Any]]] = {}  # oldest first
+        self.compressions = 0
+        self.pages: List[Tuple[int, int]] = []  # (limit, skip) of each history request
+
+    def add(self, session_id: str, content: str, role: str = "user") -> None:
+        messages = self.sessions.setdefault(session_id, [])
+        messages.append(
+            {
+                "content": content,
+                "createdAt": "2026-01-01T00:00:00Z",
+                "objectId": f"{session_id}-{len(messages)}",
+                "role": role,
+                "sessionId": session_id,
+            }
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/messages":
+            body = json.loads(request.content)
+            self.add(body["sessionId"], body["content"], body["role"])
+            return httpx.Response(200, json=self.sessions[body["sessionId"]][-1])
+        session_id = path.split("/")[4]
+        messages = self.sessions.get(session_id, [])
+        if path.endswith("/compress"):
+            self.compressions += 1
+            summary = f"{len(messages) // 15 * 15} messages"
+            return httpx.Response(
+                200,
+                json={
+                    "ai_agent_note": "",
+                    "from_cache": False,
+                    "session_id": session_id,
+                    "summaries": {"short_term": summary},
+                    "message_count": len(messages),
+                },
+            )
+        limit, skip = int(request.url.params["limit"]), int(request.url.params["skip"])
+        self.pages.append((limit, skip))
+        newest_first = messages[::-1]
+        return httpx.Response(
+            200,
+            json={
+                "messages": newest_first[skip : skip + limit],
+                "sessionId": session_id,
+                "total_count": len(messages),
+                "context_for_llm": f"{len(messages)} messages",
+            },
+        )
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_session_cache, "_caches", {})
+
+
+
+def _contents(history: Any) -> List[str]:
+    return [message.content for message in history.messages]
+
+
+def test_compress_is_reused_until_the_summary_watermark() -> None:
+    server = StandInServer()
+    for i in range(10):
+        server.add("s", f"m{i}")
+    client = mock_client(server.handle)
+    sessions = client.messages.sessions
+
+    assert sessions.compress_cached("s").summaries.short_term == "0 messages"
+    for i in range(4):
+        client.messages.store_cached(session_id="s", role="user", content=f"new{i}")
+        assert sessions.compress_cached("s").summaries.short_term == "0 messages"
+    assert server.compressions == 1
+
+    client.messages.store_cached(session_id="s", role="user", content="fifteenth")
+    assert sessions.compress_cached("s").summaries.short_term == "15 messages"
+    assert server.compressions == 2
+
+
+def test_plain_store_leaves_the_cache_to_revalidation() -> None:
+    server = StandInServer()
+    for i in range(14):
+        server.add("s", f"m{i}")
+    client = mock_client(server.handle)
+    sessions = client.messages.sessions
+    sessions.compress_cached("s")
+
+    client.messages.store(session_id="s", role="user", content="fifteenth")
+
+    assert sessions.compress_cached("s").summaries.short_term == "0 messages"
+    assert server.compressions == 1
+
+
+def test_history_is_served_from_memory_and_extended_incrementally() -> None:
+    server = StandInServer()
+    for i in range(30):
+        server.add("s", f"m{i}")
+    client = mock_client(server.handle)
+    sessions = client.messages.sessions
+
+    first = sessions.retrieve_history_cached("s", limit=20)
+    assert sessions.retrieve_history_cached("s", limit=5).messages == first.messages[:5]
+    assert server.pages == [(20, 0)]
+
+    client.messages.store_cached(session_id="s", role="user", content="question")
+    server.add("s", "answer", role="assistant")  # written by another process
+    history = sessions.retrieve_history_cached("s", limit=20)
+
+    assert _contents(history)[:3] == ["answer", "question", "m29"]
+    assert _contents(history) == [m["content"] for m in server.sessions["s"][::-1][:20]]
+    assert history.total_count == 32 and history.context_for_llm == "32 messages"
+    assert server.pages == [(20, 0), (10, 0)]
+
+
+def test_larger_limits_fetch_only_older_messages() -> None:
+    server = StandInServer()
+    for i in range(50):
+        server.add("s", f"m{i}")
+    sessions = mock_client(server.handle).messages.sessions
+
+    sessions.retrieve_history_cached("s", limit=10)
+    history = sessions.retrieve_history_cached("s", limit=25)
+    everything = sessions.retrieve_history_cached("s", limit=100)
+
+    assert _contents(history) == [f"m{i}" for i in range(49, 24, -1)]
+    assert len(everything.messages) == 50
+    assert server.pages == [(10, 0), (15, 10), (25, 25)]
+    assert sessions.retrieve_history_cached("s", limit=100).messages == everything.messages
+    assert len(server.pages) == 3
+
+
+def test_history_is_refetched_when_it_no_longer_lines_up() -> None:
+    server = StandInServer()
+    for i in range(20):
+        server.add("s", f"m{i}")
+    client = mock_client(server.handle)
+    sessions = client.messages.sessions
+    sessions.retrieve_history_cached("s", limit=10)
+
+    server.sessions["s"][-1]["objectId"] = "rewritten"
+    client.messages.store_cached(session_id="s", role="user", content="new")
+    history = sessions.retrieve_history_cached("s", limit=10)
+
+    assert _contents(history) == ["new"] + [f"m{i}" for i in range(19, 10, -1)]
+    assert history.messages[1].object_id == "rewritten"
+    assert server.pages == [(10, 0), (10, 0)]
+
+
+def test_entries_are_revalidated_after_the_ttl() -> None:
+    server = StandInServer()
+    server.add("s", "m0")
+    client = mock_client(server.handle)
+    sessions = client.messages.sessions
+    sessions.compress_cached("s")
+    sessions.retrieve_history_cached("s", limit=5)
+
+    server.add("s", "m1")  # not visible until the entry expires
+    assert _contents(sessions.retrieve_history_cached("s", limit=5)) == ["m0"]
+    session_cache_for(client).ttl = 0.0
+    assert _contents(sessions.retrieve_history_cached("s", limit=5)) == ["m1", "m0"]
+    sessions.compress_cached("s")
+
+    assert server.compressions == 2
+    assert server.pages == [(5, 0), (10, 0)]
+
+
+def test_cache_is_shared_per_host_and_credentials() -> None:
+    server = StandInServer()
+    server.add("s", "m0")
+
+    mock_client(server.handle, x_api_key="a").messages.sessions.compress_cached("s")
+    mock_client(server.handle, x_api_key="a").messages.sessions.compress_cached("s")
+    mock_client(server.handle, x_api_key="b").messages.sessions.compress_cached("s")
+
+    assert server.compressions == 2
+
+
+async def test_async_cache() -> None:
+    server = StandInServer()
+    for i in range(20):
+        server.add("s", f"m{i}")
+    client = async_mock_client(server.handle)
+    sessions = client.messages.sessions
+
+    await sessions.compress_cached("s")
+    await sessions.retrieve_history_cached("s", limit=5)
+    await client.messages.store_cached(session_id="s", role="assistant", content="reply")
+    await sessions.compress_cached("s")
+    history = await sessions.retrieve_history_cached("s", limit=5)
+
+    assert _contents(history) == ["reply", "m19", "m18", "m17", "m16"]
+    assert server.compressions == 1
+    assert server.pages == [(5, 0), (10, 0)]
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+import time
+import threading
+from typing import Any, Dict, List, Callable, Optional
+
+import httpx
+import pytest
+
+from tests.utils import mock_client, async_mock_client
+
+
+class StandInServer:
+    """Records `track_event` bodies; can hold requests back or fail them."""
+
+    def __init__(self) -> None:
+        self.bodies: List[Dict[str, Any]] = []
+        self.attempts = 0
+        self.statuses: List[int] = []  # served (and consumed) before any successful response
+        self.down = False
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/telemetry/events"
+        self.attempts += 1
+        self.gate.wait(5)
+        if self.down:
+            return httpx.Response(503, json={"detail": "down"})
+        if self.statuses:
+            return httpx.Response(self.statuses.pop(0), json={"detail": "nope"})
+        body = json.loads(request.content)
+        self.bodies.append(body)
+        n = len(body["events"])
+        return httpx.Response(200, json={"success": True, "events_received": n, "events_processed": n})
+
+    @property
+    def names(self) -> List[str]:
+        return [event["event_name"] for body in self.bodies for event in body["events"]]
+
+
+def _eventually(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_events_are_sent_in_batches() -> None:
+    server = StandInServer()
+
+    client = mock_client(server.handle)
+    with client.telemetry.buffered(batch_size=3, flush_interval=60, anonymous_id="sess") as telemetry:
+        for i in range(7):
+            assert telemetry.track(f"e{i}", {"i": i}, user_id="hashed")
+        _eventually(lambda: telemetry.sent == 6)
+        assert telemetry.buffered == 1
+
+    assert [len(body["events"]) for body in server.bodies] == [3, 3, 1]
+    assert {body["anonymous_id"] for body in server.bodies} == {"sess"}
+    first = server.bodies[0]["events"][0]
+    assert (first["event_name"], first["properties"], first["user_id"]) == ("e0", {"i": 0}, "hashed")
+    assert abs(first["timestamp"] - time.time() * 1000) < 60_000
+
+
+def test_partial_batches_are_sent_after_the_interval() -> None:
+    server = StandInServer()
+    telemetry = mock_client(server.handle).telemetry.buffered(flush_interval=0.02)
+
+    telemetry.track("search_performed", timestamp=123)
+
+    _eventually(lambda: telemetry.sent == 1)
+    assert server.bodies == [{"events": [{"event_name": "search_performed", "timestamp": 123}]}]
+    telemetry.close()
+
+
+def test_track_never_blocks_and_drops_the_oldest_events() -> None:
+    server = StandInServer()
+    server.gate.clear()
+    telemetry = mock_client(server.handle).telemetry.buffered(capacity=50, batch_size=10)
+
+    start = time.monotonic()
+    for i in range(1000):
+        telemetry.track(f"e{i}")
+    assert time.monotonic() - start < 1.0
+
+    assert telemetry.dropped + telemetry.buffered == 1000
+    assert telemetry.buffered <= 60
+    server.gate.set()
+    assert telemetry.flush()
+    assert server.names[-50:] == [f"e{i}" for i in range(950, 1000)]
+    telemetry.close()
+
+
+def test_outage_keeps_newest_events_within_capacity() -> None:
+    server = StandInServer()
+    server.statuses = [503]
+    telemetry = mock_client(server.handle).telemetry.buffered(capacity=5, batch_size=5, flush_interval=0.05)
+
+    for i in range(5):
+        telemetry.track(f"e{i}")
+    _eventually(lambda: telemetry._failures == 1)
+    assert telemetry.buffered == 5
+    for i in range(5, 8):
+        telemetry.track(f"e{i}")
+
+    _eventually(lambda: telemetry.sent == 5)
+    assert server.names == ["e3", "e4", "e5", "e6", "e7"]
+    assert (telemetry.dropped, server.attempts) == (3, 2)
+    telemetry.close()
+
+
+def test_rejected_batches_are_not_retried() -> None:
+    server = StandInServer()
+    server.statuses = [422]
+    telemetry = mock_client(server.handle).telemetry.buffered(batch_size=2)
+
+    telemetry.track("a")
+    telemetry.track("b")
+    telemetry.track("c")
+    assert telemetry.flush()
+
+    assert (telemetry.failed, telemetry.sent, server.names) == (2, 1, ["c"])
+    telemetry.close()
+
+
+def test_sampling() -> None:
+    server = StandInServer()
+    telemetry = mock_client(server.handle).telemetry.buffered(sample_rate=0.0)
+
+    assert not telemetry.track("noisy")
+    assert telemetry.track("important", sample_rate=1.0)
+    telemetry.close()
+
+    assert telemetry.sampled_out == 1
+    assert server.names == ["important"]
+    with pytest.raises(ValueError, match="sample_rate"):
+        mock_client(server.handle).telemetry.buffered(sample_rate=2.0)
+
+
+def test_close_during_an_outage_does_not_hang() -> None:
+    server = StandInServer()
+    server.down = True
+    telemetry = mock_client(server.handle).telemetry.buffered(batch_size=2, flush_interval=60)
+    for i in range(5):
+        telemetry.track(f"e{i}")
+    _eventually(lambda: telemetry._failures >= 1)
+
+    start = time.monotonic()
+    telemetry.close(timeout=5)
+
+    assert time.monotonic() - start < 1.0
+    assert (telemetry.dropped, telemetry.buffered) == (5, 0)
+    assert not telemetry.track("late")
+
+
+async def test_async_buffer() -> None:
+    server = StandInServer()
+    client = async_mock_client(server.handle)
+    telemetry = client.telemetry.buffered(batch_size=4, flush_interval=60)
+    sent: Optional[bool] = None
+
+    async with telemetry:
+        for i in range(10):
+            telemetry.track(f"e{i}")
+        sent = await telemetry.flush()
+        telemetry.track("last")
+
+    assert sent
+    assert [len(body["events"]) for body in server.bodies] == [4, 4, 2, 1]
+    assert (telemetry.sent, telemetry.buffered) == (11, 0)
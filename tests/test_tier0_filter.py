@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+
+import papr_memory._tier0_tenants as tier0_tenants_module
+from papr_memory._ondevice import lifecycle
+from tests.utils import TinyEmbedder, mock_client
+from papr_memory._index_manifest import IndexManifest
+from papr_memory._tier0_filter import Tier0Filter, UnsupportedFilter, tier0_facets
+from papr_memory._tier0_tenants import Tier0Index, Tier0TenantStore, tier0_records
+
+TIER0: List[Dict[str, Any]] = [
+    {
+        "id": "g1",
+        "content": "ship the launch",
+        "type": "goal",
+        "topics": ["launch", "q3"],
+        "external_user_id": "alice",
+        "embedding": [1.0, 0.0],
+    },
+    {
+        "id": "g2",
+        "content": "hire a designer",
+        "type": "goal",
+        "topics": ["hiring"],
+        "metadata": {"risk": "sensitive", "consent": "terms", "acl": {"read": ["bob", "organization:acme"]}},
+        "embedding": [0.9, 0.1],
+    },
+    {
+        "id": "o1",
+        "content": "reduce churn",
+        "type": "okr",
+        "topics": ["q3"],
+        "metadata": {"risk": "flagged", "consent": "none", "organization_read_access": ["acme"]},
+        "embedding": [0.8, 0.2],
+    },
+]
+
+
+def _index() -> Tier0Index:
+    ids, documents, metadatas = tier0_records(TIER0)
+    return Tier0Index.build(
+        ids, documents, metadatas, [item["embedding"] for item in TIER0], IndexManifest.for_embedder(TinyEmbedder())
+    )
+
+
+def _search(index: Tier0Index, **filters: Any) -> List[str]:
+    return index.query([1.0, 0.0], 10, Tier0Filter.compile(**filters))["documents"][0]
+
+
+def test_facets_flatten_topics_acl_consent_and_risk() -> None:
+    facets = tier0_facets(TIER0[1])
+
+    assert facets["papr_type"] == "goal"
+    assert (facets["papr_consent"], facets["papr_risk"]) == ("terms", "sensitive")
+    assert facets["papr_topic:hiring"] is True
+    assert facets["papr_read:external_user:bob"] is True
+    assert facets["papr_read:organization:acme"] is True
+    assert all(isinstance(value, (str, int, float, bool)) for value in facets.values())
+    # Owners can read their own items; unset levels use the OMO defaults
+    assert tier0_facets(TIER0[0])["papr_read:external_user:alice"] is True
+    assert (tier0_facets({})["papr_consent"], tier0_facets({})["papr_risk"]) == ("implicit", "none")
+
+
+def test_filters_select_rows_before_scoring() -> None:
+    index = _index()
+
+    assert _search(index) == ["ship the launch", "hire a designer", "reduce churn"]
+    assert _search(index, metadata={"topics": ["q3", "nope"]}) == ["ship the launch", "reduce churn"]
+    assert _search(index, metadata={"type": "okr", "topics": None}) == ["reduce churn"]
+    assert _search(index, omo_filter={"max_risk": "sensitive"}) == ["ship the launch", "hire a designer"]
+    assert _search(index, omo_filter={"exclude_flagged": True, "min_consent": "implicit"}) == ["ship the launch"]
+    assert _search(index, omo_filter={"require_consent": True, "exclude_risk": ["none"]}) == ["hire a designer"]
+    assert _search(index, search_acl={"read": ["organization:acme"]}) == ["hire a designer", "reduce churn"]
+    assert _search(index, search_acl={"read": ["alice"]}, metadata={"topics": ["q3"]}) == ["ship the launch"]
+    assert _search(index, metadata={"topics": ["hiring"]}, omo_filter={"max_risk": "none"}) == []
+
+
+def test_filters_compile_to_a_chromadb_where_clause() -> None:
+    assert Tier0Filter.compile().to_where() is None
+    assert Tier0Filter.compile(metadata={"type": "goal"}).to_where() == {"papr_type": "goal"}
+    assert Tier0Filter.compile(
+        metadata={"topics": ["q3"]}, omo_filter={"max_risk": "sensitive"}, search_acl={"read": ["bob", "user:u1"]}
+    ).to_where() == {
+        "$and": [
+            {"papr_topic:q3": True},
+            {"papr_risk": {"$in": ["none", "sensitive"]}},
+            {"$or": [{"papr_read:external_user:bob": True}, {"papr_read:user:u1": True}]},
+        ]
+    }
+    assert Tier0Filter.compile(omo_filter={"exclude_risk": ["none", "sensitive", "flagged"]}).matches_nothing
+
+
+def test_filters_that_cannot_be_exact_locally_are_rejected() -> None:
+    with pytest.raises(UnsupportedFilter, match="custom_metadata"):
+        Tier0Filter.compile(metadata={"custom_metadata": {"team": "core"}})
+    with pytest.raises(UnsupportedFilter):
+        Tier0Filter.compile(omo_filter={"max_risk": "extreme"})
+
+
+class StandInServer:
+    def __init__(self) -> None:
+        self.searches: List[Dict[str, Any]] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/sync/tiers":
+            return httpx.Response(200, json={"tier0": TIER0, "tier1": []})
+        self.searches.append(json.loads(request.content))
+        return httpx.Response(200, json={"status": "success", "data": {"memories": [], "nodes": []}})
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[Tier0TenantStore]:
+    store = Tier0TenantStore(path=str(tmp_path / "tenants.sqlite"))
+    monkeypatch.setattr(tier0_tenants_module, "_store", store)
+    monkeypatch.setenv("PAPR_ONDEVICE_PROCESSING", "true")
+    lifecycle.reset()
+    lifecycle.mark_ready("tiny")
+    yield store
+    lifecycle.reset()
+
+
+def test_search_filters_local_results(store: Tier0TenantStore) -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+    client.memory.use_embedder(TinyEmbedder(), warmup=False)
+    client.memory.search(query="plans", namespace_id="ns")
+    store.wait(5)
+
+    # "acme" is an external user, not organization:acme; nothing matches locally so the server is asked
+    filtered = client.memory.search(
+        query="plans", namespace_id="ns", omo_filter={"exclude_flagged": True}, search_acl={"read": ["acme"]}
+    )
+    assert filtered.data is not None and filtered.data.memories == []
+    assert len(server.searches) == 2
+
+    filtered = client.memory.search(
+        query="plans", namespace_id="ns", omo_filter={"max_risk": "sensitive"}, metadata={"topics": ["hiring"]}
+    )
+    assert filtered.data is not None and [m.content for m in filtered.data.memories] == ["hire a designer"]
+
+    client.memory.search(query="plans", namespace_id="ns", metadata={"custom_metadata": {"team": "core"}})
+    assert len(server.searches) == 3
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Dict, List, Iterator, Optional
+from pathlib import Path
+
+import httpx
+import pytest
+
+import papr_memory._tier0_tenants as tier0_tenants_module
+from papr_memory import Papr
+from papr_memory._ondevice import lifecycle
+from tests.utils import TinyEmbedder, mock_client
+from papr_memory._index_manifest import IndexManifest
+from papr_memory._tier0_tenants import TenantKey, Tier0Index, Tier0TenantStore, tenant_key
+
+base_url = "http://127.0.0.1:4010"
+
+
+class GoalEmbedder(TinyEmbedder):
+    def vector(self, text: str) -> List[float]:
+        return [1.0, 0.0] if "goal" in text else [0.0, 1.0]
+
+
+def _index(*vectors: List[float], synced_at: Optional[float] = None) -> Tier0Index:
+    ids = [f"tier0_{i}" for i in range(len(vectors))]
+    return Tier0Index.build(
+        ids,
+        [f"doc {i}" for i in range(len(vectors))],
+        [{"type": "goal"} for _ in vectors],
+        list(vectors),
+        IndexManifest.for_embedder(TinyEmbedder()),
+        synced_at=synced_at,
+    )
+
+
+def test_query_returns_nearest_items_by_cosine_distance() -> None:
+    index = _index([1.0, 0.0], [0.0, 3.0], [1.0, 1.0])
+
+    results = index.query([0.0, 2.0], n_results=2)
+
+    assert results["ids"] == [["tier0_1", "tier0_2"]]
+    assert results["distances"][0][0] == pytest.approx(0.0)
+    assert results["distances"][0][1] == pytest.approx(1 - 0.5**0.5)
+    assert index.query([0.0, 1.0], n_results=10)["documents"] == [["doc 1", "doc 2", "doc 0"]]
+    assert index.incompatibility([1.0, 0.0, 0.0], None) == "query has 3 dimensions, index has 2"
+    assert index.incompatibility([1.0, 0.0], TinyEmbedder()) is None
+
+
+def test_tenant_key_separates_credentials_and_ids() -> None:
+    alice = Papr(base_url=base_url, x_api_key="alice")
+    bob = Papr(base_url=base_url, x_api_key="bob")
+
+    assert tenant_key(alice) is None
+    key = tenant_key(alice, external_user_id="u1", namespace_id="ns")
+    assert key is not None and (key.external_user_id, key.namespace_id, key.user_id) == ("u1", "ns", "")
+    assert key != tenant_key(bob, external_user_id="u1", namespace_id="ns")
+    assert key != tenant_key(alice, external_user_id="u1")
+
+
+def test_cold_tenants_are_evicted_from_ram_and_reloaded_from_disk(tmp_path: Path) -> None:
+    one = _index([1.0, 0.0])
+    store = Tier0TenantStore(max_tenants=10, memory_budget=2 * one.nbytes, path=str(tmp_path / "tenants.sqlite"))
+    keys = [TenantKey("scope", external_user_id=f"u{i}") for i in range(3)]
+
+    for key in keys:
+        store.put(key, _index([1.0, 0.0]))
+    assert keys[0] not in store and len(store) == 2 and store.evictions == 1
+    assert store.nbytes <= store.memory_budget
+
+    reloaded = store.get(keys[0])
+    assert reloaded is not None and reloaded.documents == ["doc 0"]
+    assert reloaded.query([1.0, 0.0], 1)["ids"] == [["tier0_0"]]
+    assert keys[1] not in store and store.evictions == 2
+
+    store.max_tenants = 1
+    store.put(keys[1], _index([0.0, 1.0]))
+    assert len(store) == 1
+    store.drop(keys[0])
+    assert store.get(keys[0]) is None
+
+
+def test_syncs_run_once_per_tenant_and_failures_back_off() -> None:
+    store = Tier0TenantStore()
+    key = TenantKey("scope", external_user_id="u1")
+    release = threading.Event()
+    calls: List[str] = []
+
+    def slow_sync() -> Tier0Index:
+        calls.append("sync")
+        release.wait(5)
+        return _index([1.0, 0.0])
+
+    assert store.lookup(key, slow_sync) is None
+    assert store.lookup(key, slow_sync) is None
+    release.set()
+    store.wait(5)
+    assert calls == ["sync"]
+    assert store.lookup(key, slow_sync) is not None
+
+    other = TenantKey("scope", external_user_id="u2")
+
+    def failing_sync() -> Tier0Index:
+        calls.append("fail")
+        raise RuntimeError("offline")
+
+    store.lookup(other, failing_sync)
+    store.wait(5)
+    assert store.schedule_sync(other, failing_sync) is None
+    assert calls == ["sync", "fail"]
+
+
+def test_stale_indexes_are_served_while_refreshing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PAPR_SYNC_INTERVAL", "60")
+    store = Tier0TenantStore()
+    key = TenantKey("scope", external_user_id="u1")
+    store.put(key, _index([1.0, 0.0], synced_at=0.0))
+
+    stale = store.lookup(key, lambda: _index([0.0, 1.0]))
+    store.wait(5)
+
+    assert stale is not None and stale.synced_at == 0.0
+    fresh = store.get(key)
+    assert fresh is not None and fresh.synced_at > 0.0
+
+
+class StandInServer:
+    """Returns a different tier0 per tenant and counts server-side searches."""
+
+    def __init__(self) -> None:
+        self.tier0: Dict[str, List[Dict[str, Any]]] = {
+            "alice": [
+                {"id": "a1", "content": "alice goal", "type": "goal", "embedding": [1.0, 0.0]},
+                {"id": "a2", "content": "alice note", "type": "note"},
+            ],
+            "bob": [{"id": "b1", "content": "bob goal", "type": "goal", "embedding": [1.0, 0.0]}],
+        }
+        self.syncs: List[Dict[str, Any]] = []
+        self.searches = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if request.url.path == "/v1/sync/tiers":
+            self.syncs.append(body)
+            return httpx.Response(200, json={"tier0": self.tier0.get(body.get("external_user_id"), []), "tier1": []})
+        assert request.url.path == "/v1/memory/search"
+        self.searches += 1
+        return httpx.Response(200, json={"status": "success", "data": {"memories": [], "nodes": []}})
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[Tier0TenantStore]:
+    store = Tier0TenantStore(path=str(tmp_path / "tenants.sqlite"))
+    monkeypatch.setattr(tier0_tenants_module, "_store", store)
+    monkeypatch.setenv("PAPR_ONDEVICE_PROCESSING", "true")
+    lifecycle.reset()
+    lifecycle.mark_ready("tiny")
+    yield store
+    lifecycle.reset()
+
+
+def test_search_uses_only_the_tenants_own_index(store: Tier0TenantStore) -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+    client.memory.use_embedder(GoalEmbedder(), warmup=False)
+    # A shared collection holding the key owner's tier0 must never answer tenant searches
+    client.memory._chroma_collection = object()  # type: ignore[attr-defined]
+
+    first = client.memory.search(query="goal", external_user_id="alice")
+    store.wait(5)
+    assert server.searches == 1 and first.data is not None and not first.data.memories
+    assert server.syncs[0]["external_user_id"] == "alice" and server.syncs[0]["max_tier1"] == 0
+
+    alice = client.memory.search(query="goal", external_user_id="alice", max_memories=1)
+    assert alice.data is not None and [m.content for m in alice.data.memories] == ["alice goal"]
+    client.memory.search(query="goal", external_user_id="bob")
+    store.wait(5)
+    bob = client.memory.search(query="goal", external_user_id="bob")
+    assert bob.data is not None and [m.content for m in bob.data.memories] == ["bob goal"]
+    assert server.searches == 2 and len(server.syncs) == 2
+
+
+def test_tenant_sync_sends_the_tenant_ids_as_declared_fields(store: Tier0TenantStore) -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+    client.memory.use_embedder(GoalEmbedder(), warmup=False)
+
+    client.memory.search(query="goal", external_user_id="alice", namespace_id="ns", organization_id="org")
+    store.wait(5)
+
+    assert len(server.syncs) == 1
+    sync = server.syncs[0]
+    assert (sync["external_user_id"], sync["namespace_id"], sync["organization_id"]) == ("alice", "ns", "org")
+    assert "user_id" not in sync
+    assert sync["include_embeddings"] is True and sync["max_tier1"] == 0
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+from pathlib import Path
+
+import httpx
+import pytest
+
+from papr_memory import Papr, _transform_cache
+from tests.utils import mock_client, mock_base_url, async_mock_client
+from papr_memory._client_identity import client_key
+from papr_memory._transform_cache import TransformCache, content_key, schema_scope
+
+def _data(content: str) -> Dict[str, Any]:
+    return {
+        "base_dim": 2,
+        "domain": "code",
+        "frequency_schema_id": "code:cosqa:1.0.0",
+        "timing_ms": 1.0,
+        "phases": [float(len(content))] * 14,
+        "metadata_embeddings": {"0.1": [0.5, 0.5]},
+    }
+
+
+class StandInServer:
+    def __init__(self) -> None:
+        self.rerank_bodies: List[Dict[str, Any]] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if request.url.path == "/v1/holographic/transform":
+            return httpx.Response(200, json={"data": _data(body["content"])})
+        if request.url.path == "/v1/holographic/transform/batch":
+            results = [{"id": item["id"], "data": _data(item["content"])} for item in body["items"]]
+            return httpx.Response(200, json={"results": results, "timing_ms": 1.0, "total": len(results)})
+        if request.url.path == "/v1/holographic/rerank":
+            self.rerank_bodies.append(body)
+            rankings = [
+                {"id": c["id"], "path": "fast" if c.get("phases") else "cold", "rank": i, "score": 1.0}
+                for i, c in enumerate(body["candidates"])
+            ]
+            data = {"domain": "code", "ensemble_used": "auto", "rankings": rankings, "timing_ms": 1.0}
+            return httpx.Response(200, json={"data": data})
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> TransformCache:
+    cache = TransformCache(max_entries=100)
+    monkeypatch.setattr(_transform_cache, "transform_cache", cache)
+    return cache
+
+
+
+def test_lru_eviction() -> None:
+    cache = TransformCache(max_entries=2)
+    cache.put("a", {"phases": [1.0]})
+    cache.put("b", {"phases": [2.0]})
+    assert cache.get("a") == {"phases": [1.0]}
+    cache.put("c", {"phases": [3.0]})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_disk_cache_survives_restart(tmp_path: Path) -> None:
+    path = str(tmp_path / "transforms.sqlite")
+    TransformCache(path=path).put("k", {"phases": [1.0], "metadata_embeddings": {"0.1": [0.1]}})
+
+    restarted = TransformCache(path=path)
+    assert len(restarted) == 0
+    assert restarted.get("k") == {"phases": [1.0], "metadata_embeddings": {"0.1": [0.1]}}
+    assert len(restarted) == 1
+
+
+def test_keys_depend_on_client_scope_and_context() -> None:
+    client = client_key(Papr(base_url=mock_base_url, x_api_key="test"))
+    assert schema_scope("code", "code:cosqa:1.0.0") == "schema:code:cosqa:1.0.0"
+    base = content_key(client, "text", schema_scope("code"))
+    assert content_key(client, "text", schema_scope("biomedical")) != base
+    assert content_key(client, "text", schema_scope("code"), {"createdAt": "2024-01-01"}) != base
+    assert content_key(client, "text", schema_scope("code"), {}) == base
+    other = client_key(Papr(base_url=mock_base_url, x_api_key="other"))
+    assert content_key(other, "text", schema_scope("code")) != base
+    assert content_key(client_key(Papr(base_url="http://other:4010", x_api_key="test")), "text", "domain:code") != base
+
+
+def test_rerank_cached_uses_cached_transforms(cache: TransformCache) -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+    client.holographic.transform.create_cached(
+        content="query text", embedding=[0.1, 0.2], domain="code", output=["phases", "metadata_embeddings"]
+    )
+    client.holographic.transform.create_batch_cached(
+        items=iter([{"id": "a", "content": "alpha", "embedding": [0.1, 0.2]}]),
+        domain="code",
+        output=["phases", "metadata_embeddings"],
+    )
+
+    candidates: List[Any] = [
+        {"id": "a", "content": "alpha"},
+        {"id": "b", "content": "never transformed"},
+        {"id": "c", "content": "alpha", "phases": [9.0] * 14},
+    ]
+    response = client.holographic.rerank_cached(candidates=candidates, query="query text", domain="code")
+
+    sent = server.rerank_bodies[0]
+    assert sent["candidates"][0]["phases"] == [5.0] * 14
+    assert sent["candidates"][0]["metadata_embeddings"] == {"0.1": [0.5, 0.5]}
+    assert "phases" not in sent["candidates"][1]
+    assert sent["candidates"][2]["phases"] == [9.0] * 14
+    assert sent["query_phases"] == [10.0] * 14
+    assert sent["query_metadata_embeddings"] == {"0.1": [0.5, 0.5]}
+    assert [r.path for r in response.data.rankings] == ["fast", "cold", "fast"]
+    # The caller's candidate dicts are left untouched
+    assert candidates[0] == {"id": "a", "content": "alpha"}
+
+    # The schema the server resolved is a valid scope as well
+    client.holographic.rerank_cached(
+        candidates=[{"id": "a", "content": "alpha"}], query="q", frequency_schema_id="code:cosqa:1.0.0"
+    )
+    assert server.rerank_bodies[1]["candidates"][0]["phases"] == [5.0] * 14
+    # A different domain does not reuse the outputs
+    client.holographic.rerank_cached(candidates=[{"id": "a", "content": "alpha"}], query="q", domain="biomedical")
+    assert "phases" not in server.rerank_bodies[2]["candidates"][0]
+
+
+def test_generated_rerank_sends_candidates_unchanged(cache: TransformCache) -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+    client.holographic.transform.create_cached(content="alpha", embedding=[0.1], output=["phases"])
+
+    client.holographic.rerank(candidates=[{"id": "a", "content": "alpha"}], query="alpha")
+    assert "phases" not in server.rerank_bodies[0]["candidates"][0]
+    assert "query_phases" not in server.rerank_bodies[0]
+
+
+def test_explicit_query_phases_win(cache: TransformCache) -> None:
+    server = StandInServer()
+    client = mock_client(server.handle)
+    client.holographic.transform.create_cached(content="q", embedding=[0.1], output=["phases"])
+
+    client.holographic.rerank_cached(candidates=[{"id": "a", "content": "x"}], query="q", query_phases=[0.0] * 14)
+    assert server.rerank_bodies[0]["query_phases"] == [0.0] * 14
+
+
+def test_outputs_are_not_shared_across_accounts_or_recorded_by_create(cache: TransformCache) -> None:
+    server = StandInServer()
+    alice = mock_client(server.handle, x_api_key="alice")
+    alice.holographic.transform.create_cached(content="alpha", embedding=[0.1], output=["phases"])
+    bob = mock_client(server.handle, x_api_key="bob")
+    bob.holographic.transform.create(content="beta", embedding=[0.1], output=["phases"])
+
+    candidates: List[Any] = [{"id": "a", "content": "alpha"}, {"id": "b", "content": "beta"}]
+    bob.holographic.rerank_cached(candidates=candidates, query="q")
+    alice.holographic.rerank_cached(candidates=candidates, query="q")
+
+    assert [("phases" in c) for c in server.rerank_bodies[0]["candidates"]] == [False, False]
+    assert [("phases" in c) for c in server.rerank_bodies[1]["candidates"]] == [True, False]
+
+
+def test_outputs_without_phases_are_not_cached(cache: TransformCache) -> None:
+    data = _transform_cache.TransformData.construct(frequency_schema_id="s", phases=None)
+    cache.record_many([("x", None, data)], client=(mock_base_url, "credentials"))
+    assert len(cache) == 0
+
+
+def test_disabled_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_transform_cache, "transform_cache", None)
+    server = StandInServer()
+    client = mock_client(server.handle)
+    client.holographic.transform.create_cached(content="alpha", embedding=[0.1], output=["phases"])
+
+    client.holographic.rerank_cached(candidates=[{"id": "a", "content": "alpha"}], query="q")
+    assert "phases" not in server.rerank_bodies[0]["candidates"][0]
+
+
+async def test_async_rerank_cached_uses_cache(cache: TransformCache) -> None:
+    server = StandInServer()
+    client = async_mock_client(server.handle)
+    await client.holographic.transform.create_cached(content="alpha", embedding=[0.1], output=["phases"])
+
+    await client.holographic.rerank_cached(candidates=[{"id": "a", "content": "alpha"}], query="q")
+    assert server.rerank_bodies[0]["candidates"][0]["phases"] == [5.0] * 14
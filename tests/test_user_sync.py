@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Set, Dict, List, Tuple, Iterator, Optional
+
+import httpx
+import pytest
+
+from papr_memory._user_sync import plan_user_sync
+from tests.utils import mock_client, async_mock_client
+from papr_memory.types.user_response import UserResponse
+
+pytestmark = pytest.mark.usefixtures("no_retry_delay")
+
+
+class StandInServer:
+    """Keeps users by external id and serves the user endpoints."""
+
+    def __init__(self, existing: int = 0, *, report_total: bool = True) -> None:
+        self.users: Dict[str, Dict[str, Any]] = {}
+        for i in range(existing):
+            self._add({"external_id": f"u{i}", "email": f"u{i}@example.com"})
+        self.report_total = report_total
+        self.calls: List[str] = []
+        self.batch_sizes: List[int] = []
+        self.fail_once: Set[str] = set()  # "PUT u3" style keys that fail with a 503 once
+        self.reject: Set[str] = set()  # external ids rejected by create_batch / update
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _add(self, user: Dict[str, Any]) -> None:
+        self.users[user["external_id"]] = {**user, "user_id": f"id-{user['external_id']}"}
+
+    def _by_id(self, user_id: str) -> Dict[str, Any]:
+        return next(u for u in self.users.values() if u["user_id"] == user_id)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            threading.Event().wait(0.002)
+            with self._lock:
+                return self._handle(request)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        method, path = request.method, request.url.path
+        self.calls.append(f"{method} {path}")
+        if method == "GET" and path == "/v1/user":
+            page, size = int(request.url.params["page"]), int(request.url.params["page_size"])
+            users = sorted(self.users.values(), key=lambda u: u["external_id"])
+            body: Dict[str, Any] = {
+                "code": 200,
+                "status": "success",
+                "data": users[(page - 1) * size : page * size],
+                "page": page,
+                "page_size": size,
+            }
+            if self.report_total:
+                body["total"] = len(users)
+            return httpx.Response(200, json=body)
+        if method == "POST" and path == "/v1/user/batch":
+            users = json.loads(request.content)["users"]
+            self.batch_sizes.append(len(users))
+            data = []
+            for user in users:
+                if user["external_id"] in self.reject:
+                    data.append({"code": 400, "status": "error", "external_id": user["external_id"], "error": "bad"})
+                else:
+                    self._add(user)
+                    data.append({"code": 200, "status": "success", **self.users[user["external_id"]]})
+            return httpx.Response(200, json={"code": 200, "status": "success", "data": data})
+        if path.startswith("/v1/user/"):
+            user = self._by_id(path.rsplit("/", 1)[1])
+            key = f"{method} {user['external_id']}"
+            if key in self.fail_once:
+                self.fail_once.discard(key)
+                return httpx.Response(503, json={"detail": "busy"})
+            if method == "PUT":
+                if user["external_id"] in self.reject:
+                    return httpx.Response(400, json={"detail": "bad email"})
+                user.update(json.loads(request.content))
+                return httpx.Response(200, json={"code": 200, "status": "success", **user})
+            if method == "DELETE":
+                del self.users[user["external_id"]]
+                return httpx.Response(200, json={"code": 200, "status": "success", "user_id": user["user_id"]})
+        return httpx.Response(404)
+
+    def count(self, prefix: str) -> int:
+        return sum(1 for call in self.calls if call.startswith(prefix))
+
+
+def _local(n: int, changed: Tuple[int, ...] = ()) -> Iterator[Dict[str, Any]]:
+    for i in range(n):
+        email = f"new{i}@example.com" if i in changed else f"u{i}@example.com"
+        yield {"external_id": f"u{i}", "email": email}
+
+
+def test_plan() -> None:
+    remote = {
+        "a": UserResponse(code=200, status="success", user_id="1", external_id="a", email="a@x", metadata={"k": 1}),
+        "b": UserResponse(code=200, status="success", user_id="2", external_id="b", email="b@x"),
+        "gone": UserResponse(code=200, status="success", user_id="3", external_id="gone"),
+    }
+    local: Dict[str, Any] = {
+        "a": {"external_id": "a", "email": "a@x", "metadata": {"k": 2}},
+        "b": {"external_id": "b"},
+        "c": {"external_id": "c", "email": "c@x"},
+    }
+
+    plan = plan_user_sync(local, remote)
+
+    assert plan.creates == [local["c"]]
+    assert plan.updates == [("a", "1", {"metadata": {"k": 2}})]
+    assert plan.deletes == []
+    assert plan.unchanged == 1
+    assert plan_user_sync(local, remote, delete_missing=True).deletes == [("gone", "3")]
+
+
+def test_sync_creates_updates_and_deletes_only_what_changed() -> None:
+    server = StandInServer(existing=950)
+    progress: List[Tuple[int, int]] = []
+    # 900 kept (two with a new email), 50 deleted, 300 created
+    local = [user for user in _local(1250, changed=(3, 7)) if not 900 <= int(user["external_id"][1:]) < 950]
+
+    report = mock_client(server.handle).user.sync(
+        iter(local),
+        delete_missing=True,
+        batch_size=100,
+        page_size=100,
+        concurrency=3,
+        on_progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert (report.created, report.updated, report.deleted, report.unchanged) == (300, 2, 50, 898)
+    assert report.ok and report.remote_total == 950 and report.planned == 352
+    assert progress[-1] == (352, 352)
+    assert server.count("GET /v1/user") == 10
+    assert server.batch_sizes == [100, 100, 100]
+    assert server.users["u3"]["email"] == "new3@example.com"
+    assert len(server.users) == 1200
+    assert 1 < server.max_active <= 3
+
+
+def test_sync_is_idempotent() -> None:
+    server = StandInServer(existing=120)
+    client = mock_client(server.handle)
+
+    client.user.sync(_local(150), page_size=50)
+    server.calls.clear()
+    report = client.user.sync(_local(150), page_size=50)
+
+    assert report.planned == 0 and report.unchanged == 150
+    assert server.calls == ["GET /v1/user"] * 3
+
+
+def test_failures_are_reported_and_transient_errors_retried() -> None:
+    server = StandInServer(existing=10)
+    server.fail_once = {"PUT u1", "DELETE u9"}
+    server.reject = {"u2", "u12"}
+
+    report = mock_client(server.handle).user.sync(
+        [user for user in _local(13, changed=(1, 2)) if user["external_id"] != "u9"], delete_missing=True
+    )
+
+    assert (report.created, report.updated, report.deleted) == (2, 1, 1)
+    failures = sorted(report.failures)
+    assert [(f.external_id, f.operation) for f in failures] == [("u12", "create"), ("u2", "update")]
+    assert failures[0].error == "bad" and "400" in failures[1].error
+    assert not report.ok
+
+
+def test_pages_without_total() -> None:
+    server = StandInServer(existing=25, report_total=False)
+
+    report = mock_client(server.handle).user.sync(_local(25), page_size=10)
+
+    assert report.remote_total == 25 and report.unchanged == 25
+    assert server.count("GET /v1/user") == 3
+
+
+def test_dry_run_changes_nothing() -> None:
+    server = StandInServer(existing=5)
+
+    report = mock_client(server.handle).user.sync(_local(8, changed=(0,)), delete_missing=True, dry_run=True)
+
+    assert report.planned == 4 and report.done == 0 and report.dry_run
+    assert server.count("GET") == len(server.calls)
+
+
+def test_users_need_external_ids() -> None:
+    with pytest.raises(ValueError, match="external_id"):
+        mock_client(StandInServer().handle).user.sync([{"email": "x@example.com"}])  # type: ignore[typeddict-item]
+
+
+async def test_async_sync() -> None:
+    server = StandInServer(existing=300)
+    client = async_mock_client(server.handle)
+    server.fail_once = {"PUT u4"}
+    progress: List[Optional[int]] = []
+
+    report = await client.user.sync(
+        _local(420, changed=(4, 5)),
+        batch_size=50,
+        page_size=100,
+        concurrency=2,
+        on_progress=lambda done, _total: progress.append(done),
+    )
+
+    assert (report.created, report.updated, report.unchanged) == (120, 2, 298)
+    assert progress[-1] == 122
+    assert sorted(server.batch_sizes) == [20, 50, 50]
+    assert server.users["u4"]["email"] == "new4@example.com"
@@ -4,10 +4,14 @@ import os
 import inspect
 import traceback
 import contextlib
-from typing import Any, TypeVar, Iterator, Sequence, cast
+from typing import Any, List, TypeVar, Callable, Iterator, Sequence, cast
 from datetime import date, datetime
 from typing_extensions import Literal, get_args, get_origin, assert_type
 
+import httpx
+
+from papr_memory import Papr, AsyncPapr
+from papr_memory.lib import BaseEmbedder
 from papr_memory._types import Omit, NoneType
 from papr_memory._utils import (
     is_dict,
@@ -24,6 +28,10 @@ from papr_memory._models import BaseModel
 
 BaseModelT = TypeVar("BaseModelT", bound=BaseModel)
 
+mock_base_url = "http://127.0.0.1:4010"
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
 
 def assert_matches_model(model: type[BaseModelT], value: BaseModelT, *, path: list[str]) -> bool:
     for name, field in get_model_fields(model).items():
@@ -165,3 +173,40 @@ def update_env(**new_env: str | Omit) -> Iterator[None]:
     finally:
         os.environ.clear()
         os.environ.update(old)
+
+
+def mock_client(handler: Handler, *, x_api_key: str = "test") -> Papr:
+    """A client whose requests are answered by `handler` (usually a test's stand-in server), with retries off."""
+    return Papr(
+        base_url=mock_base_url,
+        x_api_key=x_api_key,
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+
+def async_mock_client(handler: Handler, *, x_api_key: str = "test") -> AsyncPapr:
+    """Async counterpart of `mock_client`."""
+    return AsyncPapr(
+        base_url=mock_base_url,
+        x_api_key=x_api_key,
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+class TinyEmbedder(BaseEmbedder):
+    """Two-dimensional embedder that maps every text to [1, 0] and records each call."""
+
+    name = "tiny"
+    dimensions = 2
+
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def embed_documents(self, input: List[str]) -> List[List[float]]:
+        self.calls.append(list(input))
+        return [self.vector(text) for text in input]
+
+    def vector(self, _text: str) -> List[float]:
+        return [1.0, 0.0]